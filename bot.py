@@ -56,10 +56,10 @@ from domains.peterbot.scheduler import PeterbotScheduler
 from domains.peterbot.data_fetchers import SKILL_DATA_FETCHERS
 
 # Import reminders handler (one-off reminders)
-from domains.peterbot.reminders.handler import (
-    reload_reminders_on_startup,
-    start_reminder_polling
-)
+from domains.peterbot.reminders.handler import start_reminder_engine
+
+# Local event bus (Hadley API pushes reload/skill-run/reminder events)
+from services.bot_events import EventBus
 
 # Import Second Brain passive capture
 from domains.second_brain.passive import (
@@ -165,6 +165,7 @@ async def _peter_channel_healthy() -> bool:
 # Set to True to use new SCHEDULE.md-based scheduler, False for legacy jobs
 USE_PETERBOT_SCHEDULER = True  # Phase 7b complete - skills created
 peterbot_scheduler = None  # Initialized in on_ready
+event_bus = EventBus()  # Started in on_ready
 _ready_initialized = False  # Guard against multiple on_ready calls
 
 
@@ -434,9 +435,12 @@ async def on_ready():
         # Phase 7: Use SCHEDULE.md-based jobs via Claude Code
         job_count = peterbot_scheduler.load_schedule()
         logger.info(f"Peterbot scheduler loaded {job_count} jobs from SCHEDULE.md")
-        # Watch for API-triggered reloads (Hadley API writes trigger file)
-        peterbot_scheduler.start_reload_watcher()
-        peterbot_scheduler.start_nag_checker()
+        # API-triggered reloads/skill runs arrive on the event bus; the trigger
+        # file watcher remains as a fallback for undelivered events
+        if not event_bus.running:
+            await event_bus.start()
+        peterbot_scheduler.register_event_handlers(event_bus)
+        peterbot_scheduler.start_reload_watcher(event_bus.poll_interval(10))
     else:
         # Legacy standalone registration was deleted 2026-06; SCHEDULE.md
         # skills are the only supported path for scheduled Discord output.
@@ -558,16 +562,12 @@ async def on_ready():
     _register_spotify_poll(scheduler, minutes=5)
 
     # Octopus Home Mini live telemetry — 30s poll into energy_live +
-    # data/energy_telemetry.jsonl, with stall alerting baked in.
-    # See domains/energy/telemetry.py.
+    # the data/energy_telemetry.ring sample store, with stall alerting and
+    # appliance event detection (kettle/oven/EV, sustained-load alerts) run
+    # on each poll. See domains/energy/telemetry.py and events.py.
     from domains.energy.telemetry import register as _register_energy_telemetry
     _register_energy_telemetry(scheduler)
 
-    # Appliance event detection over the telemetry stream (kettle/oven/EV,
-    # sustained-load alerts). See domains/energy/events.py.
-    from domains.energy.events import register as _register_energy_events
-    _register_energy_events(scheduler)
-
     # Home environment sensors watchdog — the zigbee2mqtt bridge on the
     # dashboard Pi (192.168.0.110:5001, same box as the pocket-money dashboard)
     # has dropped off WiFi silently before with no alert. Pings it every 5 min
@@ -856,15 +856,14 @@ async def on_ready():
     # Peterbot domain startup - start memory retry task
     peterbot_startup()
 
-    # Reload pending reminders from Supabase
+    # Load active reminders and nags from Supabase onto the reminder engine
+    # (changes are pushed as events when the bus is up; polling only reconciles)
     try:
-        reminder_count = await reload_reminders_on_startup(scheduler, bot)
-        if reminder_count > 0:
-            logger.info(f"Reloaded {reminder_count} pending reminders")
-        # Start polling for reminders added by Peter/external systems
-        start_reminder_polling(scheduler, bot)
+        if not event_bus.running:
+            await event_bus.start()
+        await start_reminder_engine(scheduler, bot, event_bus)
     except Exception as e:
-        logger.error(f"Failed to reload reminders: {e}")
+        logger.error(f"Failed to start reminder engine: {e}")
 
 
 async def fetch_peterbot_history(channel, limit: int = 10) -> list[dict]:
@@ -4,6 +4,7 @@ Extensible registry mapping auto_source keys to Supabase queries.
 Adding a new data source = adding one dict entry to AUTO_SOURCE_REGISTRY.
 """
 
+import asyncio
 import logging
 import os
 from datetime import date, datetime, timedelta, timezone
@@ -335,7 +336,7 @@ async def run_auto_updates(target_date: str | None = None) -> dict:
     Returns:
         Summary dict with updated count and any errors
     """
-    from domains.accountability.service import get_goals, log_progress
+    from domains.accountability.service import get_goals, log_progress_many
 
     from zoneinfo import ZoneInfo
     uk_today = datetime.now(ZoneInfo("Europe/London")).date()
@@ -347,28 +348,38 @@ async def run_auto_updates(target_date: str | None = None) -> dict:
     skipped = 0
     errors = []
 
-    for goal in auto_goals:
-        source_key = goal["auto_source"]
-        try:
-            value = await fetch_auto_value(source_key, target)
-            if value is None:
-                skipped += 1
-                continue
-
-            entry = await log_progress(
-                goal_id=goal["id"],
-                value=value,
-                source=source_key.split("_")[0],  # e.g. "garmin", "nutrition", "weight"
-                log_date=target,
-            )
-            if entry:
-                updated += 1
-                logger.info(f"Auto-updated {goal['title']}: {value} from {source_key}")
-            else:
-                skipped += 1
-        except Exception as e:
-            errors.append(f"{goal['title']}: {e}")
-            logger.error(f"Auto-update error for {goal['title']}: {e}")
+    # Source reads are independent; the writes then go in one RPC call
+    values = await asyncio.gather(
+        *(fetch_auto_value(g["auto_source"], target) for g in auto_goals),
+        return_exceptions=True,
+    )
+    to_log = []
+    for goal, value in zip(auto_goals, values):
+        if isinstance(value, Exception):
+            errors.append(f"{goal['title']}: {value}")
+            logger.error(f"Auto-update error for {goal['title']}: {value}")
+        elif value is None:
+            skipped += 1
+        else:
+            to_log.append((goal, value))
+
+    entries = []
+    if to_log:
+        entries = await log_progress_many([
+            {
+                "goal_id": goal["id"],
+                "value": value,
+                "source": goal["auto_source"].split("_")[0],  # e.g. "garmin", "nutrition", "weight"
+                "log_date": target,
+            }
+            for goal, value in to_log
+        ])
+    for (goal, value), entry in zip(to_log, entries):
+        if entry:
+            updated += 1
+            logger.info(f"Auto-updated {goal['title']}: {value} from {goal['auto_source']}")
+        else:
+            skipped += 1
 
     return {
         "updated": updated,
@@ -26,6 +26,7 @@ def _today() -> date:
 GOALS_TABLE = "accountability_goals"
 MILESTONES_TABLE = "accountability_milestones"
 PROGRESS_TABLE = "accountability_progress"
+PROGRESS_RPC = "accountability_log_progress"
 
 
 def _headers(*, returning: bool = False) -> dict:
@@ -256,6 +257,80 @@ async def log_progress(
     For auto-sources, updates existing entry for the same (goal_id, date, source).
     For manual/peter_chat, always creates a new entry.
     """
+    entries = await log_progress_many([{
+        "goal_id": goal_id,
+        "value": value,
+        "source": source,
+        "note": note,
+        "log_date": log_date,
+    }])
+    return entries[0]
+
+
+async def log_progress_many(updates: list[dict]) -> list[dict | None]:
+    """Log many progress entries in ONE round-trip.
+
+    Each update takes log_progress()'s arguments as keys (goal_id, value,
+    optional source / note / log_date). The accountability_log_progress RPC
+    (supabase/migrations/20261020_accountability_log_progress_rpc.sql)
+    applies each one atomically with the goal row locked: progress row,
+    current_value, streak / completion and milestone hits. Returns the
+    logged entry, or None, per update in order.
+
+    If the RPC isn't deployed yet (PostgREST 404), falls back to logging
+    entry by entry over REST.
+    """
+    if not updates:
+        return []
+    today = _today().isoformat()
+    payload = [
+        {
+            "goal_id": u["goal_id"],
+            "value": u["value"],
+            "source": u.get("source") or "manual",
+            "note": u.get("note") or None,
+            "date": u.get("log_date") or today,
+        }
+        for u in updates
+    ]
+    try:
+        async with httpx.AsyncClient(timeout=15) as client:
+            resp = await client.post(
+                _url(f"rpc/{PROGRESS_RPC}"),
+                headers=_headers(),
+                json={"entries": payload},
+            )
+    except Exception as e:
+        logger.error(f"Log progress error: {e}")
+        return [None] * len(updates)
+
+    if resp.status_code == 404:
+        logger.warning(f"{PROGRESS_RPC} RPC not deployed — logging progress entry by entry")
+        return [await _log_progress_rest(**u) for u in updates]
+    if resp.status_code != 200:
+        logger.error(f"Log progress failed ({resp.status_code}): {resp.text[:200]}")
+        return [None] * len(updates)
+
+    entries: list[dict | None] = []
+    for u, result in zip(updates, resp.json()):
+        if result.get("error"):
+            logger.error(f"Log progress failed for {u['goal_id']}: {result['error']}")
+            entries.append(None)
+            continue
+        for m in result.get("milestones_reached") or []:
+            logger.info(f"Milestone reached for {u['goal_id']}: {m.get('title')}")
+        entries.append(result.get("entry"))
+    return entries
+
+
+async def _log_progress_rest(
+    goal_id: str,
+    value: float,
+    source: str = "manual",
+    note: str | None = None,
+    log_date: str | None = None,
+) -> dict | None:
+    """log_progress() as separate REST calls, for when the RPC is missing."""
     target_date = log_date or _today().isoformat()
 
     # Calculate delta from previous entry
@@ -9,6 +9,17 @@ This is the reference implementation; the TS/Deno projects carry a ~25-line
 equivalent. The daily reconciliation (``domains.api_usage.reconcile``) diffs
 the sum of these rows against Anthropic's Admin usage_report to expose gaps.
 
+Rows are queued in-process and written by one background thread in
+multi-row inserts (every BATCH_SIZE rows or FLUSH_SECONDS, whichever comes
+first) over the pooled Supabase client, so a burst of calls costs a couple
+of requests rather than a thread + connection each. Rows that can't be
+written (network errors, 5xx, auth failures, rate limits) are appended to
+a local journal (``data/ai_usage_journal.jsonl``) and replayed once Supabase
+answers again, so an outage or a rotated key doesn't lose spend; the writer
+stops posting for REPLAY_SECONDS after such a failure. Rows Supabase rejects
+as bad data (400/409/422) would never go in, so they're set aside in
+``ai_usage_journal.rejected.jsonl`` instead of blocking the replay.
+
 Usage::
 
     from domains.api_usage.audit_log import log_ai_usage
@@ -20,12 +31,16 @@ Usage::
 
 from __future__ import annotations
 
+import atexit
+import json
 import os
+import queue
 import threading
+import time
+from pathlib import Path
 from typing import Any, Optional
 
-import httpx
-
+from integrations.supabase_rest import get_supabase
 from logger import logger
 
 try:
@@ -42,6 +57,16 @@ _SUPABASE_URL = (os.getenv("SUPABASE_URL") or "").rstrip("/")
 # the anon key only so a misconfig degrades to a logged no-op rather than a crash.
 _SERVICE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY") or os.getenv("SUPABASE_KEY") or ""
 
+BATCH_SIZE = 50             # rows per insert
+FLUSH_SECONDS = 2.0         # max time a row waits in the queue
+MAX_QUEUE = 5000            # beyond this, new rows are dropped (and counted)
+REPLAY_SECONDS = 60         # how often to retry the journal while it's non-empty
+ORPHAN_SECONDS = 300        # a .replay-* claim untouched this long was left by a crash
+JOURNAL_PATH = Path(__file__).resolve().parents[2] / "data" / "ai_usage_journal.jsonl"
+# Statuses meaning the rows themselves are bad; anything else (401/403 from
+# a rotated key, 5xx, timeouts) is retried later
+_REJECT_STATUSES = {400, 409, 422}
+
 
 def _usage_fields(usage: Any) -> dict:
     """Normalise an Anthropic ``usage`` object/dict into our integer columns."""
@@ -93,8 +118,9 @@ def log_ai_usage(
 ) -> None:
     """Fire-and-forget insert of one Anthropic call into ``ai_api_usage``.
 
-    Never raises and never blocks the caller's request — the insert runs on a
-    daemon thread with a short timeout. A failed insert is logged at debug only.
+    Never raises and never blocks the caller's request — the row is queued
+    for the background batch writer. Rows that can't be written are
+    journalled and replayed later.
     """
     tokens = _usage_fields(usage)
     if cost_usd is None and compute_cost is not None:
@@ -123,21 +149,315 @@ def log_ai_usage(
         return
 
     payload = {k: v for k, v in row.items() if v is not None}
-    threading.Thread(target=_insert, args=(payload,), daemon=True).start()
+    _get_writer().submit(payload)
+
+
+# ---------------------------------------------------------------------------
+# Batched background writer
+# ---------------------------------------------------------------------------
+
+
+class _AuditWriter:
+    """Bounded queue + one daemon thread doing batched inserts.
+
+    Args:
+        post: callable(rows) that writes one batch; raises on failure.
+        journal: where failed batches are spilled for later replay. Rejected
+            rows go next to it, in ``<journal stem>.rejected.jsonl``.
+    """
+
+    def __init__(self, post, journal: Path = JOURNAL_PATH, *,
+                 batch_size: int = BATCH_SIZE, flush_seconds: float = FLUSH_SECONDS,
+                 max_queue: int = MAX_QUEUE):
+        self._post = post
+        self.journal = Path(journal)
+        self.rejected = self.journal.with_name(f"{self.journal.stem}.rejected.jsonl")
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self._q: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._last_replay = 0.0
+        self._backoff_until = 0.0
+        self.stats = {
+            "enqueued": 0, "written": 0, "dropped": 0, "spilled": 0,
+            "replayed": 0, "quarantined": 0, "flushes": 0, "failed_flushes": 0,
+            "last_flush_ms": None, "max_flush_ms": 0.0,
+        }
+
+    # -- caller side ------------------------------------------------------
+
+    def submit(self, row: dict) -> None:
+        """Queue one row. Never blocks; drops (and counts) when full."""
+        try:
+            self._q.put_nowait(row)
+            self.stats["enqueued"] += 1
+        except queue.Full:
+            self.stats["dropped"] += 1
+            return
+        if self._thread is None:
+            self._start()
+
+    def _start(self) -> None:
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="ai-usage-audit", daemon=True)
+                self._thread.start()
+
+    # -- writer thread ----------------------------------------------------
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._drain_once()
+
+    def _drain_once(self) -> None:
+        batch: list[dict] = []
+        deadline = None
+        while len(batch) < self.batch_size:
+            timeout = self.flush_seconds if deadline is None else deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self._q.get(timeout=timeout))
+            except queue.Empty:
+                break
+            if deadline is None:
+                deadline = time.monotonic() + self.flush_seconds
+        if batch:
+            self._flush(batch)
+        elif time.monotonic() - self._last_replay > REPLAY_SECONDS and self._has_backlog():
+            self.replay_journal()
+
+    def _write(self, rows: list[dict]) -> tuple[list[dict], list[dict]]:
+        """Insert rows. Returns (unwritten, rejected): rows worth retrying
+        later, and rows Supabase refused outright."""
+        # PostgREST bulk inserts need identical keys per row; rows omit
+        # nulls (so column defaults apply), so post one insert per key set
+        groups: dict[frozenset, list[dict]] = {}
+        for r in rows:
+            groups.setdefault(frozenset(r), []).append(r)
+        unwritten: list[dict] = []
+        rejected: list[dict] = []
+        for group in groups.values():
+            if unwritten:
+                # Supabase is down or refusing us; don't hammer it group by group
+                unwritten.extend(group)
+                continue
+            try:
+                self._post(group)
+            except Exception as e:
+                if not _is_rejection(e):
+                    logger.debug(f"ai_api_usage: insert of {len(group)} rows failed ({e})")
+                    unwritten.extend(group)
+                    self._backoff_until = time.monotonic() + REPLAY_SECONDS
+                elif len(group) == 1:
+                    logger.warning(f"ai_api_usage: row rejected ({e}); quarantined")
+                    rejected.extend(group)
+                else:
+                    # One bad row fails the whole insert; find it
+                    u, r = self._write_each(group)
+                    unwritten.extend(u)
+                    rejected.extend(r)
+        return unwritten, rejected
+
+    def _write_each(self, rows: list[dict]) -> tuple[list[dict], list[dict]]:
+        unwritten: list[dict] = []
+        rejected: list[dict] = []
+        for i, row in enumerate(rows):
+            u, r = self._write([row])
+            if u:
+                unwritten.extend(rows[i:])
+                break
+            rejected.extend(r)
+        return unwritten, rejected
+
+    def _flush(self, batch: list[dict]) -> None:
+        started = time.monotonic()
+        if started < self._backoff_until:
+            # Backing off after a failure; the journal replay probes Supabase
+            self.stats["failed_flushes"] += 1
+            self._spill(batch)
+            return
+        unwritten, rejected = self._write(batch)
+        self._quarantine(rejected)
+        written = len(batch) - len(unwritten) - len(rejected)
+        self.stats["written"] += written
+        if unwritten:
+            self.stats["failed_flushes"] += 1
+            self._spill(unwritten)
+            logger.debug(f"ai_api_usage: {len(unwritten)} of {len(batch)} rows unwritten; "
+                         f"spilled to journal")
+            return
+        ms = round((time.monotonic() - started) * 1000, 1)
+        self.stats["flushes"] += 1
+        self.stats["last_flush_ms"] = ms
+        self.stats["max_flush_ms"] = max(self.stats["max_flush_ms"], ms)
+        # Supabase is answering — a good moment to catch up on any backlog
+        if time.monotonic() - self._last_replay > REPLAY_SECONDS and self._has_backlog():
+            self.replay_journal()
+
+    def _append(self, path: Path, rows: list[dict]) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            for r in rows:
+                f.write(json.dumps(r, default=str) + "\n")
 
+    def _spill(self, rows: list[dict], *, count: bool = True) -> None:
+        try:
+            self._append(self.journal, rows)
+            if count:
+                self.stats["spilled"] += len(rows)
+        except OSError as e:
+            self.stats["dropped"] += len(rows)
+            logger.warning(f"ai_api_usage: journal write failed, {len(rows)} rows lost: {e}")
+
+    def _quarantine(self, rows: list[dict]) -> None:
+        if not rows:
+            return
+        try:
+            self._append(self.rejected, rows)
+            self.stats["quarantined"] += len(rows)
+        except OSError as e:
+            self.stats["dropped"] += len(rows)
+            logger.warning(f"ai_api_usage: quarantine write failed, {len(rows)} rows lost: {e}")
+
+    def _orphans(self) -> list[Path]:
+        """Replay claims left behind by a process that died mid-replay."""
+        cutoff = time.time() - ORPHAN_SECONDS
+        found = []
+        for path in self.journal.parent.glob(f"{self.journal.stem}.replay-*"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    found.append(path)
+            except FileNotFoundError:
+                continue
+        return found
+
+    def _has_backlog(self) -> bool:
+        return self.journal.exists() or bool(self._orphans())
+
+    def _claim(self) -> list[Path]:
+        # Rename before reading so a concurrent spill (here or in another
+        # process) starts a fresh journal rather than racing the rewrite,
+        # and two processes can't both adopt the same orphan
+        pid = os.getpid()
+        claimed = []
+        for i, src in enumerate([self.journal, *self._orphans()]):
+            suffix = f".replay-{pid}" if i == 0 else f".replay-{pid}-{i}"
+            dst = self.journal.with_name(self.journal.stem + suffix)
+            try:
+                os.replace(src, dst)
+                os.utime(dst)
+            except FileNotFoundError:
+                continue
+            claimed.append(dst)
+        return claimed
+
+    def replay_journal(self) -> int:
+        """Re-send journalled rows, including any orphaned by a crashed replay.
+
+        Returns rows written. Rejected rows are quarantined; the rest stay
+        journalled until the next attempt.
+        """
+        self._last_replay = time.monotonic()
+        claimed = self._claim()
+        if not claimed:
+            return 0
+        rows = []
+        for path in claimed:
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        rows.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue
+        written = 0
+        for i in range(0, len(rows), self.batch_size):
+            chunk = rows[i:i + self.batch_size]
+            unwritten, rejected = self._write(chunk)
+            self._quarantine(rejected)
+            written += len(chunk) - len(unwritten) - len(rejected)
+            if unwritten:
+                logger.debug(f"ai_api_usage: journal replay paused, {len(unwritten)} rows unwritten")
+                self._spill(unwritten + rows[i + self.batch_size:], count=False)
+                break
+            # Keep the claims fresh so other processes don't take them for orphans
+            for path in claimed:
+                try:
+                    os.utime(path)
+                except OSError:
+                    pass
+        for path in claimed:
+            path.unlink(missing_ok=True)
+        if written:
+            self.stats["replayed"] += written
+            logger.info(f"ai_api_usage: replayed {written} journalled rows")
+        return written
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Flush whatever is queued (spilling on failure) and stop the thread."""
+        self._stop.set()
+        rows = []
+        while True:
+            try:
+                rows.append(self._q.get_nowait())
+            except queue.Empty:
+                break
+        if rows:
+            self._flush(rows)
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def metrics(self) -> dict:
+        return {
+            "queue_depth": self._q.qsize(),
+            "journal_pending": _count_lines(self.journal),
+            **self.stats,
+        }
 
-def _insert(payload: dict) -> None:
+
+def _count_lines(path: Path) -> int:
     try:
-        httpx.post(
-            f"{_SUPABASE_URL}/rest/v1/{_TABLE}",
-            headers={
-                "apikey": _SERVICE_KEY,
-                "Authorization": f"Bearer {_SERVICE_KEY}",
-                "Content-Type": "application/json",
-                "Prefer": "return=minimal",
-            },
-            json=payload,
-            timeout=10,
-        )
-    except Exception as e:  # pragma: no cover - network best-effort
-        logger.debug(f"ai_api_usage insert failed: {e}")
+        with open(path, "rb") as f:
+            return sum(1 for _ in f)
+    except FileNotFoundError:
+        return 0
+
+
+def _is_rejection(e: Exception) -> bool:
+    """An error retrying won't fix (bad row, unknown column, duplicate, ...)."""
+    status = getattr(getattr(e, "response", None), "status_code", None)
+    return status in _REJECT_STATUSES
+
+
+def _post_rows(rows: list[dict]) -> None:
+    sb = get_supabase(_SUPABASE_URL, _SERVICE_KEY)
+    resp = sb.request_sync(
+        "POST", _TABLE,
+        json=rows,
+        headers=sb.headers(prefer="return=minimal"),
+        timeout=10,
+    )
+    resp.raise_for_status()
+
+
+_writer: _AuditWriter | None = None
+_writer_lock = threading.Lock()
+
+
+def _get_writer() -> _AuditWriter:
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = _AuditWriter(_post_rows)
+                atexit.register(_writer.close)
+    return _writer
+
+
+def audit_queue_metrics() -> dict:
+    """Queue depth, flush latency and drop/spill counters for this process."""
+    if _writer is None:
+        return {"queue_depth": 0, "journal_pending": _count_lines(JOURNAL_PATH), "started": False}
+    return {"started": True, **_writer.metrics()}
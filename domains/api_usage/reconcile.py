@@ -4,7 +4,8 @@ For each (day × model) it compares:
   * **Anthropic** Admin usage_report (ground truth), split into keyed usage
     (the shared API key) vs ``console`` (Workbench, ``api_key_id`` is null and
     so unattributable to any project), and
-  * the **sum of our logged calls** (``ai_api_usage`` where billing_source='api_key').
+  * the **sum of our logged calls** (``ai_api_usage`` where billing_source='api_key'),
+    aggregated server-side by the ``ai_usage_daily`` RPC.
 
 The gap (Anthropic − logged) on the keyed bucket is the signal: a positive gap
 means un-instrumented usage — a project/call-site not yet wired. Results upsert
@@ -25,6 +26,7 @@ from typing import Optional
 import httpx
 
 from logger import logger
+from domains.api_usage.rollup import daily_rollup
 from domains.api_usage.services import anthropic_admin
 
 _SUPABASE_URL = (os.getenv("SUPABASE_URL") or "").rstrip("/")
@@ -49,32 +51,24 @@ def _sb_headers(extra: Optional[dict] = None) -> dict:
 
 
 def _fetch_logged(start: date) -> dict[tuple, dict]:
-    """Sum logged api_key calls by (usage_date, model) from start (inclusive)."""
+    """Sum logged api_key calls by (usage_date, model) from start (inclusive).
+
+    Postgres does the grouping (see domains/api_usage/rollup.py); we only fold
+    the per-project rows into per-model totals.
+    """
     out: dict[tuple, dict] = defaultdict(lambda: {"input": 0, "output": 0, "cost": 0.0})
     if not _SUPABASE_URL or not _SERVICE_KEY:
         return out
-    params = {
-        "select": "created_at,model,input_tokens,output_tokens,cost_usd,billing_source",
-        "created_at": f"gte.{start.isoformat()}",
-        "billing_source": "eq.api_key",
-        "limit": "200000",
-    }
     try:
-        with httpx.Client(timeout=30) as client:
-            resp = client.get(f"{_SUPABASE_URL}/rest/v1/{_USAGE_TABLE}",
-                              headers=_sb_headers(), params=params)
-            resp.raise_for_status()
-            rows = resp.json()
+        rows = daily_rollup(_SUPABASE_URL, _SERVICE_KEY, start)
     except Exception as e:
-        logger.warning(f"reconcile: failed reading {_USAGE_TABLE}: {e}")
+        logger.warning(f"reconcile: failed reading {_USAGE_TABLE} rollup: {e}")
         return out
     for r in rows:
-        day = (r.get("created_at") or "")[:10]
-        model = r.get("model") or "unknown"
-        b = out[(day, model)]
-        b["input"] += int(r.get("input_tokens") or 0)
-        b["output"] += int(r.get("output_tokens") or 0)
-        b["cost"] += float(r.get("cost_usd") or 0.0)
+        b = out[(r["usage_date"], r["model"])]
+        b["input"] += r["input_tokens"]
+        b["output"] += r["output_tokens"]
+        b["cost"] += r["cost_usd"]
     return out
 
 
@@ -22,10 +22,11 @@ import csv
 import os
 import sys
 from collections import defaultdict
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 
 import httpx
 
+from domains.api_usage.rollup import daily_rollup
 from logger import logger
 
 _SUPABASE_URL = (os.getenv("SUPABASE_URL") or "https://modjoikyuhqzouxvieua.supabase.co").rstrip("/")
@@ -77,23 +78,13 @@ def _fetch_logged_cost(start: str, end: str) -> dict[tuple, float]:
         logger.warning("reconcile_csv: no Supabase service key — logged side will be 0")
         return out
     try:
-        with httpx.Client(timeout=30) as client:
-            resp = client.get(
-                f"{_SUPABASE_URL}/rest/v1/{_USAGE_TABLE}",
-                headers={"apikey": _SERVICE_KEY, "Authorization": f"Bearer {_SERVICE_KEY}"},
-                params={"select": "created_at,project,cost_usd,billing_source",
-                        "created_at": f"gte.{start}", "billing_source": "eq.api_key",
-                        "limit": "200000"},
-            )
-            resp.raise_for_status()
-            rows = resp.json()
+        rows = daily_rollup(_SUPABASE_URL, _SERVICE_KEY,
+                            date.fromisoformat(start), date.fromisoformat(end))
     except Exception as e:
-        logger.warning(f"reconcile_csv: failed reading {_USAGE_TABLE}: {e}")
+        logger.warning(f"reconcile_csv: failed reading {_USAGE_TABLE} rollup: {e}")
         return out
     for r in rows:
-        day = (r.get("created_at") or "")[:10]
-        if day and day <= end:
-            out[(day, r.get("project") or "?")] += float(r.get("cost_usd") or 0.0)
+        out[(r["usage_date"], r["project"])] += r["cost_usd"]
     return out
 
 
@@ -0,0 +1,110 @@
+"""Per-day aggregates of the ``ai_api_usage`` audit log.
+
+Reconciliation only needs sums by (day, project, model), so it asks Postgres
+for them via the ``ai_usage_daily`` RPC (supabase/migrations/
+20261018_ai_usage_daily_rollup.sql) instead of downloading every raw call.
+Raw rows are fetched only for drill-down into a single day.
+
+If the RPC isn't deployed yet (PostgREST 404), daily_rollup() falls back to
+paging the raw rows and summing them here, with a warning, so reconciliation
+keeps working through the migration.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Optional
+
+import httpx
+
+from integrations.supabase_rest import get_supabase
+from logger import logger
+
+USAGE_TABLE = "ai_api_usage"
+ROLLUP_RPC = "ai_usage_daily"
+
+_SUM_FIELDS = ("input_tokens", "output_tokens", "cache_creation_input_tokens",
+               "cache_read_input_tokens")
+
+
+def daily_rollup(url: str, key: str, start: date, end: Optional[date] = None,
+                 billing_source: str = "api_key") -> list[dict]:
+    """Sums by (usage_date, project, model) over [start, end] (UTC days, end inclusive).
+
+    Each row: usage_date (ISO str), project, model, calls, the four token
+    columns and cost_usd (float). Raises on Supabase errors other than a
+    missing RPC; callers decide how to degrade.
+    """
+    sb = get_supabase(url, key)
+    params = {"since": start.isoformat(), "source": billing_source}
+    if end is not None:
+        params["until"] = end.isoformat()
+    # GET keeps the call idempotent, so the pool retries transient failures
+    resp = sb.request_sync("GET", f"rpc/{ROLLUP_RPC}", params=params,
+                           headers=sb.headers(prefer=None))
+    if resp.status_code == 404:
+        logger.warning(f"{ROLLUP_RPC} RPC not deployed — summing raw {USAGE_TABLE} rows")
+        return _rollup_from_rows(sb, start, end, billing_source)
+    resp.raise_for_status()
+    return [_normalise(r) for r in resp.json()]
+
+
+def _normalise(r: dict) -> dict:
+    out = {
+        "usage_date": str(r.get("usage_date") or "")[:10],
+        "project": r.get("project") or "?",
+        "model": r.get("model") or "unknown",
+        "calls": int(r.get("calls") or 0),
+        "cost_usd": float(r.get("cost_usd") or 0.0),
+    }
+    for f in _SUM_FIELDS:
+        out[f] = int(r.get(f) or 0)
+    return out
+
+
+def _rollup_from_rows(sb, start: date, end: Optional[date], billing_source: str) -> list[dict]:
+    params = {
+        "select": "created_at,project,model,cost_usd," + ",".join(_SUM_FIELDS),
+        "created_at": f"gte.{start.isoformat()}",
+        "billing_source": f"eq.{billing_source}",
+        "order": "created_at.asc",
+    }
+    if end is not None:
+        params["and"] = f"(created_at.lt.{(end + timedelta(days=1)).isoformat()})"
+    groups: dict[tuple, dict] = defaultdict(lambda: {"calls": 0, "cost_usd": 0.0,
+                                                     **{f: 0 for f in _SUM_FIELDS}})
+    for r in sb.select_sync(USAGE_TABLE, params, paginate=True):
+        key = ((r.get("created_at") or "")[:10], r.get("project") or "?", r.get("model") or "unknown")
+        g = groups[key]
+        g["calls"] += 1
+        g["cost_usd"] += float(r.get("cost_usd") or 0.0)
+        for f in _SUM_FIELDS:
+            g[f] += int(r.get(f) or 0)
+    return [{"usage_date": d, "project": p, "model": m, **g}
+            for (d, p, m), g in sorted(groups.items())]
+
+
+def fetch_calls(url: str, key: str, day: date, *, model: Optional[str] = None,
+                project: Optional[str] = None, billing_source: Optional[str] = "api_key",
+                limit: int = 500) -> list[dict]:
+    """Raw audit rows for one UTC day — drill-down behind a reconciliation gap."""
+    params = {
+        "select": "created_at,project,feature,model,input_tokens,output_tokens,"
+                  "cost_usd,status,anthropic_message_id",
+        "created_at": f"gte.{day.isoformat()}",
+        "and": f"(created_at.lt.{(day + timedelta(days=1)).isoformat()})",
+        "order": "created_at.desc",
+        "limit": str(limit),
+    }
+    if model:
+        params["model"] = f"eq.{model}"
+    if project:
+        params["project"] = f"eq.{project}"
+    if billing_source:
+        params["billing_source"] = f"eq.{billing_source}"
+    try:
+        return get_supabase(url, key).select_sync(USAGE_TABLE, params, paginate=True)
+    except (httpx.HTTPError, RuntimeError) as e:
+        logger.warning(f"ai_usage drill-down failed: {e}")
+        return []
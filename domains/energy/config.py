@@ -78,5 +78,10 @@ COMPLETE_DAY_INTERVALS = 46  # 48 ideal; tolerate a couple of meter gaps
 
 DISCORD_ENERGY_WEBHOOK = os.environ.get("DISCORD_ENERGY_WEBHOOK", "")
 
-# Local telemetry log (raw 10s samples, ring-trimmed by the poller)
+# Local telemetry store: raw 10s samples in a fixed-size binary ring
+# (see telemetry_store.py). 7 days at one sample per 10s ≈ 1.5 MB.
+TELEMETRY_RING = PROJECT_ROOT / "data" / "energy_telemetry.ring"
+TELEMETRY_RING_CAPACITY = 7 * 24 * 360
+
+# Legacy JSONL log — only read by the one-off migration into the ring
 TELEMETRY_LOG = PROJECT_ROOT / "data" / "energy_telemetry.jsonl"
@@ -1,8 +1,15 @@
 """Appliance event detection from Home Mini telemetry.
 
-Every scan, reads recent raw 10s samples from data/energy_telemetry.jsonl,
-segments sustained loads above a rolling baseline, classifies them by power
-and duration, and upserts into the energy_events table:
+Runs after every telemetry poll (telemetry.poll_once), feeding only the
+samples that arrived since the last scan into an incremental detector:
+
+- Baseline: rolling 10th percentile of demand over the last
+  LOOKBACK_MINUTES, kept as a sorted sliding window (exact, O(log n) per
+  sample) instead of recomputed over the whole window each scan.
+- An open event carries across scans (and restarts — see STATE_PATH) with
+  its baseline frozen at open, so a multi-hour EV charge doesn't drag the
+  baseline up and close itself.
+- Completed events are classified and upserted into energy_events:
 
 - kettle        : +1.6–3.3 kW for ≤ 6 min
 - ev_charge     : +4.5 kW+ for ≥ 15 min (or any event inside an Intelligent
@@ -12,22 +19,30 @@ and duration, and upserts into the energy_events table:
 - spike         : ≥ 3.5 kW shorter than 5 min (shower pump, vacuum, etc.)
 
 A sustained high_load/oven event over ALERT_MINUTES posts a throttled
-#alerts warning ("something's been drawing 2kW for 2 hours").
-State (last processed timestamp) lives in data/energy_events_state.json.
+#alerts warning ("something's been drawing 2kW for 2 hours") — within one
+poll of crossing the threshold.
+State (last processed sample, any open event, and closed events not yet
+stored) lives in data/energy_events_state.json; the baseline window is
+rebuilt from the telemetry ring on startup. Closed events that fail to
+store are kept there and retried on the next scan.
 """
 
 from __future__ import annotations
 
 import json
 import os
-import statistics
+import time
+from bisect import bisect_left, insort
+from collections import deque
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 import httpx
+import numpy as np
 
 from logger import logger
-from .config import SUPABASE_KEY, SUPABASE_URL, TELEMETRY_LOG
+from .config import SUPABASE_KEY, SUPABASE_URL
+from .telemetry_store import get_ring
 
 STATE_PATH = Path(__file__).resolve().parents[2] / "data" / "energy_events_state.json"
 HADLEY_ALERT_URL = "http://localhost:8100/alert"
@@ -36,35 +51,43 @@ LOOKBACK_MINUTES = 120
 EVENT_DELTA_W = 1200          # rise above baseline that opens an event
 EVENT_CLOSE_W = 500           # within this of baseline closes it
 MIN_EVENT_SECONDS = 60
-ALERT_MINUTES = 75            # sustained-load alert; must stay well below
-                              # LOOKBACK_MINUTES*0.9 or it can never fire
+MIN_BASELINE_SAMPLES = 30     # don't open events until the baseline has history
+HISTORY_GAP_SECONDS = 600     # a poller outage this long restarts "history"
+ALERT_MINUTES = 75            # sustained-load alert
 ALERT_UNOCCUPIED_MINUTES = 30  # faster alert when nobody seems home
+ALERT_REPEAT_MINUTES = 120    # re-alert a still-running load this often
+DISPATCH_CACHE_SECONDS = 600  # Kraken dispatch lookups, shared across polls
+MAX_PENDING_EVENTS = 200      # unstored closed events kept for retry
 ZIGBEE_API_URL = "http://192.168.0.110:5001"  # Pi zigbee2mqtt bridge
 
 # Current Intelligent Go peak rate fallback for cost estimates (p/kWh)
 FALLBACK_RATE_P = 27.0
 
 
-def _load_samples(since: datetime) -> list[dict]:
-    if not TELEMETRY_LOG.exists():
-        return []
-    out = []
-    for line in TELEMETRY_LOG.read_text(encoding="utf-8").splitlines():
+_dispatch_cache: tuple[float, dict | None] = (0.0, None)
+
+
+def _dispatches() -> dict | None:
+    """Planned/completed EV dispatches, cached — scans run every poll and
+    Kraken rate-limits (KT-CT-1199) if each one queries it."""
+    global _dispatch_cache
+    fetched_at, data = _dispatch_cache
+    if data is None or time.monotonic() - fetched_at > DISPATCH_CACHE_SECONDS:
         try:
-            s = json.loads(line)
-        except json.JSONDecodeError:
-            continue
-        if s.get("readAt") and s.get("demand") is not None and s["readAt"] >= since.isoformat():
-            out.append(s)
-    out.sort(key=lambda s: s["readAt"])
-    return out
+            from .dispatches import get_dispatches
+            data = get_dispatches()
+        except Exception as e:
+            logger.debug(f"dispatch fetch for event classification failed: {e}")
+            data = {"planned": [], "completed": []}
+        _dispatch_cache = (time.monotonic(), data)
+    return data
 
 
 def _classify(avg_delta_w: float, duration_s: float, started: datetime) -> str:
     from .dispatches import in_dispatch_window
     if avg_delta_w >= 4500 and duration_s >= 900:
         return "ev_charge"
-    if duration_s >= 900 and in_dispatch_window(started):
+    if duration_s >= 900 and in_dispatch_window(started, _dispatches()):
         return "ev_charge"
     if 1600 <= avg_delta_w <= 3300 and duration_s <= 360:
         return "kettle"
@@ -75,67 +98,152 @@ def _classify(avg_delta_w: float, duration_s: float, started: datetime) -> str:
     return "high_load"
 
 
-def _detect_events(samples: list[dict]) -> list[dict]:
-    if len(samples) < 30:
-        return []
+class _WindowQuantile:
+    """Low quantile of values over a sliding time window.
 
-    demands = [float(s["demand"]) for s in samples]
-    # 10th percentile, not median: with a dominant load (EV at 7kW for
-    # hours) the median sits ON the load and masks every other event.
-    baseline = statistics.quantiles(demands, n=10)[0]
+    Keeps the window's values in a sorted list alongside an arrival deque:
+    each add/evict is a bisect plus a short memmove (the window is at most
+    LOOKBACK_MINUTES of 10s samples, ~720 values), and reading the quantile
+    is O(1). Matches statistics.quantiles(values, n=10)[0] exactly.
+    """
 
-    events = []
-    open_event: dict | None = None
-    for s in samples:
-        d = float(s["demand"])
-        ts = datetime.fromisoformat(s["readAt"].replace("Z", "+00:00"))
-        if open_event is None:
-            if d >= baseline + EVENT_DELTA_W:
-                open_event = {"start": ts, "peaks": [d], "last": ts}
-        else:
-            if d <= baseline + EVENT_CLOSE_W:
-                events.append({**open_event, "end": ts})
-                open_event = None
+    def __init__(self, window_s: float, n: int = 10):
+        self.window_s = window_s
+        self.n = n
+        self._arrivals: deque[tuple[float, float]] = deque()
+        self._sorted: list[float] = []
+
+    def __len__(self) -> int:
+        return len(self._sorted)
+
+    def add(self, epoch: float, value: float) -> None:
+        self._arrivals.append((epoch, value))
+        insort(self._sorted, value)
+        cutoff = epoch - self.window_s
+        while self._arrivals and self._arrivals[0][0] < cutoff:
+            _, old = self._arrivals.popleft()
+            del self._sorted[bisect_left(self._sorted, old)]
+
+    def value(self) -> float | None:
+        data, n = self._sorted, self.n
+        ld = len(data)
+        if ld < 2:
+            return data[0] if data else None
+        # statistics.quantiles "exclusive" method, first cut point
+        m = ld + 1
+        j = min(max(m // n, 1), ld - 1)
+        delta = m - j * n
+        return (data[j - 1] * (n - delta) + data[j] * delta) / n
+
+
+class EventDetector:
+    """Incremental event segmentation over the telemetry stream.
+
+    feed() takes only new samples and returns events that closed within
+    them; ongoing() snapshots the event still open (for alerting).
+    """
+
+    def __init__(self, lookback_s: float = LOOKBACK_MINUTES * 60):
+        self.baseline = _WindowQuantile(lookback_s)
+        self.last_epoch: float | None = None
+        # Start of continuous history: an event opening within a minute of
+        # it was already running when we started watching (clipped)
+        self.history_start: float | None = None
+        self.open: dict | None = None
+        # Closed events not yet stored in energy_events (retried each scan)
+        self.pending: list[dict] = []
+
+    # -- state ----------------------------------------------------------
+
+    def to_state(self) -> dict:
+        return {"last_epoch": self.last_epoch, "history_start": self.history_start,
+                "open": self.open, "pending": self.pending}
+
+    @classmethod
+    def from_state(cls, state: dict, history: np.ndarray | None = None) -> "EventDetector":
+        """Restore from saved state, rebuilding the baseline from history samples."""
+        det = cls()
+        if history is not None:
+            for epoch, d in zip(history["epoch"].tolist(), history["demand_w"].tolist()):
+                det.baseline.add(epoch, d)
+        det.last_epoch = state.get("last_epoch")
+        det.history_start = state.get("history_start")
+        det.open = state.get("open")
+        det.pending = state.get("pending") or []
+        return det
+
+    # -- detection ------------------------------------------------------
+
+    def feed(self, epochs, demands) -> list[dict]:
+        """Process samples (oldest first); return events that completed."""
+        closed = []
+        for epoch, d in zip(np.asarray(epochs).tolist(), np.asarray(demands).tolist()):
+            if self.last_epoch is not None and epoch <= self.last_epoch:
+                continue
+            if self.last_epoch is None or epoch - self.last_epoch > HISTORY_GAP_SECONDS:
+                self.history_start = epoch
+            self.last_epoch = epoch
+
+            ev = self.open
+            if ev is None:
+                base = self.baseline.value()
+                if len(self.baseline) >= MIN_BASELINE_SAMPLES and d >= base + EVENT_DELTA_W:
+                    self.open = {"start": epoch, "last": epoch, "baseline": base,
+                                 "sum": d, "n": 1, "peak": d, "alerted_at": None,
+                                 "clipped": epoch - self.history_start < 60}
+            elif d <= ev["baseline"] + EVENT_CLOSE_W:
+                record = self._record(ev, end=epoch)
+                if record is not None:
+                    closed.append(record)
+                self.open = None
             else:
-                open_event["peaks"].append(d)
-                open_event["last"] = ts
-
-    # an event still open at the window edge is reported without an end
-    if open_event is not None:
-        events.append({**open_event, "end": None})
-
-    window_start = datetime.fromisoformat(samples[0]["readAt"].replace("Z", "+00:00"))
-    out = []
-    for e in events:
-        end = e["end"] or e["last"]
-        duration = (end - e["start"]).total_seconds()
+                ev["sum"] += d
+                ev["n"] += 1
+                ev["peak"] = max(ev["peak"], d)
+                ev["last"] = epoch
+
+            self.baseline.add(epoch, d)
+        return closed
+
+    def ongoing(self) -> dict | None:
+        """The open event as an energy_events-shaped dict (ended_at None)."""
+        if self.open is None:
+            return None
+        return self._record(self.open, end=None)
+
+    @staticmethod
+    def _record(ev: dict, end: float | None) -> dict | None:
+        duration = (end if end is not None else ev["last"]) - ev["start"]
         if duration < MIN_EVENT_SECONDS:
-            continue
-        avg = sum(e["peaks"]) / len(e["peaks"])
-        avg_delta = avg - baseline
+            return None
+        avg = ev["sum"] / ev["n"]
+        avg_delta = avg - ev["baseline"]
         kwh = avg_delta / 1000 * duration / 3600
-        # An event already running at the window edge has an unknown true
+        started = datetime.fromtimestamp(ev["start"], tz=timezone.utc)
+        # An event already running when history starts has an unknown true
         # start — totals would understate (EV charges by 3-4x). Mark it and
         # null the energy figures; /energy/ev dispatches are the
         # authoritative source for EV charge totals.
-        clipped = (e["start"] - window_start).total_seconds() < 60
-        out.append({
-            "started_at": e["start"].isoformat(),
-            "ended_at": e["end"].isoformat() if e["end"] else None,
-            "event_type": _classify(avg_delta, duration, e["start"]),
+        clipped = ev["clipped"]
+        return {
+            "started_at": started.isoformat(),
+            "ended_at": datetime.fromtimestamp(end, tz=timezone.utc).isoformat() if end is not None else None,
+            "event_type": _classify(avg_delta, duration, started),
             "avg_demand_w": round(avg, 0),
-            "peak_demand_w": round(max(e["peaks"]), 0),
+            "peak_demand_w": round(ev["peak"], 0),
             "energy_kwh": None if clipped else round(kwh, 3),
             "cost_pence": None if clipped else round(kwh * FALLBACK_RATE_P, 1),
-            "detail": {"baseline_w": round(baseline, 0), "duration_s": int(duration),
-                       "ongoing": e["end"] is None, "window_clipped": clipped},
-        })
-    return out
+            "detail": {"baseline_w": round(ev["baseline"], 0), "duration_s": int(duration),
+                       "ongoing": end is None, "window_clipped": clipped},
+        }
 
 
-def _store_events(events: list[dict]) -> int:
+def _store_events(events: list[dict]) -> tuple[int, list[dict]]:
     """Store COMPLETED events only, deduped by time overlap.
 
+    Returns (stored, unstored): the number inserted, and the completed
+    events that couldn't be checked or inserted, for the caller to retry.
+
     Ongoing events are never stored (they'd freeze at the first-detection
     snapshot and duplicate on later scans when the detected start shifts) —
     they exist for alerting only; once finished, the next scan stores the
@@ -143,6 +251,7 @@ def _store_events(events: list[dict]) -> int:
     the same type, which is robust to start-time jitter between scans.
     """
     stored = 0
+    unstored = []
     headers = {
         "apikey": SUPABASE_KEY,
         "Authorization": f"Bearer {SUPABASE_KEY}",
@@ -151,22 +260,32 @@ def _store_events(events: list[dict]) -> int:
     for ev in events:
         if ev["detail"].get("ongoing") or not ev["ended_at"]:
             continue
-        existing = httpx.get(
-            f"{SUPABASE_URL}/rest/v1/energy_events",
-            headers=headers,
-            params=[("select", "id"), ("event_type", f"eq.{ev['event_type']}"),
-                    ("started_at", f"lte.{ev['ended_at']}"),
-                    ("ended_at", f"gte.{ev['started_at']}"),
-                    ("limit", "1")],
-            timeout=15,
-        )
-        if existing.status_code == 200 and existing.json():
+        try:
+            existing = httpx.get(
+                f"{SUPABASE_URL}/rest/v1/energy_events",
+                headers=headers,
+                params=[("select", "id"), ("event_type", f"eq.{ev['event_type']}"),
+                        ("started_at", f"lte.{ev['ended_at']}"),
+                        ("ended_at", f"gte.{ev['started_at']}"),
+                        ("limit", "1")],
+                timeout=15,
+            )
+            if existing.status_code != 200:
+                unstored.append(ev)
+                continue
+            if existing.json():
+                continue
+            resp = httpx.post(f"{SUPABASE_URL}/rest/v1/energy_events",
+                              headers=headers, json=ev, timeout=15)
+        except Exception as e:
+            logger.debug(f"energy event store failed: {e}")
+            unstored.append(ev)
             continue
-        resp = httpx.post(f"{SUPABASE_URL}/rest/v1/energy_events",
-                          headers=headers, json=ev, timeout=15)
         if resp.status_code < 300:
             stored += 1
-    return stored
+        else:
+            unstored.append(ev)
+    return stored, unstored
 
 
 def _lounge_occupied() -> bool | None:
@@ -180,56 +299,96 @@ def _lounge_occupied() -> bool | None:
         return None
 
 
-def _maybe_alert_sustained(events: list[dict]) -> None:
+def _maybe_alert_sustained(detector: EventDetector) -> None:
+    ev = detector.open
+    if ev is None:
+        return
+    duration = ev["last"] - ev["start"]
+    # Cheap checks first — this runs every poll
+    if duration < ALERT_UNOCCUPIED_MINUTES * 60:
+        return
+    if ev["alerted_at"] and ev["last"] - ev["alerted_at"] < ALERT_REPEAT_MINUTES * 60:
+        return
+    snapshot = detector.ongoing()
+    if snapshot is None or snapshot["event_type"] == "ev_charge":
+        return
     occupied = _lounge_occupied()
     threshold_min = ALERT_UNOCCUPIED_MINUTES if occupied is False else ALERT_MINUTES
-    for ev in events:
-        if not ev["detail"].get("ongoing") or ev["event_type"] == "ev_charge":
-            continue
-        if ev["detail"]["duration_s"] >= threshold_min * 60:
-            try:
-                httpx.post(
-                    HADLEY_ALERT_URL,
-                    headers={"x-api-key": os.environ.get("HADLEY_AUTH_KEY", "")},
-                    json={
-                        "message": (
-                            f"Sustained electrical load: ~{ev['avg_demand_w']:.0f}W for "
-                            f"{ev['detail']['duration_s'] // 60} min "
-                            f"({ev['event_type']}) — oven/heater left on?"
-                            + (" No lounge motion — house may be empty."
-                               if occupied is False else "")
-                        ),
-                        "source": "energy-events",
-                        "throttle_minutes": 120,
-                    },
-                    timeout=10,
-                )
-            except Exception as e:
-                logger.debug(f"sustained-load alert failed: {e}")
+    if duration < threshold_min * 60:
+        return
+    try:
+        httpx.post(
+            HADLEY_ALERT_URL,
+            headers={"x-api-key": os.environ.get("HADLEY_AUTH_KEY", "")},
+            json={
+                "message": (
+                    f"Sustained electrical load: ~{snapshot['avg_demand_w']:.0f}W for "
+                    f"{snapshot['detail']['duration_s'] // 60} min "
+                    f"({snapshot['event_type']}) — oven/heater left on?"
+                    + (" No lounge motion — house may be empty."
+                       if occupied is False else "")
+                ),
+                "source": "energy-events",
+                "throttle_minutes": ALERT_REPEAT_MINUTES,
+            },
+            timeout=10,
+        )
+        ev["alerted_at"] = ev["last"]
+    except Exception as e:
+        logger.debug(f"sustained-load alert failed: {e}")
 
 
-def scan_once() -> dict:
-    """One event-detection pass (sync; wrap in to_thread)."""
-    since = datetime.now(timezone.utc) - timedelta(minutes=LOOKBACK_MINUTES)
-    samples = _load_samples(since)
-    events = _detect_events(samples)
-    stored = _store_events(events)
-    _maybe_alert_sustained(events)
-    return {"samples": len(samples), "events_found": len(events), "events_stored": stored}
+_detector: EventDetector | None = None
 
 
-def register(scheduler) -> None:
-    import asyncio
+def _load_detector() -> EventDetector:
+    """Restore the detector from STATE_PATH, or start cold over the lookback window."""
+    global _detector
+    if _detector is not None:
+        return _detector
+    state = None
+    try:
+        state = json.loads(STATE_PATH.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        pass
+    if state and state.get("last_epoch"):
+        last = state["last_epoch"]
+        history = get_ring().range(last - LOOKBACK_MINUTES * 60, last + 0.001)
+        _detector = EventDetector.from_state(state, history)
+    else:
+        _detector = EventDetector()
+    return _detector
 
-    async def _scan_job():
-        try:
-            await asyncio.to_thread(scan_once)
-        except Exception as e:
-            logger.debug(f"energy event scan failed: {e}")
-
-    scheduler.add_job(
-        _scan_job, "interval", minutes=5,
-        id="energy_event_scan", max_instances=1,
-        coalesce=True, replace_existing=True,
-    )
-    logger.info("Energy event scan registered (every 5 min)")
+
+def _save_detector(detector: EventDetector) -> None:
+    STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = STATE_PATH.with_suffix(".tmp")
+    tmp.write_text(json.dumps(detector.to_state()), encoding="utf-8")
+    os.replace(tmp, STATE_PATH)
+
+
+def scan_once() -> dict:
+    """Feed samples since the last scan to the detector (sync; called per poll)."""
+    detector = _load_detector()
+    if detector.last_epoch is not None:
+        samples = get_ring().range(detector.last_epoch + 0.001)
+    else:
+        since = datetime.now(timezone.utc) - timedelta(minutes=LOOKBACK_MINUTES)
+        samples = get_ring().range(since.timestamp())
+    if not len(samples) and not detector.pending:
+        return {"samples": 0, "events_closed": 0, "events_stored": 0}
+
+    closed = detector.feed(samples["epoch"], samples["demand_w"]) if len(samples) else []
+    # Events a previous scan couldn't store go first; whatever fails again
+    # stays in the saved state for the next scan
+    to_store = detector.pending + closed
+    stored, unstored = _store_events(to_store) if to_store else (0, [])
+    if unstored:
+        logger.warning(f"energy events: {len(unstored)} closed event(s) not stored, will retry")
+        if len(unstored) > MAX_PENDING_EVENTS:
+            logger.warning(f"energy events: dropping {len(unstored) - MAX_PENDING_EVENTS} oldest unstored")
+    detector.pending = unstored[-MAX_PENDING_EVENTS:]
+    _maybe_alert_sustained(detector)
+    _save_detector(detector)
+    return {"samples": len(samples), "events_closed": len(closed), "events_stored": stored,
+            "events_pending": len(detector.pending), "open_event": detector.open is not None}
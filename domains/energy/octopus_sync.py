@@ -12,6 +12,7 @@ from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
 
 import httpx
+import numpy as np
 from supabase import create_client
 
 try:
@@ -33,6 +34,7 @@ from .config import (
     GAS_M3_TO_KWH, EV_OFFPEAK_THRESHOLD_KWH, EV_TOTAL_HINT_KWH,
     DISCORD_ENERGY_WEBHOOK,
 )
+from .tariff_index import TariffIndex, to_epochs
 
 
 def fetch_consumption(fuel: str, period_from: str, period_to: str) -> list[dict]:
@@ -128,43 +130,21 @@ def is_offpeak(interval_start_iso: str) -> bool:
     return False
 
 
-def get_rate_for_interval(interval_start_iso: str, rates: list[dict], fuel: str) -> float:
-    """Find the applicable rate (inc VAT, pence/kWh) for a given interval."""
-    dt = datetime.fromisoformat(interval_start_iso.replace("Z", "+00:00"))
-
-    for rate in rates:
-        valid_from = datetime.fromisoformat(rate["valid_from"].replace("Z", "+00:00"))
-        valid_to = rate.get("valid_to")
-        if valid_to:
-            valid_to = datetime.fromisoformat(valid_to.replace("Z", "+00:00"))
-            if valid_from <= dt < valid_to:
-                return rate["value_inc_vat"]
-        elif valid_from <= dt:
-            return rate["value_inc_vat"]
+def get_rate_for_interval(interval_start_iso: str, rates: list[dict] | TariffIndex, fuel: str) -> float:
+    """Find the applicable rate (inc VAT, pence/kWh) for a given interval.
 
-    # Fallback: return most recent rate
-    if rates:
-        return rates[0]["value_inc_vat"]
-    return 0.0
+    Pass a prebuilt TariffIndex when pricing more than a handful of
+    intervals — building one from raw rows costs a full parse.
+    """
+    index = TariffIndex.ensure(rates)
+    # Fallback: most recent rate
+    return index.rate_at(interval_start_iso, pattern_fallback=False, default=index.latest_rate or 0.0)
 
 
-def get_standing_charge_for_date(d: date, charges: list[dict]) -> float:
+def get_standing_charge_for_date(d: date, charges: list[dict] | TariffIndex) -> float:
     """Find applicable standing charge (inc VAT, pence/day) for a date."""
-    dt = datetime.combine(d, datetime.min.time()).replace(
-        tzinfo=__import__("datetime").timezone.utc
-    )
-    for charge in charges:
-        valid_from = datetime.fromisoformat(charge["valid_from"].replace("Z", "+00:00"))
-        valid_to = charge.get("valid_to")
-        if valid_to:
-            valid_to = datetime.fromisoformat(valid_to.replace("Z", "+00:00"))
-            if valid_from <= dt < valid_to:
-                return charge["value_inc_vat"]
-        elif valid_from <= dt:
-            return charge["value_inc_vat"]
-    if charges:
-        return charges[0]["value_inc_vat"]
-    return 0.0
+    index = TariffIndex.ensure(charges)
+    return index.rate_at(d, pattern_fallback=False, default=index.latest_rate or 0.0)
 
 
 def store_consumption(sb, readings: list[dict], fuel: str):
@@ -200,22 +180,25 @@ def store_consumption(sb, readings: list[dict], fuel: str):
     return stored
 
 
-def store_tariff_rates(sb, rates: list[dict], fuel: str, rate_type: str, product_code: str, tariff_code: str):
-    """Store tariff rates in energy_tariffs table.
-
-    Gas rates come in DD and non-DD variants with the same valid_from.
-    We prefer DIRECT_DEBIT rates and deduplicate by valid_from.
-    """
-    # Deduplicate: prefer DIRECT_DEBIT, then first seen
+def _dedupe_rates(rates: list[dict]) -> list[dict]:
+    """One row per valid_from: prefer DIRECT_DEBIT, then first seen."""
     seen = {}
     for r in rates:
         key = r["valid_from"]
         method = r.get("payment_method", "")
         if key not in seen or method == "DIRECT_DEBIT":
             seen[key] = r
+    return list(seen.values())
+
 
+def store_tariff_rates(sb, rates: list[dict], fuel: str, rate_type: str, product_code: str, tariff_code: str):
+    """Store tariff rates in energy_tariffs table.
+
+    Gas rates come in DD and non-DD variants with the same valid_from.
+    We prefer DIRECT_DEBIT rates and deduplicate by valid_from.
+    """
     rows = []
-    for r in seen.values():
+    for r in _dedupe_rates(rates):
         rows.append({
             "fuel_type": fuel,
             "rate_type": rate_type,
@@ -235,15 +218,19 @@ def store_tariff_rates(sb, rates: list[dict], fuel: str, rate_type: str, product
 
 
 def calculate_daily_summary(
-    readings: list[dict], fuel: str, rates: list[dict], standing_charge_pence: float,
+    readings: list[dict], fuel: str, rates: list[dict] | TariffIndex, standing_charge_pence: float,
     dispatches: dict | None = None,
 ) -> dict:
     """Calculate daily summary from half-hourly readings.
 
+    ``rates`` may be raw rate rows or a TariffIndex built once for the
+    whole sync (preferred — see sync_fuel).
+
     ``dispatches`` (Octopus planned/completed EV charge slots) lets off-peak
     attribution count daytime smart-charge slots correctly; without it, the
     classification falls back to the fixed clock window only.
     """
+    index = TariffIndex.ensure(rates)
     total_kwh = 0.0
     peak_kwh = 0.0
     offpeak_kwh = 0.0
@@ -257,20 +244,19 @@ def calculate_daily_summary(
     # no-op (they already resolve to the cheap rate); it corrects daytime
     # dispatch slots that would otherwise be billed at the peak rate, keeping
     # the £ consistent with the off-peak kWh split.
-    offpeak_rate = None
-    if fuel == "electricity" and rates:
-        offpeak_rate = min(
-            (rt["value_inc_vat"] for rt in rates if rt.get("value_inc_vat") is not None),
-            default=None,
-        )
+    offpeak_rate = index.min_rate if fuel == "electricity" else None
 
-    for r in readings:
+    # Price every interval in one lookup; misses take the most recent rate
+    unit_rates = index.rates_at(to_epochs(r["interval_start"] for r in readings),
+                                pattern_fallback=False)
+    unit_rates[np.isnan(unit_rates)] = index.latest_rate or 0.0
+
+    for r, rate in zip(readings, unit_rates.tolist()):
         kwh = r["consumption"]
         if fuel == "gas":
             kwh *= GAS_M3_TO_KWH
 
         total_kwh += kwh
-        rate = get_rate_for_interval(r["interval_start"], rates, fuel)
 
         if fuel == "electricity":
             clock_op = is_offpeak(r["interval_start"])
@@ -430,11 +416,7 @@ def reclassify_recent_days(sb, days_back: int = 3) -> int:
         .eq("rate_type", "unit")
         .execute()
     ).data or []
-    rates = [
-        {"valid_from": r["valid_from"], "valid_to": r.get("valid_to"),
-         "value_inc_vat": float(r["value_inc_vat"])}
-        for r in rate_rows if r.get("value_inc_vat") is not None
-    ]
+    rates = TariffIndex(rate_rows)
 
     disp_rows = (
         sb.table("energy_dispatches")
@@ -684,6 +666,11 @@ def sync_fuel(sb, fuel: str, from_date: date, to_date: date):
     # Fetch standing charges
     standing_charges = fetch_standing_charges(fuel)
 
+    # Parse rate windows once for the whole sync — a 90-day backfill prices
+    # thousands of intervals
+    rate_index = TariffIndex(_dedupe_rates(rates))
+    standing_index = TariffIndex(_dedupe_rates(standing_charges))
+
     # Fetch Octopus EV dispatch slots — ground truth for off-peak attribution.
     # Intelligent Go dispatches the car outside 23:30-05:30 and bills those
     # slots at the off-peak rate, so a clock-only split misattributes daytime
@@ -734,8 +721,8 @@ def sync_fuel(sb, fuel: str, from_date: date, to_date: date):
             skipped_partial += 1
             continue
         d = date.fromisoformat(day_str)
-        sc = get_standing_charge_for_date(d, standing_charges)
-        summary = calculate_daily_summary(day_readings, fuel, rates, sc, dispatches)
+        sc = get_standing_charge_for_date(d, standing_index)
+        summary = calculate_daily_summary(day_readings, fuel, rate_index, sc, dispatches)
         daily_summaries[day_str] = summary
     if skipped_partial:
         print(f"    Skipped {skipped_partial} incomplete day(s) (awaiting full data)")
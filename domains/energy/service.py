@@ -10,6 +10,8 @@ from datetime import date, datetime, timedelta, timezone
 import httpx
 
 from .config import SUPABASE_KEY, SUPABASE_URL
+from .tariff_index import TariffIndex, to_epochs
+from .telemetry_store import TelemetryRing, open_ring_readonly
 
 _SB_HEADERS = {"apikey": SUPABASE_KEY, "Authorization": f"Bearer {SUPABASE_KEY}"}
 
@@ -21,13 +23,15 @@ def _sb_get(table: str, params: dict) -> list[dict]:
     return resp.json()
 
 
-def _rate_windows(hours_back: int = 72) -> list[dict]:
-    """Electricity unit-rate windows covering recent days.
+def _rate_index(hours_back: int = 72) -> TariffIndex:
+    """Electricity unit-rate windows covering recent days, indexed.
 
     energy_tariffs stores time-WINDOWED rows (each row one peak/off-peak
     window with its rate and valid_from/valid_to) — the windows themselves
     encode the tariff boundaries in real wall-clock time, so no separate
-    off-peak hour logic (which was BST-shifted) is needed.
+    off-peak hour logic (which was BST-shifted) is needed. Lookups past the
+    newest synced window reuse the same slot 24/48h earlier (the tariff
+    pattern repeats daily).
     """
     since = (datetime.now(timezone.utc) - timedelta(hours=hours_back)).isoformat()
     rows = _sb_get("energy_tariffs", {
@@ -38,65 +42,40 @@ def _rate_windows(hours_back: int = 72) -> list[dict]:
         "order": "valid_from.asc",
         "limit": "500",
     })
-    return [
-        {"from": r["valid_from"], "to": r.get("valid_to"),
-         "rate": float(r["value_inc_vat"])}
-        for r in rows
-    ]
-
-
-def _rate_for(ts_iso: str, windows: list[dict]) -> float | None:
-    """Rate (p/kWh) whose window contains the timestamp."""
-    ts = datetime.fromisoformat(ts_iso.replace("Z", "+00:00"))
-    for w in windows:
-        w_from = datetime.fromisoformat(w["from"].replace("Z", "+00:00"))
-        w_to = (datetime.fromisoformat(w["to"].replace("Z", "+00:00"))
-                if w.get("to") else None)
-        if w_from <= ts and (w_to is None or ts < w_to):
-            return w["rate"]
-    # Rates not synced this far yet — reuse the same wall-clock window from
-    # the most recent day that has one (tariff pattern repeats daily).
-    for shift_h in (24, 48):
-        shifted = (ts - timedelta(hours=shift_h)).isoformat()
-        for w in windows:
-            w_from = datetime.fromisoformat(w["from"].replace("Z", "+00:00")).isoformat()
-            w_to = (datetime.fromisoformat(w["to"].replace("Z", "+00:00")).isoformat()
-                    if w.get("to") else None)
-            if w_from <= shifted and (w_to is None or shifted < w_to):
-                return w["rate"]
-    return None
-
-
-def _is_offpeak_rate(rate: float | None, windows: list[dict]) -> bool:
-    if rate is None or not windows:
+    return TariffIndex(rows)
+
+
+def _is_offpeak_rate(rate: float | None, index: TariffIndex) -> bool:
+    if rate is None or not len(index):
         return False
-    return rate <= min(w["rate"] for w in windows) + 0.01
+    return rate <= index.min_rate + 0.01
+
+
+def _minute_cost_pence(rows: list[dict], index: TariffIndex) -> float:
+    """Cost of energy_live minute rows, priced in one vectorised pass."""
+    if not rows:
+        return 0.0
+    kwh = [float(r.get("consumption_wh") or 0) / 1000 for r in rows]
+    return index.cost(to_epochs(r["minute_start"] for r in rows), kwh,
+                      fallback_rate=index.max_rate or 27.0)
+
+
+_ring: TelemetryRing | None = None
 
 
 def _latest_telemetry_sample() -> dict:
-    """Newest raw sample from the poller's local log — no Kraken call.
+    """Newest raw sample from the poller's telemetry ring — no Kraken call.
 
     The bot's 30s poller is the single Kraken consumer; a second direct
     query from this endpoint caused KT-CT-1199 rate limiting. Reading the
-    log tail gives <=40s freshness for free.
+    ring's newest record gives <=40s freshness for free.
     """
-    import json
-    from .config import TELEMETRY_LOG
-    try:
-        with open(TELEMETRY_LOG, "rb") as f:
-            f.seek(0, 2)
-            f.seek(max(0, f.tell() - 4096))
-            lines = f.read().decode("utf-8", errors="ignore").strip().splitlines()
-        for line in reversed(lines):
-            try:
-                s = json.loads(line)
-                if s.get("readAt") and s.get("demand") is not None:
-                    return s
-            except json.JSONDecodeError:
-                continue
-    except OSError:
-        pass
-    return {}
+    global _ring
+    if _ring is None:
+        _ring = open_ring_readonly()
+        if _ring is None:
+            return {}
+    return _ring.latest() or {}
 
 
 def live_status() -> dict:
@@ -112,9 +91,9 @@ def live_status() -> dict:
         if age < 180:
             samples = [current]
 
-    today = today_curve()
-    windows = _rate_windows()
-    current_rate = _rate_for(now.isoformat(), windows)
+    index = _rate_index()
+    today = today_curve(index)
+    current_rate = index.rate_at(now)
 
     read_at = current.get("readAt")
     age_seconds = None
@@ -130,12 +109,15 @@ def live_status() -> dict:
         "today_kwh": today["total_kwh"],
         "today_cost_pounds": today["est_cost_pounds"],
         "current_rate_p_per_kwh": current_rate,
-        "offpeak_now": _is_offpeak_rate(current_rate, windows),
+        "offpeak_now": _is_offpeak_rate(current_rate, index),
     }
 
 
-def today_curve() -> dict:
-    """Today's 1-minute curve + totals from energy_live, cost-estimated."""
+def today_curve(index: TariffIndex | None = None) -> dict:
+    """Today's 1-minute curve + totals from energy_live, cost-estimated.
+
+    Pass the caller's rate index to avoid fetching it twice.
+    """
     day_start = datetime.now(timezone.utc).astimezone().replace(
         hour=0, minute=0, second=0, microsecond=0)
     rows = _sb_get("energy_live", {
@@ -145,12 +127,7 @@ def today_curve() -> dict:
         "limit": "1500",
     })
     total_wh = sum(float(r.get("consumption_wh") or 0) for r in rows)
-    windows = _rate_windows()
-    fallback = max((w["rate"] for w in windows), default=27.0)
-    cost = 0.0
-    for r in rows:
-        rate = _rate_for(r["minute_start"], windows)
-        cost += float(r.get("consumption_wh") or 0) / 1000 * (rate if rate is not None else fallback)
+    cost = _minute_cost_pence(rows, index if index is not None else _rate_index())
 
     return {
         "date": day_start.date().isoformat(),
@@ -193,8 +170,7 @@ def recent_summary(days: int = 7) -> list[dict]:
          if r["fuel_type"] == "electricity"), 60.0)
 
     have_elec = {r["summary_date"] for r in rows if r["fuel_type"] == "electricity"}
-    windows = _rate_windows(hours_back=24 * (days + 1))
-    fallback = max((w["rate"] for w in windows), default=27.0)
+    index = _rate_index(hours_back=24 * (days + 1))
 
     provisional = []
     for back in range(1, min(days, 3) + 1):
@@ -214,11 +190,7 @@ def recent_summary(days: int = 7) -> list[dict]:
         if len(mins) < 1200:
             continue
         kwh = sum(float(m.get("consumption_wh") or 0) for m in mins) / 1000
-        cost = sum(
-            float(m.get("consumption_wh") or 0) / 1000
-            * (_rate_for(m["minute_start"], windows) or fallback)
-            for m in mins
-        )
+        cost = _minute_cost_pence(mins, index)
         provisional.append({
             "summary_date": day.isoformat(),
             "fuel_type": "electricity",
@@ -0,0 +1,184 @@
+"""Tariff interval index: O(log n) rate lookup and array costing.
+
+Rate rows (Octopus REST results or energy_tariffs rows) are windows with
+valid_from / valid_to. Pricing used to scan every row and re-parse its ISO
+timestamps for every interval priced — fine for one day, slow for a 90-day
+backfill or a 1440-minute "today" curve. TariffIndex parses the windows
+once into sorted epoch arrays:
+
+- rate_at(ts): bisect to the window containing ts.
+- rates_at(epochs): the same for a whole NumPy array (searchsorted).
+- cost(epochs, kwh): price a consumption array in one call.
+
+Both lookups can fall back to the same wall-clock slot 24h/48h earlier
+(the tariff pattern repeats daily) for timestamps past the newest synced
+rate — that's what /energy/today needs when today's rates aren't in yet.
+
+Build one index per sync/request and pass it around; don't rebuild per
+interval.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from datetime import date, datetime, timezone
+
+import numpy as np
+
+# Shifts (seconds) tried when a timestamp has no window: same slot yesterday,
+# then the day before
+PATTERN_SHIFTS = (24 * 3600, 48 * 3600)
+
+
+def to_epoch(ts: str | datetime | date) -> float:
+    """ISO string / datetime / date (midnight UTC) -> epoch seconds.
+
+    Naive datetimes are treated as UTC, matching how Supabase returns
+    timestamptz values.
+    """
+    if isinstance(ts, str):
+        ts = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+    elif not isinstance(ts, datetime):
+        ts = datetime(ts.year, ts.month, ts.day, tzinfo=timezone.utc)
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.timestamp()
+
+
+def to_epochs(timestamps) -> np.ndarray:
+    """Vector of epoch seconds for an iterable of ISO strings / datetimes."""
+    return np.fromiter((to_epoch(t) for t in timestamps), dtype=np.float64)
+
+
+class TariffIndex:
+    """Pre-parsed, start-sorted rate windows.
+
+    Args:
+        rows: dicts with a start, optional end (None = open-ended) and rate.
+        rate_key / from_key / to_key: field names — defaults match both the
+            Octopus REST API and the energy_tariffs table.
+    """
+
+    def __init__(
+        self,
+        rows: list[dict],
+        *,
+        rate_key: str = "value_inc_vat",
+        from_key: str = "valid_from",
+        to_key: str = "valid_to",
+    ):
+        windows = sorted(
+            (
+                to_epoch(r[from_key]),
+                to_epoch(r[to_key]) if r.get(to_key) else np.inf,
+                float(r[rate_key]),
+            )
+            for r in rows
+            if r.get(rate_key) is not None and r.get(from_key)
+        )
+        self.starts = np.array([w[0] for w in windows], dtype=np.float64)
+        self.ends = np.array([w[1] for w in windows], dtype=np.float64)
+        self.rates = np.array([w[2] for w in windows], dtype=np.float64)
+        self._starts_list = self.starts.tolist()
+        # Running max of window ends lets rate_at() stop walking back as soon
+        # as no earlier window can still be open (only matters on overlaps)
+        self._max_end = np.maximum.accumulate(self.ends) if len(windows) else self.ends
+        self._overlapping = bool(len(windows) > 1 and np.any(self.starts[1:] < self.ends[:-1]))
+
+    @classmethod
+    def ensure(cls, rates: "TariffIndex | list[dict]") -> "TariffIndex":
+        """Accept either a prebuilt index or raw rate rows."""
+        return rates if isinstance(rates, cls) else cls(rates)
+
+    def __len__(self) -> int:
+        return len(self.rates)
+
+    @property
+    def min_rate(self) -> float | None:
+        return float(self.rates.min()) if len(self.rates) else None
+
+    @property
+    def max_rate(self) -> float | None:
+        return float(self.rates.max()) if len(self.rates) else None
+
+    @property
+    def latest_rate(self) -> float | None:
+        """Rate of the most recently starting window."""
+        return float(self.rates[-1]) if len(self.rates) else None
+
+    # ------------------------------------------------------------------
+    # Scalar lookup
+    # ------------------------------------------------------------------
+
+    def _exact(self, t: float) -> float | None:
+        i = bisect_right(self._starts_list, t) - 1
+        # Latest-starting window that contains t
+        while i >= 0 and self._max_end[i] > t:
+            if t < self.ends[i]:
+                return float(self.rates[i])
+            i -= 1
+        return None
+
+    def rate_at(self, ts, *, pattern_fallback: bool = True, default: float | None = None) -> float | None:
+        """Rate (p/kWh) whose window contains ts.
+
+        Args:
+            ts: ISO string, datetime, date or epoch seconds.
+            pattern_fallback: try the same slot 24h/48h earlier on a miss.
+            default: returned if nothing matches.
+        """
+        t = ts if isinstance(ts, (int, float)) else to_epoch(ts)
+        rate = self._exact(t)
+        if rate is None and pattern_fallback:
+            for shift in PATTERN_SHIFTS:
+                rate = self._exact(t - shift)
+                if rate is not None:
+                    break
+        return default if rate is None else rate
+
+    # ------------------------------------------------------------------
+    # Vector lookup / costing
+    # ------------------------------------------------------------------
+
+    def _exact_many(self, t: np.ndarray) -> np.ndarray:
+        out = np.full(t.shape, np.nan)
+        if not len(self.rates) or not t.size:
+            return out
+        idx = np.searchsorted(self.starts, t, side="right") - 1
+        safe = np.clip(idx, 0, None)
+        hit = (idx >= 0) & (t < self.ends[safe])
+        out[hit] = self.rates[safe[hit]]
+        if self._overlapping:
+            # The nearest-starting window may have closed while an earlier,
+            # longer one is still open — resolve those few misses exactly.
+            for i in np.flatnonzero(~hit & (idx >= 0)):
+                rate = self._exact(float(t[i]))
+                if rate is not None:
+                    out[i] = rate
+        return out
+
+    def rates_at(self, epochs, *, pattern_fallback: bool = True) -> np.ndarray:
+        """Rates for an array of epoch seconds; NaN where nothing matches."""
+        t = np.asarray(epochs, dtype=np.float64)
+        out = self._exact_many(t)
+        if pattern_fallback:
+            for shift in PATTERN_SHIFTS:
+                miss = np.isnan(out)
+                if not miss.any():
+                    break
+                out[miss] = self._exact_many(t[miss] - shift)
+        return out
+
+    def cost(self, epochs, kwh, *, fallback_rate: float | None = None,
+             pattern_fallback: bool = True) -> float:
+        """Total cost in pence of kwh[i] consumed at epochs[i].
+
+        Intervals with no rate are priced at fallback_rate (default: the
+        highest known rate, so estimates err on the expensive side).
+        """
+        kwh = np.asarray(kwh, dtype=np.float64)
+        rates = self.rates_at(epochs, pattern_fallback=pattern_fallback)
+        if fallback_rate is None:
+            fallback_rate = self.max_rate or 0.0
+        rates = np.where(np.isnan(rates), fallback_rate, rates)
+        return float(np.dot(kwh, rates))
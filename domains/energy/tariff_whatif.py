@@ -20,6 +20,7 @@ from zoneinfo import ZoneInfo
 UK = ZoneInfo("Europe/London")
 
 import httpx
+import numpy as np
 
 from logger import logger
 from .config import (
@@ -29,6 +30,7 @@ from .config import (
     SUPABASE_KEY,
     SUPABASE_URL,
 )
+from .tariff_index import TariffIndex, to_epochs
 
 AGILE_PRODUCT = "AGILE-24-10-01"
 AGILE_TARIFF = f"E-1R-{AGILE_PRODUCT}-J"  # region J (South East)
@@ -45,9 +47,9 @@ def _month_bounds(target: date | None = None) -> tuple[date, date]:
     return last_month_start, last_month_end
 
 
-def _fetch_agile_rates(start: date, end: date) -> dict[str, float]:
-    """Agile unit rates keyed by interval-start ISO (UTC)."""
-    rates: dict[str, float] = {}
+def _fetch_agile_rates(start: date, end: date) -> TariffIndex:
+    """Agile half-hourly unit rates for the period, indexed."""
+    rows: list[dict] = []
     url = (f"{OCTOPUS_REST_BASE}/products/{AGILE_PRODUCT}/electricity-tariffs/"
            f"{AGILE_TARIFF}/standard-unit-rates/")
     params = {
@@ -60,11 +62,10 @@ def _fetch_agile_rates(start: date, end: date) -> dict[str, float]:
         resp = httpx.get(url, params=params, auth=auth, timeout=30)
         resp.raise_for_status()
         body = resp.json()
-        for r in body.get("results", []):
-            rates[r["valid_from"]] = float(r["value_inc_vat"])
+        rows.extend(body.get("results", []))
         url = body.get("next")
         params = None  # next URL already carries the query
-    return rates
+    return TariffIndex(rows)
 
 
 def _fetch_consumption_utc(start: datetime, end: datetime) -> list[dict]:
@@ -122,18 +123,15 @@ def compare_last_month() -> dict:
         return {"error": f"no consumption data for {start} - {end}"}
 
     agile = _fetch_agile_rates(start, end)
-    matched = unmatched = 0
-    agile_cost = 0.0
-    for c in consumption:
-        # normalise interval_start to the UTC key format Agile rates use
-        ts = datetime.fromisoformat(c["interval_start"].replace("Z", "+00:00"))
-        k = ts.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
-        rate = agile.get(k)
-        if rate is None:
-            unmatched += 1
-            continue
-        matched += 1
-        agile_cost += float(c["consumption_kwh"]) * rate
+    # Price the whole month in one pass; intervals Agile has no published
+    # rate for are excluded (no daily-pattern fallback — Agile varies daily)
+    rates = agile.rates_at(to_epochs(c["interval_start"] for c in consumption),
+                           pattern_fallback=False)
+    kwh = np.array([float(c["consumption_kwh"]) for c in consumption])
+    has_rate = ~np.isnan(rates)
+    matched = int(has_rate.sum())
+    unmatched = len(consumption) - matched
+    agile_cost = float(np.dot(kwh[has_rate], rates[has_rate]))
 
     if matched and unmatched / (matched + unmatched) > 0.05:
         return {"error": f"only {matched}/{matched + unmatched} intervals had Agile "
@@ -3,11 +3,13 @@
 Every POLL_SECONDS the poller fetches 10-second telemetry since the last
 sample from Kraken's smartMeterTelemetry, then:
 
-1. appends raw samples to data/energy_telemetry.jsonl (ring-trimmed to
-   ~RETENTION_HOURS so 10s data doesn't grow unbounded),
+1. appends raw samples to the fixed-size binary ring
+   data/energy_telemetry.ring (telemetry_store.py — oldest samples are
+   overwritten in place, so 10s data never grows or needs trimming),
 2. upserts 1-minute aggregates into Supabase ``energy_live``
    (avg/max/min demand W + Wh delta from the meter's cumulative register),
-3. keeps an in-memory "latest" snapshot the API endpoints read for free.
+3. keeps an in-memory "latest" snapshot the API endpoints read for free,
+4. feeds the new samples to the appliance event detector (events.py).
 
 Failures are quiet at debug level (wifi blips are normal) but a stall
 counter escalates: STALL_ALERT_POLLS consecutive empty/failed polls posts a
@@ -18,17 +20,17 @@ pipeline gets the watchdog its predecessors never had.
 from __future__ import annotations
 
 import asyncio
-import json
 import os
 from datetime import datetime, timedelta, timezone
 
 import httpx
 
+from integrations.supabase_rest import get_supabase
 from logger import logger
-from .config import SMART_DEVICE_ID, SUPABASE_KEY, SUPABASE_URL, TELEMETRY_LOG
+from .config import SMART_DEVICE_ID, SUPABASE_KEY, SUPABASE_URL
+from .telemetry_store import get_ring
 
 POLL_SECONDS = 30
-RETENTION_HOURS = 48
 STALL_ALERT_POLLS = 20  # ~10 min of nothing → alert
 HADLEY_ALERT_URL = "http://localhost:8100/alert"
 
@@ -66,21 +68,7 @@ def _fetch_since(start: datetime, end: datetime) -> list[dict]:
 
 
 def _append_log(samples: list[dict]) -> None:
-    TELEMETRY_LOG.parent.mkdir(parents=True, exist_ok=True)
-    with open(TELEMETRY_LOG, "a", encoding="utf-8") as f:
-        for s in samples:
-            f.write(json.dumps(s) + "\n")
-
-
-def _trim_log() -> None:
-    """Ring-trim the raw log (called occasionally, not every poll)."""
-    if not TELEMETRY_LOG.exists() or TELEMETRY_LOG.stat().st_size < 20_000_000:
-        return
-    cutoff = (datetime.now(timezone.utc) - timedelta(hours=RETENTION_HOURS)).isoformat()
-    lines = TELEMETRY_LOG.read_text(encoding="utf-8").splitlines()
-    kept = [l for l in lines if l[12:37] >= cutoff or json.loads(l).get("readAt", "") >= cutoff]
-    TELEMETRY_LOG.write_text("\n".join(kept) + "\n", encoding="utf-8")
-    logger.info(f"energy telemetry log trimmed: {len(lines)} -> {len(kept)} lines")
+    get_ring().append_samples(samples)
 
 
 def _upsert_minutes(samples: list[dict]) -> int:
@@ -117,14 +105,10 @@ def _upsert_minutes(samples: list[dict]) -> int:
     if not rows:
         return 0
 
-    resp = httpx.post(
-        f"{SUPABASE_URL}/rest/v1/energy_live",
-        headers={
-            "apikey": SUPABASE_KEY,
-            "Authorization": f"Bearer {SUPABASE_KEY}",
-            "Content-Type": "application/json",
-            "Prefer": "resolution=merge-duplicates",
-        },
+    sb = get_supabase(SUPABASE_URL, SUPABASE_KEY)
+    resp = sb.request_sync(
+        "POST", "energy_live",
+        headers=sb.headers(prefer="resolution=merge-duplicates"),
         params={"on_conflict": "minute_start"},
         json=rows,
         timeout=20,
@@ -196,8 +180,13 @@ def poll_once() -> dict:
 
     _append_log(samples)
     minutes = _upsert_minutes(samples)
-    if minutes and now.minute % 30 == 0:
-        _trim_log()
+
+    # Event detection is incremental, so it runs on every poll's new samples
+    try:
+        from .events import scan_once
+        scan_once()
+    except Exception as e:
+        logger.debug(f"energy event scan failed: {e}")
     return {"ok": True, "samples": len(samples), "minutes_upserted": minutes}
 
 
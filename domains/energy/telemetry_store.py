@@ -0,0 +1,299 @@
+"""Binary ring buffer for raw Home Mini telemetry samples.
+
+Replaces the JSONL log (data/energy_telemetry.jsonl), which the poller
+appended to every 30s, re-read and rewrote whole to trim, and the event
+scanner re-parsed in full every pass. The ring is a fixed-size file of
+fixed-width records, memory-mapped:
+
+    header (64 bytes): magic, version, capacity, head, count, last_epoch
+    records:           capacity x (epoch f8, demand_w f8, consumption_delta f8)
+
+- Appends write the records, then publish them by updating the header —
+  when the ring is full the oldest records are overwritten in place
+  (wrap-around), so there is never a rewrite/trim.
+- Records are kept in time order (appends older than the newest sample are
+  dropped), so the ring is at most two sorted runs and range reads are a
+  binary search (np.searchsorted) plus one copy, returned as NumPy arrays.
+- Other processes (Hadley API) can open the same file read-only.
+
+One-off migration from the old JSONL log: ``python -m
+domains.energy.telemetry_store`` (get_ring() also migrates automatically
+the first time it creates the ring).
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from logger import logger
+from .config import TELEMETRY_LOG, TELEMETRY_RING, TELEMETRY_RING_CAPACITY
+
+MAGIC = b"ETRB"
+VERSION = 1
+HEADER_SIZE = 64
+_HEADER = struct.Struct("<4sIQQQd")  # magic, version, capacity, head, count, last_epoch
+
+RECORD_DTYPE = np.dtype([
+    ("epoch", "<f8"),
+    ("demand_w", "<f8"),
+    ("consumption_delta", "<f8"),
+])
+
+
+def _epoch(read_at: str) -> float:
+    return datetime.fromisoformat(read_at.replace("Z", "+00:00")).timestamp()
+
+
+def epoch_to_iso(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).isoformat()
+
+
+class TelemetryRing:
+    """Memory-mapped, fixed-capacity, time-ordered sample ring.
+
+    Args:
+        path: ring file; created (sized for capacity) if missing unless
+            readonly.
+        capacity: records held before the oldest are overwritten. Ignored
+            when opening an existing file (its header wins).
+        readonly: map read-only (for processes that never append).
+    """
+
+    def __init__(self, path: Path, capacity: int = TELEMETRY_RING_CAPACITY, readonly: bool = False):
+        self.path = Path(path)
+        self.readonly = readonly
+        self._lock = threading.Lock()
+
+        if not self.path.exists():
+            if readonly:
+                raise FileNotFoundError(self.path)
+            self._create(capacity)
+
+        self._file = open(self.path, "rb" if readonly else "r+b")
+        self._mm = mmap.mmap(
+            self._file.fileno(), 0,
+            access=mmap.ACCESS_READ if readonly else mmap.ACCESS_WRITE,
+        )
+        magic, version, cap, _, _, _ = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{self.path} is not a telemetry ring (magic={magic!r}, version={version})")
+        self.capacity = cap
+        self._records = np.ndarray((cap,), dtype=RECORD_DTYPE, buffer=self._mm, offset=HEADER_SIZE)
+
+    def _create(self, capacity: int) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, capacity, 0, 0, 0.0).ljust(HEADER_SIZE, b"\0"))
+            f.truncate(HEADER_SIZE + capacity * RECORD_DTYPE.itemsize)
+        os.replace(tmp, self.path)
+
+    def close(self) -> None:
+        self._records = None
+        if getattr(self, "_mm", None) is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+
+    # ------------------------------------------------------------------
+    # Header
+    # ------------------------------------------------------------------
+
+    def _header(self) -> tuple[int, int, float]:
+        _, _, _, head, count, last_epoch = _HEADER.unpack_from(self._mm, 0)
+        return head, count, last_epoch
+
+    def __len__(self) -> int:
+        return self._header()[1]
+
+    @property
+    def last_epoch(self) -> float | None:
+        head, count, last_epoch = self._header()
+        return last_epoch if count else None
+
+    # ------------------------------------------------------------------
+    # Append
+    # ------------------------------------------------------------------
+
+    def append(self, epochs, demand_w, consumption_delta) -> int:
+        """Append samples (array-likes of equal length). Returns the number written.
+
+        Samples at or before the newest stored sample are dropped, which
+        keeps the ring time-ordered (and makes replays idempotent).
+        """
+        if self.readonly:
+            raise PermissionError("telemetry ring opened read-only")
+        batch = np.empty(len(epochs), dtype=RECORD_DTYPE)
+        batch["epoch"] = epochs
+        batch["demand_w"] = demand_w
+        batch["consumption_delta"] = consumption_delta
+
+        with self._lock:
+            head, count, last_epoch = self._header()
+            batch = np.sort(batch, order="epoch", kind="stable")
+            if count:
+                batch = batch[batch["epoch"] > last_epoch]
+            if len(batch) > 1:
+                # drop duplicate timestamps within the batch
+                keep = np.concatenate(([True], np.diff(batch["epoch"]) > 0))
+                batch = batch[keep]
+            if not len(batch):
+                return 0
+            if len(batch) > self.capacity:
+                batch = batch[-self.capacity:]
+
+            written = len(batch)
+            first = min(written, self.capacity - head)
+            self._records[head:head + first] = batch[:first]
+            if written > first:
+                self._records[:written - first] = batch[first:]
+
+            # Publish: readers only look at slots the header says exist
+            _HEADER.pack_into(
+                self._mm, 0, MAGIC, VERSION, self.capacity,
+                (head + written) % self.capacity,
+                min(count + written, self.capacity),
+                float(batch["epoch"][-1]),
+            )
+            self._mm.flush()
+            return written
+
+    def append_samples(self, samples: list[dict]) -> int:
+        """Append Kraken smartMeterTelemetry samples (readAt/demand/consumptionDelta)."""
+        rows = [
+            (_epoch(s["readAt"]), float(s["demand"]), float(s.get("consumptionDelta") or 0))
+            for s in samples
+            if s.get("readAt") and s.get("demand") is not None
+        ]
+        if not rows:
+            return 0
+        epochs, demand, delta = zip(*rows)
+        return self.append(epochs, demand, delta)
+
+    # ------------------------------------------------------------------
+    # Read
+    # ------------------------------------------------------------------
+
+    def _runs(self, head: int, count: int) -> list[tuple[int, int]]:
+        """Physical [start, end) slot runs in time order."""
+        if count < self.capacity:
+            return [(0, count)]
+        return [(head, self.capacity), (0, head)] if head else [(0, self.capacity)]
+
+    def range(self, since: float, until: float | None = None) -> np.ndarray:
+        """Samples with since <= epoch < until (epoch seconds), oldest first.
+
+        Returns a structured array with fields epoch, demand_w and
+        consumption_delta (a copy — safe to keep).
+        """
+        head, count, _ = self._header()
+        parts = []
+        for a, b in self._runs(head, count):
+            ep = self._records["epoch"][a:b]
+            i = int(np.searchsorted(ep, since, side="left"))
+            j = b - a if until is None else int(np.searchsorted(ep, until, side="left"))
+            if j > i:
+                parts.append(self._records[a + i:a + j].copy())
+        if not parts:
+            return np.empty(0, dtype=RECORD_DTYPE)
+        out = parts[0] if len(parts) == 1 else np.concatenate(parts)
+        # A concurrent append may have overwritten the oldest slots while we
+        # copied; those now hold newer samples out of place — drop them.
+        mask = out["epoch"] >= since
+        if until is not None:
+            mask &= out["epoch"] < until
+        if len(out) > 1:
+            mask &= np.concatenate((np.diff(out["epoch"]) > 0, [True]))
+        return out[mask]
+
+    def latest(self) -> dict | None:
+        """Newest sample as {"epoch", "readAt", "demand", "consumptionDelta"}."""
+        head, count, _ = self._header()
+        if not count:
+            return None
+        rec = self._records[(head - 1) % self.capacity]
+        return {
+            "epoch": float(rec["epoch"]),
+            "readAt": epoch_to_iso(float(rec["epoch"])),
+            "demand": float(rec["demand_w"]),
+            "consumptionDelta": float(rec["consumption_delta"]),
+        }
+
+
+# ----------------------------------------------------------------------
+# Process-wide ring + migration
+# ----------------------------------------------------------------------
+
+_ring: TelemetryRing | None = None
+_ring_lock = threading.Lock()
+
+
+def migrate_jsonl(log_path: Path, ring: TelemetryRing) -> int:
+    """Load the legacy JSONL telemetry log into the ring. Returns samples written.
+
+    Streams the file line by line; bad lines are skipped. Safe to re-run —
+    samples already in the ring are dropped by append().
+    """
+    epochs, demand, delta = [], [], []
+    with open(log_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                s = json.loads(line)
+                if not s.get("readAt") or s.get("demand") is None:
+                    continue
+                epochs.append(_epoch(s["readAt"]))
+                demand.append(float(s["demand"]))
+                delta.append(float(s.get("consumptionDelta") or 0))
+            except (json.JSONDecodeError, ValueError, TypeError):
+                continue
+    if not epochs:
+        return 0
+    return ring.append(epochs, demand, delta)
+
+
+def get_ring() -> TelemetryRing:
+    """The bot's writable ring, created (and migrated from JSONL) on first use."""
+    global _ring
+    with _ring_lock:
+        if _ring is None:
+            created = not TELEMETRY_RING.exists()
+            _ring = TelemetryRing(TELEMETRY_RING)
+            if created and TELEMETRY_LOG.exists():
+                n = migrate_jsonl(TELEMETRY_LOG, _ring)
+                TELEMETRY_LOG.rename(TELEMETRY_LOG.with_suffix(".jsonl.migrated"))
+                logger.info(f"energy telemetry: migrated {n} samples from {TELEMETRY_LOG.name} to ring")
+        return _ring
+
+
+def open_ring_readonly() -> TelemetryRing | None:
+    """Read-only view for other processes; None if the poller hasn't created it."""
+    try:
+        return TelemetryRing(TELEMETRY_RING, readonly=True)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def main():
+    """One-off migration: python -m domains.energy.telemetry_store"""
+    if not TELEMETRY_LOG.exists():
+        print(f"No legacy log at {TELEMETRY_LOG} — nothing to migrate")
+        return
+    ring = TelemetryRing(TELEMETRY_RING)
+    n = migrate_jsonl(TELEMETRY_LOG, ring)
+    print(f"Migrated {n} samples into {TELEMETRY_RING} ({len(ring)}/{ring.capacity} slots used)")
+    ring.close()
+    TELEMETRY_LOG.rename(TELEMETRY_LOG.with_suffix(".jsonl.migrated"))
+    print(f"Renamed {TELEMETRY_LOG.name} -> {TELEMETRY_LOG.name}.migrated")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ that each produce structured advice with severity levels.
 """
 from __future__ import annotations
 
+import asyncio
 import logging
 from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta
@@ -87,22 +88,55 @@ class Snapshot:
     avg_protein_pct_this_week: float = 100.0
 
 
+async def _optional(fetcher, *args):
+    """memo() a read the snapshot can do without; failures become None."""
+    from domains.fitness.loader import memo
+    try:
+        return await memo(fetcher, *args)
+    except Exception as e:
+        logger.debug(f"Advisor optional fetch {getattr(fetcher, '__name__', fetcher)} failed: {e}")
+        return None
+
+
 async def build_snapshot() -> Snapshot:
-    """Gather all available data into a single advisor snapshot."""
+    """Gather all available data into a single advisor snapshot.
+
+    Every read is started at once (and shared with any dashboard / review
+    built in the same load scope); only the programme is awaited first, so
+    the no-programme case returns without waiting on the rest.
+    """
     from domains.fitness import service as fit
+    from domains.fitness.loader import load_scope, memo
     from domains.fitness.trend import compute_trend
     from domains.fitness.programme_generator import generate_week
     from zoneinfo import ZoneInfo
-    import httpx
 
     UK_TZ = ZoneInfo("Europe/London")
     now = datetime.now(UK_TZ)
     today = now.date()
+    week_start = today - timedelta(days=today.weekday())
     snap = Snapshot(hour_of_day=now.hour, day_of_week=today.weekday())
 
-    programme = await fit.get_active_programme()
-    if not programme:
-        return snap
+    async with load_scope():
+        fetches = asyncio.gather(
+            memo(fit.fetch_weight_history, 30),
+            memo(fit.fetch_nutrition_today),
+            memo(fit.fetch_steps_history, 7),
+            memo(fit.count_sessions_this_week),
+            memo(fit.get_sessions_in_range, today - timedelta(days=14), today),
+            memo(fit.mobility_today),
+            memo(fit.fetch_live_steps),
+            _optional(fit.fetch_recovery_history, 5),
+            _optional(fit.fetch_mobility_dates, today - timedelta(days=30), today),
+            _optional(fit.fetch_nutrition_logs, week_start, today),
+        )
+        programme = await memo(fit.get_active_programme)
+        if not programme:
+            fetches.cancel()
+            return snap
+        (weight_history, nutrition, steps_history, sessions_week, recent_sessions,
+         mob, _, garmin_rows, mobility_dates, nut_rows) = await fetches
+        steps_today = await fit._live_steps_today(steps_history)
 
     snap.programme_active = True
     snap.week_no = fit.week_number(programme)
@@ -123,7 +157,6 @@ async def build_snapshot() -> Snapshot:
             snap.session_type = today_session.session_type
 
     # Weight — filter history to programme start so pre-cut data doesn't fake trends
-    weight_history = await fit.fetch_weight_history(30)
     prog_start = date.fromisoformat(programme["start_date"])
     trend = compute_trend(weight_history, programme_start=prog_start)
     snap.current_weight_kg = trend.trend_7d or trend.latest_raw
@@ -131,7 +164,6 @@ async def build_snapshot() -> Snapshot:
     snap.weight_stalled = trend.stalled
 
     # Nutrition today
-    nutrition = await fit.fetch_nutrition_today()
     snap.calories_eaten = nutrition["calories"]
     snap.protein_eaten = nutrition["protein_g"]
     snap.carbs_eaten = nutrition["carbs_g"]
@@ -139,8 +171,7 @@ async def build_snapshot() -> Snapshot:
     snap.water_ml = nutrition["water_ml"]
 
     # Live targets
-    steps_history = await fit.fetch_steps_history(7)
-    snap.steps_today = int(await fit._live_steps_today(steps_history))
+    snap.steps_today = int(steps_today)
     snap.steps_7d_avg = (
         sum(p["value"] for p in steps_history) / len(steps_history)
         if steps_history else 0
@@ -155,38 +186,16 @@ async def build_snapshot() -> Snapshot:
     snap.tdee = live.tdee
 
     # Training load
-    snap.strength_sessions_week = await fit.count_sessions_this_week()
-    recent_sessions = await fit.get_sessions_in_range(
-        today - timedelta(days=14), today
-    )
+    snap.strength_sessions_week = sessions_week
     snap.recent_rpe = [
         int(s["rpe"]) for s in recent_sessions
         if s.get("rpe") is not None
     ]
 
     # Mobility
-    mob = await fit.mobility_today()
     snap.mobility_done_today = mob.get("morning", False) or mob.get("evening", False)
 
     # Recovery: Garmin data (last 5 days for HR trend)
-    try:
-        async with httpx.AsyncClient(timeout=10) as c:
-            resp = await c.get(
-                f"{fit.SUPABASE_URL}/rest/v1/garmin_daily_summary",
-                headers=fit._read_headers(),
-                params={
-                    "select": "date,resting_hr,sleep_hours,sleep_score,hrv_weekly_avg,hrv_last_night,hrv_status,avg_stress",
-                    "user_id": "eq.chris",
-                    "date": f"gte.{(today - timedelta(days=5)).isoformat()}",
-                    "order": "date.desc",
-                    "limit": "5",
-                },
-            )
-            resp.raise_for_status()
-            garmin_rows = resp.json()
-    except Exception:
-        garmin_rows = []
-
     if garmin_rows:
         latest = garmin_rows[0]
         snap.sleep_hours = latest.get("sleep_hours")
@@ -202,69 +211,36 @@ async def build_snapshot() -> Snapshot:
         ]
 
     # Mobility streak (reuse the endpoint logic)
-    try:
-        cutoff = (today - timedelta(days=30)).isoformat()
-        async with httpx.AsyncClient(timeout=10) as c:
-            resp = await c.get(
-                f"{fit.SUPABASE_URL}/rest/v1/{fit.MOBILITY_TABLE}",
-                headers=fit._read_headers(),
-                params={
-                    "select": "session_date",
-                    "user_id": "eq.chris",
-                    "session_date": f"gte.{cutoff}",
-                    "order": "session_date.desc",
-                },
-            )
-            resp.raise_for_status()
-            mob_rows = resp.json()
-        days_done = {str(r["session_date"]) for r in mob_rows}
+    if mobility_dates is not None:
         streak = 0
         for i in range(30):
             d = (today - timedelta(days=i)).isoformat()
-            if d in days_done:
+            if d in mobility_dates:
                 streak += 1
             elif i == 0:
                 continue
             else:
                 break
         snap.mobility_streak = streak
-    except Exception:
-        pass
 
     # Weekly nutrition pattern (this ISO week so far)
-    try:
-        week_start = today - timedelta(days=today.weekday())
-        async with httpx.AsyncClient(timeout=10) as c:
-            resp = await c.get(
-                f"{fit.SUPABASE_URL}/rest/v1/nutrition_logs",
-                headers=fit._read_headers(),
-                params={
-                    "select": "logged_at,calories,protein_g",
-                    "and": f"(logged_at.gte.{week_start.isoformat()}T00:00:00,logged_at.lt.{(today + timedelta(days=1)).isoformat()}T00:00:00)",
-                },
-            )
-            resp.raise_for_status()
-            nut_rows = resp.json()
-
-        by_day: dict[str, dict] = {}
-        for r in nut_rows:
-            d = str(r["logged_at"])[:10]
-            if d not in by_day:
-                by_day[d] = {"cal": 0.0, "pro": 0.0}
-            by_day[d]["cal"] += float(r.get("calories") or 0)
-            by_day[d]["pro"] += float(r.get("protein_g") or 0)
-
-        if by_day:
-            snap.days_over_target_this_week = sum(
-                1 for v in by_day.values() if v["cal"] > snap.calories_target * 1.05
-            )
-            pro_pcts = [
-                (v["pro"] / snap.protein_target * 100) if snap.protein_target else 100
-                for v in by_day.values()
-            ]
-            snap.avg_protein_pct_this_week = sum(pro_pcts) / len(pro_pcts)
-    except Exception:
-        pass
+    by_day: dict[str, dict] = {}
+    for r in nut_rows or []:
+        d = str(r["logged_at"])[:10]
+        if d not in by_day:
+            by_day[d] = {"cal": 0.0, "pro": 0.0}
+        by_day[d]["cal"] += float(r.get("calories") or 0)
+        by_day[d]["pro"] += float(r.get("protein_g") or 0)
+
+    if by_day:
+        snap.days_over_target_this_week = sum(
+            1 for v in by_day.values() if v["cal"] > snap.calories_target * 1.05
+        )
+        pro_pcts = [
+            (v["pro"] / snap.protein_target * 100) if snap.protein_target else 100
+            for v in by_day.values()
+        ]
+        snap.avg_protein_pct_this_week = sum(pro_pcts) / len(pro_pcts)
 
     return snap
 
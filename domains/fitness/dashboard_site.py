@@ -27,6 +27,7 @@ import httpx
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 
 from domains.fitness import service as fit
+from domains.fitness.loader import load_scope, memo
 from domains.fitness.programme_generator import generate_week, session_to_dict
 from domains.fitness.trend import compute_trend
 from logger import logger
@@ -283,11 +284,18 @@ async def _ai_summary(facts: dict) -> str:
 # ── data assembly ──────────────────────────────────────────────────────
 
 async def _build_data() -> dict:
-    programme = await fit.get_active_programme()
-    dash = await fit.compute_dashboard()
-    trends = await fit.fetch_trends_series(90)
-    bodyfat = await _latest_bodyfat()
-    library = {r["slug"]: r for r in await fit.get_all_exercises()}
+    # One load scope: compute_dashboard() reuses the programme read, and every
+    # independent source (Supabase, Withings, Garmin) is fetched concurrently.
+    async with load_scope():
+        programme, dash, trends, bodyfat, exercises, _hist = await asyncio.gather(
+            memo(fit.get_active_programme),
+            fit.compute_dashboard(),
+            memo(fit.fetch_trends_series, 90),
+            _latest_bodyfat(),
+            memo(fit.get_all_exercises),
+            memo(fit.fetch_weight_history, 45),
+        )
+    library = {r["slug"]: r for r in exercises}
     await _heal_dead_videos(library)  # check each demo plays; search+heal dead ones, else hide
 
     w = dash.get("weight", {})
@@ -301,7 +309,6 @@ async def _build_data() -> dict:
     week_no = dash.get("week_no", 0) or 0
     days_remaining = dash.get("days_remaining")
     # Current weight independent of programme start so it shows pre-start too.
-    _hist = await fit.fetch_weight_history(45)
     _wt = compute_trend(_hist)
     current = _wt.trend_7d or _wt.latest_raw
     latest_raw = _wt.latest_raw  # today's actual scale reading (vs the smoothed trend headline)
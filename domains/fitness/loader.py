@@ -0,0 +1,73 @@
+"""Per-request memoisation for fitness reads.
+
+The dashboard, advisor snapshot, weekly review and the reset-cut site build
+all read the same handful of Supabase tables (programme, weight, steps,
+nutrition, mobility, sessions) plus the live Garmin step count. Each used
+to await them one after another, and the site build then re-fetched most
+of them again via compute_dashboard().
+
+Wrap a unit of work in ``load_scope()`` and route reads through
+``memo(fetcher, *args)``:
+
+- the first call for a (fetcher, args) key starts the fetch as a task;
+  later calls in the same scope await that same task, so concurrent
+  consumers share one round-trip;
+- ``asyncio.gather(memo(a), memo(b), ...)`` therefore fans all independent
+  reads out at once over the pooled Supabase client;
+- outside a scope memo() just awaits the fetcher, so nothing is cached
+  across requests.
+
+Scopes nest: an inner load_scope() (e.g. compute_dashboard() called from
+the site build) joins the outer one.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Hashable
+
+_scope: ContextVar[dict | None] = ContextVar("fitness_load_scope", default=None)
+
+
+@asynccontextmanager
+async def load_scope():
+    """Share memo()ised fetches across everything awaited inside the block."""
+    if _scope.get() is not None:
+        yield
+        return
+    token = _scope.set({})
+    try:
+        yield
+    finally:
+        memo_tasks = _scope.get() or {}
+        _scope.reset(token)
+        # Fetches nobody awaited (an early return, or a sibling raised in
+        # gather) shouldn't outlive the request
+        for task in memo_tasks.values():
+            if not task.done():
+                task.cancel()
+
+
+async def memo(
+    fetcher: Callable[..., Awaitable[Any]],
+    *args: Hashable,
+    key: Hashable | None = None,
+) -> Any:
+    """Await fetcher(*args), sharing the result within the current scope.
+
+    Args:
+        fetcher: async function to call.
+        args: positional arguments; must be hashable (dates, ints).
+        key: explicit cache key, when args alone don't identify the read.
+    """
+    tasks = _scope.get()
+    if tasks is None:
+        return await fetcher(*args)
+    k = (fetcher, args) if key is None else key
+    task = tasks.get(k)
+    if task is None:
+        task = tasks[k] = asyncio.ensure_future(fetcher(*args))
+    # Shield so one cancelled consumer doesn't cancel the fetch for the rest
+    return await asyncio.shield(task)
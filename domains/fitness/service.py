@@ -3,20 +3,26 @@
 CRUD for programmes, workouts, mobility sessions, weekly check-ins, plus
 aggregation queries for the daily dashboard and Sunday review.
 
+The aggregators read through `domains.fitness.loader.memo` inside a
+`load_scope()`, so independent reads run concurrently and are shared with
+anything else (advisor, site build) running in the same scope.
+
 All DB access goes via httpx + PostgREST against Supabase, matching the
 pattern used by `domains/accountability/service.py`.
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
 from datetime import date, datetime, timedelta
 from typing import Any, Optional
 from zoneinfo import ZoneInfo
 
-import httpx
+from integrations.supabase_rest import get_supabase
 
+from domains.fitness.loader import load_scope, memo
 from domains.fitness.trend import compute_trend, TrendResult
 from domains.fitness.tdee import compute_tdee, TdeeResult, DEFAULT_PROTEIN_G_PER_KG
 from domains.fitness.programme_generator import (
@@ -82,7 +88,7 @@ def _url(table: str) -> str:
 
 async def get_active_programme() -> dict | None:
     """Return the currently active programme (or None)."""
-    async with httpx.AsyncClient(timeout=10) as c:
+    async with get_supabase().session(timeout=10) as c:
         resp = await c.get(
             _url(PROGRAMMES_TABLE),
             headers=_read_headers(),
@@ -131,7 +137,7 @@ async def create_programme(
         "weekly_strength_sessions": weekly_strength_sessions,
         "notes": notes,
     }
-    async with httpx.AsyncClient(timeout=10) as c:
+    async with get_supabase().session(timeout=10) as c:
         resp = await c.post(_url(PROGRAMMES_TABLE), headers=_write_headers(), json=body)
         resp.raise_for_status()
         return resp.json()[0]
@@ -139,7 +145,7 @@ async def create_programme(
 
 async def abandon_active_programmes() -> int:
     """Mark all active programmes as abandoned. Returns count changed."""
-    async with httpx.AsyncClient(timeout=10) as c:
+    async with get_supabase().session(timeout=10) as c:
         resp = await c.patch(
             _url(PROGRAMMES_TABLE),
             headers=_write_headers(),
@@ -275,7 +281,7 @@ async def recalibrate_programme(
         "daily_protein_g": live.target_protein_g,
     }
 
-    async with httpx.AsyncClient(timeout=10) as c:
+    async with get_supabase().session(timeout=10) as c:
         resp = await c.patch(
             _url(PROGRAMMES_TABLE),
             headers=_write_headers(),
@@ -307,7 +313,7 @@ async def get_exercises_by_slugs(slugs: list[str]) -> dict[str, dict]:
     if not slugs:
         return {}
     slug_filter = ",".join(slugs)
-    async with httpx.AsyncClient(timeout=10) as c:
+    async with get_supabase().session(timeout=10) as c:
         resp = await c.get(
             _url(EXERCISES_TABLE),
             headers=_read_headers(),
@@ -318,7 +324,7 @@ async def get_exercises_by_slugs(slugs: list[str]) -> dict[str, dict]:
 
 
 async def get_all_exercises() -> list[dict]:
-    async with httpx.AsyncClient(timeout=10) as c:
+    async with get_supabase().session(timeout=10) as c:
         resp = await c.get(
             _url(EXERCISES_TABLE),
             headers=_read_headers(),
@@ -358,7 +364,7 @@ async def log_workout(
         "programme_id": programme_id,
         "week_no": week_no,
     }
-    async with httpx.AsyncClient(timeout=15) as c:
+    async with get_supabase().session(timeout=15) as c:
         resp = await c.post(_url(SESSIONS_TABLE), headers=_write_headers(), json=body)
         resp.raise_for_status()
         session = resp.json()[0]
@@ -388,7 +394,7 @@ async def log_workout(
 
 
 async def get_sessions_in_range(start: date, end: date) -> list[dict]:
-    async with httpx.AsyncClient(timeout=10) as c:
+    async with get_supabase().session(timeout=10) as c:
         resp = await c.get(
             _url(SESSIONS_TABLE),
             headers=_read_headers(),
@@ -409,7 +415,7 @@ async def count_sessions_this_week(today: date | None = None) -> int:
     # ISO week: Monday as start
     start = today - timedelta(days=today.weekday())
     end = start + timedelta(days=6)
-    sessions = await get_sessions_in_range(start, end)
+    sessions = await memo(get_sessions_in_range, start, end)
     return len([s for s in sessions if s["session_type"] not in ("mobility", "rest")])
 
 
@@ -484,7 +490,7 @@ async def log_mobility(
         "routine": routine,
         "programme_id": programme_id,
     }
-    async with httpx.AsyncClient(timeout=10) as c:
+    async with get_supabase().session(timeout=10) as c:
         resp = await c.post(
             _url(MOBILITY_TABLE),
             headers={**_write_headers(), "Prefer": "resolution=merge-duplicates,return=representation"},
@@ -497,7 +503,7 @@ async def log_mobility(
 async def mobility_today() -> dict:
     """Return which slots (morning/evening) are done today."""
     today = _today().isoformat()
-    async with httpx.AsyncClient(timeout=10) as c:
+    async with get_supabase().session(timeout=10) as c:
         resp = await c.get(
             _url(MOBILITY_TABLE),
             headers=_read_headers(),
@@ -512,6 +518,22 @@ async def mobility_today() -> dict:
     }
 
 
+async def fetch_mobility_dates(start: date, end: date) -> set[str]:
+    """ISO dates between start and end (inclusive) with any mobility logged."""
+    async with get_supabase().session(timeout=10) as c:
+        resp = await c.get(
+            _url(MOBILITY_TABLE),
+            headers=_read_headers(),
+            params={
+                "select": "session_date",
+                "user_id": "eq.chris",
+                "and": f"(session_date.gte.{start.isoformat()},session_date.lte.{end.isoformat()})",
+            },
+        )
+        resp.raise_for_status()
+        return {str(row["session_date"]) for row in resp.json()}
+
+
 # ══════════════════════════════════════════════════════════════════════
 # DATA FETCHERS (external tables)
 # ══════════════════════════════════════════════════════════════════════
@@ -520,7 +542,7 @@ async def mobility_today() -> dict:
 async def fetch_weight_history(days: int = 30) -> list[dict]:
     """Pull raw weight readings from weight_readings (Withings)."""
     cutoff = (_today() - timedelta(days=days)).isoformat()
-    async with httpx.AsyncClient(timeout=10) as c:
+    async with get_supabase().session(timeout=10) as c:
         resp = await c.get(
             f"{SUPABASE_URL}/rest/v1/weight_readings",
             headers=_read_headers(),
@@ -541,7 +563,7 @@ async def fetch_weight_history(days: int = 30) -> list[dict]:
 
 async def fetch_steps_history(days: int = 7) -> list[dict]:
     cutoff = (_today() - timedelta(days=days)).isoformat()
-    async with httpx.AsyncClient(timeout=10) as c:
+    async with get_supabase().session(timeout=10) as c:
         resp = await c.get(
             f"{SUPABASE_URL}/rest/v1/garmin_daily_summary",
             headers=_read_headers(),
@@ -560,18 +582,26 @@ async def fetch_steps_history(days: int = 7) -> list[dict]:
         ]
 
 
-async def _live_steps_today(steps_history: list[dict]) -> float:
-    """Today's step count — live from Garmin when reachable, otherwise
-    the most recent row in `garmin_daily_summary` (which is up to 1 day stale
-    because the sync job only runs once a morning)."""
-    today_iso = _today().isoformat()
+async def fetch_live_steps() -> float | None:
+    """Today's step count straight from Garmin, or None if unavailable."""
     try:
         from domains.nutrition.services import get_steps
         live = await get_steps()
-        if live and live.get("steps") is not None and live.get("date") == today_iso:
+        if live and live.get("steps") is not None and live.get("date") == _today().isoformat():
             return float(live["steps"])
     except Exception as e:
         logger.warning(f"Live Garmin step fetch failed, falling back to DB: {e}")
+    return None
+
+
+async def _live_steps_today(steps_history: list[dict]) -> float:
+    """Today's step count — live from Garmin when reachable, otherwise
+    the most recent row in `garmin_daily_summary` (which is up to 1 day stale
+    because the sync job only runs once a morning)."""
+    live = await memo(fetch_live_steps)
+    if live is not None:
+        return live
+    today_iso = _today().isoformat()
     # Fall back to whatever the sync job last wrote.
     for row in reversed(steps_history):
         if row.get("date") == today_iso:
@@ -598,90 +628,77 @@ async def fetch_trends_series(days: int = 90) -> dict:
             }
         }
 
-    Each series drops nulls so the UI can plot directly. `summary` averages the
-    most recent 14 days vs the prior 14 days for headline deltas.
+    Each series drops nulls so the UI can plot directly (weight is the daily
+    mean of that day's weigh-ins). `summary` averages the most recent 14 days
+    vs the prior 14 days for headline deltas.
+
+    Served from the local health timeseries cache, which only pulls the
+    days it hasn't seen (or a short delta) from Supabase.
     """
+    from domains.nutrition.services.health_timeseries import (
+        load_health_timeseries, period_delta,
+    )
+
+    today = _today()
+    start = today - timedelta(days=days)
+    cache = await load_health_timeseries(start)
+    metrics = {
+        "weight": "weight",
+        "steps": "steps",
+        "sleep_score": "sleep_score",
+        "sleep_hours": "sleep_hours",
+        "resting_hr": "resting_hr",
+        "hrv": "hrv_last_night",
+        "stress": "avg_stress",
+    }
+    series: dict[str, list[dict]] = {}
+    summary: dict[str, dict] = {}
+    for name, metric in metrics.items():
+        d, v = cache.daily(metric, start)
+        series[name] = [{"date": str(day), "value": float(val)} for day, val in zip(d, v)]
+        summary[name] = period_delta(d, v, today)
+    return {"series": series, "summary": summary}
+
+
+async def fetch_recovery_history(days: int = 5) -> list[dict]:
+    """Garmin sleep / HR / HRV / stress rows for the last N days, newest first."""
     cutoff = (_today() - timedelta(days=days)).isoformat()
-    # Weight
-    async with httpx.AsyncClient(timeout=10) as c:
-        w_resp = await c.get(
-            f"{SUPABASE_URL}/rest/v1/weight_readings",
-            headers=_read_headers(),
-            params={
-                "select": "measured_at,weight_kg",
-                "user_id": "eq.chris",
-                "measured_at": f"gte.{cutoff}T00:00:00Z",
-                "order": "measured_at.asc",
-            },
-        )
-        w_resp.raise_for_status()
-        weight_rows = w_resp.json()
-        # Garmin (single round-trip for all fields)
-        g_resp = await c.get(
+    async with get_supabase().session(timeout=10) as c:
+        resp = await c.get(
             f"{SUPABASE_URL}/rest/v1/garmin_daily_summary",
             headers=_read_headers(),
             params={
-                "select": "date,steps,sleep_score,sleep_hours,resting_hr,hrv_weekly_avg,hrv_last_night,avg_stress",
+                "select": "date,resting_hr,sleep_hours,sleep_score,hrv_weekly_avg,hrv_last_night,hrv_status,avg_stress",
                 "user_id": "eq.chris",
                 "date": f"gte.{cutoff}",
-                "order": "date.asc",
+                "order": "date.desc",
+                "limit": str(days),
             },
         )
-        g_resp.raise_for_status()
-        garmin_rows = g_resp.json()
-
-    def _pick(rows: list[dict], field_name: str, date_field: str = "date") -> list[dict]:
-        out: list[dict] = []
-        for r in rows:
-            v = r.get(field_name)
-            if v is None:
-                continue
-            day = str(r[date_field])[:10]
-            out.append({"date": day, "value": float(v)})
-        return out
-
-    weight_series = [
-        {"date": str(r["measured_at"])[:10], "value": float(r["weight_kg"])}
-        for r in weight_rows
-        if r.get("weight_kg") is not None
-    ]
+        resp.raise_for_status()
+        return resp.json()
 
-    series = {
-        "weight": weight_series,
-        "steps": _pick(garmin_rows, "steps"),
-        "sleep_score": _pick(garmin_rows, "sleep_score"),
-        "sleep_hours": _pick(garmin_rows, "sleep_hours"),
-        "resting_hr": _pick(garmin_rows, "resting_hr"),
-        "hrv": _pick(garmin_rows, "hrv_last_night"),
-        "stress": _pick(garmin_rows, "avg_stress"),
-    }
 
-    # Summary: last 14d avg vs prior 14d avg.
-    def _summarise(points: list[dict]) -> dict:
-        if not points:
-            return {"current": None, "prior": None, "delta_pct": None, "n": 0}
-        today_ord = _today().toordinal()
-        recent = [p["value"] for p in points if today_ord - date.fromisoformat(p["date"]).toordinal() < 14]
-        prior = [
-            p["value"] for p in points
-            if 14 <= today_ord - date.fromisoformat(p["date"]).toordinal() < 28
-        ]
-        r_avg = round(sum(recent) / len(recent), 2) if recent else None
-        p_avg = round(sum(prior) / len(prior), 2) if prior else None
-        delta_pct: float | None = None
-        if r_avg is not None and p_avg is not None and p_avg != 0:
-            delta_pct = round((r_avg - p_avg) / p_avg * 100, 1)
-        return {"current": r_avg, "prior": p_avg, "delta_pct": delta_pct, "n": len(points)}
-
-    summary = {name: _summarise(pts) for name, pts in series.items()}
-    return {"series": series, "summary": summary}
+async def fetch_nutrition_logs(start: date, end: date) -> list[dict]:
+    """Raw nutrition log rows (logged_at, calories, protein_g) for start <= day <= end."""
+    async with get_supabase().session(timeout=10) as c:
+        resp = await c.get(
+            f"{SUPABASE_URL}/rest/v1/nutrition_logs",
+            headers=_read_headers(),
+            params={
+                "select": "logged_at,calories,protein_g",
+                "and": f"(logged_at.gte.{start.isoformat()}T00:00:00,logged_at.lt.{(end + timedelta(days=1)).isoformat()}T00:00:00)",
+            },
+        )
+        resp.raise_for_status()
+        return resp.json()
 
 
 async def fetch_nutrition_today() -> dict:
     """Sum today's nutrition logs into totals."""
     today = _today().isoformat()
     tomorrow = (_today() + timedelta(days=1)).isoformat()
-    async with httpx.AsyncClient(timeout=10) as c:
+    async with get_supabase().session(timeout=10) as c:
         resp = await c.get(
             f"{SUPABASE_URL}/rest/v1/nutrition_logs",
             headers=_read_headers(),
@@ -721,21 +738,25 @@ async def compute_dashboard() -> dict:
             "flags": [...],   # human-readable alerts
         }
     """
-    programme = await get_active_programme()
+    async with load_scope():
+        (programme, weight_history, nutrition, steps_history, mob,
+         strength_this_week, _) = await asyncio.gather(
+            memo(get_active_programme),
+            memo(fetch_weight_history, 30),
+            memo(fetch_nutrition_today),
+            memo(fetch_steps_history, 7),
+            memo(mobility_today),
+            memo(count_sessions_this_week),
+            memo(fetch_live_steps),
+        )
+        steps_today = await _live_steps_today(steps_history)
 
-    weight_history = await fetch_weight_history(30)
     prog_start = date.fromisoformat(programme["start_date"]) if programme else None
     trend = compute_trend(weight_history, programme_start=prog_start)
-
-    nutrition = await fetch_nutrition_today()
-    steps_history = await fetch_steps_history(7)
-    steps_today = await _live_steps_today(steps_history)
     steps_avg = (
         sum(p["value"] for p in steps_history) / len(steps_history)
         if steps_history else 0
     )
-    mob = await mobility_today()
-    strength_this_week = await count_sessions_this_week()
 
     flags: list[str] = []
     result: dict[str, Any] = {
@@ -843,17 +864,26 @@ async def compute_dashboard() -> dict:
 
 async def compute_weekly_review() -> dict:
     """Build Sunday review payload: 7-day adherence, trend change, adjustment."""
-    programme = await get_active_programme()
-    if not programme:
-        return {"error": "No active programme"}
-
     today = _today()
     week_start = today - timedelta(days=today.weekday())  # Monday
     week_end = week_start + timedelta(days=6)
+
+    async with load_scope():
+        (programme, weight_history, logs, steps_week, sessions,
+         mobility_dates) = await asyncio.gather(
+            memo(get_active_programme),
+            memo(fetch_weight_history, 30),
+            memo(fetch_nutrition_logs, week_start, week_end),
+            memo(fetch_steps_history, 7),
+            memo(get_sessions_in_range, week_start, week_end),
+            memo(fetch_mobility_dates, week_start, week_end),
+        )
+    if not programme:
+        return {"error": "No active programme"}
+
     wk_no = week_number(programme, today)
 
     # Weight
-    weight_history = await fetch_weight_history(30)
     trend = compute_trend(weight_history)
 
     # Last week's weight for delta
@@ -877,18 +907,6 @@ async def compute_weekly_review() -> dict:
         cum_loss = round(float(programme["start_weight_kg"]) - this_avg, 2)
 
     # Nutrition adherence (rough: look at nutrition_logs per day this week)
-    async with httpx.AsyncClient(timeout=10) as c:
-        resp = await c.get(
-            f"{SUPABASE_URL}/rest/v1/nutrition_logs",
-            headers=_read_headers(),
-            params={
-                "select": "logged_at,calories,protein_g",
-                "and": f"(logged_at.gte.{week_start.isoformat()}T00:00:00,logged_at.lt.{(week_end+timedelta(days=1)).isoformat()}T00:00:00)",
-            },
-        )
-        resp.raise_for_status()
-        logs = resp.json()
-
     daily_cal: dict[str, float] = {}
     daily_pro: dict[str, float] = {}
     for r in logs:
@@ -903,27 +921,14 @@ async def compute_weekly_review() -> dict:
     tracked_days = len(daily_cal)
 
     # Steps adherence
-    steps_week = await fetch_steps_history(7)
     steps_target = programme["daily_steps_target"]
     days_hit_steps = sum(1 for p in steps_week if p["value"] >= steps_target)
 
     # Strength sessions done
-    sessions = await get_sessions_in_range(week_start, week_end)
     strength_done = len([s for s in sessions if s["session_type"] not in ("mobility", "rest")])
 
     # Mobility days hit
-    async with httpx.AsyncClient(timeout=10) as c:
-        mresp = await c.get(
-            _url(MOBILITY_TABLE),
-            headers=_read_headers(),
-            params={
-                "select": "session_date",
-                "user_id": "eq.chris",
-                "and": f"(session_date.gte.{week_start.isoformat()},session_date.lte.{week_end.isoformat()})",
-            },
-        )
-        mresp.raise_for_status()
-        mobility_days = len({row["session_date"] for row in mresp.json()})
+    mobility_days = len(mobility_dates)
 
     # Live targets recomputed from current weight. Weekly review is the
     # natural recalibration checkpoint — if BMR has dropped enough that the
@@ -1043,7 +1048,7 @@ async def save_weekly_checkin(review: dict) -> dict | None:
         "next_steps_target": review["adjustment"]["next_steps_target"],
         "adjustment_note": review["adjustment"]["note"],
     }
-    async with httpx.AsyncClient(timeout=10) as c:
+    async with get_supabase().session(timeout=10) as c:
         resp = await c.post(
             _url(CHECKINS_TABLE),
             headers={**_write_headers(), "Prefer": "resolution=merge-duplicates,return=representation"},
@@ -10,15 +10,28 @@ This module surfaces the full sensor set to the Hadley API (``/home/sensors``)
 and runs a reachability + low-battery watchdog, because the Pi has dropped off
 WiFi silently before with no alert (it also hosts the pocket-money IHD
 dashboard on :3000, so when it dies, both go dark).
+
+History reads go through one pooled client and a small thread pool, so the
+per-room fetches behind ``get_trend`` run side by side. Completed days'
+min/max/avg buckets are kept in ``data/home_sensors_daily.json``; a trend
+call with every past day cached only pulls today's points from the bridge.
 """
 
 from __future__ import annotations
 
 import asyncio
+import json
+import math
 import os
-from datetime import datetime, timezone
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, time as dtime, timedelta, timezone
+from pathlib import Path
+from zoneinfo import ZoneInfo
 
 import httpx
+import numpy as np
 
 from logger import logger
 
@@ -34,6 +47,21 @@ _fail_count = 0
 DOWN_ALERT_AFTER = 3        # consecutive failed polls before alerting (~15 min @ 5-min cadence)
 LOW_BATTERY_PCT = 15        # alert when a sensor drops below this
 
+# History fetches: at most this many in flight against the Pi at once
+HISTORY_WORKERS = 4
+# Friendly-name -> device resolution reuses the last sensor list this long
+SENSORS_TTL_SECONDS = 60
+# Per-room daily aggregates for completed days (today is always re-fetched)
+DAILY_CACHE_FILE = Path(__file__).resolve().parents[2] / "data" / "home_sensors_daily.json"
+DAILY_CACHE_DAYS = 35       # bridge keeps ~30 days; prune anything older
+# Bridge timestamps are UTC; days are bucketed on the house's calendar
+LONDON = ZoneInfo("Europe/London")
+
+_client = httpx.Client(timeout=httpx.Timeout(12, connect=4))
+_pool = ThreadPoolExecutor(max_workers=HISTORY_WORKERS, thread_name_prefix="home-sensors")
+_sensors_cache: tuple[float, list[dict]] | None = None
+_daily_lock = threading.Lock()
+
 # Prefixes stripped from the bridge's device keys to derive a friendly room
 # label, e.g. "sensor_kitchen" -> "Kitchen", "motion_lounge" -> "Lounge".
 _PREFIXES = ("sensor_", "motion_", "temp_", "climate_", "th_")
@@ -76,9 +104,11 @@ def _reshape(raw: dict) -> list[dict]:
 
 def get_sensors() -> dict:
     """Fetch and reshape the live sensor set. Raises on bridge failure."""
-    resp = httpx.get(BRIDGE_URL, timeout=8)
+    global _sensors_cache
+    resp = _client.get(BRIDGE_URL, timeout=8)
     resp.raise_for_status()
     sensors = _reshape(resp.json())
+    _sensors_cache = (time.monotonic(), sensors)
     return {
         "sensors": sensors,
         "count": len(sensors),
@@ -95,7 +125,11 @@ def _resolve_device(room_or_device: str) -> str:
     if any(key.startswith(p) for p in _PREFIXES):
         return key
     try:
-        for s in get_sensors()["sensors"]:
+        if _sensors_cache and time.monotonic() - _sensors_cache[0] < SENSORS_TTL_SECONDS:
+            sensors = _sensors_cache[1]
+        else:
+            sensors = get_sensors()["sensors"]
+        for s in sensors:
             if s["room"].lower() == key.lower() or s["id"].lower() == key.lower():
                 return s["id"]
     except Exception:
@@ -109,9 +143,8 @@ def get_history(room_or_device: str, hours: int = 24, kind: str = "readings") ->
     kind="readings" → temperature/humidity points; kind="motion" → motion events.
     """
     device = _resolve_device(room_or_device)
-    resp = httpx.get(f"{BRIDGE_URL}/history",
-                     params={"device": device, "hours": hours, "type": kind},
-                     timeout=12)
+    resp = _client.get(f"{BRIDGE_URL}/history",
+                       params={"device": device, "hours": hours, "type": kind})
     resp.raise_for_status()
     points = resp.json() or []
     return {
@@ -124,40 +157,116 @@ def get_history(room_or_device: str, hours: int = 24, kind: str = "readings") ->
     }
 
 
+def _local_day(ts: str) -> str | None:
+    """Europe/London date of a bridge timestamp (UTC; naive means UTC)."""
+    try:
+        dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(LONDON).date().isoformat()
+
+
+def _daily_buckets(points: list[dict]) -> dict[str, dict]:
+    """Raw reading points -> {YYYY-MM-DD (London): daily min/max/avg row}."""
+    by_day: dict[str, dict] = {}
+    for p in points:
+        day = _local_day(p.get("ts") or "")
+        if not day:
+            continue
+        bucket = by_day.setdefault(day, {"temps": [], "hums": []})
+        if p.get("temperature") is not None:
+            bucket["temps"].append(float(p["temperature"]))
+        if p.get("humidity") is not None:
+            bucket["hums"].append(float(p["humidity"]))
+    out = {}
+    for day, b in by_day.items():
+        temps, hums = b["temps"], b["hums"]
+        out[day] = {
+            "date": day,
+            "temp_min": round(min(temps), 1) if temps else None,
+            "temp_max": round(max(temps), 1) if temps else None,
+            "temp_avg": round(sum(temps) / len(temps), 1) if temps else None,
+            "humidity_avg": round(sum(hums) / len(hums), 1) if hums else None,
+            "samples": len(temps),
+        }
+    return out
+
+
+def _load_daily_cache() -> dict[str, dict[str, dict]]:
+    try:
+        return json.loads(DAILY_CACHE_FILE.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _save_daily_cache(cache: dict[str, dict[str, dict]]) -> None:
+    cutoff = (datetime.now(LONDON).date() - timedelta(days=DAILY_CACHE_DAYS)).isoformat()
+    pruned = {dev: {d: row for d, row in days.items() if d >= cutoff}
+              for dev, days in cache.items()}
+    DAILY_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp = DAILY_CACHE_FILE.with_suffix(".tmp")
+    tmp.write_text(json.dumps(pruned), encoding="utf-8")
+    os.replace(tmp, DAILY_CACHE_FILE)
+
+
+def _room_daily(device: str, days: int, cached: dict[str, dict]) -> tuple[list[dict], dict[str, dict]]:
+    """Daily rows for the last `days` London calendar days (today included).
+
+    Returns (rows, newly completed days to cache). Past days come from the
+    cache when all are present, so only today's points are fetched;
+    otherwise the whole window is fetched once and its complete days cached.
+    """
+    now = datetime.now(LONDON)
+    today = now.date()
+    wanted = [(today - timedelta(days=i)).isoformat() for i in range(days - 1, -1, -1)]
+    past = wanted[:-1]
+    fresh: dict[str, dict] = {}
+
+    if all(d in cached for d in past):
+        since_midnight = now.timestamp() - datetime.combine(today, dtime.min, tzinfo=LONDON).timestamp()
+        points = get_history(device, hours=max(1, math.ceil(since_midnight / 3600)))["points"]
+        buckets = _daily_buckets(points)
+    else:
+        points = get_history(device, hours=days * 24)["points"]
+        buckets = _daily_buckets(points)
+        # The window's first day is partial (it starts at now - days*24h);
+        # only whole past days are worth keeping
+        fresh = {d: row for d, row in buckets.items() if wanted[0] <= d < wanted[-1]}
+
+    rows = []
+    for d in wanted:
+        row = buckets.get(d) if d == wanted[-1] else (fresh.get(d) or cached.get(d) or buckets.get(d))
+        if row:
+            rows.append(row)
+    return rows, fresh
+
+
 def get_trend(days: int = 7) -> dict:
     """Per-room daily min/max/avg temp + humidity, with a vs-prior-day delta.
 
     Only rooms that report a temperature are included (the lounge motion sensor
-    has no temperature history). Backed by the bridge's ~30-day /history store.
+    has no temperature history). Backed by the bridge's ~30-day /history store,
+    fetched for all rooms concurrently; completed days come from the local
+    daily cache.
     """
-    hours = max(1, days) * 24
+    days = max(1, days)
+    rooms_live = [s for s in get_sensors()["sensors"] if s["temperature_c"] is not None]
+    with _daily_lock:
+        cache = _load_daily_cache()
+
+    futures = [
+        _pool.submit(_room_daily, s["id"], days, dict(cache.get(s["id"], {})))
+        for s in rooms_live
+    ]
     rooms = []
-    for s in get_sensors()["sensors"]:
-        if s["temperature_c"] is None:
-            continue
-        points = get_history(s["id"], hours=hours)["points"]
-        by_day: dict[str, dict] = {}
-        for p in points:
-            day = (p.get("ts") or "")[:10]
-            if not day:
-                continue
-            bucket = by_day.setdefault(day, {"temps": [], "hums": []})
-            if p.get("temperature") is not None:
-                bucket["temps"].append(float(p["temperature"]))
-            if p.get("humidity") is not None:
-                bucket["hums"].append(float(p["humidity"]))
-        daily = []
-        for day in sorted(by_day):
-            temps = by_day[day]["temps"]
-            hums = by_day[day]["hums"]
-            daily.append({
-                "date": day,
-                "temp_min": round(min(temps), 1) if temps else None,
-                "temp_max": round(max(temps), 1) if temps else None,
-                "temp_avg": round(sum(temps) / len(temps), 1) if temps else None,
-                "humidity_avg": round(sum(hums) / len(hums), 1) if hums else None,
-                "samples": len(temps),
-            })
+    updated = False
+    for s, fut in zip(rooms_live, futures):
+        daily, fresh = fut.result()
+        if fresh:
+            cache.setdefault(s["id"], {}).update(fresh)
+            updated = True
         delta = None
         if (len(daily) >= 2 and daily[-1]["temp_avg"] is not None
                 and daily[-2]["temp_avg"] is not None):
@@ -170,6 +279,12 @@ def get_trend(days: int = 7) -> dict:
             "daily": daily,
             "avg_change_vs_prev_day_c": delta,
         })
+    if updated:
+        with _daily_lock:
+            merged = _load_daily_cache()
+            for dev, rows in cache.items():
+                merged.setdefault(dev, {}).update(rows)
+            _save_daily_cache(merged)
     return {
         "days": days,
         "rooms": rooms,
@@ -177,6 +292,50 @@ def get_trend(days: int = 7) -> dict:
     }
 
 
+def get_series(room_or_device: str, hours: int = 24, max_points: int = 200) -> dict:
+    """Downsampled temperature/humidity series for charts.
+
+    Splits the window into at most `max_points` equal time buckets and
+    averages each (empty buckets are dropped), so a 30-day chart is a few
+    hundred points instead of tens of thousands.
+    """
+    hist = get_history(room_or_device, hours=hours)
+    raw = [p for p in hist["points"] if p.get("ts")]
+    series: list[dict] = []
+    if raw:
+        ts = np.array([datetime.fromisoformat(p["ts"].replace("Z", "+00:00")).timestamp() for p in raw])
+        temp = np.array([np.nan if p.get("temperature") is None else float(p["temperature"]) for p in raw])
+        hum = np.array([np.nan if p.get("humidity") is None else float(p["humidity"]) for p in raw])
+        n = max(1, min(max_points, len(raw)))
+        lo, hi = ts.min(), ts.max()
+        idx = np.minimum(((ts - lo) / ((hi - lo) or 1) * n).astype(int), n - 1)
+
+        def _bucket_mean(v):
+            ok = ~np.isnan(v)
+            total = np.bincount(idx[ok], weights=v[ok], minlength=n)
+            count = np.bincount(idx[ok], minlength=n)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                return total / count, count
+
+        t_avg, t_n = _bucket_mean(temp)
+        h_avg, h_n = _bucket_mean(hum)
+        t_mid = np.bincount(idx, weights=ts, minlength=n) / np.maximum(np.bincount(idx, minlength=n), 1)
+        for i in np.flatnonzero(np.bincount(idx, minlength=n)):
+            series.append({
+                "ts": datetime.fromtimestamp(t_mid[i], tz=timezone.utc).isoformat(),
+                "temperature": round(float(t_avg[i]), 2) if t_n[i] else None,
+                "humidity": round(float(h_avg[i]), 1) if h_n[i] else None,
+            })
+    return {
+        "device": hist["device"],
+        "room": hist["room"],
+        "hours": hours,
+        "raw_count": len(raw),
+        "count": len(series),
+        "points": series,
+    }
+
+
 def _post_alert(message: str, source: str, throttle_minutes: int) -> None:
     try:
         httpx.post(
@@ -1,4 +1,14 @@
-"""RSS feed fetching and article extraction."""
+"""RSS feed fetching and article extraction.
+
+All sources in a category are fetched concurrently over one HTTP client with
+conditional GETs (ETag / Last-Modified from the news store), so an unchanged
+feed costs a 304 and no parsing. Feed parsing, HTML extraction and store
+writes run in worker threads to keep the event loop free. Headlines are
+served from the store, deduplicated by normalised URL, newest first; a feed
+that fails to fetch falls back to its last stored listing.
+"""
+
+import asyncio
 
 import feedparser
 import httpx
@@ -6,6 +16,34 @@ from bs4 import BeautifulSoup
 
 from logger import logger
 from ..config import SOURCES
+from .store import get_store
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+FEED_TIMEOUT = 20
+
+
+def _parse_and_store(store, feed_url: str, source: str, category: str, content: bytes) -> int:
+    feed = feedparser.parse(content)
+    return store.replace_feed_items(feed_url, source, category, feed.entries)
+
+
+async def _refresh_source(client: httpx.AsyncClient, store, category: str,
+                          source_name: str, url: str) -> None:
+    """Conditionally fetch one feed and store any new listing."""
+    try:
+        headers = await asyncio.to_thread(store.validators, url)
+        response = await client.get(url, headers=headers)
+        if response.status_code == 304:
+            await asyncio.to_thread(store.mark_fetched, url, 304)
+            return
+        response.raise_for_status()
+        new = await asyncio.to_thread(_parse_and_store, store, url, source_name, category,
+                                      response.content)
+        await asyncio.to_thread(store.mark_fetched, url, response.status_code,
+                                response.headers.get("etag"), response.headers.get("last-modified"))
+        logger.debug(f"{source_name}: {new} new entries")
+    except Exception as e:
+        logger.warning(f"Failed to fetch from {source_name}: {e}")
 
 
 async def fetch_feed(category: str, limit: int = 10) -> list[dict]:
@@ -13,31 +51,36 @@ async def fetch_feed(category: str, limit: int = 10) -> list[dict]:
     try:
         if category == "all":
             sources = []
-            for cat_sources in SOURCES.values():
-                sources.extend(cat_sources)
+            for cat, cat_sources in SOURCES.items():
+                sources.extend((cat, name, url) for name, url in cat_sources)
         else:
-            sources = SOURCES.get(category, [])
+            sources = [(category, name, url) for name, url in SOURCES.get(category, [])]
 
         if not sources:
             return {"error": f"Unknown category: {category}", "headlines": []}
 
-        headlines = []
-
-        for source_name, url in sources:
-            try:
-                feed = feedparser.parse(url)
-                for entry in feed.entries[:limit // len(sources) + 1]:
-                    headlines.append({
-                        "title": entry.get("title", "No title"),
-                        "url": entry.get("link", ""),
-                        "source": source_name,
-                        "published": entry.get("published", "")
-                    })
-            except Exception as e:
-                logger.warning(f"Failed to fetch from {source_name}: {e}")
+        store = get_store()
+        async with httpx.AsyncClient(follow_redirects=True, timeout=FEED_TIMEOUT,
+                                     headers={"User-Agent": USER_AGENT}) as client:
+            await asyncio.gather(*(_refresh_source(client, store, cat, name, url)
+                                   for cat, name, url in sources))
+
+        per_source = limit // len(sources) + 1
+        headlines, seen = [], set()
+        for _, source_name, url in sources:
+            entries = await asyncio.to_thread(store.feed_entries, url, per_source)
+            for entry in entries:
+                if entry["url_norm"] in seen:
+                    continue
+                seen.add(entry["url_norm"])
+                headlines.append(entry | {"source": source_name})
 
         # Sort by freshness and limit
-        headlines = headlines[:limit]
+        headlines.sort(key=lambda e: e["published_ts"] or e["first_seen"], reverse=True)
+        headlines = [
+            {"title": e["title"], "url": e["url"], "source": e["source"], "published": e["published"]}
+            for e in headlines[:limit]
+        ]
 
         logger.info(f"Fetched {len(headlines)} headlines for category '{category}'")
         return {"headlines": headlines}
@@ -46,38 +89,47 @@ async def fetch_feed(category: str, limit: int = 10) -> list[dict]:
         return {"error": str(e), "headlines": []}
 
 
+def _extract_text(html: str) -> str:
+    soup = BeautifulSoup(html, "html.parser")
+
+    # Remove script, style, nav, footer elements
+    for element in soup(["script", "style", "nav", "footer", "header", "aside"]):
+        element.decompose()
+
+    # Try to find article content
+    article = soup.find("article")
+    if article:
+        text = article.get_text(separator="\n", strip=True)
+    else:
+        # Fall back to body
+        body = soup.find("body")
+        text = body.get_text(separator="\n", strip=True) if body else ""
+
+    # Clean up whitespace
+    lines = [line.strip() for line in text.split("\n") if line.strip()]
+    text = "\n".join(lines)
+
+    # Truncate if too long
+    max_chars = 4000
+    if len(text) > max_chars:
+        text = text[:max_chars] + "...[truncated]"
+    return text
+
+
 async def fetch_article(url: str) -> dict:
     """Fetch and extract text content from an article URL."""
     try:
+        store = get_store()
+        cached = await asyncio.to_thread(store.get_article, url)
+        if cached is not None:
+            return {"content": cached, "url": url, "cached": True}
+
         async with httpx.AsyncClient(follow_redirects=True, timeout=30) as client:
-            response = await client.get(url, headers={
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-            })
+            response = await client.get(url, headers={"User-Agent": USER_AGENT})
             response.raise_for_status()
 
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        # Remove script, style, nav, footer elements
-        for element in soup(["script", "style", "nav", "footer", "header", "aside"]):
-            element.decompose()
-
-        # Try to find article content
-        article = soup.find("article")
-        if article:
-            text = article.get_text(separator="\n", strip=True)
-        else:
-            # Fall back to body
-            body = soup.find("body")
-            text = body.get_text(separator="\n", strip=True) if body else ""
-
-        # Clean up whitespace
-        lines = [line.strip() for line in text.split("\n") if line.strip()]
-        text = "\n".join(lines)
-
-        # Truncate if too long
-        max_chars = 4000
-        if len(text) > max_chars:
-            text = text[:max_chars] + "...[truncated]"
+        text = await asyncio.to_thread(_extract_text, response.text)
+        await asyncio.to_thread(store.save_article, url, text)
 
         logger.info(f"Fetched article: {url[:50]}...")
         return {"content": text, "url": url}
@@ -0,0 +1,272 @@
+"""Local store for news feeds, entries, article text and sent briefings.
+
+``data/news_store.db`` keeps:
+
+- **feeds** — the ETag / Last-Modified validators of every feed URL, so the
+  next fetch is a conditional GET that usually comes back 304 with no body;
+- **entries** — every headline seen, keyed by normalised URL (scheme/host
+  lower-cased, ``utm_*``/tracking parameters and fragments dropped), so the
+  same story from two feeds or with two tracking links is stored once;
+- **feed_items** — which entries each feed listed last time, in feed order,
+  so a 304 can be answered from the store;
+- **articles** — extracted article text, so ``read_article`` on a URL seen
+  before doesn't re-download and re-parse the page;
+- **briefings** / **sent_links** — news posts already sent and the links
+  they covered, used to tell the next briefing what not to repeat.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from calendar import timegm
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from logger import logger
+from utils.sqlite_store import SQLiteStore
+
+DB_PATH = Path(__file__).resolve().parents[3] / "data" / "news_store.db"
+
+ARTICLE_TTL_SECONDS = 7 * 24 * 3600
+# Entries and briefings older than this are pruned on write
+RETENTION_SECONDS = 30 * 24 * 3600
+
+_TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "ref", "cmpid", "at_medium", "at_campaign"}
+_MD_LINK_RE = re.compile(r"\[([^\]]+)\]\(<?(https?://[^\s)>]+)>?\)")
+_URL_RE = re.compile(r"https?://[^\s)>\]]+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS feeds (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at REAL,
+    status INTEGER
+);
+CREATE TABLE IF NOT EXISTS entries (
+    url_norm TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    title TEXT,
+    source TEXT,
+    category TEXT,
+    published TEXT,
+    published_ts REAL,
+    first_seen REAL NOT NULL,
+    sent_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_first_seen ON entries(first_seen);
+CREATE TABLE IF NOT EXISTS feed_items (
+    feed_url TEXT NOT NULL,
+    url_norm TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    title TEXT,
+    PRIMARY KEY (feed_url, url_norm)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS articles (
+    url_norm TEXT PRIMARY KEY,
+    text TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS briefings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    sent_at REAL NOT NULL,
+    response TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_briefings_sent ON briefings(sent_at);
+CREATE TABLE IF NOT EXISTS sent_links (
+    briefing_id INTEGER NOT NULL,
+    url_norm TEXT NOT NULL,
+    url TEXT NOT NULL,
+    title TEXT,
+    PRIMARY KEY (briefing_id, url_norm)
+) WITHOUT ROWID;
+"""
+
+
+def normalise_url(url: str) -> str:
+    """Canonical form of an article URL for dedup."""
+    url = (url or "").strip()
+    if not url:
+        return ""
+    parts = urlsplit(url)
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+             if not k.lower().startswith("utm_") and k.lower() not in _TRACKING_PARAMS]
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit(("https" if parts.scheme in ("http", "https") else parts.scheme,
+                       host, path, urlencode(sorted(query)), ""))
+
+
+def extract_links(text: str) -> list[tuple[str, str | None]]:
+    """(url, title) for every link in a markdown message, markdown links first."""
+    links, seen = [], set()
+    for title, url in _MD_LINK_RE.findall(text or ""):
+        if url not in seen:
+            seen.add(url)
+            links.append((url, title.strip()))
+    for url in _URL_RE.findall(text or ""):
+        url = url.rstrip(".,;")
+        if url not in seen:
+            seen.add(url)
+            links.append((url, None))
+    return links
+
+
+def _published_ts(entry: dict) -> float | None:
+    parsed = entry.get("published_parsed") or entry.get("updated_parsed")
+    try:
+        return float(timegm(parsed)) if parsed else None
+    except (TypeError, ValueError):
+        return None
+
+
+class NewsStore(SQLiteStore):
+    """Feed validators and entries, plus the log of stories already sent."""
+
+    SCHEMA = _SCHEMA
+
+    def __init__(self, path: Path | str = DB_PATH):
+        super().__init__(path)
+
+    # -- feeds -----------------------------------------------------------
+
+    def validators(self, feed_url: str) -> dict:
+        """Conditional-GET headers for a feed fetched before."""
+        with self.db() as conn:
+            row = conn.execute("SELECT etag, last_modified FROM feeds WHERE url = ?",
+                               (feed_url,)).fetchone()
+        headers = {}
+        if row and row["etag"]:
+            headers["If-None-Match"] = row["etag"]
+        if row and row["last_modified"]:
+            headers["If-Modified-Since"] = row["last_modified"]
+        return headers
+
+    def mark_fetched(self, feed_url: str, status: int, etag: str | None = None,
+                     last_modified: str | None = None) -> None:
+        """Record a fetch; validators are only replaced when the server sent new ones."""
+        with self.db() as conn:
+            conn.execute(
+                """INSERT INTO feeds (url, etag, last_modified, fetched_at, status)
+                   VALUES (?, ?, ?, ?, ?)
+                   ON CONFLICT(url) DO UPDATE SET
+                     etag = COALESCE(excluded.etag, etag),
+                     last_modified = COALESCE(excluded.last_modified, last_modified),
+                     fetched_at = excluded.fetched_at, status = excluded.status""",
+                (feed_url, etag, last_modified, time.time(), status))
+
+    def replace_feed_items(self, feed_url: str, source: str, category: str,
+                           entries: list[dict]) -> int:
+        """Upsert a freshly parsed feed's entries and make them its current listing.
+
+        Returns how many entries were new to the store.
+        """
+        now = time.time()
+        new = 0
+        with self.db() as conn:
+            conn.execute("DELETE FROM feed_items WHERE feed_url = ?", (feed_url,))
+            for pos, entry in enumerate(entries):
+                url = entry.get("link", "")
+                norm = normalise_url(url)
+                if not norm:
+                    continue
+                cur = conn.execute(
+                    """INSERT OR IGNORE INTO entries
+                       (url_norm, url, title, source, category, published, published_ts, first_seen)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                    (norm, url, entry.get("title", "No title"), source, category,
+                     entry.get("published", ""), _published_ts(entry), now))
+                new += cur.rowcount
+                conn.execute("INSERT OR IGNORE INTO feed_items (feed_url, url_norm, position, title) "
+                             "VALUES (?, ?, ?, ?)", (feed_url, norm, pos, entry.get("title")))
+            conn.execute("DELETE FROM entries WHERE first_seen < ? AND url_norm NOT IN "
+                         "(SELECT url_norm FROM feed_items)", (now - RETENTION_SECONDS,))
+        return new
+
+    def feed_entries(self, feed_url: str, limit: int) -> list[dict]:
+        """The first `limit` entries of a feed's current listing, in feed order.
+
+        Titles are the feed's own, whichever feed first stored the entry.
+        """
+        with self.db() as conn:
+            rows = conn.execute(
+                """SELECT e.url_norm, e.url, COALESCE(f.title, e.title) AS title, e.published,
+                          e.published_ts, e.first_seen, e.sent_at
+                   FROM feed_items f JOIN entries e ON e.url_norm = f.url_norm
+                   WHERE f.feed_url = ? ORDER BY f.position LIMIT ?""",
+                (feed_url, limit)).fetchall()
+        return [dict(r) for r in rows]
+
+    # -- articles --------------------------------------------------------
+
+    def get_article(self, url: str, max_age: float = ARTICLE_TTL_SECONDS) -> str | None:
+        with self.db() as conn:
+            row = conn.execute("SELECT text FROM articles WHERE url_norm = ? AND fetched_at >= ?",
+                               (normalise_url(url), time.time() - max_age)).fetchone()
+        return row["text"] if row else None
+
+    def save_article(self, url: str, text: str) -> None:
+        with self.db() as conn:
+            conn.execute("INSERT OR REPLACE INTO articles (url_norm, text, fetched_at) VALUES (?, ?, ?)",
+                         (normalise_url(url), text, time.time()))
+            conn.execute("DELETE FROM articles WHERE fetched_at < ?",
+                         (time.time() - ARTICLE_TTL_SECONDS,))
+
+    # -- sent briefings --------------------------------------------------
+
+    def record_briefing(self, response: str, sent_at: float | None = None) -> int:
+        """Log a sent news post and the links it covered; returns the briefing id."""
+        sent_at = time.time() if sent_at is None else sent_at
+        with self.db() as conn:
+            briefing_id = conn.execute("INSERT INTO briefings (sent_at, response) VALUES (?, ?)",
+                                       (sent_at, response)).lastrowid
+            for url, title in extract_links(response):
+                norm = normalise_url(url)
+                conn.execute("INSERT OR IGNORE INTO sent_links (briefing_id, url_norm, url, title) "
+                             "VALUES (?, ?, ?, ?)", (briefing_id, norm, url, title))
+                conn.execute("UPDATE entries SET sent_at = ? WHERE url_norm = ? AND sent_at IS NULL",
+                             (sent_at, norm))
+            old = conn.execute("SELECT id FROM briefings WHERE sent_at < ?",
+                               (sent_at - RETENTION_SECONDS,)).fetchall()
+            for row in old:
+                conn.execute("DELETE FROM sent_links WHERE briefing_id = ?", (row["id"],))
+                conn.execute("DELETE FROM briefings WHERE id = ?", (row["id"],))
+        return briefing_id
+
+    def has_briefings(self) -> bool:
+        with self.db() as conn:
+            return conn.execute("SELECT 1 FROM briefings LIMIT 1").fetchone() is not None
+
+    def recent_briefings(self, days: int = 7) -> list[dict]:
+        """Briefings sent in the last `days`, oldest first, each with its covered links."""
+        cutoff = time.time() - days * 86400
+        with self.db() as conn:
+            briefings = [dict(r) for r in conn.execute(
+                "SELECT id, sent_at, response FROM briefings WHERE sent_at >= ? ORDER BY sent_at",
+                (cutoff,))]
+            for b in briefings:
+                b["links"] = [dict(r) for r in conn.execute(
+                    "SELECT url, title FROM sent_links WHERE briefing_id = ?", (b["id"],))]
+        return briefings
+
+
+_store: NewsStore | None = None
+
+
+def get_store() -> NewsStore:
+    """The process-wide news store."""
+    global _store
+    if _store is None:
+        _store = NewsStore()
+    return _store
+
+
+def safe_record_briefing(response: str) -> None:
+    """record_briefing() that never breaks the job it is called from."""
+    try:
+        get_store().record_briefing(response)
+    except Exception as e:
+        logger.warning(f"Could not record news briefing: {e}")
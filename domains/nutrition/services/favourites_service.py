@@ -2,7 +2,7 @@
 
 from datetime import datetime
 
-import httpx
+from integrations.supabase_rest import get_supabase
 
 from config import SUPABASE_URL, SUPABASE_KEY
 from logger import logger
@@ -40,7 +40,7 @@ async def save_favourite(
         # Normalize name for lookup
         name_lower = name.lower().strip()
 
-        async with httpx.AsyncClient() as client:
+        async with get_supabase().session() as client:
             # Upsert (insert or update)
             response = await client.post(
                 f"{_get_rest_url()}/meal_favourites",
@@ -75,7 +75,7 @@ async def get_favourite(name: str) -> dict | None:
 
         name_lower = name.lower().strip()
 
-        async with httpx.AsyncClient() as client:
+        async with get_supabase().session() as client:
             response = await client.get(
                 f"{_get_rest_url()}/meal_favourites",
                 headers=_get_headers(),
@@ -112,7 +112,7 @@ async def get_favourite(name: str) -> dict | None:
 async def _increment_use_count(favourite_id: str):
     """Increment the use count for a favourite."""
     try:
-        async with httpx.AsyncClient() as client:
+        async with get_supabase().session() as client:
             # Get current count
             response = await client.get(
                 f"{_get_rest_url()}/meal_favourites",
@@ -145,7 +145,7 @@ async def list_favourites() -> list:
         if not SUPABASE_URL or not SUPABASE_KEY:
             raise ValueError("Supabase credentials not configured")
 
-        async with httpx.AsyncClient() as client:
+        async with get_supabase().session() as client:
             response = await client.get(
                 f"{_get_rest_url()}/meal_favourites",
                 headers=_get_headers(),
@@ -183,7 +183,7 @@ async def delete_favourite(name: str) -> dict:
 
         name_lower = name.lower().strip()
 
-        async with httpx.AsyncClient() as client:
+        async with get_supabase().session() as client:
             response = await client.delete(
                 f"{_get_rest_url()}/meal_favourites",
                 headers=_get_headers(),
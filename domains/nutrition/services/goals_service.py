@@ -2,7 +2,7 @@
 
 from datetime import datetime
 
-import httpx
+from integrations.supabase_rest import get_supabase
 
 from config import SUPABASE_URL, SUPABASE_KEY
 from logger import logger
@@ -35,7 +35,7 @@ async def get_goals() -> dict:
         if not SUPABASE_URL or not SUPABASE_KEY:
             raise ValueError("Supabase credentials not configured")
 
-        async with httpx.AsyncClient() as client:
+        async with get_supabase().session() as client:
             response = await client.get(
                 f"{_get_rest_url()}/user_goals",
                 headers=_get_headers(),
@@ -152,7 +152,7 @@ async def update_goal(
         if not updates:
             return {"error": "No updates provided"}
 
-        async with httpx.AsyncClient() as client:
+        async with get_supabase().session() as client:
             response = await client.patch(
                 f"{_get_rest_url()}/user_goals",
                 headers=_get_headers(),
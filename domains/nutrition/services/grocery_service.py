@@ -10,9 +10,15 @@ import json
 import re
 from datetime import datetime
 
+from domains.nutrition.services.product_catalogue import (
+    STRONG_MATCH, WEAK_MATCH, get_catalogue, match_score, safe_record_products,
+)
 from logger import logger
 
 CDP_ENDPOINT = "http://localhost:9222"
+# Product searches in flight at once from one page, so a long shopping
+# list doesn't fire every search at Sainsbury's simultaneously
+SEARCH_CONCURRENCY = 3
 
 STORES = {
     "sainsburys": {
@@ -134,6 +140,58 @@ def _search_sainsburys(page, query: str, limit: int = 10) -> list[dict]:
     return result.get("products", [])
 
 
+def _search_sainsburys_many(page, queries: list[str], limit: int = 5) -> dict[str, list[dict]]:
+    """Run several product searches in one page round-trip, SEARCH_CONCURRENCY at a time."""
+    if not queries:
+        return {}
+    if "sainsburys.co.uk" not in page.url:
+        page.goto(
+            "https://www.sainsburys.co.uk/gol-ui/groceries",
+            wait_until="domcontentloaded",
+            timeout=20000,
+        )
+        page.wait_for_timeout(2000)
+
+    results = page.evaluate("""async (params) => {
+        const one = async (query) => {
+            try {
+                const resp = await fetch(
+                    '/groceries-api/gol-services/product/v1/product?filter[keyword]='
+                    + encodeURIComponent(query)
+                    + '&page_number=1&page_size=' + params.limit
+                    + '&sort_order=FAVOURITES_FIRST'
+                );
+                if (!resp.ok) return [];
+                const data = await resp.json();
+                return (data.products || []).map(p => ({
+                    name: p.name,
+                    sain_id: p.sainId,
+                    product_uid: p.product_uid,
+                    price: p.retail_price ? p.retail_price.price : null,
+                    unit_price: p.unit_price ? p.unit_price.price : null,
+                    unit_measure: p.unit_price ? p.unit_price.measure : null,
+                    available: p.is_available,
+                    image: p.image,
+                    promotions: (p.promotions || []).map(pr => pr.strap_line || pr.description || ''),
+                    badges: (p.badges || []).map(b => b.text || ''),
+                }));
+            } catch (e) { return []; }
+        };
+        const results = new Array(params.queries.length);
+        let next = 0;
+        const worker = async () => {
+            while (next < params.queries.length) {
+                const i = next++;
+                results[i] = await one(params.queries[i]);
+            }
+        };
+        await Promise.all(Array.from({length: Math.min(params.workers, params.queries.length)}, worker));
+        return results;
+    }""", {"queries": queries, "limit": limit, "workers": SEARCH_CONCURRENCY})
+
+    return dict(zip(queries, results))
+
+
 async def search_products(store: str, query: str, limit: int = 10) -> list[dict]:
     """Search for products at the specified store."""
     def _search():
@@ -152,6 +210,7 @@ async def search_products(store: str, query: str, limit: int = 10) -> list[dict]
             p.stop()
 
     result = await asyncio.to_thread(_search)
+    safe_record_products(store, result)
     logger.info(f"Searched {store} for '{query}': {len(result)} results")
     return result
 
@@ -544,6 +603,12 @@ async def get_trolley(store: str) -> dict:
                         "image": product.get("image", ""),
                     })
 
+                safe_record_products(store, [
+                    {"name": i["name"], "product_uid": i["product_uid"], "image": i["image"],
+                     "price": i["price"] if i["quantity"] == 1 else None}
+                    for i in items
+                ])
+
                 return {
                     "items": items,
                     "item_count": result.get("item_count", len(items)),
@@ -585,65 +650,20 @@ def _strip_quantity_prefix(query: str) -> str:
     return cleaned if cleaned else query
 
 
-def _match_score(query: str, product: dict) -> float:
-    """Score how well a product matches a shopping list item query."""
-    name = product.get("name", "").lower()
-    query_lower = query.lower()
-
-    # Also try with quantity prefix stripped
-    stripped = _strip_quantity_prefix(query_lower)
-    queries_to_try = [query_lower]
-    if stripped != query_lower:
-        queries_to_try.append(stripped)
-
-    best_score = 0.0
-
-    for q in queries_to_try:
-        score = 0.0
-        q_words = q.split()
-
-        # Exact match
-        if q == name:
-            return 1.0
-
-        # All query words appear in product name
-        if all(w in name for w in q_words):
-            score += 0.7
-            # Bonus for shorter names (more specific match)
-            score += max(0, 0.2 - len(name) / 500)
-        else:
-            # Partial word match
-            matched = sum(1 for w in q_words if w in name)
-            if q_words:
-                score += 0.3 * (matched / len(q_words))
-
-        # If original query had a quantity, check if it appears in the product name
-        if query_lower != stripped:
-            qty_match = re.match(r"^(\d+)", query_lower)
-            if qty_match and qty_match.group(1) in name:
-                score += 0.1
-
-        best_score = max(best_score, score)
-
-    # Prefer available products
-    if not product.get("available", True):
-        best_score *= 0.1
-
-    # Prefer own-brand (Sainsbury's) for staples
-    if "sainsbury" in name:
-        best_score += 0.05
-
-    return min(best_score, 1.0)
-
-
 async def add_shopping_list(store: str, items: list[dict]) -> dict:
     """Add a shopping list to the store's trolley.
 
+    Items chosen before are resolved from the local product catalogue;
+    only the rest are searched, all in one batched round-trip, with ranked
+    catalogue products as extra candidates. See product_catalogue.py.
+
     Args:
         items: List of {name, quantity?, unit?, category?}
 
     Returns dict with matched, ambiguous, not_found lists.
     """
+    catalogue = get_catalogue(store)
+
     def _add_list():
         p, browser = _connect_browser()
         try:
@@ -660,48 +680,69 @@ async def add_shopping_list(store: str, items: list[dict]) -> dict:
                 ambiguous = []
                 not_found = []
 
-                for item in items:
-                    item_name = item.get("name", "")
-                    # Try original query first, then stripped version
-                    search_results = _search_sainsburys(page, item_name, limit=5)
-                    stripped_name = _strip_quantity_prefix(item_name.lower())
-                    if stripped_name != item_name.lower():
-                        # Also search with the cleaned query and merge
-                        extra = _search_sainsburys(page, stripped_name, limit=5)
-                        seen_uids = {r["product_uid"] for r in search_results}
-                        for r in extra:
+                names = [item.get("name", "") for item in items]
+                resolved: dict[str, tuple[dict, float, str]] = {}
+                for item_name in names:
+                    hit = catalogue.lookup(item_name)
+                    if hit:
+                        resolved[item_name] = (*hit, "catalogue")
+
+                # Misses: original and quantity-stripped queries, one batch
+                misses = [n for n in dict.fromkeys(names) if n not in resolved]
+                queries = list(dict.fromkeys(
+                    q for n in misses for q in (n, _strip_quantity_prefix(n.lower()))
+                ))
+                searched = _search_sainsburys_many(page, queries, limit=5) if queries else {}
+                catalogue.record_products([prod for found in searched.values() for prod in found])
+
+                for item_name in names:
+                    if item_name in resolved:
+                        best_product, best_score, source = resolved[item_name]
+                    else:
+                        search_results: list[dict] = []
+                        seen_uids = set()
+                        hits = [r for q in (item_name, _strip_quantity_prefix(item_name.lower()))
+                                for r in searched.get(q, [])]
+                        for r in hits + [prod for prod, _ in catalogue.rank(item_name)]:
                             if r["product_uid"] not in seen_uids:
+                                seen_uids.add(r["product_uid"])
                                 search_results.append(r)
 
-                    if not search_results:
-                        not_found.append({"item": item_name, "reason": "no_results"})
-                        continue
-
-                    # Score each result
-                    scored = [(prod, _match_score(item_name, prod)) for prod in search_results]
-                    scored.sort(key=lambda x: x[1], reverse=True)
+                        if not search_results:
+                            not_found.append({"item": item_name, "reason": "no_results"})
+                            continue
 
-                    best_score = scored[0][1]
-                    best_product = scored[0][0]
+                        # Score each result
+                        scored = [(prod, match_score(item_name, prod)) for prod in search_results]
+                        scored.sort(key=lambda x: x[1], reverse=True)
+                        best_product, best_score = scored[0]
+                        source = "search"
 
-                    if best_score >= 0.7:
+                    if best_score >= STRONG_MATCH:
                         # Strong match — auto-add
                         add_result = _add_to_sainsburys_trolley(
                             page,
                             best_product["product_uid"],
                             quantity=1,
                         )
+                        added = add_result.get("ok", False)
+                        if added:
+                            catalogue.record_choice(item_name, best_product["product_uid"])
+                        elif source == "catalogue":
+                            # Stale memory (delisted/unavailable) — search next time
+                            catalogue.forget_choice(item_name)
                         matched.append({
                             "item": item_name,
                             "product": {
                                 "name": best_product["name"],
-                                "price": best_product["price"],
+                                "price": best_product.get("price"),
                                 "product_uid": best_product["product_uid"],
                             },
                             "score": round(best_score, 2),
-                            "added": add_result.get("ok", False),
+                            "added": added,
+                            "source": source,
                         })
-                    elif best_score >= 0.3:
+                    elif best_score >= WEAK_MATCH:
                         # Ambiguous — present options
                         options = [
                             {
@@ -731,6 +772,8 @@ async def add_shopping_list(store: str, items: list[dict]) -> dict:
                         "auto_added": len(matched),
                         "needs_choice": len(ambiguous),
                         "not_found": len(not_found),
+                        "from_catalogue": sum(1 for m in matched if m["source"] == "catalogue"),
+                        "searches": len(queries),
                     },
                 }
             finally:
@@ -741,7 +784,8 @@ async def add_shopping_list(store: str, items: list[dict]) -> dict:
 
     result = await asyncio.to_thread(_add_list)
     logger.info(
-        f"Shopping list for {store}: {result.get('summary', {}).get('auto_added', 0)} added, "
+        f"Shopping list for {store}: {result.get('summary', {}).get('auto_added', 0)} added "
+        f"({result.get('summary', {}).get('from_catalogue', 0)} from catalogue), "
         f"{result.get('summary', {}).get('needs_choice', 0)} ambiguous, "
         f"{result.get('summary', {}).get('not_found', 0)} not found"
     )
@@ -767,6 +811,8 @@ async def resolve_item(store: str, product_uid: str, quantity: int = 1, item_nam
                     page.wait_for_timeout(2000)
 
                 result = _add_to_sainsburys_trolley(page, product_uid, quantity)
+                if result.get("ok") and item_name:
+                    get_catalogue(store).record_choice(item_name, product_uid)
                 return {
                     "item_name": item_name,
                     "product_uid": product_uid,
@@ -0,0 +1,400 @@
+"""Local columnar cache of daily health metrics.
+
+The trends tab, the weekly/monthly health reports and the fitness site all
+re-pulled 7-90 days of `garmin_daily_summary` and `weight_readings` from
+Supabase on every run and re-aggregated them row by row. This keeps one
+local copy, column-per-metric in a single .npz file (data/health_daily.npz):
+
+    days            datetime64[D], sorted, one slot per calendar date
+    g_<field>       float64 per GARMIN_FIELDS entry, NaN = missing
+    weight_at       datetime64[s] per Withings reading, sorted
+    weight_kg       float64
+
+Writes are incremental:
+- `_sync_garmin_to_supabase` records the Garmin rows it upserts;
+- the Withings adapter records each weigh-in window it stores;
+- `load_health_timeseries(since)` backfills once when asked for a window
+  older than the cache covers, then tops up with a short delta pull (last
+  few days, which the Garmin sync rewrites) at most every REFRESH_SECONDS,
+  so rows written by other processes still land.
+
+The file is replaced atomically and reloaded when it changes, so
+the bot and Hadley API processes share it; each read-merge-write holds a
+lock file (health_daily.npz.lock) so one process can't overwrite rows
+another just merged. Windowed aggregates (rolling
+mean, EMA, slope, 14-vs-14 deltas) are NumPy over the column arrays.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import tempfile
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from datetime import date, datetime
+from pathlib import Path
+
+import numpy as np
+
+from integrations.supabase_rest import get_supabase
+from logger import logger
+
+CACHE_FILE = Path(os.getenv("HEALTH_TIMESERIES_FILE")
+                  or Path(__file__).resolve().parents[3] / "data" / "health_daily.npz")
+
+USER_ID = "chris"
+GARMIN_FIELDS = (
+    "steps", "steps_goal", "sleep_hours", "sleep_score",
+    "resting_hr", "hrv_weekly_avg", "hrv_last_night", "avg_stress",
+)
+# Delta pulls happen at most this often per process
+REFRESH_SECONDS = 15 * 60
+# The Garmin sync rewrites a trailing 3-day window (late overnight metrics),
+# so a delta pull re-reads a little further back than the last refresh
+REFRESH_OVERLAP_DAYS = 4
+
+_NAT = np.datetime64("NaT", "D")
+
+
+def _day(d: date | datetime | str) -> np.datetime64:
+    return np.datetime64(str(d)[:10], "D")
+
+
+def _file_version(path: Path) -> tuple:
+    # mtime alone can tie for two saves within one filesystem tick; every
+    # save is a fresh file via os.replace, so the inode changes as well
+    st = path.stat()
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+@contextmanager
+def _file_lock(path: Path):
+    """Exclusive inter-process lock on `path` (created if missing)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+b") as f:
+        if os.name == "nt":
+            import msvcrt
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:  # LK_LOCK gives up after ~10s; keep waiting
+                    pass
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _stamp(ts: str | datetime) -> np.datetime64:
+    # measured_at's wall-clock time; the date is its first 10 chars, same as
+    # every other consumer of weight_readings
+    return np.datetime64(str(ts).replace(" ", "T")[:19], "s")
+
+
+class HealthTimeseries:
+    """In-memory view of the cache file; see module docstring."""
+
+    def __init__(self, path: Path | str | None = None):
+        self.path = Path(path or CACHE_FILE)
+        self._lock_path = self.path.with_name(self.path.name + ".lock")
+        self._lock = threading.RLock()
+        self._version: tuple | None = None
+        self._reset()
+        self._maybe_reload()
+
+    def _reset(self) -> None:
+        self.days = np.empty(0, dtype="datetime64[D]")
+        self.cols = {f: np.empty(0) for f in GARMIN_FIELDS}
+        self.weight_at = np.empty(0, dtype="datetime64[s]")
+        self.weight_kg = np.empty(0)
+        self.covered_from: np.datetime64 | None = None
+        self.refreshed_at = 0.0
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _maybe_reload(self) -> None:
+        try:
+            version = _file_version(self.path)
+        except FileNotFoundError:
+            return
+        if version == self._version:
+            return
+        try:
+            with np.load(self.path) as z:
+                self.days = z["days"]
+                self.cols = {f: z[f"g_{f}"] for f in GARMIN_FIELDS}
+                self.weight_at = z["weight_at"]
+                self.weight_kg = z["weight_kg"]
+                covered = z["covered_from"][()]
+                self.covered_from = None if np.isnat(covered) else covered
+                self.refreshed_at = float(z["refreshed_at"])
+            self._version = version
+        except Exception as e:
+            logger.warning(f"Health cache unreadable, starting empty: {e}")
+            self._reset()
+
+    @contextmanager
+    def _updating(self):
+        """Hold both locks and start from the latest file contents."""
+        with self._lock, _file_lock(self._lock_path):
+            self._maybe_reload()
+            yield
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = tempfile.NamedTemporaryFile(
+            dir=self.path.parent, prefix=self.path.name + ".", suffix=".tmp", delete=False,
+        )
+        try:
+            with tmp as f:
+                np.savez(
+                    f,
+                    days=self.days,
+                    weight_at=self.weight_at,
+                    weight_kg=self.weight_kg,
+                    covered_from=np.array(self.covered_from if self.covered_from is not None else _NAT),
+                    refreshed_at=np.array(self.refreshed_at),
+                    **{f"g_{k}": v for k, v in self.cols.items()},
+                )
+            os.replace(tmp.name, self.path)
+        except BaseException:
+            Path(tmp.name).unlink(missing_ok=True)
+            raise
+        self._version = _file_version(self.path)
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def _merge_days(self, records: list[dict]) -> None:
+        rows = [r for r in records if r.get("date")]
+        if not rows:
+            return
+        new_days = np.array([_day(r["date"]) for r in rows])
+        days = np.union1d(self.days, new_days)
+        old_idx = np.searchsorted(days, self.days)
+        new_idx = np.searchsorted(days, new_days)
+        for f in GARMIN_FIELDS:
+            col = np.full(len(days), np.nan)
+            col[old_idx] = self.cols[f]
+            vals = np.array([np.nan if r.get(f) is None else float(r[f]) for r in rows])
+            has = ~np.isnan(vals)
+            col[new_idx[has]] = vals[has]
+            self.cols[f] = col
+        self.days = days
+
+    def _merge_weights(self, rows: list[dict]) -> None:
+        rows = [r for r in rows if r.get("measured_at") and r.get("weight_kg") is not None]
+        if not rows:
+            return
+        at = np.concatenate([self.weight_at, np.array([_stamp(r["measured_at"]) for r in rows])])
+        kg = np.concatenate([self.weight_kg, np.array([float(r["weight_kg"]) for r in rows])])
+        order = np.argsort(at, kind="stable")
+        at, kg = at[order], kg[order]
+        # Same timestamp re-stored: keep the newest write
+        keep = np.append(at[1:] != at[:-1], True)
+        self.weight_at, self.weight_kg = at[keep], kg[keep]
+
+    def record_days(self, records: list[dict]) -> None:
+        """Merge garmin_daily_summary-shaped rows (non-null fields win)."""
+        with self._updating():
+            self._merge_days(records)
+            self._save()
+
+    def record_weights(self, rows: list[dict]) -> None:
+        """Merge weight_readings-shaped rows ({measured_at, weight_kg})."""
+        with self._updating():
+            self._merge_weights(rows)
+            self._save()
+
+    # ------------------------------------------------------------------
+    # Sync from Supabase
+    # ------------------------------------------------------------------
+
+    def _pull_start(self, since: date) -> np.datetime64 | None:
+        """First date to (re)fetch, or None if the cache is good as-is."""
+        since_d = _day(since)
+        if self.covered_from is None or since_d < self.covered_from:
+            return since_d
+        if time.time() - self.refreshed_at > REFRESH_SECONDS:
+            last = np.datetime64(datetime.fromtimestamp(self.refreshed_at).date(), "D")
+            return max(self.covered_from, last - REFRESH_OVERLAP_DAYS)
+        return None
+
+    async def ensure(self, since: date) -> None:
+        """Make sure [since, today] is cached and reasonably fresh."""
+        with self._lock:
+            self._maybe_reload()
+            start = self._pull_start(since)
+        if start is None:
+            return
+        sb = get_supabase()
+        start_iso = str(start)
+        garmin_rows, weight_rows = await asyncio.gather(
+            sb.select("garmin_daily_summary", {
+                "select": "date," + ",".join(GARMIN_FIELDS),
+                "user_id": f"eq.{USER_ID}",
+                "date": f"gte.{start_iso}",
+                "order": "date.asc",
+            }, paginate=True),
+            sb.select("weight_readings", {
+                "select": "measured_at,weight_kg",
+                "user_id": f"eq.{USER_ID}",
+                "measured_at": f"gte.{start_iso}T00:00:00",
+                "order": "measured_at.asc",
+            }, paginate=True),
+        )
+        with self._updating():
+            self._merge_days(garmin_rows)
+            self._merge_weights(weight_rows)
+            if self.covered_from is None or start < self.covered_from:
+                self.covered_from = start
+            self.refreshed_at = time.time()
+            self._save()
+        logger.debug(
+            f"Health cache: pulled {len(garmin_rows)} Garmin days + "
+            f"{len(weight_rows)} weigh-ins from {start_iso}"
+        )
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def weights(self, start: date | datetime, end: date | datetime | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """Raw weigh-ins with start <= measured_at < end (end=None: open)."""
+        with self._lock:
+            at, kg = self.weight_at, self.weight_kg
+        lo = np.searchsorted(at, _stamp(start) if isinstance(start, datetime) else _day(start))
+        hi = len(at) if end is None else np.searchsorted(
+            at, _stamp(end) if isinstance(end, datetime) else _day(end)
+        )
+        return at[lo:hi], kg[lo:hi]
+
+    def daily(self, metric: str, start: date, end: date | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """(days, values) for start <= day <= end with missing days dropped.
+
+        metric is a GARMIN_FIELDS entry or "weight" (mean of that day's
+        weigh-ins).
+        """
+        lo_d = _day(start)
+        hi_d = _day(end) if end is not None else None
+        if metric == "weight":
+            at, kg = self.weights(start, None if hi_d is None else hi_d + 1)
+            if not len(at):
+                return np.empty(0, dtype="datetime64[D]"), np.empty(0)
+            days, inv = np.unique(at.astype("datetime64[D]"), return_inverse=True)
+            return days, np.bincount(inv, weights=kg) / np.bincount(inv)
+        with self._lock:
+            days, col = self.days, self.cols[metric]
+        lo = np.searchsorted(days, lo_d)
+        hi = len(days) if hi_d is None else np.searchsorted(days, hi_d, side="right")
+        days, vals = days[lo:hi], col[lo:hi]
+        has = ~np.isnan(vals)
+        return days[has], vals[has]
+
+    def points(self, metric: str, start: date, end: date | None = None) -> list[dict]:
+        """daily() as [{"date": "YYYY-MM-DD", "value": float}] for JSON payloads."""
+        days, vals = self.daily(metric, start, end)
+        return [{"date": str(d), "value": float(v)} for d, v in zip(days, vals)]
+
+
+# ----------------------------------------------------------------------
+# Vectorised aggregates over (days, values) arrays
+# ----------------------------------------------------------------------
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing mean over the last `window` values at each position."""
+    values = np.asarray(values, dtype=np.float64)
+    if not len(values):
+        return values
+    csum = np.cumsum(np.insert(values, 0, 0.0))
+    idx = np.arange(1, len(values) + 1)
+    lo = np.maximum(idx - window, 0)
+    return (csum[idx] - csum[lo]) / (idx - lo)
+
+
+def ema(values: np.ndarray, alpha: float = 0.1) -> float | None:
+    """Final value of an EMA seeded with the first value (closed form)."""
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    if not n:
+        return None
+    weights = alpha * (1 - alpha) ** np.arange(n - 1, -1, -1)
+    weights[0] = (1 - alpha) ** (n - 1)
+    return float(np.dot(weights, values))
+
+
+def slope_per_day(days: np.ndarray, values: np.ndarray) -> float | None:
+    """Least-squares slope of values against calendar day."""
+    if len(values) < 2:
+        return None
+    x = (days - days[0]).astype(np.float64)
+    if np.all(x == x[0]):
+        return None
+    return float(np.polyfit(x, np.asarray(values, dtype=np.float64), 1)[0])
+
+
+def period_delta(days: np.ndarray, values: np.ndarray, today: date,
+                 recent: int = 14, prior: int = 14) -> dict:
+    """Average of the last `recent` days vs the `prior` days before them.
+
+    Returns {"current", "prior", "delta_pct", "n"} — the Trends tab shape.
+    """
+    if not len(values):
+        return {"current": None, "prior": None, "delta_pct": None, "n": 0}
+    age = (_day(today) - days).astype(np.int64)
+    r_mask = age < recent
+    p_mask = (age >= recent) & (age < recent + prior)
+    r_avg = round(float(values[r_mask].mean()), 2) if r_mask.any() else None
+    p_avg = round(float(values[p_mask].mean()), 2) if p_mask.any() else None
+    delta_pct = None
+    if r_avg is not None and p_avg is not None and p_avg != 0:
+        delta_pct = round((r_avg - p_avg) / p_avg * 100, 1)
+    return {"current": r_avg, "prior": p_avg, "delta_pct": delta_pct, "n": int(len(values))}
+
+
+# ----------------------------------------------------------------------
+# Process-wide instance
+# ----------------------------------------------------------------------
+
+_cache: HealthTimeseries | None = None
+# One lock per event loop (asyncio.Lock can't be shared across loops)
+_ensure_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = weakref.WeakKeyDictionary()
+
+
+def get_health_timeseries() -> HealthTimeseries:
+    global _cache
+    if _cache is None:
+        _cache = HealthTimeseries()
+    return _cache
+
+
+async def load_health_timeseries(since: date) -> HealthTimeseries:
+    """The shared cache, synced to cover `since` onwards.
+
+    Concurrent callers (e.g. the report's parallel section fetches) share
+    one pull. If Supabase is unreachable the cache is served as-is.
+    """
+    lock = _ensure_locks.setdefault(asyncio.get_running_loop(), asyncio.Lock())
+    cache = get_health_timeseries()
+    async with lock:
+        try:
+            await cache.ensure(since)
+        except Exception as e:
+            logger.warning(f"Health cache sync failed, serving cached data: {e}")
+    return cache
@@ -2,7 +2,7 @@
 
 from datetime import datetime, timedelta
 
-import httpx
+from integrations.supabase_rest import get_supabase
 
 from config import SUPABASE_URL, SUPABASE_KEY
 from logger import logger
@@ -29,7 +29,7 @@ def _get_rest_url():
 
 async def list_templates() -> list[dict]:
     """List all meal plan templates."""
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         response = await client.get(
             f"{_get_rest_url()}/meal_plan_templates",
             headers=_get_headers(),
@@ -42,7 +42,7 @@ async def list_templates() -> list[dict]:
 
 async def get_template(name: str) -> dict | None:
     """Get a template by name."""
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         response = await client.get(
             f"{_get_rest_url()}/meal_plan_templates",
             headers=_get_headers(),
@@ -56,7 +56,7 @@ async def get_template(name: str) -> dict | None:
 
 async def get_default_template() -> dict | None:
     """Get the default template."""
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         response = await client.get(
             f"{_get_rest_url()}/meal_plan_templates",
             headers=_get_headers(),
@@ -86,7 +86,7 @@ async def upsert_template(name: str, days: dict, is_default: bool = False) -> di
     headers = _get_headers()
     headers["Prefer"] = "return=representation,resolution=merge-duplicates"
 
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         response = await client.post(
             f"{_get_rest_url()}/meal_plan_templates",
             headers=headers,
@@ -104,7 +104,7 @@ async def upsert_template(name: str, days: dict, is_default: bool = False) -> di
 
 async def delete_template(name: str) -> dict:
     """Delete a template by name."""
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         response = await client.delete(
             f"{_get_rest_url()}/meal_plan_templates",
             headers=_get_headers(),
@@ -119,7 +119,7 @@ async def delete_template(name: str) -> dict:
 
 async def _clear_default_template():
     """Clear the is_default flag on all templates."""
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         await client.patch(
             f"{_get_rest_url()}/meal_plan_templates",
             headers=_get_headers(),
@@ -135,7 +135,7 @@ async def _clear_default_template():
 
 async def get_preferences(profile_name: str = "default") -> dict | None:
     """Get preferences by profile name."""
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         response = await client.get(
             f"{_get_rest_url()}/meal_plan_preferences",
             headers=_get_headers(),
@@ -181,7 +181,7 @@ async def upsert_preferences(
     headers = _get_headers()
     headers["Prefer"] = "return=representation,resolution=merge-duplicates"
 
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         response = await client.post(
             f"{_get_rest_url()}/meal_plan_preferences",
             headers=headers,
@@ -225,7 +225,7 @@ async def log_meal_history(
     # Remove None values
     payload = {k: v for k, v in payload.items() if v is not None}
 
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         response = await client.post(
             f"{_get_rest_url()}/meal_history",
             headers=_get_headers(),
@@ -244,7 +244,7 @@ async def get_recent_meal_history(days: int = 14) -> list[dict]:
     from datetime import timedelta
     cutoff = (datetime.now().date() - timedelta(days=days)).isoformat()
 
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         response = await client.get(
             f"{_get_rest_url()}/meal_history",
             headers=_get_headers(),
@@ -267,7 +267,7 @@ async def update_meal_rating(meal_id: str, rating: int, would_make_again: bool =
     if notes is not None:
         payload["notes"] = notes
 
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         response = await client.patch(
             f"{_get_rest_url()}/meal_history",
             headers=_get_headers(),
@@ -302,7 +302,7 @@ async def list_staples(active_only: bool = True) -> list[dict]:
     if active_only:
         params["is_active"] = "eq.true"
 
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         response = await client.get(
             f"{_get_rest_url()}/shopping_staples",
             headers=_get_headers(),
@@ -361,7 +361,7 @@ async def upsert_staple(
     headers = _get_headers()
     headers["Prefer"] = "return=representation,resolution=merge-duplicates"
 
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         response = await client.post(
             f"{_get_rest_url()}/shopping_staples",
             headers=headers,
@@ -378,7 +378,7 @@ async def upsert_staple(
 
 async def delete_staple(name: str) -> dict:
     """Delete a shopping staple."""
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         response = await client.delete(
             f"{_get_rest_url()}/shopping_staples",
             headers=_get_headers(),
@@ -395,7 +395,7 @@ async def mark_staples_added(staple_names: list[str]) -> dict:
     """Mark staples as added to today's shopping list."""
     today = datetime.now().date().isoformat()
 
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         response = await client.patch(
             f"{_get_rest_url()}/shopping_staples",
             headers=_get_headers(),
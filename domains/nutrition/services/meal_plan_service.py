@@ -10,6 +10,7 @@ except ImportError:
 UK_TZ = ZoneInfo("Europe/London")
 
 import httpx
+from integrations.supabase_rest import get_supabase
 
 from config import SUPABASE_URL, SUPABASE_KEY
 from logger import logger
@@ -63,7 +64,7 @@ async def upsert_meal_plan(week_start: str, source: str = None,
     headers = _get_headers()
     headers["Prefer"] = "return=representation,resolution=merge-duplicates"
 
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         response = await client.post(
             f"{_get_rest_url()}/meal_plans",
             headers=headers,
@@ -88,7 +89,7 @@ async def get_meal_plan(week_start: str) -> dict | None:
     if not SUPABASE_URL or not SUPABASE_KEY:
         raise ValueError("Supabase credentials not configured")
 
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         response = await client.get(
             f"{_get_rest_url()}/meal_plans",
             headers=_get_headers(),
@@ -107,7 +108,7 @@ async def get_meal_plan(week_start: str) -> dict | None:
     plan = plans[0]
 
     # Fetch items and ingredients in parallel
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         items_resp, ingredients_resp = await _parallel_get(client, plan["id"])
 
     plan["items"] = items_resp
@@ -128,7 +129,7 @@ async def get_meals_for_date_range(start_date: str, end_date: str) -> list[dict]
     if not SUPABASE_URL or not SUPABASE_KEY:
         raise ValueError("Supabase credentials not configured")
 
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         resp = await client.get(
             f"{_get_rest_url()}/meal_plan_items",
             headers=_get_headers(),
@@ -163,7 +164,7 @@ async def get_current_meal_plan() -> dict | None:
     plan_ids = list({item["plan_id"] for item in items})
 
     # Fetch the plan metadata for context
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         resp = await client.get(
             f"{_get_rest_url()}/meal_plans",
             headers=_get_headers(),
@@ -195,7 +196,7 @@ async def get_current_meal_plan() -> dict | None:
 
     # Fetch ingredients for all referenced plans
     all_ingredients = []
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         for pid in plan_ids:
             resp = await client.get(
                 f"{_get_rest_url()}/meal_plan_ingredients",
@@ -219,7 +220,7 @@ async def get_meal_plan_by_id(plan_id: str) -> dict | None:
     if not SUPABASE_URL or not SUPABASE_KEY:
         raise ValueError("Supabase credentials not configured")
 
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         response = await client.get(
             f"{_get_rest_url()}/meal_plans",
             headers=_get_headers(),
@@ -233,7 +234,7 @@ async def get_meal_plan_by_id(plan_id: str) -> dict | None:
         return None
 
     plan = plans[0]
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         items_resp, ingredients_resp = await _parallel_get(client, plan["id"])
 
     plan["items"] = items_resp
@@ -282,7 +283,7 @@ async def delete_meal_plan(plan_id: str) -> dict:
     if not SUPABASE_URL or not SUPABASE_KEY:
         raise ValueError("Supabase credentials not configured")
 
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         response = await client.delete(
             f"{_get_rest_url()}/meal_plans?id=eq.{plan_id}",
             headers=_get_headers(),
@@ -318,7 +319,7 @@ async def check_meal_overlaps(items: list[dict], exclude_plan_id: str = None) ->
     if exclude_plan_id:
         params["plan_id"] = f"neq.{exclude_plan_id}"
 
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         resp = await client.get(
             f"{_get_rest_url()}/meal_plan_items",
             headers=_get_headers(),
@@ -358,7 +359,7 @@ async def upsert_meal_plan_items(plan_id: str, items: list[dict]) -> list:
     headers = _get_headers()
     headers["Prefer"] = "return=representation,resolution=merge-duplicates"
 
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         response = await client.post(
             f"{_get_rest_url()}/meal_plan_items",
             headers=headers,
@@ -388,7 +389,7 @@ async def set_meal_plan_ingredients(plan_id: str, ingredients: list[dict]) -> li
     if not SUPABASE_URL or not SUPABASE_KEY:
         raise ValueError("Supabase credentials not configured")
 
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         # Delete existing ingredients
         await client.delete(
             f"{_get_rest_url()}/meal_plan_ingredients?plan_id=eq.{plan_id}",
@@ -427,7 +428,7 @@ async def get_shopping_list_categories(plan_id: str) -> dict[str, list[str]]:
     if not SUPABASE_URL or not SUPABASE_KEY:
         raise ValueError("Supabase credentials not configured")
 
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         response = await client.get(
             f"{_get_rest_url()}/meal_plan_ingredients",
             headers=_get_headers(),
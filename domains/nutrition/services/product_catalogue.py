@@ -0,0 +1,373 @@
+"""Local product catalogue for resolving shopping-list items without searching.
+
+Every Sainsbury's search result and trolley line we see is kept in
+``data/grocery_catalogue.db`` together with the choices made for each
+shopping-list phrase (auto-added strong matches and items resolved by hand).
+`add_shopping_list` asks the catalogue first:
+
+1. a phrase chosen before ("semi skimmed milk" -> the same 4 pint bottle)
+   resolves straight to that product, without a search;
+2. the other phrases go to the store in one batched search, and the
+   catalogue is ranked for each of them (BM25 over an inverted token index)
+   to add candidates the search missed; `match_score` (token coverage both
+   ways, parsed quantity/unit agreement, availability, own-brand) decides
+   whether the best of them is strong enough to add.
+
+Ranked catalogue products are never used without a search: a cached name
+containing every query word can still be something else ("milk" ->
+"Milk Chocolate").
+
+Quantities are parsed out of both the phrase and the product name
+("500g chicken breast", "British Chicken Breast Fillets 1kg") and normalised
+to g/ml/each, so a matching size scores higher than a different one.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from logger import logger
+from utils.sqlite_store import SQLiteStore
+
+DB_PATH = Path(__file__).resolve().parents[3] / "data" / "grocery_catalogue.db"
+
+# A catalogue product is trusted for matching this long after it was last seen
+PRODUCT_TTL_SECONDS = 14 * 24 * 3600
+STRONG_MATCH = 0.7
+WEAK_MATCH = 0.3
+BM25_K1 = 1.2
+BM25_B = 0.75
+CANDIDATES = 20
+
+_UNITS = {
+    "g": ("g", 1), "gram": ("g", 1), "grams": ("g", 1), "kg": ("g", 1000),
+    "ml": ("ml", 1), "cl": ("ml", 10), "l": ("ml", 1000), "litre": ("ml", 1000),
+    "litres": ("ml", 1000), "liter": ("ml", 1000), "pint": ("ml", 568), "pints": ("ml", 568),
+    "pt": ("ml", 568), "pk": ("each", 1), "pack": ("each", 1), "x": ("each", 1),
+}
+_QTY_RE = re.compile(
+    r"(\d+(?:\.\d+)?)\s*(kg|g|grams?|ml|cl|litres?|liter|l|pints?|pt|pk|pack|x)\b", re.IGNORECASE)
+_COUNT_RE = re.compile(r"^\s*(\d+)\s+(?!(?:kg|g|ml|cl|l|pints?|pt)\b)", re.IGNORECASE)
+_TOKEN_RE = re.compile(r"[a-z]+")
+_STOP = frozenset({
+    "of", "the", "and", "a", "an", "with", "in", "by", "for", "fresh",
+    "jar", "tin", "bag", "bunch", "box", "bottle", "carton", "tub", "pack", "packs",
+    "pint", "pints", "pt", "pk", "kg", "g", "ml", "cl", "l", "litre", "litres", "x",
+})
+_OWN_BRAND = ("sainsbury",)
+# Words that may follow a phrase's head word in a name without making it a
+# different product ("Chicken Breast Fillets", "Free Range Eggs Large")
+_QUALIFIERS = frozenset({
+    "fillet", "piece", "slice", "sliced", "chunk", "diced", "large", "medium", "small",
+    "mini", "loose", "whole", "loaf", "each",
+})
+# Where the product itself ends and its trimmings start
+_NAME_TAIL_RE = re.compile(r"\s(?:in|with)\s|[(,]|\s-\s")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    product_uid  TEXT NOT NULL,
+    store        TEXT NOT NULL,
+    name         TEXT NOT NULL,
+    price        REAL,
+    unit_price   REAL,
+    unit_measure TEXT,
+    available    INTEGER NOT NULL DEFAULT 1,
+    payload      TEXT NOT NULL,
+    seen_at      REAL NOT NULL,
+    PRIMARY KEY (store, product_uid)
+);
+
+CREATE TABLE IF NOT EXISTS choices (
+    store       TEXT NOT NULL,
+    phrase      TEXT NOT NULL,
+    product_uid TEXT NOT NULL,
+    times       INTEGER NOT NULL DEFAULT 1,
+    chosen_at   REAL NOT NULL,
+    PRIMARY KEY (store, phrase)
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+# ------------------------------------------------------------------
+# Text handling
+# ------------------------------------------------------------------
+
+def _stem(token: str) -> str:
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("es") and token[-3] in "sxz":
+        return token[:-2]
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def tokens(text: str) -> list[str]:
+    """Lower-cased, stemmed content tokens (numbers and units dropped)."""
+    text = (text or "").lower().replace("'s", "")
+    return [_stem(t) for t in _TOKEN_RE.findall(text) if t not in _STOP and len(t) > 1]
+
+
+def parse_quantity(text: str) -> tuple[float, str] | None:
+    """Normalised (amount, unit) from a phrase or product name.
+
+    '500g chicken breast' -> (500, 'g'); 'Milk 2.27L' -> (2270, 'ml');
+    '12 eggs' -> (12, 'each'); 'Eggs x6' is not matched (count after unit).
+    """
+    text = text or ""
+    found = [(float(m.group(1)) * _UNITS[m.group(2).lower()][1], _UNITS[m.group(2).lower()][0])
+             for m in _QTY_RE.finditer(text)]
+    # '6 x 500g' is a 500g item; weights/volumes beat pack counts
+    for qty in found:
+        if qty[1] != "each":
+            return qty
+    if found:
+        return found[0]
+    m = _COUNT_RE.match(text)
+    if m:
+        return float(m.group(1)), "each"
+    return None
+
+
+def normalise_phrase(phrase: str) -> str:
+    """Key under which a choice for a shopping-list phrase is remembered."""
+    qty = parse_quantity(phrase)
+    key = " ".join(sorted(set(tokens(phrase))))
+    return f"{key}|{qty[0]:g}{qty[1]}" if qty else key
+
+
+def same_head(query: str, name: str) -> bool:
+    """Whether a product name is the phrase's thing, not something it describes.
+
+    The phrase's last word is its head ("semi skimmed milk" -> milk). In the
+    name, before any "in ..."/"with ..."/"(...)" trimmings, only phrase words
+    and qualifiers may follow it: "Semi Skimmed Milk 2.27L" is milk,
+    "Milk Chocolate 100g" and "Chicken Stock Cubes" are not.
+    """
+    q = tokens(query)
+    if not q:
+        return False
+    main = tokens(_NAME_TAIL_RE.split(name.lower(), maxsplit=1)[0])
+    if q[-1] not in main:
+        return False
+    after = main[len(main) - main[::-1].index(q[-1]):]
+    return all(t in q or t in _QUALIFIERS for t in after)
+
+
+def match_score(query: str, product: dict) -> float:
+    """How well a product matches a shopping-list phrase, 0..1.
+
+    All query tokens present -> 0.7 plus a bonus for shorter (more specific)
+    names, or 0.5 if the name adds a head of its own (see same_head());
+    otherwise 0.3 x the fraction present. Matching quantity adds 0.1, a
+    conflicting one takes 0.1 off, own-brand adds 0.05 and unavailable
+    products are scaled right down.
+    """
+    name = product.get("name", "") or ""
+    q_tokens = set(tokens(query))
+    n_tokens = set(tokens(name))
+    if not q_tokens:
+        return 0.0
+    covered = len(q_tokens & n_tokens) / len(q_tokens)
+    if covered == 1 and not same_head(query, name):
+        # Worth offering as an option, never strong enough to auto-add
+        score = 0.5
+    elif covered == 1:
+        score = 0.7 + max(0.0, 0.2 - 0.03 * max(0, len(n_tokens) - len(q_tokens)))
+    else:
+        score = 0.3 * covered
+
+    q_qty, n_qty = parse_quantity(query), parse_quantity(name)
+    if q_qty and n_qty and q_qty[1] == n_qty[1]:
+        score += 0.1 if math.isclose(q_qty[0], n_qty[0], rel_tol=0.05) else -0.1
+
+    if not product.get("available", True):
+        score *= 0.1
+    if any(b in name.lower() for b in _OWN_BRAND):
+        score += 0.05
+    return max(0.0, min(score, 1.0))
+
+
+# ------------------------------------------------------------------
+# Catalogue
+# ------------------------------------------------------------------
+
+class _Index:
+    """In-memory inverted index over product names, with BM25 ranking."""
+
+    def __init__(self, rows: list[sqlite3.Row]):
+        self.docs: dict[str, dict] = {}
+        self.postings: dict[str, dict[str, int]] = {}
+        lengths = []
+        for r in rows:
+            terms = Counter(tokens(r["name"]))
+            self.docs[r["product_uid"]] = {**json.loads(r["payload"]), "_len": sum(terms.values())}
+            lengths.append(sum(terms.values()))
+            for term, tf in terms.items():
+                self.postings.setdefault(term, {})[r["product_uid"]] = tf
+        self.avg_len = (sum(lengths) / len(lengths)) if lengths else 1.0
+
+    def search(self, query: str, limit: int = CANDIDATES) -> list[tuple[dict, float]]:
+        n = len(self.docs)
+        scores: dict[str, float] = {}
+        for term in set(tokens(query)):
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            idf = math.log(1 + (n - len(posting) + 0.5) / (len(posting) + 0.5))
+            for uid, tf in posting.items():
+                norm = 1 - BM25_B + BM25_B * self.docs[uid]["_len"] / self.avg_len
+                scores[uid] = scores.get(uid, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * norm)
+        ranked = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)[:limit]
+        return [(self.docs[uid], score) for uid, score in ranked]
+
+
+class ProductCatalogue(SQLiteStore):
+    """Products seen in searches plus the choices made for each phrase."""
+
+    SCHEMA = _SCHEMA
+
+    def __init__(self, path: Path | str = DB_PATH, store: str = "sainsburys"):
+        super().__init__(path)
+        self.store = store
+        self._lock = threading.Lock()
+        self._index: _Index | None = None
+        self._index_version = -1
+
+    def _version(self, conn) -> int:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        return int(row["value"]) if row else 0
+
+    def _bump(self, conn) -> None:
+        conn.execute(
+            "INSERT INTO meta (key, value) VALUES ('version', '1') "
+            "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1")
+
+    # -- writes ----------------------------------------------------------
+
+    def record_products(self, products: list[dict]) -> None:
+        """Upsert products seen in search results or the trolley."""
+        rows = [
+            (p["product_uid"], self.store, p.get("name") or "", p.get("price"), p.get("unit_price"),
+             p.get("unit_measure"), 0 if p.get("available") is False else 1,
+             json.dumps(p), time.time())
+            for p in products if p.get("product_uid") and p.get("name")
+        ]
+        if not rows:
+            return
+        with self.db() as conn:
+            conn.executemany(
+                """INSERT INTO products VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(store, product_uid) DO UPDATE SET
+                     name = excluded.name,
+                     price = COALESCE(excluded.price, products.price),
+                     unit_price = COALESCE(excluded.unit_price, products.unit_price),
+                     unit_measure = COALESCE(excluded.unit_measure, products.unit_measure),
+                     available = excluded.available,
+                     payload = json_patch(products.payload, excluded.payload),
+                     seen_at = excluded.seen_at""",
+                rows,
+            )
+            self._bump(conn)
+
+    def record_choice(self, phrase: str, product_uid: str) -> None:
+        """Remember that `phrase` resolved to `product_uid`."""
+        key = normalise_phrase(phrase)
+        if not key or not product_uid:
+            return
+        with self.db() as conn:
+            conn.execute(
+                """INSERT INTO choices (store, phrase, product_uid, chosen_at) VALUES (?, ?, ?, ?)
+                   ON CONFLICT(store, phrase) DO UPDATE SET
+                     times = CASE WHEN choices.product_uid = excluded.product_uid
+                                  THEN choices.times + 1 ELSE 1 END,
+                     product_uid = excluded.product_uid,
+                     chosen_at = excluded.chosen_at""",
+                (self.store, key, product_uid, time.time()),
+            )
+
+    def forget_choice(self, phrase: str) -> None:
+        with self.db() as conn:
+            conn.execute("DELETE FROM choices WHERE store = ? AND phrase = ?",
+                         (self.store, normalise_phrase(phrase)))
+
+    # -- reads -----------------------------------------------------------
+
+    def _current_index(self) -> _Index:
+        with self.db() as conn:
+            version = self._version(conn)
+            with self._lock:
+                if self._index is None or version != self._index_version:
+                    rows = conn.execute(
+                        "SELECT product_uid, name, payload FROM products WHERE store = ? AND seen_at >= ?",
+                        (self.store, time.time() - PRODUCT_TTL_SECONDS),
+                    ).fetchall()
+                    self._index, self._index_version = _Index(rows), version
+                return self._index
+
+    def rank(self, phrase: str, limit: int = 5) -> list[tuple[dict, float]]:
+        """Catalogue products for a phrase, best first, as (product, match_score)."""
+        candidates = self._current_index().search(phrase)
+        scored = [({k: v for k, v in p.items() if k != "_len"}, match_score(phrase, p))
+                  for p, _ in candidates]
+        # BM25 order is kept as the tie-break (stable sort)
+        scored.sort(key=lambda x: x[1], reverse=True)
+        return scored[:limit]
+
+    def lookup(self, phrase: str) -> tuple[dict, float] | None:
+        """The product chosen before for a phrase (score 1.0), or None if the
+        store must be searched.
+
+        Only remembered choices resolve here, and only while the product is
+        still available; ranked products are search candidates (see rank()).
+        """
+        key = normalise_phrase(phrase)
+        with self.db() as conn:
+            row = conn.execute(
+                """SELECT p.payload, p.available FROM choices c
+                   JOIN products p ON p.store = c.store AND p.product_uid = c.product_uid
+                   WHERE c.store = ? AND c.phrase = ?""",
+                (self.store, key),
+            ).fetchone()
+        if row and row["available"]:
+            return json.loads(row["payload"]), 1.0
+        return None
+
+    def stats(self) -> dict:
+        with self.db() as conn:
+            products = conn.execute(
+                "SELECT COUNT(*) FROM products WHERE store = ?", (self.store,)).fetchone()[0]
+            choices = conn.execute(
+                "SELECT COUNT(*) FROM choices WHERE store = ?", (self.store,)).fetchone()[0]
+        return {"store": self.store, "products": products, "choices": choices}
+
+
+_catalogues: dict[str, ProductCatalogue] = {}
+
+
+def get_catalogue(store: str = "sainsburys") -> ProductCatalogue:
+    """The process-wide catalogue for a store."""
+    if store not in _catalogues:
+        _catalogues[store] = ProductCatalogue(store=store)
+    return _catalogues[store]
+
+
+def safe_record_products(store: str, products: list[dict]) -> None:
+    """record_products() that never breaks the shopping flow it is called from."""
+    try:
+        get_catalogue(store).record_products(products)
+    except Exception as e:
+        logger.warning(f"Could not update grocery catalogue: {e}")
@@ -2,7 +2,7 @@
 
 from datetime import datetime, timedelta
 
-import httpx
+from integrations.supabase_rest import get_supabase
 
 from config import SUPABASE_URL, SUPABASE_KEY
 from logger import logger
@@ -36,7 +36,7 @@ async def insert_meal(
         if not SUPABASE_URL or not SUPABASE_KEY:
             raise ValueError("Supabase credentials not configured")
 
-        async with httpx.AsyncClient() as client:
+        async with get_supabase().session() as client:
             response = await client.post(
                 f"{_get_rest_url()}/nutrition_logs",
                 headers=_get_headers(),
@@ -77,7 +77,7 @@ async def insert_water(ml: float) -> dict:
             "fat_g": 0
         }
 
-        async with httpx.AsyncClient() as client:
+        async with get_supabase().session() as client:
             response = await client.post(
                 f"{_get_rest_url()}/nutrition_logs",
                 headers=_get_headers(),
@@ -109,7 +109,7 @@ async def delete_meal(meal_id: str) -> dict:
         if not SUPABASE_URL or not SUPABASE_KEY:
             raise ValueError("Supabase credentials not configured")
 
-        async with httpx.AsyncClient() as client:
+        async with get_supabase().session() as client:
             response = await client.delete(
                 f"{_get_rest_url()}/nutrition_logs?id=eq.{meal_id}",
                 headers=_get_headers(),
@@ -138,7 +138,7 @@ async def get_today_totals() -> dict:
         filter_str = f"and=(logged_at.gte.{today}T00:00:00,logged_at.lt.{tomorrow}T00:00:00)"
         url = f"{_get_rest_url()}/nutrition_logs?select=calories,protein_g,carbs_g,fat_g,water_ml,logged_at&{filter_str}"
 
-        async with httpx.AsyncClient() as client:
+        async with get_supabase().session() as client:
             response = await client.get(
                 url,
                 headers=_get_headers(),
@@ -177,7 +177,7 @@ async def get_today_meals() -> list:
         filter_str = f"and=(logged_at.gte.{today}T00:00:00,logged_at.lt.{tomorrow}T00:00:00)"
         url = f"{_get_rest_url()}/nutrition_logs?select=*&{filter_str}&meal_type=neq.water&order=logged_at"
 
-        async with httpx.AsyncClient() as client:
+        async with get_supabase().session() as client:
             response = await client.get(
                 url,
                 headers=_get_headers(),
@@ -205,7 +205,7 @@ async def get_today_water_entries() -> list:
         filter_str = f"and=(logged_at.gte.{today}T00:00:00,logged_at.lt.{tomorrow}T00:00:00)"
         url = f"{_get_rest_url()}/nutrition_logs?select=id,water_ml,description,logged_at&{filter_str}&meal_type=eq.water&order=logged_at"
 
-        async with httpx.AsyncClient() as client:
+        async with get_supabase().session() as client:
             response = await client.get(url, headers=_get_headers(), timeout=30)
             response.raise_for_status()
             data = response.json()
@@ -230,7 +230,7 @@ async def delete_today_water() -> dict:
         url = f"{_get_rest_url()}/nutrition_logs?{filter_str}&meal_type=eq.water"
 
         # Use Prefer: return=representation to get deleted rows
-        async with httpx.AsyncClient() as client:
+        async with get_supabase().session() as client:
             response = await client.delete(url, headers=_get_headers(), timeout=30)
             response.raise_for_status()
             deleted = response.json()
@@ -262,7 +262,7 @@ async def get_meals_by_date(date: str) -> list:
         filter_str = f"and=(logged_at.gte.{target_date.isoformat()}T00:00:00,logged_at.lt.{next_date.isoformat()}T00:00:00)"
         url = f"{_get_rest_url()}/nutrition_logs?select=*&{filter_str}&meal_type=neq.water&order=logged_at"
 
-        async with httpx.AsyncClient() as client:
+        async with get_supabase().session() as client:
             response = await client.get(url, headers=_get_headers(), timeout=30)
             response.raise_for_status()
             data = response.json()
@@ -298,7 +298,7 @@ async def get_nutrition_totals(date: str = None) -> dict:
         filter_str = f"and=(logged_at.gte.{target_date.isoformat()}T00:00:00,logged_at.lt.{next_date.isoformat()}T00:00:00)"
         url = f"{_get_rest_url()}/nutrition_logs?select=calories,protein_g,carbs_g,fat_g,water_ml,logged_at&{filter_str}"
 
-        async with httpx.AsyncClient() as client:
+        async with get_supabase().session() as client:
             response = await client.get(
                 url,
                 headers=_get_headers(),
@@ -335,7 +335,7 @@ async def get_week_summary() -> list:
         start_date = end_date - timedelta(days=7)
 
         # Call RPC function
-        async with httpx.AsyncClient() as client:
+        async with get_supabase().session() as client:
             response = await client.post(
                 f"{_get_rest_url()}/rpc/get_daily_totals",
                 headers=_get_headers(),
@@ -6,6 +6,7 @@ from datetime import datetime, timedelta
 from pathlib import Path
 
 import httpx
+from integrations.supabase_rest import get_supabase
 
 from config import (
     WITHINGS_CLIENT_ID,
@@ -16,6 +17,7 @@ from config import (
     SUPABASE_KEY
 )
 from logger import logger
+from .health_timeseries import get_health_timeseries
 
 # Persistent token file (survives service restarts)
 TOKEN_FILE = Path(os.getenv("LOCALAPPDATA", ".")) / "discord-assistant" / "withings_tokens.json"
@@ -217,7 +219,7 @@ async def _store_weight_readings(measuregrps: list[dict]) -> int:
         if not rows:
             return 0
 
-        async with httpx.AsyncClient() as client:
+        async with get_supabase().session() as client:
             response = await client.post(
                 f"{SUPABASE_URL}/rest/v1/weight_readings?on_conflict=user_id,measured_at",
                 headers={
@@ -231,6 +233,7 @@ async def _store_weight_readings(measuregrps: list[dict]) -> int:
             )
             if response.status_code in (200, 201, 204):
                 logger.info(f"Stored Withings window: {len(rows)} readings upserted")
+                get_health_timeseries().record_weights(rows)
                 return len(rows)
             logger.warning(f"Weight readings upsert returned {response.status_code}: {response.text[:200]}")
             return 0
@@ -247,7 +250,7 @@ async def get_weight_history(days: int = 30) -> list:
 
         start_date = (datetime.now() - timedelta(days=days)).isoformat()
 
-        async with httpx.AsyncClient() as client:
+        async with get_supabase().session() as client:
             response = await client.get(
                 f"{SUPABASE_URL}/rest/v1/weight_readings",
                 headers={
@@ -318,6 +318,8 @@ async def _sync_garmin_to_supabase(date_str: str, data: dict | None = None) -> N
                 for r in records
             )
             logger.info(f"Garmin sync: upserted {len(records)} rows — {summary}")
+            from domains.nutrition.services.health_timeseries import get_health_timeseries
+            get_health_timeseries().record_days(records)
         else:
             logger.warning(f"Garmin sync: upsert returned {resp.status_code}: {resp.text}")
 
@@ -812,29 +814,26 @@ async def get_morning_briefing_data() -> dict[str, Any]:
     from datetime import timedelta
 
     try:
-        from jobs.morning_briefing import (
-            _search_x,
-            _search_reddit,
-            _search_web
-        )
+        from jobs.briefing_fetch import BriefingFetcher
+        from jobs.morning_briefing import briefing_sources
 
         # Date range for X search (last 7 days for richer content)
         now = datetime.now(UK_TZ)
         to_date = now.strftime("%Y-%m-%d")
         from_date = (now - timedelta(days=7)).strftime("%Y-%m-%d")
 
-        # Search topics in parallel
-        x_results, reddit_results, web_results = await asyncio.gather(
-            _search_x("Claude AI OR Anthropic OR Claude Code", from_date, to_date),
-            _search_reddit("Claude AI OR Anthropic"),
-            _search_web("Claude Anthropic AI news"),
-            return_exceptions=True
-        )
-
-        # Handle exceptions
-        x_items = x_results if not isinstance(x_results, Exception) else []
-        reddit_items = reddit_results if not isinstance(reddit_results, Exception) else []
-        web_items = web_results if not isinstance(web_results, Exception) else []
+        # One request budget across sources; per-topic results are cached
+        # for a few hours, so a re-run only repeats failed/empty searches
+        results = await BriefingFetcher().fetch(briefing_sources(
+            x_topics=["Claude AI OR Anthropic OR Claude Code"],
+            reddit_topics=["Claude AI OR Anthropic"],
+            web_topics=["Claude Anthropic AI news"],
+            from_date=from_date,
+            to_date=to_date,
+        ))
+        x_items = results["x"]
+        reddit_items = results["reddit"]
+        web_items = results["web"]
 
         logger.info(f"Morning briefing fetch: {len(x_items)} X, {len(reddit_items)} Reddit, {len(web_items)} web")
 
@@ -3483,239 +3482,24 @@ async def get_subscription_monitor_data() -> dict[str, Any]:
     """Analyse subscriptions against bank transactions.
 
     Detects: price changes, missed payments, new recurring charges,
-    upcoming renewals, and cancellation windows.
+    upcoming renewals, and cancellation windows. Shares the health check
+    (and its recurring-series engine) with the dashboard.
     """
-    import re
-    from collections import defaultdict
-    from datetime import date
-
     try:
-        from mcp_servers.financial_data.supabase_client import finance_query
+        from mcp_servers.financial_data.subscriptions import subscription_health
     except ImportError:
         return {"error": "finance_query not available"}
 
     now = datetime.now(UK_TZ)
-    today = date.today()
-    alerts: list[dict] = []
-
     try:
-        # 1. Fetch all subscriptions
-        subs = await finance_query("subscriptions", {
-            "select": "*",
-            "order": "name.asc",
-        }, paginate=True)
-
-        active_subs = [s for s in subs if s.get("status") == "active"]
-
-        # 2. Fetch last 6 months of outgoing transactions for analysis
-        six_months_ago = (today - timedelta(days=180)).isoformat()
-        all_txns = await finance_query("transactions", {
-            "select": "description,amount,date",
-            "amount": "lt.0",
-            "date": f"gte.{six_months_ago}",
-            "order": "date.desc",
-        }, paginate=True)
-
-        # 3. For each active sub with a bank pattern, find matching transactions
-        tracked_patterns: list[str] = []
-        for sub in active_subs:
-            pattern = sub.get("bank_description_pattern")
-            if not pattern:
-                continue
-
-            clean = pattern.replace("*", "").strip()
-            if not clean:
-                continue
-
-            tracked_patterns.append(clean.lower())
-
-            # Find matching transactions
-            matching = [
-                t for t in all_txns
-                if clean.lower() in t.get("description", "").lower()
-            ]
-
-            if not matching:
-                continue
-
-            # --- Price change detection ---
-            stored_amount = abs(float(sub["amount"]))
-            latest_txn = matching[0]
-            latest_amount = abs(float(latest_txn["amount"]))
-
-            # Allow 10% tolerance for FX-converted amounts
-            if stored_amount > 0 and abs(latest_amount - stored_amount) / stored_amount > 0.10:
-                alerts.append({
-                    "type": "price_change",
-                    "subscription": sub["name"],
-                    "scope": sub.get("scope", "personal"),
-                    "old_amount": stored_amount,
-                    "new_amount": latest_amount,
-                    "last_transaction_date": latest_txn["date"],
-                    "description": latest_txn["description"][:60],
-                })
-
-            # --- Missed payment detection ---
-            freq = sub.get("frequency", "monthly")
-            expected_gap_days = {
-                "weekly": 10,
-                "fortnightly": 20,
-                "monthly": 45,
-                "quarterly": 105,
-                "termly": 140,
-                "annual": 400,
-            }.get(freq, 45)
-
-            latest_date = date.fromisoformat(latest_txn["date"])
-            days_since = (today - latest_date).days
-
-            if days_since > expected_gap_days:
-                alerts.append({
-                    "type": "missed_payment",
-                    "subscription": sub["name"],
-                    "scope": sub.get("scope", "personal"),
-                    "amount": stored_amount,
-                    "frequency": freq,
-                    "last_payment_date": latest_txn["date"],
-                    "days_overdue": days_since - expected_gap_days,
-                    "expected_by": (latest_date + timedelta(days=expected_gap_days)).isoformat(),
-                })
-
-        # 4. Cancellation window alerts
-        for sub in active_subs:
-            notice_days = sub.get("cancellation_notice_days")
-            renewal_date = sub.get("next_renewal_date")
-            if not notice_days or not renewal_date:
-                continue
-
-            renewal = date.fromisoformat(renewal_date)
-            deadline = renewal - timedelta(days=notice_days)
-            # Alert if within the cancellation window (deadline is in next 14 days)
-            if today <= deadline <= today + timedelta(days=14):
-                alerts.append({
-                    "type": "cancellation_window",
-                    "subscription": sub["name"],
-                    "scope": sub.get("scope", "personal"),
-                    "renewal_date": renewal_date,
-                    "cancellation_deadline": deadline.isoformat(),
-                    "amount": float(sub["amount"]),
-                    "frequency": sub.get("frequency", "monthly"),
-                })
-
-        # 5. Upcoming renewals (next 7 days)
-        upcoming = []
-        for sub in active_subs:
-            renewal_date = sub.get("next_renewal_date")
-            if not renewal_date:
-                continue
-            renewal = date.fromisoformat(renewal_date)
-            if today <= renewal <= today + timedelta(days=7):
-                upcoming.append({
-                    "name": sub["name"],
-                    "renewal_date": renewal_date,
-                    "amount": float(sub["amount"]),
-                    "frequency": sub.get("frequency", "monthly"),
-                    "scope": sub.get("scope", "personal"),
-                })
-
-        # 6. Detect new recurring transactions not yet tracked
-        groups: dict[str, list[dict]] = defaultdict(list)
-        for t in all_txns:
-            desc = t.get("description", "").strip()
-            norm = re.sub(r"\s+\d{2,}[/-]\d{2,}.*$", "", desc.lower()).strip()
-            norm = re.sub(r"\s+", " ", norm)
-            if norm:
-                groups[norm].append(t)
-
-        # Filter: 3+ occurrences, not already tracked, not MMBILL
-        # Load user-dismissed exclusions
-        exclusion_rows = await finance_query("subscription_exclusions", {
-            "select": "description_pattern",
-        })
-        user_exclusions = [r["description_pattern"].lower() for r in exclusion_rows]
-
-        # Exclude known non-subscription merchants
-        _EXCLUDE = {
-            "aldi", "tesco", "sainsbury", "lidl", "asda", "waitrose", "co-op",
-            "morrisons", "marks and spencer", "m&s", "ocado",
-            "pret a manger", "costa", "starbucks", "greggs", "mcdonalds",
-            "nandos", "pizza", "burger", "kitchen", "restaurant", "cafe",
-            "bar ", "pub ", "deli", "bakery", "chippy",
-            "tfl travel", "ringgo", "parking", "petrol", "shell", "bp ",
-            "amazon marketplace", "amazon.co.uk", "ebay", "paypal",
-            "hsbc", "non-sterling", "transaction fee", "interest",
-            "atm", "cash", "withdrawal",
-            "stocks green prima", "burnhill", "next directory",
-            "box bar", "se hildenborough", "accenture",
-        }
-
-        for desc, txs in groups.items():
-            if len(txs) < 3:
-                continue
-            if "mmbill" in desc.lower() or "mmbil" in desc.lower():
-                continue
-            if any(excl in desc for excl in _EXCLUDE):
-                continue
-            if any(excl in desc for excl in user_exclusions):
-                continue
-
-            already_tracked = any(tp in desc for tp in tracked_patterns)
-            if already_tracked:
-                continue
-
-            amounts = [abs(float(t["amount"])) for t in txs]
-            avg = sum(amounts) / len(amounts)
-            if avg < 2:
-                continue
-
-            # Subscription heuristic: consistent amounts (low CV)
-            if len(amounts) >= 3:
-                std_dev = (sum((a - avg) ** 2 for a in amounts) / len(amounts)) ** 0.5
-                cv = std_dev / avg if avg > 0 else 1
-                if cv > 0.20:
-                    continue
-
-            alerts.append({
-                "type": "new_recurring",
-                "description": txs[0].get("description", desc)[:60],
-                "avg_amount": round(avg, 2),
-                "occurrences": len(txs),
-                "first_seen": txs[-1].get("date", ""),
-                "latest": txs[0].get("date", ""),
-            })
-
-        # 7. Summary
-        total_monthly = sum(
-            _sub_monthly_cost(float(s["amount"]), s.get("frequency", "monthly"))
-            for s in active_subs
-        )
-
-        return {
-            "alerts": alerts,
-            "upcoming_renewals": upcoming,
-            "summary": {
-                "total_active": len(active_subs),
-                "total_monthly_cost": round(total_monthly, 2),
-                "alerts_count": len(alerts),
-                "scanned_transactions": len(all_txns),
-            },
-            "timestamp": now.strftime("%Y-%m-%d %H:%M"),
-        }
-
+        result = await subscription_health()
+        result["timestamp"] = now.strftime("%Y-%m-%d %H:%M")
+        return result
     except Exception as e:
         logger.error(f"Subscription monitor data fetch error: {e}")
         return {"error": str(e)}
 
 
-def _sub_monthly_cost(amount: float, frequency: str) -> float:
-    """Convert any frequency to monthly cost."""
-    multipliers = {
-        "weekly": 52, "fortnightly": 26, "monthly": 12,
-        "quarterly": 4, "termly": 3, "annual": 1,
-    }
-    return amount * multipliers.get(frequency, 12) / 12
-
-
 async def get_tutor_email_data() -> dict[str, Any]:
     """Fetch the most recent tutor email for 11+ Mate tutor integration.
 
@@ -1,25 +1,33 @@
 """Reminders module for one-off scheduled notifications.
 
-Uses APScheduler date triggers with Supabase persistence.
+Fired by a timing-wheel engine (engine.py) with Supabase persistence;
+APScheduler date triggers remain the fallback when no engine is running.
 """
 
 from .parser import parse_reminder, ParsedReminder
 from .store import (
     save_reminder,
     mark_reminder_fired,
+    mark_reminders_fired,
     delete_reminder,
     get_pending_reminders,
     get_user_reminders,
 )
 from .scheduler import add_reminder, cancel_reminder, reload_pending_reminders, poll_for_new_reminders
 from .executor import execute_reminder
-from .handler import handle_reminder_intent, reload_reminders_on_startup, start_reminder_polling
+from .engine import ReminderEngine, get_engine
+from .wheel import TimingWheel
+from .handler import (
+    handle_reminder_intent,
+    start_reminder_engine,
+)
 
 __all__ = [
     "parse_reminder",
     "ParsedReminder",
     "save_reminder",
     "mark_reminder_fired",
+    "mark_reminders_fired",
     "delete_reminder",
     "get_pending_reminders",
     "get_user_reminders",
@@ -28,7 +36,9 @@ __all__ = [
     "reload_pending_reminders",
     "poll_for_new_reminders",
     "execute_reminder",
+    "ReminderEngine",
+    "get_engine",
+    "TimingWheel",
     "handle_reminder_intent",
-    "reload_reminders_on_startup",
-    "start_reminder_polling",
+    "start_reminder_engine",
 ]
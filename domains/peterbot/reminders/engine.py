@@ -0,0 +1,379 @@
+"""Reminder engine: reminders and nag recurrences on a timing wheel.
+
+Reminders used to be mirrored into APScheduler DateTrigger jobs by polling
+every pending row out of Supabase each minute, and nags were re-evaluated by
+fetching every active nag over HTTP each minute. The engine instead keeps
+every reminder that can still fire in memory and puts its next fire on a
+`TimingWheel`:
+
+- ``fire:<id>`` — the reminder's run_at (Discord post via execute_reminder);
+- ``nag:<id>`` — a nag's next WhatsApp nudge (run_at, then every
+  interval_minutes after the last one), or its nag_until wrap-up, whichever
+  comes first.
+
+The run loop sleeps until the wheel's next wakeup, so fires are on time
+whatever the sync cadence, and each tick only touches what's due. Supabase
+stays the source of truth: the engine syncs incrementally on the
+reminders.updated_at cursor (pushed reminder events trigger a sync straight
+away), does a full sync now and then to notice deletions, and writes fired
+and nag marks for everything due on one tick in one request per field set.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Optional
+from zoneinfo import ZoneInfo
+
+from dateutil.parser import parse as parse_datetime
+
+from logger import logger
+from .store import get_active_reminders, get_reminders_changed_since, mark_reminders_fired, update_reminders
+from .wheel import TimingWheel
+
+UK_TZ = ZoneInfo("Europe/London")
+
+# Reminders found up to this late (e.g. after a restart) still fire, as with
+# the scheduler's misfire_grace_time; older ones are skipped, unless they
+# changed after the engine's last sync (it never had the chance to fire them)
+MISFIRE_GRACE_SECONDS = 60
+DEFAULT_NAG_INTERVAL_MINUTES = 120
+# Upper bound on a single sleep, so a wall-clock jump is noticed
+MAX_SLEEP_SECONDS = 300
+# A nag whose WhatsApp send failed is retried after this long
+NAG_RETRY_SECONDS = 60
+
+FireFunc = Callable[[dict], Awaitable[None]]
+SendNagFunc = Callable[[str, str], Awaitable[None]]
+
+
+def _ts(value) -> Optional[float]:
+    """Timestamp for a Supabase datetime string (naive means UTC)."""
+    if not value:
+        return None
+    dt = parse_datetime(value) if isinstance(value, str) else value
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat()
+
+
+def is_active(row: dict) -> bool:
+    """Whether a reminder can still fire (mirrors store.ACTIVE_FILTER)."""
+    if row.get("reminder_type") == "nag":
+        return not row.get("acknowledged_at")
+    return not row.get("fired_at")
+
+
+def nag_until_ts(row: dict, now: float) -> Optional[float]:
+    """Today's nag_until cut-off (UK time) for a nag that has started, if set."""
+    if not row.get("nag_until"):
+        return None
+    try:
+        hour, minute = map(int, row["nag_until"].split(":"))
+    except (ValueError, AttributeError):
+        return None
+    start = max(now, _ts(row["run_at"]) or now)
+    day = datetime.fromtimestamp(start, UK_TZ)
+    return day.replace(hour=hour, minute=minute, second=0, microsecond=0).timestamp()
+
+
+def next_nag_ts(row: dict, now: float) -> Optional[float]:
+    """When a WhatsApp nag should next go out (or wrap up), None if never."""
+    if row.get("reminder_type") != "nag" or row.get("acknowledged_at"):
+        return None
+    until = nag_until_ts(row, now)
+    if not (row.get("delivery") or "").startswith("whatsapp:"):
+        return until  # other deliveries only get the initial fire (and the cut-off)
+    last = _ts(row.get("last_nagged_at"))
+    interval = (row.get("interval_minutes") or DEFAULT_NAG_INTERVAL_MINUTES) * 60
+    due = _ts(row["run_at"]) if last is None else last + interval
+    due = max(due, row.get("_retry_at", 0))
+    return min(due, until) if until is not None else due
+
+
+class ReminderEngine:
+    """Timing-wheel scheduler for reminders and nags, synced from Supabase.
+
+    Args:
+        fire: called with the reminder row when a reminder's run_at arrives
+            (after it has been marked fired).
+        send_nag: called with (target, message) to send a WhatsApp nag.
+        clock: time source (seconds since the epoch).
+    """
+
+    def __init__(self, fire: FireFunc, send_nag: SendNagFunc, clock: Callable[[], float] = time.time):
+        self.fire = fire
+        self.send_nag = send_nag
+        self.clock = clock
+        self.wheel = TimingWheel(start=clock())
+        self.reminders: dict[str, dict] = {}
+        self.cursor: Optional[str] = None
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        # Serialises syncs with a tick's mark-then-plan step, so a sync can't
+        # re-plan a reminder between it coming due and being marked fired
+        self._lock = asyncio.Lock()
+        self._running: set[asyncio.Task] = set()
+        # Start of the last successful sync (engine clock)
+        self.synced_at: Optional[float] = None
+        # Late reminders already skipped, so each is only reported once; they
+        # stay unfired upstream, as nothing was delivered
+        self._missed: set[str] = set()
+        self.stats = {"fired": 0, "nags": 0, "wrapped_up": 0, "skipped_late": 0, "syncs": 0, "writes": 0}
+
+    # -- state -----------------------------------------------------------
+
+    def upsert(self, row: dict) -> None:
+        """Add or refresh a reminder and (re)plan its wheel entries."""
+        rid = row["id"]
+        if not is_active(row):
+            self.drop(rid)
+            return
+        self.reminders[rid] = row
+        now = self.clock()
+
+        fire_key = f"fire:{rid}"
+        run_at = _ts(row["run_at"])
+        if not row.get("fired_at") and run_at is not None:
+            if (run_at < now - MISFIRE_GRACE_SECONDS and fire_key not in self.wheel
+                    and not self._changed_since_sync(row)):
+                if rid not in self._missed:
+                    self._missed.add(rid)
+                    logger.warning(f"Skipping past reminder {rid}: was due {row['run_at']}")
+                    self.stats["skipped_late"] += 1
+            else:
+                self.wheel.add(fire_key, run_at)  # a past deadline fires on the next tick
+        else:
+            self.wheel.remove(fire_key)
+
+        nag_key = f"nag:{rid}"
+        nag_at = next_nag_ts(row, now)
+        if nag_at is not None:
+            self.wheel.add(nag_key, nag_at)
+        else:
+            self.wheel.remove(nag_key)
+        if row.get("reminder_type") != "nag" and fire_key not in self.wheel:
+            self.reminders.pop(rid, None)
+        self._wake.set()
+
+    def _changed_since_sync(self, row: dict) -> bool:
+        """Whether a row was created or updated after the last successful sync.
+
+        Such a reminder is late only because its event was lost, so it still
+        fires. Before the first sync (a restart) nothing counts as new.
+        """
+        if self.synced_at is None:
+            return False
+        changed = max(_ts(row.get("created_at")) or 0, _ts(row.get("updated_at")) or 0)
+        # Allow for skew between Supabase's clock and ours
+        return changed >= self.synced_at - MISFIRE_GRACE_SECONDS
+
+    def drop(self, reminder_id: str) -> bool:
+        """Forget a reminder (cancelled, deleted or acknowledged)."""
+        existed = self.reminders.pop(reminder_id, None) is not None
+        self.wheel.remove(f"fire:{reminder_id}")
+        self.wheel.remove(f"nag:{reminder_id}")
+        return existed
+
+    def upcoming(self, limit: int = 20) -> list[dict]:
+        """The next `limit` scheduled fires and nags."""
+        out = []
+        for key, at in self.wheel.upcoming(limit):
+            kind, rid = key.split(":", 1)
+            row = self.reminders.get(rid, {})
+            out.append({
+                "id": rid,
+                "kind": kind,
+                "at": _iso(at),
+                "task": row.get("task"),
+                "reminder_type": row.get("reminder_type") or "one_off",
+                "delivery": row.get("delivery"),
+            })
+        return out
+
+    # -- sync ------------------------------------------------------------
+
+    async def sync(self, full: bool = False) -> int:
+        """Pull changes from Supabase; returns how many rows were applied.
+
+        Incremental (updated_at > cursor) unless `full`, or no cursor yet. A
+        full sync also drops reminders that no longer exist upstream.
+        """
+        async with self._lock:
+            started = self.clock()
+            incremental = not full and self.cursor is not None
+            rows = (await get_reminders_changed_since(self.cursor) if incremental
+                    else await get_active_reminders())
+            if rows is None:
+                return 0
+            if not incremental:
+                live = {r["id"] for r in rows}
+                for rid in list(self.reminders):
+                    if rid not in live:
+                        self.drop(rid)
+            for row in rows:
+                self.upsert(row)
+                if row.get("updated_at") and (self.cursor is None or
+                                              _ts(row["updated_at"]) > _ts(self.cursor)):
+                    self.cursor = row["updated_at"]
+            self.synced_at = started
+            self.stats["syncs"] += 1
+            return len(rows)
+
+    async def apply_event(self, payload: dict) -> None:
+        """Handle a pushed reminder.changed event."""
+        reminder_id = payload.get("id")
+        action = payload.get("action", "created")
+        if reminder_id and action in ("deleted", "acknowledged"):
+            self.drop(reminder_id)
+        else:
+            await self.sync()
+
+    # -- running ---------------------------------------------------------
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="reminder_engine")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.tick()
+            except Exception as e:
+                logger.error(f"Reminder engine tick failed: {e}")
+            wakeup = self.wheel.next_wakeup()
+            delay = MAX_SLEEP_SECONDS if wakeup is None else max(0.0, min(wakeup - self.clock(), MAX_SLEEP_SECONDS))
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def tick(self) -> int:
+        """Run everything due now; returns how many wheel entries expired.
+
+        Reminder executions are started as tasks (a Peter-triggering
+        reminder can take minutes) so the loop is back on the wheel at once.
+        """
+        async with self._lock:
+            now = self.clock()
+            due = self.wheel.advance(now)
+            if not due:
+                return 0
+
+            fires = [self.reminders[k[5:]] for k in due if k.startswith("fire:") and k[5:] in self.reminders]
+            nags = [self.reminders[k[4:]] for k in due if k.startswith("nag:") and k[4:] in self.reminders]
+
+            # At-most-once: mark the whole batch fired before anything is sent
+            if fires:
+                await mark_reminders_fired([r["id"] for r in fires])
+                self.stats["writes"] += 1
+                fired_at = _iso(now)
+                for row in fires:
+                    row["fired_at"] = fired_at
+                self.stats["fired"] += len(fires)
+
+            if nags:
+                await self._run_nags(nags, now)
+
+            for row in fires + nags:
+                if row["id"] in self.reminders:
+                    self.upsert(row)
+
+        for row in fires:
+            task = asyncio.create_task(self._fire(row))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+        return len(due)
+
+    async def _fire(self, row: dict) -> None:
+        try:
+            await self.fire(row)
+        except Exception as e:
+            logger.error(f"Failed to execute reminder {row['id']}: {e}")
+
+    async def _run_nags(self, nags: list[dict], now: float) -> None:
+        nagged, first_nagged, wrapped = [], [], []
+
+        async def nag_one(row: dict):
+            delivery = row.get("delivery") or ""
+            target = delivery.split(":", 1)[1] if delivery.startswith("whatsapp:") else None
+            task = row.get("task", "")
+            until = nag_until_ts(row, now)
+            try:
+                if until is not None and now >= until:
+                    wrapped.append(row)
+                    if target:
+                        await self.send_nag(
+                            target, f"Wrapping up nag for today: *{task}* — no more reminders until tomorrow 👋")
+                    logger.info(f"Nag {row['id']} auto-acknowledged (past {row['nag_until']})")
+                elif target:
+                    await self.send_nag(target, f"Hey — {task} 💪\nReply *done* when you've finished.")
+                    row.pop("_retry_at", None)
+                    (nagged if row.get("fired_at") else first_nagged).append(row)
+                    logger.info(f"Nag sent via WhatsApp to {target}: {task[:50]}")
+            except Exception as e:
+                row["_retry_at"] = now + NAG_RETRY_SECONDS
+                logger.warning(f"Nag {row['id']} failed: {e}")
+
+        await asyncio.gather(*(nag_one(row) for row in nags))
+        stamp = _iso(now)
+        for row in nagged + first_nagged:
+            row["last_nagged_at"] = stamp
+        for row in first_nagged:
+            row["fired_at"] = stamp
+        for row in wrapped:
+            row["acknowledged_at"] = stamp
+        writes = [
+            ([r["id"] for r in nagged], {"last_nagged_at": stamp}),
+            ([r["id"] for r in first_nagged], {"last_nagged_at": stamp, "fired_at": stamp}),
+            ([r["id"] for r in wrapped], {"acknowledged_at": stamp}),
+        ]
+        for ids, fields in writes:
+            if ids:
+                await update_reminders(ids, fields)
+                self.stats["writes"] += 1
+        self.stats["nags"] += len(nagged) + len(first_nagged)
+        self.stats["wrapped_up"] += len(wrapped)
+
+
+_engine: Optional[ReminderEngine] = None
+
+
+def get_engine() -> Optional[ReminderEngine]:
+    """The running process-wide engine, if the bot has started one."""
+    return _engine
+
+
+def set_engine(engine: Optional[ReminderEngine]) -> None:
+    global _engine
+    _engine = engine
+
+
+async def send_nag_whatsapp(target: str, message: str):
+    """Send a WhatsApp nag message to a target (chris, abby, group)."""
+    from integrations.whatsapp import send_text, send_to_chris, send_to_abby, send_to_group
+
+    if target == "chris":
+        await send_to_chris(message)
+    elif target == "abby":
+        await send_to_abby(message)
+    elif target == "group":
+        await send_to_group("extended-team", message)
+    else:
+        await send_text(target, message)
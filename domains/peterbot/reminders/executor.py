@@ -14,11 +14,13 @@ async def execute_reminder(
     user_id: int,
     channel_id: int,
     reminder_id: str,
-    bot: discord.Client
+    bot: discord.Client,
+    mark_fired: bool = True
 ):
     """Fire a reminder - send to channel and optionally trigger Peter.
 
-    This function is called by APScheduler when the reminder time arrives.
+    This function is called by the reminder engine (or APScheduler) when the
+    reminder time arrives.
 
     Args:
         task: The reminder task/message
@@ -26,6 +28,8 @@ async def execute_reminder(
         channel_id: Discord channel ID to post in
         reminder_id: The reminder ID
         bot: Discord bot instance
+        mark_fired: Mark fired in Supabase first (False when the caller
+            already marked it as part of a batch)
     """
     # Prevent duplicate execution — mark fired BEFORE doing anything
     if reminder_id in _fired_ids:
@@ -34,7 +38,8 @@ async def execute_reminder(
     _fired_ids.add(reminder_id)
 
     # Mark as fired in Supabase immediately (at-most-once delivery)
-    await mark_reminder_fired(reminder_id)
+    if mark_fired:
+        await mark_reminder_fired(reminder_id)
 
     try:
         channel = bot.get_channel(channel_id)
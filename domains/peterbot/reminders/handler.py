@@ -8,9 +8,10 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
 from logger import logger
 from .parser import parse_reminder, is_reminder_request
-from .scheduler import add_reminder, cancel_reminder, reload_pending_reminders, poll_for_new_reminders
+from .scheduler import add_reminder, cancel_reminder
 from .store import get_user_reminders
 from .executor import execute_reminder
+from .engine import ReminderEngine, set_engine, send_nag_whatsapp
 
 UK_TZ = ZoneInfo("Europe/London")
 
@@ -116,47 +117,61 @@ async def _cancel_reminder(user_id: int, reminder_id_partial: str, scheduler) ->
     return "Reminder not found. Use `list reminders` to see your reminders."
 
 
-async def reload_reminders_on_startup(scheduler: AsyncIOScheduler, bot) -> int:
-    """Reload pending reminders from Supabase on bot startup.
+async def start_reminder_engine(scheduler: AsyncIOScheduler, bot, bus) -> ReminderEngine:
+    """Load active reminders from Supabase and start the reminder engine.
+
+    The engine fires reminders and nags from its timing wheel. Reminder
+    changes pushed by Hadley API trigger an incremental sync straight away;
+    APScheduler only runs the reconciliation syncs (incremental every minute,
+    and a full sync hourly to notice deleted rows). The incremental sync
+    stays at a minute even with the event bus: it is one small query, and
+    a lost or failed event must not delay a reminder that is due soon.
 
     Args:
-        scheduler: APScheduler instance
+        scheduler: APScheduler instance (for the reconciliation jobs)
         bot: Discord bot instance
+        bus: services.bot_events.EventBus
 
     Returns:
-        Count of reminders loaded
-    """
-    async def executor_wrapper(task, user_id, channel_id, reminder_id):
-        await execute_reminder(task, user_id, channel_id, reminder_id, bot)
-
-    return await reload_pending_reminders(scheduler, executor_wrapper)
-
-
-def start_reminder_polling(scheduler: AsyncIOScheduler, bot):
-    """Start polling for new reminders every 60 seconds.
-
-    This allows Peter (or external systems) to insert reminders into Supabase
-    and have the bot pick them up without a restart.
-
-    Args:
-        scheduler: APScheduler instance
-        bot: Discord bot instance
+        The running engine
     """
     from apscheduler.triggers.interval import IntervalTrigger
-
-    async def poll_task():
-        async def executor_wrapper(task, user_id, channel_id, reminder_id):
-            await execute_reminder(task, user_id, channel_id, reminder_id, bot)
-
-        count = await poll_for_new_reminders(scheduler, executor_wrapper)
-        if count > 0:
-            logger.info(f"Polling picked up {count} new reminder(s)")
+    from services.bot_events import REMINDER_CHANGED
+
+    async def fire(row: dict):
+        await execute_reminder(row["task"], row["user_id"], row["channel_id"], row["id"], bot,
+                               mark_fired=False)
+
+    engine = ReminderEngine(fire=fire, send_nag=send_nag_whatsapp)
+    count = await engine.sync(full=True)
+    engine.start()
+    set_engine(engine)
+    logger.info(f"Reminder engine started with {len(engine.reminders)} active reminder(s) "
+                f"({count} loaded from Supabase)")
+
+    bus.subscribe(REMINDER_CHANGED, engine.apply_event)
+    bus.expose("reminders", lambda query: {
+        "upcoming": engine.upcoming(int(query.get("limit", 20))),
+        "active": len(engine.reminders),
+        "cursor": engine.cursor,
+        "stats": engine.stats,
+    })
+
+    async def full_sync():
+        await engine.sync(full=True)
 
     scheduler.add_job(
-        poll_task,
+        engine.sync,
         trigger=IntervalTrigger(seconds=60),
         id="reminder_polling",
-        name="Poll for new reminders",
+        name="Sync changed reminders",
+        replace_existing=True
+    )
+    scheduler.add_job(
+        full_sync,
+        trigger=IntervalTrigger(hours=1),
+        id="reminder_full_sync",
+        name="Full reminder reconciliation",
         replace_existing=True
     )
-    logger.info("Started reminder polling (every 60s)")
+    return engine
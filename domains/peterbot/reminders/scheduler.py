@@ -9,6 +9,7 @@ from dateutil.parser import parse as parse_datetime
 
 from logger import logger
 from .store import save_reminder, delete_reminder, get_pending_reminders
+from .engine import get_engine
 
 
 def _get_scheduled_reminder_ids(scheduler: AsyncIOScheduler) -> set[str]:
@@ -30,6 +31,9 @@ async def add_reminder(
 ) -> str:
     """Add a one-off reminder job.
 
+    Goes onto the reminder engine's wheel when the engine is running,
+    otherwise onto APScheduler.
+
     Args:
         scheduler: APScheduler instance
         reminder_id: Unique reminder ID
@@ -40,7 +44,7 @@ async def add_reminder(
         executor_func: Async function to call when reminder fires
 
     Returns:
-        job_id for cancellation
+        job_id (the reminder ID) for cancellation
 
     Raises:
         Exception: If reminder fails to save to database
@@ -50,6 +54,19 @@ async def add_reminder(
     if not saved:
         raise Exception("Failed to save reminder to database")
 
+    engine = get_engine()
+    if engine is not None:
+        engine.upsert({
+            "id": reminder_id,
+            "user_id": user_id,
+            "channel_id": channel_id,
+            "task": task,
+            "run_at": run_at.isoformat(),
+            "reminder_type": "one_off",
+        })
+        logger.info(f"Added reminder {reminder_id}: '{task}' at {run_at}")
+        return reminder_id
+
     # Add to APScheduler (max_instances=1 prevents concurrent execution)
     job = scheduler.add_job(
         executor_func,
@@ -76,7 +93,11 @@ async def cancel_reminder(scheduler: AsyncIOScheduler, reminder_id: str) -> bool
         True if cancelled successfully
     """
     try:
-        scheduler.remove_job(reminder_id)
+        engine = get_engine()
+        if engine is not None:
+            engine.drop(reminder_id)
+        else:
+            scheduler.remove_job(reminder_id)
         await delete_reminder(reminder_id)
         logger.info(f"Cancelled reminder {reminder_id}")
         return True
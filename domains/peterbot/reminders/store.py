@@ -1,7 +1,7 @@
 """Supabase persistence for reminders."""
 
 from datetime import datetime
-import httpx
+from integrations.supabase_rest import get_supabase
 
 from config import SUPABASE_URL, SUPABASE_KEY
 from logger import logger
@@ -41,7 +41,7 @@ async def save_reminder(
         return True  # Allow in-memory only operation
 
     try:
-        async with httpx.AsyncClient() as client:
+        async with get_supabase().session() as client:
             response = await client.post(
                 f"{SUPABASE_URL}/rest/v1/reminders",
                 headers=_headers(),
@@ -75,7 +75,7 @@ async def mark_reminder_fired(reminder_id: str) -> bool:
         return True
 
     try:
-        async with httpx.AsyncClient() as client:
+        async with get_supabase().session() as client:
             response = await client.patch(
                 f"{SUPABASE_URL}/rest/v1/reminders?id=eq.{reminder_id}",
                 headers=_headers(),
@@ -103,7 +103,7 @@ async def delete_reminder(reminder_id: str) -> bool:
         return True
 
     try:
-        async with httpx.AsyncClient() as client:
+        async with get_supabase().session() as client:
             response = await client.delete(
                 f"{SUPABASE_URL}/rest/v1/reminders?id=eq.{reminder_id}",
                 headers=_headers(),
@@ -127,7 +127,7 @@ async def get_pending_reminders() -> list[dict]:
         return []
 
     try:
-        async with httpx.AsyncClient() as client:
+        async with get_supabase().session() as client:
             response = await client.get(
                 f"{SUPABASE_URL}/rest/v1/reminders?fired_at=is.null&select=*",
                 headers=_headers(),
@@ -153,7 +153,7 @@ async def get_user_reminders(user_id: int) -> list[dict]:
         return []
 
     try:
-        async with httpx.AsyncClient() as client:
+        async with get_supabase().session() as client:
             response = await client.get(
                 f"{SUPABASE_URL}/rest/v1/reminders?user_id=eq.{user_id}&fired_at=is.null&select=*&order=run_at",
                 headers=_headers(),
@@ -164,3 +164,96 @@ async def get_user_reminders(user_id: int) -> list[dict]:
     except Exception as e:
         logger.error(f"Failed to fetch user reminders: {e}")
         return []
+
+
+# Reminders the engine keeps in its wheel: not yet fired, or nags still nagging
+ACTIVE_FILTER = "(fired_at.is.null,and(reminder_type.eq.nag,acknowledged_at.is.null))"
+
+
+async def get_active_reminders() -> list[dict] | None:
+    """Fetch every reminder that can still fire (full engine sync).
+
+    Returns:
+        List of reminder dicts, or None if the fetch failed (so callers
+        can tell "nothing active" from "couldn't ask")
+    """
+    if not SUPABASE_URL or not SUPABASE_KEY:
+        return []
+
+    try:
+        async with get_supabase().session() as client:
+            response = await client.get(
+                f"{SUPABASE_URL}/rest/v1/reminders",
+                # Not updated_at: a full sync must still work before that
+                # column's migration is applied (the engine skips the cursor then)
+                params={"or": ACTIVE_FILTER, "select": "*", "order": "run_at,id"},
+                headers=_headers(),
+                timeout=10
+            )
+            response.raise_for_status()
+            return response.json()
+    except Exception as e:
+        logger.error(f"Failed to fetch active reminders: {e}")
+        return None
+
+
+async def get_reminders_changed_since(cursor: str) -> list[dict] | None:
+    """Fetch reminders inserted or updated after `cursor` (an updated_at value).
+
+    Includes rows that stopped being active (fired, acknowledged) so the
+    engine can drop them.
+
+    Returns:
+        List of reminder dicts ordered by updated_at, or None on failure
+    """
+    if not SUPABASE_URL or not SUPABASE_KEY:
+        return []
+
+    try:
+        async with get_supabase().session() as client:
+            response = await client.get(
+                f"{SUPABASE_URL}/rest/v1/reminders",
+                params={"updated_at": f"gt.{cursor}", "select": "*", "order": "updated_at"},
+                headers=_headers(),
+                timeout=10
+            )
+            response.raise_for_status()
+            return response.json()
+    except Exception as e:
+        logger.error(f"Failed to fetch changed reminders: {e}")
+        return None
+
+
+async def update_reminders(reminder_ids: list[str], fields: dict) -> bool:
+    """Apply the same field update to several reminders in one request.
+
+    Args:
+        reminder_ids: IDs to update
+        fields: Column values to set (e.g. fired_at, last_nagged_at)
+
+    Returns:
+        True if updated successfully
+    """
+    if not reminder_ids or not SUPABASE_URL or not SUPABASE_KEY:
+        return True
+
+    try:
+        async with get_supabase().session() as client:
+            response = await client.patch(
+                f"{SUPABASE_URL}/rest/v1/reminders",
+                params={"id": f"in.({','.join(reminder_ids)})"},
+                headers=_headers(),
+                json=fields,
+                timeout=10
+            )
+            response.raise_for_status()
+            logger.debug(f"Updated {len(reminder_ids)} reminder(s): {sorted(fields)}")
+            return True
+    except Exception as e:
+        logger.error(f"Failed to update reminders {reminder_ids}: {e}")
+        return False
+
+
+async def mark_reminders_fired(reminder_ids: list[str]) -> bool:
+    """Batched mark_reminder_fired() for reminders due on the same tick."""
+    return await update_reminders(reminder_ids, {"fired_at": datetime.utcnow().isoformat()})
@@ -0,0 +1,159 @@
+"""Hierarchical timing wheel.
+
+Keys are bucketed by deadline into ``levels`` wheels of ``slots`` slots each;
+level L's slots are ``slots**L`` ticks wide. A key sits in the lowest level
+whose window reaches its deadline and is cascaded down a level when the
+wheel turns into its slot, so adding, removing and expiring a key are O(1)
+and ``advance`` only touches slots that hold something. Keys further out
+than the top level's window wait in an overflow set until they fit.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+
+
+class TimingWheel:
+    """Deadline-keyed timer set with one-tick resolution.
+
+    Args:
+        tick: seconds per tick (the firing resolution).
+        slots: slots per level.
+        levels: number of levels; the window is tick * slots**levels.
+        start: time the wheel starts turning from.
+    """
+
+    def __init__(self, tick: float = 1.0, slots: int = 64, levels: int = 4, start: float = 0.0):
+        self.tick = tick
+        self.slots = slots
+        self.levels = levels
+        self._spans = [slots ** level for level in range(levels)]
+        self._wheels: list[list[set[str]]] = [[set() for _ in range(slots)] for _ in range(levels)]
+        self._counts = [0] * levels
+        self._overflow: set[str] = set()
+        self._ready: set[str] = set()
+        # key -> (deadline, tick, level or -1 for overflow / -2 for ready)
+        self._entries: dict[str, tuple[float, int, int]] = {}
+        self._current = self._to_tick(start)
+
+    def _to_tick(self, t: float) -> int:
+        return math.floor(t / self.tick)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def deadline(self, key: str) -> float | None:
+        entry = self._entries.get(key)
+        return entry[0] if entry else None
+
+    # -- insert / remove -------------------------------------------------
+
+    def add(self, key: str, deadline: float) -> None:
+        """Schedule (or reschedule) `key` to expire at `deadline`."""
+        self.remove(key)
+        # Round deadlines up so nothing expires early
+        self._place(key, deadline, math.ceil(deadline / self.tick))
+
+    def _place(self, key: str, deadline: float, t: int) -> None:
+        if t < self._current:
+            self._ready.add(key)
+            self._entries[key] = (deadline, t, -2)
+            return
+        for level, span in enumerate(self._spans):
+            if t // span - self._current // span < self.slots:
+                self._wheels[level][(t // span) % self.slots].add(key)
+                self._counts[level] += 1
+                self._entries[key] = (deadline, t, level)
+                return
+        self._overflow.add(key)
+        self._entries[key] = (deadline, t, -1)
+
+    def remove(self, key: str) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        _, t, level = entry
+        if level == -2:
+            self._ready.discard(key)
+        elif level == -1:
+            self._overflow.discard(key)
+        else:
+            self._wheels[level][(t // self._spans[level]) % self.slots].discard(key)
+            self._counts[level] -= 1
+        return True
+
+    # -- turning ---------------------------------------------------------
+
+    def advance(self, now: float) -> list[str]:
+        """Turn the wheel up to `now`; returns expired keys, earliest first."""
+        target = self._to_tick(now)
+        due = list(self._ready)
+        self._ready.clear()
+        while self._current <= target:
+            c = self._current
+            # Cascade higher levels entering a new slot, top down, so their
+            # keys can land in level 0 at this same tick
+            if self._overflow and c % self._spans[-1] == 0:
+                waiting, self._overflow = self._overflow, set()
+                for key in waiting:
+                    deadline, t, _ = self._entries.pop(key)
+                    self._place(key, deadline, t)
+            for level in range(self.levels - 1, 0, -1):
+                span = self._spans[level]
+                if self._counts[level] and c % span == 0:
+                    bucket = self._wheels[level][(c // span) % self.slots]
+                    moving = list(bucket)
+                    bucket.clear()
+                    self._counts[level] -= len(moving)
+                    for key in moving:
+                        deadline, t, _ = self._entries.pop(key)
+                        self._place(key, deadline, t)
+            bucket = self._wheels[0][c % self.slots]
+            if bucket:
+                due.extend(bucket)
+                self._counts[0] -= len(bucket)
+                bucket.clear()
+            self._current = min(target + 1, self._next_event_tick(c + 1))
+        due.sort(key=lambda k: self._entries[k][0])
+        for key in due:
+            del self._entries[key]
+        return due
+
+    def _next_event_tick(self, c: int) -> int:
+        """First tick >= c at which advance() has anything to do."""
+        best = math.inf
+        if self._counts[0]:
+            for t in range(c, c + self.slots):
+                if self._wheels[0][t % self.slots]:
+                    best = t
+                    break
+        for level in range(1, self.levels):
+            if not self._counts[level]:
+                continue
+            span = self._spans[level]
+            first = -(-c // span)  # first slot boundary at or after c
+            for n in range(first, first + self.slots):
+                if self._wheels[level][n % self.slots]:
+                    best = min(best, n * span)
+                    break
+        if self._overflow:
+            top = self._spans[-1]
+            best = min(best, -(-c // top) * top)
+        return best if best != math.inf else c + self._spans[-1] * self.slots
+
+    def next_wakeup(self) -> float | None:
+        """Earliest time advance() could return something (None if empty)."""
+        if not self._entries:
+            return None
+        if self._ready:
+            return self._current * self.tick
+        return self._next_event_tick(self._current) * self.tick
+
+    def upcoming(self, limit: int = 20) -> list[tuple[str, float]]:
+        """The `limit` soonest (key, deadline) pairs."""
+        return heapq.nsmallest(limit, ((k, e[0]) for k, e in self._entries.items()),
+                               key=lambda kv: kv[1])
@@ -64,6 +64,10 @@ OAUTH_ENV_SH = (
 # Temp directory for downloaded attachments (images, files)
 ATTACHMENT_TEMP_DIR = Path(__file__).parent.parent.parent / "data" / "tmp" / "attachments"
 
+# Hadley API batch voice endpoint — Discord voice notes share its voice worker
+# queue (background priority) with WhatsApp notes instead of loading whisper here
+VOICE_LISTEN_BATCH_URL = "http://127.0.0.1:8100/voice/listen/batch"
+
 # Cost log file — JSONL for easy analysis
 COST_LOG_PATH = Path(__file__).parent.parent.parent / "data" / "cli_costs.jsonl"
 
@@ -201,6 +205,50 @@ def _windows_to_wsl_path(win_path: Path) -> str:
     return posix
 
 
+async def _transcribe_voice_notes(clips: list[tuple[bytes, str]]) -> list[Optional[str]]:
+    """Transcribe voice notes in one batch via Hadley API's voice worker.
+
+    Uses /voice/listen/batch at background priority, so Discord notes share
+    the worker queue with WhatsApp ones. Falls back to transcribing in a
+    thread if Hadley API is unreachable — never via the voice worker pool,
+    which would spin up a process pool inside the bot.
+
+    Returns:
+        Transcription per clip, in order — None where that clip failed.
+    """
+    import base64
+
+    results = None
+    try:
+        async with aiohttp.ClientSession() as session:
+            async with session.post(
+                VOICE_LISTEN_BATCH_URL,
+                json={
+                    "priority": "background",
+                    "clips": [
+                        {"audio_b64": base64.b64encode(data).decode(), "format": fmt}
+                        for data, fmt in clips
+                    ],
+                },
+                timeout=aiohttp.ClientTimeout(total=300),
+            ) as resp:
+                if resp.status == 200:
+                    results = (await resp.json()).get("results", [])
+                else:
+                    logger.warning(f"Hadley voice/listen/batch returned HTTP {resp.status}, transcribing locally")
+    except aiohttp.ClientConnectionError as e:
+        logger.warning(f"Hadley voice/listen/batch unreachable ({e}), transcribing locally")
+
+    if results is None:
+        from hadley_api.voice_engine import transcribe_batch_sync
+        results = await asyncio.to_thread(transcribe_batch_sync, clips)
+
+    for r in results:
+        if r.get("error"):
+            logger.error(f"Voice note transcription failed: {r['error']}")
+    return [None if r.get("error") else r.get("text", "") for r in results]
+
+
 async def _download_attachments(
     attachment_urls: list[dict],
 ) -> tuple[list[dict], list[Path]]:
@@ -210,22 +258,23 @@ async def _download_attachments(
     Claude and reference local file paths instead.
     Audio attachments (voice notes) are transcribed via faster-whisper and
     the transcription is added as a text field on the attachment dict.
+    Downloads run concurrently and all voice notes in the message are
+    transcribed in a single batch.
 
     Returns:
         (updated_attachments, temp_files_to_cleanup)
     """
     ATTACHMENT_TEMP_DIR.mkdir(parents=True, exist_ok=True)
-    updated = []
     temp_files = []
+    voice_clips: list[tuple[int, bytes, str]] = []  # (index in updated, bytes, format)
 
-    for att in attachment_urls:
+    async def _download(session: aiohttp.ClientSession, att: dict) -> tuple[dict, Optional[bytes], str]:
         content_type = att.get("content_type", "")
         is_image = content_type.startswith("image/")
         is_audio = content_type.startswith("audio/")
 
         if not is_image and not is_audio:
-            updated.append(att)
-            continue
+            return att, None, ""
 
         # Download to temp file
         ext = Path(att.get("filename", "file")).suffix or (".jpg" if is_image else ".ogg")
@@ -233,41 +282,45 @@ async def _download_attachments(
         temp_path = ATTACHMENT_TEMP_DIR / temp_name
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(att["url"], timeout=aiohttp.ClientTimeout(total=30)) as resp:
-                    if resp.status == 200:
-                        data = await resp.read()
-                        temp_path.write_bytes(data)
-                        temp_files.append(temp_path)
-
-                        if is_image:
-                            wsl_path = _windows_to_wsl_path(temp_path)
-                            updated.append({
-                                **att,
-                                "local_path": wsl_path,
-                            })
-                        elif is_audio:
-                            # Transcribe voice note
-                            try:
-                                from hadley_api.voice_engine import transcribe
-                                source_fmt = ext.lstrip(".") or "ogg"
-                                transcription = await transcribe(data, source_format=source_fmt)
-                                logger.info(f"Voice note transcribed ({len(data)} bytes): {transcription[:100]}")
-                                updated.append({
-                                    **att,
-                                    "transcription": transcription,
-                                })
-                            except Exception as e:
-                                logger.error(f"Voice note transcription failed: {e}")
-                                updated.append({**att, "transcription": "[Voice note — transcription failed]"})
-
-                        logger.info(f"Downloaded attachment {att.get('filename', '?')} ({len(data)} bytes)")
-                    else:
-                        logger.warning(f"Attachment download failed: HTTP {resp.status}")
-                        updated.append(att)
+            async with session.get(att["url"], timeout=aiohttp.ClientTimeout(total=30)) as resp:
+                if resp.status != 200:
+                    logger.warning(f"Attachment download failed: HTTP {resp.status}")
+                    return att, None, ""
+                data = await resp.read()
         except Exception as e:
             logger.warning(f"Attachment download failed: {e}")
-            updated.append(att)
+            return att, None, ""
+
+        temp_path.write_bytes(data)
+        temp_files.append(temp_path)
+        logger.info(f"Downloaded attachment {att.get('filename', '?')} ({len(data)} bytes)")
+
+        if is_image:
+            return {**att, "local_path": _windows_to_wsl_path(temp_path)}, None, ""
+        return att, data, ext.lstrip(".") or "ogg"
+
+    async with aiohttp.ClientSession() as session:
+        downloaded = await asyncio.gather(*(_download(session, att) for att in attachment_urls))
+
+    updated = []
+    for att, audio, source_fmt in downloaded:
+        if audio is not None:
+            voice_clips.append((len(updated), audio, source_fmt))
+        updated.append(att)
+
+    if voice_clips:
+        try:
+            transcriptions = await _transcribe_voice_notes([(data, fmt) for _, data, fmt in voice_clips])
+        except Exception as e:
+            logger.error(f"Voice note transcription failed: {e}")
+            transcriptions = [None] * len(voice_clips)
+
+        for (idx, data, _), transcription in zip(voice_clips, transcriptions):
+            if transcription is None:
+                transcription = "[Voice note — transcription failed]"
+            else:
+                logger.info(f"Voice note transcribed ({len(data)} bytes): {transcription[:100]}")
+            updated[idx] = {**updated[idx], "transcription": transcription}
 
     return updated, temp_files
 
@@ -9,7 +9,7 @@ import json
 import re
 import yaml
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
 from typing import Optional, Callable, Any
 from zoneinfo import ZoneInfo
@@ -142,7 +142,7 @@ class PeterbotScheduler:
         self._reload_trigger_path = Path(__file__).parent.parent.parent / "data" / "schedule_reload.trigger"
         self._skill_run_trigger_path = Path(__file__).parent.parent.parent / "data" / "skill_run.trigger"
 
-        # News article history log for deduplication
+        # Legacy news history log (imported once into the news store for deduplication)
         self._news_history_path = Path(__file__).parent.parent.parent / "data" / "news_history.jsonl"
 
         # Active skill context for cross-channel injection (conversational jobs)
@@ -153,43 +153,39 @@ class PeterbotScheduler:
         self.data_fetchers = fetchers
 
     def _save_news_history(self, response: str) -> None:
-        """Append a successful news response to the history log."""
-        entry = {
-            "timestamp": datetime.now(UK_TZ).isoformat(),
-            "response": response,
-        }
-        try:
-            self._news_history_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(self._news_history_path, "a", encoding="utf-8") as f:
-                f.write(json.dumps(entry) + "\n")
-        except Exception as e:
-            logger.debug(f"News history write failed: {e}")
+        """Log a successful news response (and the links it covered) in the news store."""
+        from domains.news.services.store import safe_record_briefing
+        safe_record_briefing(response)
+
+    def _import_legacy_news_history(self, store) -> None:
+        """One-off import of data/news_history.jsonl into an empty news store."""
+        if not self._news_history_path.exists() or store.has_briefings():
+            return
+        imported = 0
+        with open(self._news_history_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    ts = datetime.fromisoformat(entry["timestamp"])
+                    store.record_briefing(entry["response"], sent_at=ts.timestamp())
+                    imported += 1
+                except (json.JSONDecodeError, KeyError, ValueError):
+                    continue
+        logger.info(f"Imported {imported} news history entries into the news store")
 
     def _load_news_history(self, days: int = 7) -> str:
         """Load recent news history for deduplication context.
 
         Returns a markdown section listing previously covered articles,
-        or empty string if no history exists.
+        or empty string if no history exists. Briefings whose links were
+        extracted are listed by link; others fall back to their full text.
         """
-        if not self._news_history_path.exists():
-            return ""
-
-        cutoff = datetime.now(UK_TZ) - timedelta(days=days)
-        recent_entries = []
+        from domains.news.services.store import get_store
 
         try:
-            with open(self._news_history_path, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        entry = json.loads(line)
-                        ts = datetime.fromisoformat(entry["timestamp"])
-                        if ts >= cutoff:
-                            recent_entries.append(entry)
-                    except (json.JSONDecodeError, KeyError, ValueError):
-                        continue
+            store = get_store()
+            self._import_legacy_news_history(store)
+            recent_entries = store.recent_briefings(days)
         except Exception as e:
             logger.debug(f"News history read failed: {e}")
             return ""
@@ -198,14 +194,19 @@ class PeterbotScheduler:
             return ""
 
         parts = [
-            "## Previously Covered Articles (last 7 days)",
+            f"## Previously Covered Articles (last {days} days)",
             "Do NOT repeat these stories. Find fresh news instead.",
             "",
         ]
         for entry in recent_entries:
-            ts = datetime.fromisoformat(entry["timestamp"])
+            ts = datetime.fromtimestamp(entry["sent_at"], UK_TZ)
             parts.append(f"### {ts.strftime('%A %d %b %H:%M')}")
-            parts.append(entry["response"])
+            if entry["links"]:
+                for link in entry["links"]:
+                    parts.append(f"- {link['title']} <{link['url']}>" if link["title"]
+                                 else f"- <{link['url']}>")
+            else:
+                parts.append(entry["response"])
             parts.append("")
 
         return "\n".join(parts)
@@ -293,16 +294,65 @@ class PeterbotScheduler:
         # Load fresh schedule
         return self.load_schedule()
 
-    def start_reload_watcher(self):
-        """Register a periodic check for API-triggered reload requests."""
+    def start_reload_watcher(self, interval_seconds: int = 10):
+        """Register a periodic check for API-triggered reload requests.
+
+        With the event bus up, trigger files are only written when an event
+        couldn't be delivered, so the watcher becomes a slow fallback sweep.
+        """
         self.scheduler.add_job(
             self._check_reload_trigger,
-            IntervalTrigger(seconds=10),
+            IntervalTrigger(seconds=interval_seconds),
             id="__reload_watcher",
             max_instances=1,
             replace_existing=True,
         )
-        logger.info("Schedule reload watcher started (checks every 10s)")
+        logger.info(f"Schedule reload watcher started (checks every {interval_seconds}s)")
+
+    def register_event_handlers(self, bus) -> None:
+        """Handle reload and skill-run events pushed by Hadley API."""
+        from services import bot_events
+
+        async def on_reload(payload: dict):
+            self._handle_reload(payload.get("reason", ""))
+
+        async def on_skill_run(payload: dict):
+            await self._handle_skill_run(payload["skill"], payload.get("channel") or "#peterbot")
+
+        bus.subscribe(bot_events.SCHEDULE_RELOAD, on_reload)
+        bus.subscribe(bot_events.SKILL_RUN, on_skill_run)
+
+    def _handle_reload(self, reason: str) -> None:
+        logger.info(f"Schedule reload triggered via API: {reason}")
+        job_count = self.reload_schedule()
+        logger.info(f"Schedule reloaded: {job_count} jobs registered")
+
+    async def _handle_skill_run(self, skill_name: str, channel: str) -> None:
+        logger.info(f"Skill run triggered via API: {skill_name} -> {channel}")
+
+        # Build a job config and execute
+        import re as _re
+        whatsapp = False
+        whatsapp_target = ""
+        wa_match = _re.search(r'\+[Ww]hats[Aa]pp(?::(\w+))?', channel)
+        if wa_match:
+            whatsapp = True
+            whatsapp_target = (wa_match.group(1) or "").lower()
+            channel = channel[:wa_match.start()] + channel[wa_match.end():]
+            channel = channel.strip()
+
+        job = JobConfig(
+            name=f"Manual: {skill_name}",
+            skill=skill_name,
+            schedule="manual",
+            channel=channel,
+            enabled=True,
+            job_type="manual",
+            whatsapp=whatsapp,
+            whatsapp_target=whatsapp_target,
+            exempt_quiet_hours=True,  # Manual runs always bypass quiet hours
+        )
+        await self._execute_job_internal(job)
 
     async def _check_reload_trigger(self):
         """Check for trigger files from Hadley API and process if found."""
@@ -311,9 +361,7 @@ class PeterbotScheduler:
             try:
                 reason = self._reload_trigger_path.read_text(encoding="utf-8").strip()
                 self._reload_trigger_path.unlink()
-                logger.info(f"Schedule reload triggered via API: {reason}")
-                job_count = self.reload_schedule()
-                logger.info(f"Schedule reloaded: {job_count} jobs registered")
+                self._handle_reload(reason)
             except Exception as e:
                 logger.error(f"Failed to process reload trigger: {e}")
 
@@ -326,31 +374,7 @@ class PeterbotScheduler:
                 parts = content.split("|", 1)
                 skill_name = parts[0].strip()
                 channel = parts[1].strip() if len(parts) > 1 else "#peterbot"
-                logger.info(f"Skill run triggered via API: {skill_name} -> {channel}")
-
-                # Build a job config and execute
-                import re as _re
-                whatsapp = False
-                whatsapp_target = ""
-                wa_match = _re.search(r'\+[Ww]hats[Aa]pp(?::(\w+))?', channel)
-                if wa_match:
-                    whatsapp = True
-                    whatsapp_target = (wa_match.group(1) or "").lower()
-                    channel = channel[:wa_match.start()] + channel[wa_match.end():]
-                    channel = channel.strip()
-
-                job = JobConfig(
-                    name=f"Manual: {skill_name}",
-                    skill=skill_name,
-                    schedule="manual",
-                    channel=channel,
-                    enabled=True,
-                    job_type="manual",
-                    whatsapp=whatsapp,
-                    whatsapp_target=whatsapp_target,
-                    exempt_quiet_hours=True,  # Manual runs always bypass quiet hours
-                )
-                await self._execute_job_internal(job)
+                await self._handle_skill_run(skill_name, channel)
             except Exception as e:
                 logger.error(f"Failed to process skill run trigger: {e}")
 
@@ -1741,114 +1765,3 @@ class PeterbotScheduler:
         ])
 
         return "\n".join(parts)
-
-    # --- Nag Reminder Checker ---
-
-    def start_nag_checker(self):
-        """Register a 60-second interval job to check and fire nag reminders."""
-        self.scheduler.add_job(
-            self._nag_reminder_checker,
-            IntervalTrigger(seconds=60),
-            id="__nag_checker",
-            max_instances=1,
-            replace_existing=True,
-        )
-        logger.info("Nag reminder checker started (checks every 60s)")
-
-    async def _nag_reminder_checker(self):
-        """Check for due nag reminders and send WhatsApp messages."""
-        import httpx
-
-        API_BASE = "http://172.19.64.1:8100"
-        now = datetime.now(UK_TZ)
-
-        try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                resp = await client.get(f"{API_BASE}/reminders/active-nags")
-                if resp.status_code != 200:
-                    return
-                nags = resp.json()
-        except Exception as e:
-            logger.debug(f"Nag checker: failed to fetch active nags: {e}")
-            return
-
-        for nag in nags:
-            try:
-                nag_id = nag["id"]
-                task = nag.get("task", "")
-                delivery = nag.get("delivery", "discord")
-                interval = nag.get("interval_minutes") or 120
-                nag_until = nag.get("nag_until")
-                last_nagged = nag.get("last_nagged_at")
-
-                # Check if past nag_until time — auto-acknowledge
-                if nag_until:
-                    try:
-                        end_hour, end_min = map(int, nag_until.split(":"))
-                        end_time = now.replace(hour=end_hour, minute=end_min, second=0)
-                        if now >= end_time:
-                            async with httpx.AsyncClient(timeout=10.0) as client:
-                                await client.post(f"{API_BASE}/reminders/{nag_id}/acknowledge")
-                            if delivery.startswith("whatsapp:"):
-                                target = delivery.split(":", 1)[1]
-                                await self._send_nag_whatsapp(
-                                    target, f"Wrapping up nag for today: *{task}* — no more reminders until tomorrow 👋"
-                                )
-                            logger.info(f"Nag {nag_id} auto-acknowledged (past {nag_until})")
-                            continue
-                    except (ValueError, AttributeError):
-                        pass
-
-                # Check if it's time to nag again
-                should_nag = False
-                if last_nagged is None:
-                    should_nag = True
-                else:
-                    from dateutil.parser import parse as parse_dt
-                    last = parse_dt(last_nagged)
-                    if last.tzinfo is None:
-                        last = last.replace(tzinfo=UK_TZ)
-                    if (now - last).total_seconds() >= interval * 60:
-                        should_nag = True
-
-                if not should_nag:
-                    continue
-
-                # Send the nag via WhatsApp
-                if delivery.startswith("whatsapp:"):
-                    target = delivery.split(":", 1)[1]
-                    await self._send_nag_whatsapp(target, f"Hey — {task} 💪\nReply *done* when you've finished.")
-                    logger.info(f"Nag sent via WhatsApp to {target}: {task[:50]}")
-                else:
-                    logger.debug(f"Nag {nag_id}: delivery={delivery} not handled by checker")
-                    continue
-
-                # Update last_nagged_at and fired_at
-                try:
-                    update_fields = {"last_nagged_at": now.isoformat()}
-                    if not nag.get("fired_at"):
-                        update_fields["fired_at"] = now.isoformat()
-                    async with httpx.AsyncClient(timeout=10.0) as client:
-                        await client.patch(
-                            f"{API_BASE}/reminders/{nag_id}",
-                            json=update_fields,
-                        )
-                except Exception:
-                    pass
-
-            except Exception as e:
-                logger.debug(f"Nag checker error for {nag.get('id', '?')}: {e}")
-
-    @staticmethod
-    async def _send_nag_whatsapp(target: str, message: str):
-        """Send a WhatsApp nag message to a target (chris, abby, group)."""
-        from integrations.whatsapp import send_text, send_to_chris, send_to_abby, send_to_group
-
-        if target == "chris":
-            await send_to_chris(message)
-        elif target == "abby":
-            await send_to_abby(message)
-        elif target == "group":
-            await send_to_group("extended-team", message)
-        else:
-            await send_text(target, message)
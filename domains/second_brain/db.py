@@ -6,9 +6,9 @@ from datetime import datetime, timedelta, timezone
 from typing import Optional
 from uuid import UUID
 
-import httpx
 
 from config import SUPABASE_URL, SUPABASE_KEY
+from integrations.supabase_rest import get_supabase
 from logger import logger
 from .config import (
     EMBEDDING_DIMENSIONS,
@@ -35,18 +35,9 @@ from .types import (
 # Shared HTTP client
 # ---------------------------------------------------------------------------
 
-_http_client: httpx.AsyncClient | None = None
-
-
-def _get_http_client() -> httpx.AsyncClient:
-    """Get or create a shared httpx client for Supabase REST calls."""
-    global _http_client
-    if _http_client is None or _http_client.is_closed:
-        _http_client = httpx.AsyncClient(
-            timeout=30,
-            limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
-        )
-    return _http_client
+def _get_http_client():
+    """Get the shared pooled Supabase client (see integrations.supabase_rest)."""
+    return get_supabase(SUPABASE_URL, SUPABASE_KEY).pooled(timeout=30)
 
 
 def _get_headers() -> dict[str, str]:
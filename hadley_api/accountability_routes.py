@@ -21,6 +21,7 @@ from domains.accountability.service import (
     add_milestone,
     get_milestones,
     log_progress,
+    log_progress_many,
     get_progress,
     get_daily_summary,
     get_report_data,
@@ -71,6 +72,14 @@ class LogProgressRequest(BaseModel):
     date: Optional[str] = None
 
 
+class BatchProgressItem(LogProgressRequest):
+    goal_id: str
+
+
+class LogProgressBatchRequest(BaseModel):
+    entries: list[BatchProgressItem]
+
+
 # ── Goals ────────────────────────────────────────────────────────────────
 
 
@@ -211,6 +220,23 @@ async def log_progress_endpoint(goal_id: str, req: LogProgressRequest):
     return JSONResponse({"error": "Failed to log progress"}, status_code=500)
 
 
+@router.post("/progress/batch", dependencies=[Depends(require_auth)])
+async def log_progress_batch_endpoint(req: LogProgressBatchRequest):
+    """Log progress for several goals in one call."""
+    entries = await log_progress_many([
+        {
+            "goal_id": item.goal_id,
+            "value": item.value,
+            "source": item.source,
+            "note": item.note,
+            "log_date": item.date,
+        }
+        for item in req.entries
+    ])
+    logged = sum(1 for e in entries if e)
+    return {"logged": logged, "failed": len(entries) - logged, "entries": entries}
+
+
 @router.get("/goals/{goal_id}/progress", dependencies=[Depends(require_auth)])
 async def get_progress_endpoint(
     goal_id: str,
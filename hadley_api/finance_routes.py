@@ -6,6 +6,7 @@ financial data via curl when MCP servers aren't available.
 All functions return pre-formatted markdown strings (same output as MCP tools).
 """
 
+import asyncio
 import os
 import sys
 from typing import Optional
@@ -32,6 +33,7 @@ def _personal():
     from financial_data.personal_finance import (
         net_worth, budget_status, spending_by_category, savings_rate,
         fire_status, find_recurring, search_transactions, transactions_by_category,
+        compare_spending,
     )
     return {
         "net_worth": net_worth,
@@ -42,6 +44,7 @@ def _personal():
         "find_recurring": find_recurring,
         "search_transactions": search_transactions,
         "transactions_by_category": transactions_by_category,
+        "compare_spending": compare_spending,
     }
 
 
@@ -156,42 +159,7 @@ async def compare_spending(
     period_b: str = Query(...),
 ):
     """Compare spending between two periods."""
-    from financial_data.config import get_date_range
-    from financial_data.supabase_client import finance_rpc, finance_query
-    from financial_data.formatters import gbp, md_table, safe_float, period_label
-
-    excluded_cats = await finance_query("categories", {
-        "exclude_from_totals": "eq.true",
-        "select": "id",
-    })
-    excluded_ids = [c["id"] for c in excluded_cats]
-
-    start_a, end_a = get_date_range(period_a)
-    start_b, end_b = get_date_range(period_b)
-
-    rows_a = await finance_rpc("get_spending_by_category", {
-        "start_date": start_a, "end_date": end_a, "excluded_ids": excluded_ids,
-    })
-    rows_b = await finance_rpc("get_spending_by_category", {
-        "start_date": start_b, "end_date": end_b, "excluded_ids": excluded_ids,
-    })
-
-    map_a = {r["category_name"]: safe_float(r["total_amount"]) for r in rows_a}
-    map_b = {r["category_name"]: safe_float(r["total_amount"]) for r in rows_b}
-    all_cats = sorted(set(map_a.keys()) | set(map_b.keys()))
-
-    table_rows = []
-    for cat in all_cats:
-        a, b = map_a.get(cat, 0), map_b.get(cat, 0)
-        table_rows.append([cat, gbp(a), gbp(b), gbp(a - b, show_sign=True)])
-
-    total_a, total_b = sum(map_a.values()), sum(map_b.values())
-    table_rows.append(["**Total**", f"**{gbp(total_a)}**", f"**{gbp(total_b)}**",
-                        f"**{gbp(total_a - total_b, show_sign=True)}**"])
-
-    output = f"# Spending Comparison: {period_label(period_a)} vs {period_label(period_b)}\n\n"
-    output += md_table(["Category", period_label(period_a), period_label(period_b), "Difference"], table_rows)
-    return {"result": output}
+    return {"result": await _personal()["compare_spending"](period_a, period_b)}
 
 
 @router.get("/health")
@@ -200,17 +168,17 @@ async def get_financial_health():
     pf = _personal()
     bf = _business()
 
-    sections = []
-    for name, fn, args in [
+    parts = [
         ("Net Worth", pf["net_worth"], ()),
         ("Budget Status", pf["budget_status"], (None, None)),
         ("Savings Rate", pf["savings_rate"], (None, None)),
         ("FIRE Status", pf["fire_status"], (None,)),
         ("Business P&L", bf["business_pnl"], (None, None)),
-    ]:
-        try:
-            sections.append(await fn(*args))
-        except Exception as e:
-            sections.append(f"## {name}\n\nFailed to load: {e}")
+    ]
+    results = await asyncio.gather(*(fn(*args) for _, fn, args in parts), return_exceptions=True)
+    sections = [
+        f"## {name}\n\nFailed to load: {res}" if isinstance(res, Exception) else res
+        for (name, _, _), res in zip(parts, results)
+    ]
 
     return {"result": "\n\n---\n\n".join(sections)}
@@ -8,6 +8,7 @@ Endpoints:
     GET  /flights/history        — price history for a route+date
     GET  /flights/deals          — current deal alerts
     GET  /flights/summary        — monitoring summary stats
+    GET  /flights/plan           — per date-pair coverage/staleness and next scan's picks
     POST /flights/check-now      — trigger an on-demand price scan
 """
 
@@ -85,6 +86,25 @@ async def get_summary(days_back: int = Query(7)):
     return monitor.get_summary(days_back=days_back)
 
 
+@router.get("/plan")
+async def get_plan(
+    route_id: Optional[int] = Query(None),
+    budget: Optional[int] = Query(None, ge=0),
+):
+    """Coverage and staleness per date pair, and which pairs the next scan would search."""
+    monitor = _get_monitor()
+    routes = [r for r in monitor.get_routes() if route_id is None or r["id"] == route_id]
+    plans = monitor.plan_scan(routes, budget=budget)
+    checked = sum(1 for p in plans if p["checks"])
+    return {
+        "pairs": plans,
+        "total": len(plans),
+        "covered": checked,
+        "due": sum(1 for p in plans if p["due"]),
+        "selected": sum(1 for p in plans if p["selected"]),
+    }
+
+
 # --- Write endpoints (auth required) ---
 
 @router.post("/routes", dependencies=[Depends(require_auth)])
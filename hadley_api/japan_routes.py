@@ -20,6 +20,7 @@ from typing import Optional
 from zoneinfo import ZoneInfo
 
 import httpx
+from integrations.supabase_rest import get_supabase
 from fastapi import APIRouter, HTTPException, Request
 
 router = APIRouter(prefix="/japan", tags=["Japan 2026"])
@@ -104,7 +105,7 @@ def _load_smtp_config() -> dict:
 @router.get("/day-plans")
 async def get_all_day_plans():
     """Get all day plans."""
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         resp = await client.get(
             f"{SUPABASE_URL}/rest/v1/japan_day_plans",
             headers=_supabase_headers(),
@@ -118,7 +119,7 @@ async def get_all_day_plans():
 @router.get("/day-plans/{date}")
 async def get_day_plan(date: str):
     """Get plan for a specific date (YYYY-MM-DD)."""
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         resp = await client.get(
             f"{SUPABASE_URL}/rest/v1/japan_day_plans",
             headers=_supabase_headers(),
@@ -138,7 +139,7 @@ async def update_day_plan(date: str, request: Request):
     body = await request.json()
     body["updated_at"] = datetime.now(JAPAN_TZ).isoformat()
 
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         resp = await client.patch(
             f"{SUPABASE_URL}/rest/v1/japan_day_plans",
             headers=_supabase_headers(),
@@ -598,7 +599,7 @@ async def send_digest(request: Request):
         raise HTTPException(status_code=400, detail="Invalid date format, use YYYY-MM-DD")
 
     # 1. Fetch day plan from Supabase
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         resp = await client.get(
             f"{SUPABASE_URL}/rest/v1/japan_day_plans",
             headers=_supabase_headers(),
@@ -624,7 +625,7 @@ async def send_digest(request: Request):
     tomorrow_str = tomorrow_dt.strftime("%Y-%m-%d")
     tomorrow_plan = None
     try:
-        async with httpx.AsyncClient() as client:
+        async with get_supabase().session() as client:
             resp2 = await client.get(
                 f"{SUPABASE_URL}/rest/v1/japan_day_plans",
                 headers=_supabase_headers(),
@@ -842,7 +843,7 @@ async def photobook_upload(request: Request):
         "city": DAY_TO_CITY.get(day_number, ""),
     }
 
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         resp = await client.post(
             f"{SUPABASE_URL}/rest/v1/japan_photos",
             headers=_japan_supabase_headers(),
@@ -883,7 +884,7 @@ async def photobook_highlight(request: Request):
         "sent_by": body.get("sender", "Chris"),
     }
 
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         resp = await client.post(
             f"{SUPABASE_URL}/rest/v1/japan_highlights",
             headers=_japan_supabase_headers(),
@@ -923,7 +924,7 @@ async def photobook_diary(request: Request):
         "sent_by": body.get("sender", "Chris"),
     }
 
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         resp = await client.post(
             f"{SUPABASE_URL}/rest/v1/japan_diary",
             headers=_japan_supabase_headers(),
@@ -948,7 +949,7 @@ async def photobook_coverage(day_number: int):
     headers = _japan_supabase_headers()
     results = {}
 
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         # Count photos
         resp = await client.get(
             f"{SUPABASE_URL}/rest/v1/japan_photos",
@@ -1087,7 +1088,7 @@ async def add_expense(request: Request):
         "payment_method": body.get("payment_method", "cash"),
     }
 
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         resp = await client.post(
             f"{SUPABASE_URL}/rest/v1/japan_expenses",
             headers={
@@ -1130,7 +1131,7 @@ async def photobook_compile():
     headers = _japan_supabase_headers()
     days = {}
 
-    async with httpx.AsyncClient(timeout=30) as client:
+    async with get_supabase().session(timeout=30) as client:
         # Fetch all data in parallel
         photos_resp, highlights_resp, diary_resp, plans_resp = await asyncio.gather(
             client.get(f"{SUPABASE_URL}/rest/v1/japan_photos",
@@ -1221,7 +1222,7 @@ async def get_today_expenses():
         if sim:
             today = sim
 
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         resp = await client.get(
             f"{SUPABASE_URL}/rest/v1/japan_expenses",
             headers={**_supabase_headers(), "Accept-Profile": "japan"},
@@ -41,6 +41,14 @@ from hadley_api.whatsapp_webhook import router as whatsapp_router
 app.include_router(whatsapp_router)
 from hadley_api.voice_routes import router as voice_router
 app.include_router(voice_router)
+
+
+@app.on_event("startup")
+async def _start_voice_worker():
+    """Spawn the voice worker pool so models are warm before the first voice note."""
+    from hadley_api.voice_worker import get_worker
+    get_worker().start()
+
 from hadley_api.spelling_routes import router as spelling_router
 app.include_router(spelling_router)
 from hadley_api.japan_routes import router as japan_router
@@ -81,6 +89,13 @@ async def get_current_time():
     }
 
 
+@app.get("/supabase/metrics")
+async def supabase_metrics():
+    """Per-table call counts, retries, rows and latency for the shared Supabase pool."""
+    from integrations.supabase_rest import all_metrics
+    return {"clients": all_metrics()}
+
+
 # ---------------------------------------------------------------------------
 # Service restart endpoint — Peter can restart NSSM services (admin-gated)
 # ---------------------------------------------------------------------------
@@ -1593,6 +1608,22 @@ async def notion_ideas():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/notion/mirror/status")
+async def notion_mirror_status():
+    """Sync lag, page counts and last sync outcome for the local Notion mirror."""
+    from .notion_client import get_mirror
+    return get_mirror().status()
+
+
+@app.on_event("startup")
+async def _start_notion_mirror_sync():
+    """Keep the Notion mirror warm so todo/idea reads never wait on Notion."""
+    from .notion_client import get_mirror, mirrored_database_ids
+    database_ids = mirrored_database_ids()
+    if database_ids:
+        asyncio.create_task(get_mirror().run_sync_loop(database_ids))
+
+
 
 
 # ============================================================
@@ -6531,6 +6562,8 @@ async def brain_delete_item(item_id: str):
 # Schedule Management
 # ============================================================
 
+from services import bot_events
+
 SCHEDULE_PATH = Path(__file__).parent.parent / "domains" / "peterbot" / "wsl_config" / "SCHEDULE.md"
 SCHEDULE_RELOAD_TRIGGER = Path(__file__).parent.parent / "data" / "schedule_reload.trigger"
 
@@ -6575,11 +6608,7 @@ async def update_schedule(body: ScheduleUpdate):
     SCHEDULE_PATH.write_text(body.content, encoding="utf-8")
 
     # Trigger reload
-    SCHEDULE_RELOAD_TRIGGER.parent.mkdir(parents=True, exist_ok=True)
-    SCHEDULE_RELOAD_TRIGGER.write_text(
-        f"{datetime.now(UK_TZ).isoformat()}|{body.reason}",
-        encoding="utf-8"
-    )
+    await _trigger_schedule_reload(body.reason)
 
     return {
         "status": "updated",
@@ -6588,15 +6617,27 @@ async def update_schedule(body: ScheduleUpdate):
     }
 
 
-@app.post("/schedule/reload")
-async def reload_schedule():
-    """Trigger a schedule reload without editing the file."""
+async def _trigger_schedule_reload(reason: str) -> bool:
+    """Push a reload event to the bot, falling back to the trigger file.
+
+    Returns True if the bot received the event (reload is immediate).
+    """
+    if await bot_events.publish(bot_events.SCHEDULE_RELOAD, {"reason": reason}):
+        return True
     SCHEDULE_RELOAD_TRIGGER.parent.mkdir(parents=True, exist_ok=True)
     SCHEDULE_RELOAD_TRIGGER.write_text(
-        f"{datetime.now(UK_TZ).isoformat()}|manual_reload",
+        f"{datetime.now(UK_TZ).isoformat()}|{reason}",
         encoding="utf-8"
     )
-    return {"status": "reload_triggered", "message": "Schedule reload will apply within 10 seconds"}
+    return False
+
+
+@app.post("/schedule/reload")
+async def reload_schedule():
+    """Trigger a schedule reload without editing the file."""
+    if await _trigger_schedule_reload("manual_reload"):
+        return {"status": "reload_triggered", "message": "Schedule reload applied"}
+    return {"status": "reload_triggered", "message": "Schedule reload will apply when the bot next checks"}
 
 
 SKILL_RUN_TRIGGER = Path(__file__).parent.parent / "data" / "skill_run.trigger"
@@ -6610,16 +6651,20 @@ async def run_skill(skill_name: str, channel: str = "#peterbot"):
         skill_name: The skill to run (e.g., tutor-email-parser)
         channel: Target channel (default #peterbot). Supports +WhatsApp:chris etc.
     """
-    SKILL_RUN_TRIGGER.parent.mkdir(parents=True, exist_ok=True)
-    SKILL_RUN_TRIGGER.write_text(
-        f"{skill_name}|{channel}",
-        encoding="utf-8"
-    )
+    if await bot_events.publish(bot_events.SKILL_RUN, {"skill": skill_name, "channel": channel}):
+        message = f"Skill '{skill_name}' started"
+    else:
+        SKILL_RUN_TRIGGER.parent.mkdir(parents=True, exist_ok=True)
+        SKILL_RUN_TRIGGER.write_text(
+            f"{skill_name}|{channel}",
+            encoding="utf-8"
+        )
+        message = f"Skill '{skill_name}' will run when the bot next checks"
     return {
         "status": "triggered",
         "skill": skill_name,
         "channel": channel,
-        "message": f"Skill '{skill_name}' will run within 10 seconds",
+        "message": message,
     }
 
 
@@ -6631,6 +6676,16 @@ SUPABASE_URL = os.environ.get("SUPABASE_URL", "")
 SUPABASE_KEY = os.environ.get("SUPABASE_KEY", "")
 
 
+async def _publish_reminder_event(reminder_id: str, action: str, reminder_type: str | None = None) -> bool:
+    """Tell the bot a reminder changed; its one-minute reconcile covers a missed event."""
+    delivered = await bot_events.publish(bot_events.REMINDER_CHANGED,
+                                         {"id": reminder_id, "action": action, "reminder_type": reminder_type})
+    if not delivered:
+        _logging.getLogger("hadley_api.reminders").warning(
+            f"Reminder {reminder_id} {action}: bot not notified, waiting for its reconcile")
+    return delivered
+
+
 def _supabase_headers():
     """Headers for Supabase REST API."""
     return {
@@ -6729,7 +6784,8 @@ async def create_reminder(body: ReminderCreate):
             )
             resp.raise_for_status()
             created = resp.json()
-            return created[0] if isinstance(created, list) and created else created
+        await _publish_reminder_event(reminder_id, "created", body.reminder_type)
+        return created[0] if isinstance(created, list) and created else created
     except httpx.HTTPStatusError as e:
         raise HTTPException(status_code=e.response.status_code, detail=str(e))
     except Exception as e:
@@ -6785,7 +6841,10 @@ async def update_reminder(reminder_id: str, body: ReminderUpdate):
             result = resp.json()
             if not result:
                 raise HTTPException(status_code=404, detail="Reminder not found or already fired")
-            return result[0] if isinstance(result, list) and result else result
+        # Nag bookkeeping (last_nagged_at/fired_at) is written by the bot's reminder engine
+        if body.task is not None or body.run_at is not None:
+            await _publish_reminder_event(reminder_id, "updated")
+        return result[0] if isinstance(result, list) and result else result
     except HTTPException:
         raise
     except Exception as e:
@@ -6816,7 +6875,8 @@ async def delete_reminder(reminder_id: str):
                 headers=_supabase_headers(),
             )
             resp.raise_for_status()
-            return {"status": "deleted", "id": reminder_id}
+        await _publish_reminder_event(reminder_id, "deleted")
+        return {"status": "deleted", "id": reminder_id}
     except HTTPException:
         raise
     except Exception as e:
@@ -9921,13 +9981,23 @@ async def acknowledge_reminder(reminder_id: str):
             result = resp.json()
             if not result:
                 raise HTTPException(status_code=404, detail="Reminder not found")
-            return {"status": "acknowledged", "reminder": result[0] if isinstance(result, list) else result}
+        await _publish_reminder_event(reminder_id, "acknowledged", "nag")
+        return {"status": "acknowledged", "reminder": result[0] if isinstance(result, list) else result}
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to acknowledge: {e}")
 
 
+@app.get("/reminders/upcoming")
+async def list_upcoming_reminders(limit: int = Query(20, ge=1, le=500)):
+    """Next reminder fires and nags as scheduled in the bot's reminder engine."""
+    state = await bot_events.query("reminders", {"limit": limit})
+    if state is None:
+        raise HTTPException(status_code=503, detail="Bot reminder engine not reachable")
+    return state
+
+
 @app.get("/reminders/active-nags")
 async def list_active_nags(delivery: str = Query(None)):
     """List active nag reminders (fired, not acknowledged).
@@ -1,11 +1,19 @@
-"""Notion API client."""
+"""Notion API client.
+
+Reads (get_todos/get_ideas) are served from a local SQLite mirror that is
+kept in sync incrementally — see notion_mirror.py. Writes go straight to
+Notion and the returned page is applied to the mirror.
+"""
 
 import os
+import time
 import httpx
 from datetime import datetime
 from zoneinfo import ZoneInfo
 from dotenv import load_dotenv
 
+from .notion_mirror import MIRROR_DB_PATH, NotionMirror
+
 # Load .env file
 load_dotenv()
 
@@ -15,6 +23,25 @@ NOTION_IDEAS_DATABASE_ID = os.getenv("NOTION_IDEAS_DATABASE_ID")
 
 UK_TZ = ZoneInfo("Europe/London")
 
+# Database schemas rarely change — cache them so every create/update
+# doesn't cost an extra Notion round trip
+SCHEMA_CACHE_SECONDS = 3600
+_schema_cache: dict[str, tuple[float, dict]] = {}
+
+_mirror: NotionMirror | None = None
+
+
+def get_mirror() -> NotionMirror:
+    """Get or create the process-wide Notion mirror."""
+    global _mirror
+    if _mirror is None:
+        _mirror = NotionMirror(MIRROR_DB_PATH, _notion_request)
+    return _mirror
+
+
+def mirrored_database_ids() -> list[str]:
+    return [db for db in (NOTION_TODOS_DATABASE_ID, NOTION_IDEAS_DATABASE_ID) if db]
+
 
 async def _notion_request(endpoint: str, method: str = "GET", data: dict = None) -> dict:
     """Make a request to Notion API.
@@ -56,20 +83,13 @@ async def get_todos() -> dict:
     if not NOTION_TODOS_DATABASE_ID:
         return {"error": "Notion todos database not configured", "todos": []}
 
-    # Fetch all items first (filtering handled in code for flexibility)
-    result = await _notion_request(
-        f"/databases/{NOTION_TODOS_DATABASE_ID}/query",
-        method="POST",
-        data={
-            "page_size": 100
-        }
-    )
-
+    # Served from the local mirror (filtering handled in code for flexibility)
+    result = await get_mirror().read(NOTION_TODOS_DATABASE_ID)
     if "error" in result:
-        return {"error": result.get("message", "Notion API error"), "todos": []}
+        return {"error": result["error"], "todos": []}
 
     todos = []
-    for page in result.get("results", []):
+    for page in result["pages"]:
         props = page.get("properties", {})
 
         # Extract status (handles both "status" and "select" property types)
@@ -129,7 +149,9 @@ async def get_todos() -> dict:
     return {
         "todos": todos,
         "count": len(todos),
-        "fetched_at": datetime.now(UK_TZ).isoformat()
+        "fetched_at": datetime.now(UK_TZ).isoformat(),
+        "synced_at": result["synced_at"],
+        "sync_lag_seconds": result["sync_lag_seconds"],
     }
 
 
@@ -138,20 +160,13 @@ async def get_ideas() -> dict:
     if not NOTION_IDEAS_DATABASE_ID:
         return {"error": "Notion ideas database not configured", "ideas": []}
 
-    result = await _notion_request(
-        f"/databases/{NOTION_IDEAS_DATABASE_ID}/query",
-        method="POST",
-        data={
-            "sorts": [{"timestamp": "created_time", "direction": "descending"}],
-            "page_size": 20
-        }
-    )
-
+    # Mirror returns newest first; keep the 20 most recent as before
+    result = await get_mirror().read(NOTION_IDEAS_DATABASE_ID)
     if "error" in result:
-        return {"error": result.get("message", "Notion API error"), "ideas": []}
+        return {"error": result["error"], "ideas": []}
 
     ideas = []
-    for page in result.get("results", []):
+    for page in result["pages"][:20]:
         props = page.get("properties", {})
 
         # Extract title
@@ -178,7 +193,9 @@ async def get_ideas() -> dict:
     return {
         "ideas": ideas,
         "count": len(ideas),
-        "fetched_at": datetime.now(UK_TZ).isoformat()
+        "fetched_at": datetime.now(UK_TZ).isoformat(),
+        "synced_at": result["synced_at"],
+        "sync_lag_seconds": result["sync_lag_seconds"],
     }
 
 
@@ -187,11 +204,16 @@ async def get_ideas() -> dict:
 # =============================================================================
 
 async def get_database_schema(database_id: str) -> dict:
-    """Get the schema (properties) of a Notion database."""
+    """Get the schema (properties) of a Notion database (cached for an hour)."""
+    cached = _schema_cache.get(database_id)
+    if cached and time.monotonic() - cached[0] < SCHEMA_CACHE_SECONDS:
+        return cached[1]
     result = await _notion_request(f"/databases/{database_id}", method="GET")
     if "error" in result or result.get("object") == "error":
         return {"error": result.get("message", "Failed to get database schema")}
-    return result.get("properties", {})
+    properties = result.get("properties", {})
+    _schema_cache[database_id] = (time.monotonic(), properties)
+    return properties
 
 
 def find_property_name(schema: dict, candidates: list, prop_type: str = None) -> str | None:
@@ -288,6 +310,8 @@ async def create_todo(
             "code": result.get("code")
         }
 
+    get_mirror().apply_page(NOTION_TODOS_DATABASE_ID, result)
+
     return {
         "success": True,
         "id": result.get("id"),
@@ -372,6 +396,8 @@ async def update_todo(
             "code": result.get("code")
         }
 
+    get_mirror().apply_page(NOTION_TODOS_DATABASE_ID, result)
+
     return {
         "success": True,
         "id": result.get("id"),
@@ -398,6 +424,8 @@ async def delete_todo(todo_id: str) -> dict:
             "code": result.get("code")
         }
 
+    get_mirror().apply_page(NOTION_TODOS_DATABASE_ID, result)
+
     return {
         "success": True,
         "id": todo_id,
@@ -475,6 +503,8 @@ async def create_idea(
             "code": result.get("code")
         }
 
+    get_mirror().apply_page(NOTION_IDEAS_DATABASE_ID, result)
+
     return {
         "success": True,
         "id": result.get("id"),
@@ -544,6 +574,8 @@ async def update_idea(
             "code": result.get("code")
         }
 
+    get_mirror().apply_page(NOTION_IDEAS_DATABASE_ID, result)
+
     return {
         "success": True,
         "id": result.get("id"),
@@ -570,6 +602,8 @@ async def delete_idea(idea_id: str) -> dict:
             "code": result.get("code")
         }
 
+    get_mirror().apply_page(NOTION_IDEAS_DATABASE_ID, result)
+
     return {
         "success": True,
         "id": idea_id,
@@ -0,0 +1,329 @@
+"""Local SQLite mirror of the Notion databases Peter reads.
+
+/notion/todos and /notion/ideas used to query Notion on every call, which
+is slow (1-3s) and trips Notion's rate limit when the morning skills all
+fire together. Instead, each database is mirrored into SQLite:
+
+- Incremental sync: only pages with last_edited_time on or after the last
+  cursor are fetched (Notion's timestamp filter), paginated.
+- Periodic full resync: Notion's query endpoint never returns archived
+  pages, so pages archived in the Notion UI are only noticed by a full
+  pass that drops rows it didn't see.
+- Request coalescing: concurrent callers that need the same database
+  synced share one in-flight sync instead of each querying Notion.
+- Writes go to Notion first; the page object Notion returns is applied to
+  the mirror straight away so reads see the change immediately.
+
+Sync lag (seconds since the last successful sync) is reported per database
+by status().
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+MIRROR_DB_PATH = Path(__file__).parent.parent / "data" / "notion_mirror.db"
+
+# Serve from the mirror without syncing if the last sync is this recent
+SYNC_MAX_AGE_SECONDS = 60
+# Do a full pass (to catch pages archived in Notion) this often
+FULL_RESYNC_SECONDS = 30 * 60
+# Background loop interval (see run_sync_loop)
+SYNC_INTERVAL_SECONDS = 60
+
+QUERY_PAGE_SIZE = 100
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def _is_error(result: dict) -> bool:
+    return "error" in result or result.get("object") == "error"
+
+
+class NotionMirror:
+    """SQLite-backed mirror of one or more Notion databases.
+
+    request_fn is an async callable with the signature of
+    notion_client._notion_request(endpoint, method, data).
+    """
+
+    def __init__(self, db_path: Path, request_fn):
+        self.db_path = Path(db_path)
+        self._request = request_fn
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._init_db()
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def _conn(self):
+        """Connection to the mirror database, committed on exit and closed."""
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _init_db(self) -> None:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._conn() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS pages (
+                    id               TEXT PRIMARY KEY,
+                    database_id      TEXT NOT NULL,
+                    created_time     TEXT,
+                    last_edited_time TEXT,
+                    page_json        TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_pages_db_created
+                    ON pages (database_id, created_time DESC);
+
+                CREATE TABLE IF NOT EXISTS sync_state (
+                    database_id    TEXT PRIMARY KEY,
+                    cursor         TEXT,
+                    last_synced_at REAL,
+                    last_full_at   REAL,
+                    last_error     TEXT,
+                    last_duration_ms INTEGER,
+                    last_fetched   INTEGER,
+                    syncs          INTEGER NOT NULL DEFAULT 0,
+                    failures       INTEGER NOT NULL DEFAULT 0
+                );
+                """
+            )
+
+    def _state(self, conn: sqlite3.Connection, database_id: str) -> sqlite3.Row | None:
+        return conn.execute(
+            "SELECT * FROM sync_state WHERE database_id = ?", (database_id,)
+        ).fetchone()
+
+    @staticmethod
+    def _upsert(conn: sqlite3.Connection, database_id: str, page: dict) -> None:
+        conn.execute(
+            """
+            INSERT INTO pages (id, database_id, created_time, last_edited_time, page_json)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                created_time = excluded.created_time,
+                last_edited_time = excluded.last_edited_time,
+                page_json = excluded.page_json
+            """,
+            (page["id"], database_id, page.get("created_time"),
+             page.get("last_edited_time"), json.dumps(page)),
+        )
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def pages(self, database_id: str) -> list[dict]:
+        """All mirrored (non-archived) pages for a database, newest first."""
+        with self._conn() as conn:
+            rows = conn.execute(
+                "SELECT page_json FROM pages WHERE database_id = ? ORDER BY created_time DESC",
+                (database_id,),
+            ).fetchall()
+        return [json.loads(r["page_json"]) for r in rows]
+
+    def sync_lag(self, database_id: str) -> float | None:
+        """Seconds since the last successful sync, or None if never synced."""
+        with self._conn() as conn:
+            state = self._state(conn, database_id)
+        if state is None or state["last_synced_at"] is None:
+            return None
+        return max(0.0, time.time() - state["last_synced_at"])
+
+    async def read(self, database_id: str, max_age: float = SYNC_MAX_AGE_SECONDS) -> dict:
+        """Pages for a database, syncing first if the mirror is older than max_age.
+
+        If the sync fails but the mirror has data, the (stale) mirror is
+        served rather than an error.
+
+        Returns:
+            {"pages": [...], "synced_at": iso | None, "sync_lag_seconds": float | None,
+             "error": str (only if nothing could be served)}
+        """
+        lag = self.sync_lag(database_id)
+        sync_error = None
+        if lag is None or lag > max_age:
+            try:
+                await self.sync(database_id)
+            except Exception as e:
+                sync_error = str(e)
+                logger.warning(f"Notion mirror sync failed for {database_id[:8]}: {e}")
+            lag = self.sync_lag(database_id)
+
+        if lag is None:
+            return {"pages": [], "synced_at": None, "sync_lag_seconds": None,
+                    "error": sync_error or "Notion mirror has never synced"}
+        synced_at = datetime.now(timezone.utc) - timedelta(seconds=lag)
+        return {
+            "pages": self.pages(database_id),
+            "synced_at": synced_at.isoformat(timespec="seconds"),
+            "sync_lag_seconds": round(lag, 1),
+        }
+
+    # ------------------------------------------------------------------
+    # Sync
+    # ------------------------------------------------------------------
+
+    async def sync(self, database_id: str, full: bool = False) -> int:
+        """Sync a database, coalescing with any sync already in flight.
+
+        Returns the number of pages fetched from Notion.
+        """
+        task = self._inflight.get(database_id)
+        if task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop():
+            return await asyncio.shield(task)
+
+        task = asyncio.ensure_future(self._sync(database_id, full))
+        self._inflight[database_id] = task
+        try:
+            return await asyncio.shield(task)
+        finally:
+            if self._inflight.get(database_id) is task and task.done():
+                del self._inflight[database_id]
+
+    async def _query_all(self, database_id: str, body: dict) -> list[dict]:
+        pages: list[dict] = []
+        cursor = None
+        while True:
+            data = {**body, "page_size": QUERY_PAGE_SIZE}
+            if cursor:
+                data["start_cursor"] = cursor
+            result = await self._request(f"/databases/{database_id}/query", method="POST", data=data)
+            if _is_error(result):
+                raise RuntimeError(result.get("message") or result.get("error") or "Notion API error")
+            pages.extend(result.get("results", []))
+            if not result.get("has_more"):
+                return pages
+            cursor = result.get("next_cursor")
+
+    async def _sync(self, database_id: str, full: bool) -> int:
+        started = time.time()
+        with self._conn() as conn:
+            state = self._state(conn, database_id)
+        cursor = state["cursor"] if state else None
+        last_full = state["last_full_at"] if state else None
+        full = full or cursor is None or last_full is None or started - last_full > FULL_RESYNC_SECONDS
+
+        body: dict = {}
+        if not full:
+            body["filter"] = {
+                "timestamp": "last_edited_time",
+                "last_edited_time": {"on_or_after": cursor},
+            }
+
+        try:
+            pages = await self._query_all(database_id, body)
+        except Exception as e:
+            with self._conn() as conn:
+                conn.execute(
+                    """
+                    INSERT INTO sync_state (database_id, last_error, failures) VALUES (?, ?, 1)
+                    ON CONFLICT(database_id) DO UPDATE SET
+                        last_error = excluded.last_error, failures = failures + 1
+                    """,
+                    (database_id, str(e)),
+                )
+            raise
+
+        new_cursor = max([cursor or ""] + [p.get("last_edited_time") or "" for p in pages]) or None
+        duration_ms = int((time.time() - started) * 1000)
+        with self._conn() as conn:
+            if full:
+                conn.execute("DELETE FROM pages WHERE database_id = ?", (database_id,))
+            for page in pages:
+                if page.get("archived") or page.get("in_trash"):
+                    conn.execute("DELETE FROM pages WHERE id = ?", (page["id"],))
+                else:
+                    self._upsert(conn, database_id, page)
+            conn.execute(
+                """
+                INSERT INTO sync_state
+                    (database_id, cursor, last_synced_at, last_full_at, last_error,
+                     last_duration_ms, last_fetched, syncs)
+                VALUES (?, ?, ?, ?, NULL, ?, ?, 1)
+                ON CONFLICT(database_id) DO UPDATE SET
+                    cursor = excluded.cursor,
+                    last_synced_at = excluded.last_synced_at,
+                    last_full_at = COALESCE(excluded.last_full_at, last_full_at),
+                    last_error = NULL,
+                    last_duration_ms = excluded.last_duration_ms,
+                    last_fetched = excluded.last_fetched,
+                    syncs = syncs + 1
+                """,
+                (database_id, new_cursor, started, started if full else None,
+                 duration_ms, len(pages)),
+            )
+        logger.debug(
+            f"Notion mirror {'full' if full else 'incremental'} sync {database_id[:8]}: "
+            f"{len(pages)} pages in {duration_ms}ms"
+        )
+        return len(pages)
+
+    # ------------------------------------------------------------------
+    # Write-through
+    # ------------------------------------------------------------------
+
+    def apply_page(self, database_id: str, page: dict) -> None:
+        """Apply a page object returned by a Notion create/update/archive."""
+        if not database_id or not page.get("id") or _is_error(page):
+            return
+        with self._conn() as conn:
+            if page.get("archived") or page.get("in_trash"):
+                conn.execute("DELETE FROM pages WHERE id = ?", (page["id"],))
+            else:
+                self._upsert(conn, database_id, page)
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def status(self) -> dict:
+        """Per-database sync lag, page counts and last sync outcome."""
+        with self._conn() as conn:
+            states = conn.execute("SELECT * FROM sync_state").fetchall()
+            counts = dict(conn.execute(
+                "SELECT database_id, COUNT(*) FROM pages GROUP BY database_id"
+            ).fetchall())
+        now = time.time()
+        databases = {}
+        for s in states:
+            databases[s["database_id"]] = {
+                "pages": counts.get(s["database_id"], 0),
+                "sync_lag_seconds": round(now - s["last_synced_at"], 1) if s["last_synced_at"] else None,
+                "last_full_sync_age_seconds": round(now - s["last_full_at"], 1) if s["last_full_at"] else None,
+                "cursor": s["cursor"],
+                "last_duration_ms": s["last_duration_ms"],
+                "last_fetched": s["last_fetched"],
+                "syncs": s["syncs"],
+                "failures": s["failures"],
+                "last_error": s["last_error"],
+            }
+        return {"databases": databases, "checked_at": _now_iso()}
+
+    async def run_sync_loop(self, database_ids: list[str], interval: float = SYNC_INTERVAL_SECONDS) -> None:
+        """Keep the given databases synced in the background (never returns)."""
+        while True:
+            for database_id in database_ids:
+                try:
+                    await self.sync(database_id)
+                except Exception as e:
+                    logger.warning(f"Notion mirror background sync failed for {database_id[:8]}: {e}")
+            await asyncio.sleep(interval)
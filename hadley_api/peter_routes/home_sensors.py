@@ -3,6 +3,8 @@
 GET /home/sensors — per-room temperature, humidity, occupancy, illuminance,
 battery and link quality from the zigbee2mqtt HTTP bridge at
 192.168.0.110:5001 (the same Pi that serves the pocket-money IHD dashboard).
+/home/sensors/history, /trend and /series add raw, daily-aggregate and
+chart-downsampled history per room.
 
 Read-only. Reshaping + the bridge URL live in domains.home_sensors.service,
 which also runs the reachability/low-battery watchdog registered in bot.py.
@@ -44,3 +46,12 @@ async def home_sensors_trend(days: int = 7):
         return await asyncio.to_thread(service.get_trend, days)
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"sensor trend unavailable: {e}")
+
+
+@router.get("/sensors/series")
+async def home_sensors_series(room: str, hours: int = 24, points: int = 200):
+    """Temperature/humidity for one room, downsampled to at most `points` buckets for charts."""
+    try:
+        return await asyncio.to_thread(service.get_series, room, hours, max(1, min(points, 2000)))
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"sensor series unavailable: {e}")
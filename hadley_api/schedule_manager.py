@@ -21,7 +21,11 @@ def _write_schedule(content: str):
     from datetime import datetime
     from zoneinfo import ZoneInfo
 
+    from services import bot_events
+
     SCHEDULE_PATH.write_text(content, encoding="utf-8")
+    if bot_events.publish_sync(bot_events.SCHEDULE_RELOAD, {"reason": "schedule_manager"}):
+        return
     RELOAD_TRIGGER.parent.mkdir(parents=True, exist_ok=True)
     now = datetime.now(ZoneInfo("Europe/London"))
     RELOAD_TRIGGER.write_text(f"{now.isoformat()}|schedule_manager", encoding="utf-8")
@@ -10,7 +10,7 @@ Uses Supabase for storage with REST API.
 """
 
 import os
-import httpx
+from integrations.supabase_rest import get_supabase
 from datetime import datetime, date
 from typing import Optional, List
 from uuid import UUID
@@ -207,7 +207,7 @@ async def get_categories():
     if not SUPABASE_URL or not SUPABASE_KEY:
         raise HTTPException(500, "Supabase not configured")
 
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         resp = await client.get(
             f"{SUPABASE_URL}/rest/v1/task_categories?select=id,name,slug,color,icon&order=sort_order",
             headers=get_supabase_headers(),
@@ -246,7 +246,7 @@ async def create_category(category: CategoryCreate):
     # Remove any non-alphanumeric characters except hyphens
     slug = "".join(c for c in slug if c.isalnum() or c == "-")
 
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         # Get max sort_order
         order_resp = await client.get(
             f"{SUPABASE_URL}/rest/v1/task_categories?select=sort_order&order=sort_order.desc&limit=1",
@@ -294,7 +294,7 @@ async def update_category(category_id: str, update: CategoryUpdate):
     if not update_data:
         raise HTTPException(400, "No fields to update")
 
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         resp = await client.patch(
             f"{SUPABASE_URL}/rest/v1/task_categories?id=eq.{category_id}",
             headers=get_supabase_headers(),
@@ -318,7 +318,7 @@ async def delete_category(category_id: str):
     if not SUPABASE_URL or not SUPABASE_KEY:
         raise HTTPException(500, "Supabase not configured")
 
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         # Delete category links first
         await client.delete(
             f"{SUPABASE_URL}/rest/v1/task_category_links?category_id=eq.{category_id}",
@@ -345,7 +345,7 @@ async def get_task_counts():
     if not SUPABASE_URL or not SUPABASE_KEY:
         raise HTTPException(500, "Supabase not configured")
 
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         # Get counts for each list type
         resp = await client.get(
             f"{SUPABASE_URL}/rest/v1/tasks?select=list_type&status=not.in.(done,cancelled)",
@@ -404,7 +404,7 @@ async def list_tasks(
 
     query_string = "&".join(params)
 
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         resp = await client.get(
             f"{SUPABASE_URL}/rest/v1/tasks?{query_string}",
             headers=get_supabase_headers(),
@@ -471,7 +471,7 @@ async def list_tasks_by_type(
 
     status_filter = "" if include_done else "&status=not.in.(done,cancelled)"
 
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         resp = await client.get(
             f"{SUPABASE_URL}/rest/v1/tasks?list_type=eq.{list_type.value}{status_filter}&order=sort_order.asc,priority,created_at.desc",
             headers=get_supabase_headers(),
@@ -533,7 +533,7 @@ async def get_task(task_id: str):
     if not SUPABASE_URL or not SUPABASE_KEY:
         raise HTTPException(500, "Supabase not configured")
 
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         resp = await client.get(
             f"{SUPABASE_URL}/rest/v1/tasks?id=eq.{task_id}&select=*",
             headers=get_supabase_headers(),
@@ -603,7 +603,7 @@ async def create_task(task: TaskCreate):
     # Remove None values
     task_data = {k: v for k, v in task_data.items() if v is not None}
 
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         resp = await client.post(
             f"{SUPABASE_URL}/rest/v1/tasks",
             headers=get_supabase_headers(),
@@ -685,7 +685,7 @@ async def update_task(task_id: str, update: TaskUpdate):
     if not update_data:
         raise HTTPException(400, "No fields to update")
 
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         resp = await client.patch(
             f"{SUPABASE_URL}/rest/v1/tasks?id=eq.{task_id}",
             headers=get_supabase_headers(),
@@ -709,7 +709,7 @@ async def delete_task(task_id: str):
     if not SUPABASE_URL or not SUPABASE_KEY:
         raise HTTPException(500, "Supabase not configured")
 
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         resp = await client.delete(
             f"{SUPABASE_URL}/rest/v1/tasks?id=eq.{task_id}",
             headers=get_supabase_headers(),
@@ -728,7 +728,7 @@ async def change_task_status(task_id: str, change: TaskStatusChange):
     if not SUPABASE_URL or not SUPABASE_KEY:
         raise HTTPException(500, "Supabase not configured")
 
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         # Get current task
         resp = await client.get(
             f"{SUPABASE_URL}/rest/v1/tasks?id=eq.{task_id}&select=id,list_type,status",
@@ -796,7 +796,7 @@ async def schedule_heartbeat(task_id: str, schedule: HeartbeatSchedule):
     if not SUPABASE_URL or not SUPABASE_KEY:
         raise HTTPException(500, "Supabase not configured")
 
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         # Get current task
         resp = await client.get(
             f"{SUPABASE_URL}/rest/v1/tasks?id=eq.{task_id}&select=id,list_type,status",
@@ -852,7 +852,7 @@ async def get_heartbeat_plan():
     if not SUPABASE_URL or not SUPABASE_KEY:
         raise HTTPException(500, "Supabase not configured")
 
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         resp = await client.get(
             f"{SUPABASE_URL}/rest/v1/v_heartbeat_plan?select=*&order=plan_date",
             headers=get_supabase_headers(),
@@ -871,7 +871,7 @@ async def add_comment(task_id: str, comment: CommentCreate):
     if not SUPABASE_URL or not SUPABASE_KEY:
         raise HTTPException(500, "Supabase not configured")
 
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         resp = await client.post(
             f"{SUPABASE_URL}/rest/v1/task_comments",
             headers=get_supabase_headers(),
@@ -896,7 +896,7 @@ async def get_comments(task_id: str):
     if not SUPABASE_URL or not SUPABASE_KEY:
         raise HTTPException(500, "Supabase not configured")
 
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         resp = await client.get(
             f"{SUPABASE_URL}/rest/v1/task_comments?task_id=eq.{task_id}&order=created_at.asc",
             headers=get_supabase_headers(),
@@ -915,7 +915,7 @@ async def get_task_history(task_id: str):
     if not SUPABASE_URL or not SUPABASE_KEY:
         raise HTTPException(500, "Supabase not configured")
 
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         resp = await client.get(
             f"{SUPABASE_URL}/rest/v1/task_history?task_id=eq.{task_id}&order=created_at.desc&limit=50",
             headers=get_supabase_headers(),
@@ -934,7 +934,7 @@ async def update_task_categories(task_id: str, category_slugs: List[str]):
     if not SUPABASE_URL or not SUPABASE_KEY:
         raise HTTPException(500, "Supabase not configured")
 
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         # Delete existing links
         await client.delete(
             f"{SUPABASE_URL}/rest/v1/task_category_links?task_id=eq.{task_id}",
@@ -971,7 +971,7 @@ async def reorder_task(task_id: str, new_order: int, actor: str = "chris"):
     if not SUPABASE_URL or not SUPABASE_KEY:
         raise HTTPException(500, "Supabase not configured")
 
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         resp = await client.patch(
             f"{SUPABASE_URL}/rest/v1/tasks?id=eq.{task_id}",
             headers=get_supabase_headers(),
@@ -991,7 +991,7 @@ async def bulk_reorder_tasks(tasks_order: List[dict]):
     if not SUPABASE_URL or not SUPABASE_KEY:
         raise HTTPException(500, "Supabase not configured")
 
-    async with httpx.AsyncClient() as client:
+    async with get_supabase().session() as client:
         for item in tasks_order:
             await client.patch(
                 f"{SUPABASE_URL}/rest/v1/tasks?id=eq.{item['id']}",
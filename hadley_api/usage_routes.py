@@ -5,7 +5,9 @@ calls) and ``ai_usage_reconciliation`` (daily diff vs Anthropic's Admin usage
 report). See domains/api_usage/audit_log.py and domains/api_usage/reconcile.py.
 
   GET  /usage/audit?hours=24        — logged spend, broken down by project/feature/model
+  GET  /usage/audit/queue           — this process's audit writer: queue depth, flush latency, drops
   GET  /usage/reconcile?days=7      — latest reconciliation rows + any gaps
+  GET  /usage/reconcile/calls?date=YYYY-MM-DD&model=  — raw logged calls behind one day's gap
   POST /usage/reconcile/run?days=3  — run reconciliation now (needs ANTHROPIC_ADMIN_KEY)
 """
 
@@ -95,6 +97,14 @@ async def usage_audit(hours: int = Query(24, ge=1, le=24 * 90)):
     }
 
 
+@router.get("/audit/queue", dependencies=[Depends(require_auth)])
+async def usage_audit_queue():
+    """Batched audit writer health for this process (queue, journal, drops)."""
+    from domains.api_usage.audit_log import audit_queue_metrics
+
+    return audit_queue_metrics()
+
+
 @router.get("/reconcile", dependencies=[Depends(require_auth)])
 async def usage_reconcile(days: int = Query(7, ge=1, le=90)):
     """Latest reconciliation rows (Anthropic truth vs logged), highlighting gaps."""
@@ -117,6 +127,27 @@ async def usage_reconcile(days: int = Query(7, ge=1, le=90)):
     }
 
 
+@router.get("/reconcile/calls", dependencies=[Depends(require_auth)])
+async def usage_reconcile_calls(
+    date: str = Query(..., description="UTC day, YYYY-MM-DD", regex=r"^\d{4}-\d{2}-\d{2}$"),
+    model: str | None = Query(None),
+    project: str | None = Query(None),
+    limit: int = Query(500, ge=1, le=5000),
+):
+    """Drill-down: the raw api_key calls logged on one UTC day (optionally one model/project)."""
+    import asyncio
+    from datetime import date as date_cls
+
+    from domains.api_usage.rollup import fetch_calls
+
+    if not _SUPABASE_URL or not _SERVICE_KEY:
+        return {"date": date, "count": 0, "calls": []}
+    rows = await asyncio.to_thread(fetch_calls, _SUPABASE_URL, _SERVICE_KEY,
+                                   date_cls.fromisoformat(date), model=model,
+                                   project=project, limit=limit)
+    return {"date": date, "model": model, "project": project, "count": len(rows), "calls": rows}
+
+
 @router.post("/reconcile/run", dependencies=[Depends(require_auth)])
 async def usage_reconcile_run(days: int = Query(3, ge=1, le=31)):
     """Run reconciliation now (used by the scheduler too)."""
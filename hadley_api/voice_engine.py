@@ -1,6 +1,8 @@
 """Voice engine — lazy-loaded STT (faster-whisper) and TTS (Kokoro ONNX).
 
 Singletons loaded on first use. All processing runs locally on CPU.
+The async wrappers run inference on the voice worker pool
+(see voice_worker.py), which preloads models and prioritises requests.
 """
 import asyncio
 import io
@@ -30,6 +32,18 @@ KOKORO_SAMPLE_RATE = 24000
 
 # Whisper model
 WHISPER_MODEL_SIZE = "small.en"
+WHISPER_SAMPLE_RATE = 16000
+WHISPER_CPU_THREADS = 0  # 0 = CTranslate2 default; the voice worker sets a per-process share
+
+# Batched transcription — clips are decoded concurrently on this many threads,
+# and background voice notes arriving within the window share one batch
+BATCH_DECODE_THREADS = 4
+BATCH_WINDOW_SECONDS = 0.5
+BATCH_MAX_CLIPS = 16
+
+# Streaming TTS — sentences shorter than this are merged with the next one
+# so Kokoro isn't called for a lone "Right." with its per-call overhead.
+MIN_TTS_CHUNK_CHARS = 40
 
 # Singletons
 _whisper_model = None
@@ -63,6 +77,7 @@ def _get_whisper():
             WHISPER_MODEL_SIZE,
             device="cpu",
             compute_type="int8",
+            cpu_threads=WHISPER_CPU_THREADS,
         )
         logger.info("faster-whisper model loaded")
     return _whisper_model
@@ -80,56 +95,78 @@ def _get_kokoro():
     return _kokoro_instance
 
 
-def _audio_bytes_to_wav(audio_bytes: bytes, source_format: str = "ogg") -> str:
-    """Convert audio bytes to a temporary WAV file path.
+def _resample(samples: np.ndarray, source_rate: int, target_rate: int) -> np.ndarray:
+    """Linearly resample a mono float32 signal. Good enough for speech STT."""
+    if source_rate == target_rate or len(samples) == 0:
+        return samples.astype(np.float32, copy=False)
+    duration = len(samples) / source_rate
+    target_len = int(round(duration * target_rate))
+    src_x = np.linspace(0.0, duration, num=len(samples), endpoint=False)
+    dst_x = np.linspace(0.0, duration, num=target_len, endpoint=False)
+    return np.interp(dst_x, src_x, samples).astype(np.float32)
 
-    faster-whisper needs a file path, so we write to a temp file.
-    Supports: wav, ogg, opus, webm, mp3, m4a, flac.
+
+def _ffmpeg_decode(audio_bytes: bytes, source_format: str) -> np.ndarray:
+    """Decode via ffmpeg to 16 kHz mono float32 PCM.
+
+    Piped through stdin/stdout so nothing touches disk. MP4/M4A containers
+    can keep their index at the end of the file, which ffmpeg can't seek to
+    on a pipe — those fall back to a temp input file.
     """
-    # If already WAV, write directly
-    suffix = f".{source_format}" if source_format != "opus" else ".ogg"
+    import subprocess
+
+    cmd_tail = ["-f", "f32le", "-ac", "1", "-ar", str(WHISPER_SAMPLE_RATE), "pipe:1"]
+    result = subprocess.run(
+        ["ffmpeg", "-loglevel", "error", "-i", "pipe:0", *cmd_tail],
+        input=audio_bytes,
+        capture_output=True,
+        timeout=30,
+    )
+    if result.returncode == 0 and result.stdout:
+        return np.frombuffer(result.stdout, dtype=np.float32)
+
+    if source_format not in ("m4a", "mp4"):
+        raise ValueError(f"ffmpeg could not decode {source_format}")
 
-    tmp = tempfile.NamedTemporaryFile(suffix=suffix, delete=False)
-    tmp.write(audio_bytes)
-    tmp.close()
+    tmp = tempfile.NamedTemporaryFile(suffix=f".{source_format}", delete=False)
+    try:
+        tmp.write(audio_bytes)
+        tmp.close()
+        result = subprocess.run(
+            ["ffmpeg", "-loglevel", "error", "-i", tmp.name, *cmd_tail],
+            capture_output=True,
+            timeout=30,
+        )
+    finally:
+        try:
+            os.unlink(tmp.name)
+        except OSError:
+            pass
+    if result.returncode == 0 and result.stdout:
+        return np.frombuffer(result.stdout, dtype=np.float32)
+    raise ValueError(f"ffmpeg could not decode {source_format}")
 
-    if source_format == "wav":
-        return tmp.name
 
-    # Convert to WAV using soundfile (handles ogg/flac) or ffmpeg fallback
-    wav_tmp = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
-    wav_tmp.close()
+def _decode_audio(audio_bytes: bytes, source_format: str = "ogg") -> np.ndarray:
+    """Decode audio bytes to a 16 kHz mono float32 array, entirely in memory.
 
+    faster-whisper accepts numpy input directly, so there's no need to
+    round-trip through WAV temp files.
+    Supports: wav, ogg, opus, webm, mp3, m4a, flac.
+    """
+    # Try soundfile first (fast, handles wav/ogg/flac/mp3)
     try:
-        # Try soundfile first (fast, handles common formats)
-        data, sr = sf.read(tmp.name)
-        sf.write(wav_tmp.name, data, sr)
-        os.unlink(tmp.name)
-        return wav_tmp.name
+        data, sr = sf.read(io.BytesIO(audio_bytes), dtype="float32", always_2d=True)
+        return _resample(data.mean(axis=1), sr, WHISPER_SAMPLE_RATE)
     except Exception:
         pass
 
     # Fallback: ffmpeg (handles ogg/opus, webm, m4a, etc.)
     try:
-        import subprocess
-        result = subprocess.run(
-            ["ffmpeg", "-i", tmp.name, "-ar", "16000", "-ac", "1", "-y", wav_tmp.name],
-            capture_output=True,
-            timeout=30,
-        )
-        os.unlink(tmp.name)
-        if result.returncode == 0:
-            return wav_tmp.name
+        return _ffmpeg_decode(audio_bytes, source_format)
     except Exception as e:
         logger.error(f"ffmpeg conversion failed: {e}")
 
-    # Clean up on failure
-    for f in [tmp.name, wav_tmp.name]:
-        try:
-            os.unlink(f)
-        except OSError:
-            pass
-
     raise ValueError(f"Cannot convert audio format: {source_format}")
 
 
@@ -144,23 +181,77 @@ def transcribe_sync(audio_bytes: bytes, source_format: str = "ogg") -> str:
         Transcribed text string.
     """
     model = _get_whisper()
-    wav_path = _audio_bytes_to_wav(audio_bytes, source_format)
+    audio = _decode_audio(audio_bytes, source_format)
 
-    try:
-        segments, info = model.transcribe(
-            wav_path,
-            beam_size=5,
-            language="en",
-            vad_filter=True,
-        )
-        text = " ".join(segment.text.strip() for segment in segments)
-        logger.info(f"STT result ({info.duration:.1f}s audio): {text[:100]}")
-        return text.strip()
-    finally:
+    segments, info = model.transcribe(
+        audio,
+        beam_size=5,
+        language="en",
+        vad_filter=True,
+    )
+    text = " ".join(segment.text.strip() for segment in segments)
+    logger.info(f"STT result ({info.duration:.1f}s audio): {text[:100]}")
+    return text.strip()
+
+
+def transcribe_batch_sync(clips: list[tuple[bytes, str]]) -> list[dict]:
+    """Transcribe many clips in one call on a single warm model.
+
+    Clips are decoded concurrently (ffmpeg/soundfile release the GIL), then
+    run back-to-back through the same whisper path as transcribe_sync, so a
+    backlog pays model/queue overhead once rather than per clip. One bad
+    clip doesn't fail the batch.
+
+    Args:
+        clips: (audio_bytes, source_format) pairs.
+
+    Returns:
+        One dict per clip, in input order: text, duration (seconds of
+        audio), decode_ms, transcribe_ms and error (None on success).
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    import time
+
+    def _timed_decode(clip):
+        started = time.monotonic()
         try:
-            os.unlink(wav_path)
-        except OSError:
-            pass
+            audio = _decode_audio(*clip)
+            return audio, None, (time.monotonic() - started) * 1000
+        except Exception as e:
+            return None, str(e), (time.monotonic() - started) * 1000
+
+    with ThreadPoolExecutor(max_workers=min(BATCH_DECODE_THREADS, max(1, len(clips)))) as pool:
+        decoded = list(pool.map(_timed_decode, clips))
+
+    model = _get_whisper() if any(audio is not None for audio, _, _ in decoded) else None
+    results = []
+    for audio, error, decode_ms in decoded:
+        result = {
+            "text": "",
+            "duration": 0.0,
+            "decode_ms": round(decode_ms, 1),
+            "transcribe_ms": 0.0,
+            "error": error,
+        }
+        if audio is not None:
+            started = time.monotonic()
+            try:
+                segments, info = model.transcribe(
+                    audio,
+                    beam_size=5,
+                    language="en",
+                    vad_filter=True,
+                )
+                result["text"] = " ".join(segment.text.strip() for segment in segments).strip()
+                result["duration"] = round(info.duration, 2)
+            except Exception as e:
+                result["error"] = str(e)
+            result["transcribe_ms"] = round((time.monotonic() - started) * 1000, 1)
+        results.append(result)
+
+    ok = sum(1 for r in results if r["error"] is None)
+    logger.info(f"STT batch: {ok}/{len(clips)} clips, {sum(r['duration'] for r in results):.1f}s audio")
+    return results
 
 
 def _sanitise_for_speech(text: str) -> str:
@@ -238,18 +329,259 @@ def synthesise_sync(
     return wav_bytes
 
 
-async def transcribe(audio_bytes: bytes, source_format: str = "ogg") -> str:
-    """Async wrapper for transcribe_sync."""
-    return await asyncio.to_thread(transcribe_sync, audio_bytes, source_format)
+def split_sentences(text: str, min_chars: int = MIN_TTS_CHUNK_CHARS) -> list[str]:
+    """Split speech text into sentence-sized chunks for incremental TTS.
+
+    Very short sentences are merged forward so each Kokoro call has enough
+    text to amortise its overhead and the prosody doesn't sound clipped.
+    """
+    import re
+
+    parts = [p.strip() for p in re.split(r'(?<=[.!?;:])\s+', text) if p.strip()]
+    chunks: list[str] = []
+    pending = ""
+    for part in parts:
+        pending = f"{pending} {part}".strip()
+        if len(pending) >= min_chars:
+            chunks.append(pending)
+            pending = ""
+    if pending:
+        if chunks and len(pending) < min_chars // 2:
+            chunks[-1] = f"{chunks[-1]} {pending}"
+        else:
+            chunks.append(pending)
+    return chunks
+
+
+def _synthesise_chunk(sentence: str, voice: str, speed: float) -> bytes:
+    """Synthesise one already-sanitised sentence to standalone WAV bytes."""
+    kokoro = _get_kokoro()
+    samples, sample_rate = kokoro.create(
+        sentence,
+        voice=voice,
+        speed=speed,
+        lang=DEFAULT_LANG,
+    )
+    buf = io.BytesIO()
+    sf.write(buf, samples, sample_rate, format="WAV")
+    return buf.getvalue()
+
+
+def synthesise_stream_sync(
+    text: str,
+    voice: str = DEFAULT_VOICE,
+    speed: float = DEFAULT_SPEED,
+):
+    """Synthesise text sentence-by-sentence, yielding (sentence, wav_bytes).
+
+    Each chunk is a self-contained WAV so clients can start playback as soon
+    as the first sentence is ready instead of waiting for the whole reply.
+    """
+    for sentence in split_sentences(_sanitise_for_speech(text)):
+        yield sentence, _synthesise_chunk(sentence, voice, speed)
+
+
+async def transcribe(
+    audio_bytes: bytes,
+    source_format: str = "ogg",
+    priority: int | None = None,
+) -> str:
+    """Async wrapper for transcribe_sync, run on the voice worker pool.
+
+    Pass priority=PRIORITY_BACKGROUND for voice notes nobody is waiting on
+    live, so they yield to interactive /voice requests.
+    """
+    from hadley_api.voice_worker import get_worker, PRIORITY_INTERACTIVE
+    return await get_worker().submit(
+        transcribe_sync, audio_bytes, source_format,
+        priority=PRIORITY_INTERACTIVE if priority is None else priority,
+        kind="transcribe",
+    )
+
+
+async def transcribe_many(
+    clips: list[tuple[bytes, str]],
+    priority: int | None = None,
+) -> list[dict]:
+    """Transcribe a list of clips, spread across the voice worker pool.
+
+    Clips are split into one slice per worker and each slice runs as a
+    single transcribe_batch_sync job, so catch-up after an outage is bound
+    by total CPU rather than per-clip round trips. Defaults to background
+    priority. Results are in input order (see transcribe_batch_sync).
+    """
+    from hadley_api.voice_worker import get_worker, PRIORITY_BACKGROUND
+
+    if not clips:
+        return []
+    worker = get_worker()
+    slices = max(1, min(worker.workers, len(clips)))
+    step = -(-len(clips) // slices)
+    batches = [clips[i:i + step] for i in range(0, len(clips), step)]
+    results = await asyncio.gather(*(
+        worker.submit(
+            transcribe_batch_sync, batch,
+            priority=PRIORITY_BACKGROUND if priority is None else priority,
+            kind="transcribe_batch",
+        )
+        for batch in batches
+    ))
+    return [r for batch_results in results for r in batch_results]
+
+
+class _TranscriptionBatcher:
+    """Coalesce single-clip transcription calls into batches.
+
+    Webhooks deliver voice notes one at a time; after downtime they arrive
+    in a burst. Calls landing within BATCH_WINDOW_SECONDS of each other (up
+    to BATCH_MAX_CLIPS) are transcribed together via transcribe_many.
+    """
+
+    def __init__(self):
+        self._pending: list[tuple[bytes, str, asyncio.Future]] = []
+        self._flush_task: asyncio.Task | None = None
+        self._running: set[asyncio.Task] = set()
+
+    async def submit(self, audio_bytes: bytes, source_format: str) -> str:
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((audio_bytes, source_format, future))
+        if len(self._pending) >= BATCH_MAX_CLIPS:
+            self._flush_now()
+        elif self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_after_window())
+        return await future
+
+    async def _flush_after_window(self):
+        await asyncio.sleep(BATCH_WINDOW_SECONDS)
+        self._flush_now()
+
+    def _flush_now(self):
+        batch, self._pending = self._pending, []
+        if self._flush_task is not None and self._flush_task is not asyncio.current_task():
+            self._flush_task.cancel()
+        self._flush_task = None
+        if batch:
+            task = asyncio.create_task(self._run(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch):
+        try:
+            results = await transcribe_many([(audio, fmt) for audio, fmt, _ in batch])
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, _, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if result["error"]:
+                future.set_exception(ValueError(result["error"]))
+            else:
+                future.set_result(result["text"])
+
+
+_batcher: _TranscriptionBatcher | None = None
+
+
+async def transcribe_batched(audio_bytes: bytes, source_format: str = "ogg") -> str:
+    """Background transcription of one clip, coalesced with concurrent calls.
+
+    Drop-in for transcribe() where nobody is waiting live (voice notes).
+    """
+    global _batcher
+    if _batcher is None:
+        _batcher = _TranscriptionBatcher()
+    return await _batcher.submit(audio_bytes, source_format)
 
 
 async def synthesise(
     text: str,
     voice: str = DEFAULT_VOICE,
     speed: float = DEFAULT_SPEED,
+    priority: int | None = None,
 ) -> bytes:
-    """Async wrapper for synthesise_sync."""
-    return await asyncio.to_thread(synthesise_sync, text, voice, speed)
+    """Async wrapper for synthesise_sync, run on the voice worker pool."""
+    from hadley_api.voice_worker import get_worker, PRIORITY_INTERACTIVE
+    return await get_worker().submit(
+        synthesise_sync, text, voice, speed,
+        priority=PRIORITY_INTERACTIVE if priority is None else priority,
+        kind="synthesise",
+    )
+
+
+async def _iter_sentences(text_chunks):
+    """Re-chunk an async stream of text fragments into speakable sentences."""
+    import re
+
+    sentence_end = re.compile(r'[.!?;:]\s+')
+    buffer = ""
+    async for chunk in text_chunks:
+        buffer += chunk
+        # Only hand over text up to the last sentence boundary seen so far
+        last = None
+        for last in sentence_end.finditer(buffer):
+            pass
+        if last is None or last.end() < MIN_TTS_CHUNK_CHARS:
+            continue
+        ready, buffer = buffer[:last.end()], buffer[last.end():]
+        for sentence in split_sentences(_sanitise_for_speech(ready)):
+            yield sentence
+
+    if buffer.strip():
+        for sentence in split_sentences(_sanitise_for_speech(buffer)):
+            yield sentence
+
+
+async def synthesise_stream(
+    text_chunks,
+    voice: str = DEFAULT_VOICE,
+    speed: float = DEFAULT_SPEED,
+):
+    """Async generator: synthesise sentences as text arrives.
+
+    Synthesis runs one sentence ahead of the consumer, so sentence N+1 is
+    being rendered while sentence N is on the wire.
+
+    Args:
+        text_chunks: Async iterable of reply text fragments (any granularity).
+            Complete sentences are synthesised as soon as they're available;
+            the trailing fragment is flushed when the iterable ends.
+        voice: Kokoro voice ID.
+        speed: Speech speed multiplier.
+
+    Yields:
+        (sentence, wav_bytes) tuples in reply order.
+    """
+    from hadley_api.voice_worker import get_worker, PRIORITY_INTERACTIVE
+
+    queue: asyncio.Queue = asyncio.Queue(maxsize=2)
+    done = object()
+
+    async def _produce():
+        try:
+            async for sentence in _iter_sentences(text_chunks):
+                wav = await get_worker().submit(
+                    _synthesise_chunk, sentence, voice, speed,
+                    priority=PRIORITY_INTERACTIVE, kind="synthesise_chunk",
+                )
+                await queue.put((sentence, wav))
+        except Exception as e:
+            await queue.put(e)
+        await queue.put(done)
+
+    producer = asyncio.create_task(_produce())
+    try:
+        while True:
+            item = await queue.get()
+            if item is done:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        producer.cancel()
 
 
 def get_available_voices() -> list[str]:
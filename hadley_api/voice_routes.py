@@ -1,12 +1,17 @@
 """Voice API routes — STT, TTS, and conversational voice endpoints.
 
 POST /voice/listen    — audio → text (STT)
+POST /voice/listen/batch — many clips → per-clip text + timings (STT)
 POST /voice/speak     — text → audio (TTS)
 POST /voice/converse  — audio → text + audio (full round-trip via Peter)
+POST /voice/converse/stream — same round-trip, streamed as NDJSON events
 GET  /voice/audio/<id> — serve generated audio files
 GET  /voice/voices    — list available TTS voices
+GET  /voice/metrics   — voice worker queue depth and latency
 """
 import asyncio
+import base64
+import json
 import logging
 import os
 import time
@@ -15,10 +20,11 @@ from pathlib import Path
 
 import httpx
 from fastapi import APIRouter, HTTPException, Request, Response
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from pydantic import BaseModel
 
-from hadley_api.voice_engine import transcribe, synthesise, get_available_voices
+from hadley_api.voice_engine import transcribe, transcribe_many, synthesise, synthesise_stream, get_available_voices
+from hadley_api.voice_worker import get_worker, parse_priority
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +49,16 @@ class SpeakRequest(BaseModel):
     speed: float = 1.0
 
 
+class BatchClip(BaseModel):
+    audio_b64: str
+    format: str = "ogg"
+
+
+class BatchListenRequest(BaseModel):
+    clips: list[BatchClip]
+    priority: str = "background"
+
+
 class ConverseRequest(BaseModel):
     sender_name: str = "Chris"
     sender_number: str = "447855620978"
@@ -90,21 +106,55 @@ async def voice_listen(request: Request):
 
     Send audio as request body with appropriate Content-Type header.
     Supports: wav, ogg/opus, webm, mp3, m4a, flac.
+
+    Query params:
+        priority: "interactive" (default) or "background" — background
+            voice-note transcription yields to live conversations.
     """
     body = await request.body()
     if not body:
         raise HTTPException(400, "Empty audio body")
 
     fmt = _detect_format(request.headers.get("content-type"))
+    priority = parse_priority(request.query_params.get("priority"))
 
     try:
-        text = await transcribe(body, source_format=fmt)
+        text = await transcribe(body, source_format=fmt, priority=priority)
         return JSONResponse({"text": text, "format_detected": fmt})
     except Exception as e:
         logger.error(f"/voice/listen error: {e}")
         raise HTTPException(500, f"Transcription failed: {e}")
 
 
+@router.post("/listen/batch")
+async def voice_listen_batch(req: BatchListenRequest):
+    """Transcribe several clips in one call.
+
+    Clips are decoded concurrently and spread across the voice workers.
+    Defaults to background priority. Returns one result per clip, in
+    order: {text, duration, decode_ms, transcribe_ms, error}.
+    """
+    if not req.clips:
+        raise HTTPException(400, "No clips")
+
+    try:
+        clips = [(base64.b64decode(c.audio_b64), c.format) for c in req.clips]
+    except Exception as e:
+        raise HTTPException(400, f"Invalid base64 audio: {e}")
+
+    started = time.monotonic()
+    try:
+        results = await transcribe_many(clips, priority=parse_priority(req.priority))
+    except Exception as e:
+        logger.error(f"/voice/listen/batch error: {e}")
+        raise HTTPException(500, f"Transcription failed: {e}")
+
+    return JSONResponse({
+        "results": results,
+        "total_ms": int((time.monotonic() - started) * 1000),
+    })
+
+
 @router.post("/speak")
 async def voice_speak(req: SpeakRequest):
     """Synthesise text to audio.
@@ -211,6 +261,125 @@ async def voice_converse(request: Request):
     })
 
 
+async def _peter_reply_chunks(
+    client: httpx.AsyncClient,
+    user_text: str,
+    sender_name: str,
+    sender_number: str,
+):
+    """Yield Peter's reply text as it arrives from the internal server.
+
+    The bot answers with a single JSON body today; if it responds with
+    NDJSON (``{"delta": "..."}`` per line) each delta is yielded as soon as
+    it's read, so TTS can start on the first sentence.
+    """
+    tagged_message = f"[Voice from {sender_name}] {user_text}"
+    async with client.stream(
+        "POST",
+        PETER_INTERNAL_URL,
+        json={
+            "sender_name": sender_name,
+            "sender_number": sender_number,
+            "reply_to": sender_number,
+            "is_group": False,
+            "text": tagged_message,
+            "is_voice": True,
+            "skip_whatsapp_reply": True,
+            "stream": True,
+        },
+        timeout=120,
+    ) as resp:
+        if "ndjson" in resp.headers.get("content-type", ""):
+            async for line in resp.aiter_lines():
+                if line.strip():
+                    delta = json.loads(line).get("delta", "")
+                    if delta:
+                        yield delta
+        else:
+            body = await resp.aread()
+            reply = json.loads(body or b"{}").get("reply", "")
+            if reply:
+                yield reply
+
+
+@router.post("/converse/stream")
+async def voice_converse_stream(request: Request):
+    """Streaming voice round-trip — audio plays while Peter is still talking.
+
+    Same inputs as /voice/converse. The response is chunked NDJSON, one
+    event per line:
+
+        {"type": "transcript", "text": ...}
+        {"type": "audio", "seq": n, "text": sentence, "audio_b64": <WAV>}
+        {"type": "reply", "text": full reply}
+        {"type": "done", "timings": {...}}
+        {"type": "error", "stage": "peter"|"tts", "error": ...}
+
+    Each audio event is a standalone WAV for one sentence, emitted as soon
+    as Kokoro finishes it rather than after the whole reply is synthesised.
+    """
+    body = await request.body()
+    if not body:
+        raise HTTPException(400, "Empty audio body")
+
+    sender_name = request.query_params.get("sender_name", "Chris")
+    sender_number = request.query_params.get("sender_number", "447855620978")
+    voice = request.query_params.get("voice", "bm_daniel")
+
+    started = time.monotonic()
+    fmt = _detect_format(request.headers.get("content-type"))
+    try:
+        user_text = await transcribe(body, source_format=fmt)
+    except Exception as e:
+        logger.error(f"/voice/converse/stream STT error: {e}")
+        raise HTTPException(500, f"Transcription failed: {e}")
+    stt_ms = int((time.monotonic() - started) * 1000)
+
+    def _event(payload: dict) -> bytes:
+        return (json.dumps(payload) + "\n").encode()
+
+    async def _events():
+        yield _event({"type": "transcript", "text": user_text})
+        if not user_text.strip():
+            yield _event({"type": "error", "stage": "stt", "error": "No speech detected"})
+            return
+
+        reply_parts: list[str] = []
+        timings = {"stt_ms": stt_ms}
+
+        async def _collect(chunks):
+            async for chunk in chunks:
+                reply_parts.append(chunk)
+                timings.setdefault("first_reply_ms", int((time.monotonic() - started) * 1000))
+                yield chunk
+
+        stage = "peter"
+        try:
+            async with httpx.AsyncClient() as client:
+                chunks = _collect(_peter_reply_chunks(client, user_text, sender_name, sender_number))
+                seq = 0
+                async for sentence, wav_bytes in synthesise_stream(chunks, voice=voice):
+                    stage = "tts"
+                    timings.setdefault("first_audio_ms", int((time.monotonic() - started) * 1000))
+                    yield _event({
+                        "type": "audio",
+                        "seq": seq,
+                        "text": sentence,
+                        "audio_b64": base64.b64encode(wav_bytes).decode(),
+                    })
+                    seq += 1
+        except Exception as e:
+            logger.error(f"/voice/converse/stream {stage} error: {e}")
+            yield _event({"type": "error", "stage": stage, "error": str(e)})
+
+        yield _event({"type": "reply", "text": "".join(reply_parts)})
+        timings["total_ms"] = int((time.monotonic() - started) * 1000)
+        logger.info(f"/voice/converse/stream timings: {timings}")
+        yield _event({"type": "done", "timings": timings})
+
+    return StreamingResponse(_events(), media_type="application/x-ndjson")
+
+
 @router.get("/audio/{filename}")
 async def voice_audio(filename: str):
     """Serve a generated audio file."""
@@ -229,7 +398,7 @@ async def voice_audio(filename: str):
 async def voice_list():
     """List available TTS voices."""
     try:
-        voices = get_available_voices()
+        voices = await get_worker().submit(get_available_voices, kind="voices")
         british_male = [v for v in voices if v.startswith("bm_")]
         return JSONResponse({
             "default": "bm_daniel",
@@ -238,3 +407,9 @@ async def voice_list():
         })
     except Exception as e:
         raise HTTPException(500, f"Failed to list voices: {e}")
+
+
+@router.get("/metrics")
+async def voice_metrics():
+    """Voice worker status — warm workers, queue depth, per-job latency."""
+    return JSONResponse(get_worker().metrics())
@@ -0,0 +1,270 @@
+"""Voice worker — warm model pool with prioritised CPU inference.
+
+faster-whisper and Kokoro are CPU-bound and slow to load. Rather than
+lazy-loading them on the first request and letting every caller spin up
+its own thread, all voice inference goes through one worker:
+
+- A process pool sized to the host, whose workers load both models in
+  their initializer, so the first voice note after a restart doesn't stall.
+- An asyncio priority queue in front of the pool. Interactive requests
+  (/voice/converse, /voice/listen, /voice/speak) jump ahead of background
+  voice-note transcription from WhatsApp and Discord.
+- At most one job per worker process at a time, so simultaneous
+  transcriptions queue instead of thrashing the cores alongside the API.
+
+Set VOICE_WORKERS=0 to run inference on threads in-process (no pool).
+"""
+import asyncio
+import itertools
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+logger = logging.getLogger(__name__)
+
+# Priorities — lower runs first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+
+PRIORITY_NAMES = {
+    "interactive": PRIORITY_INTERACTIVE,
+    "background": PRIORITY_BACKGROUND,
+}
+
+# Latency samples kept per job kind for percentile metrics
+_LATENCY_WINDOW = 200
+
+
+def _default_worker_count() -> int:
+    """One worker per ~4 cores, capped at 2 — each holds both models in RAM."""
+    cpus = os.cpu_count() or 2
+    return max(1, min(2, cpus // 4))
+
+
+VOICE_WORKERS = int(os.getenv("VOICE_WORKERS", str(_default_worker_count())))
+
+
+def _worker_init(cpu_threads: int) -> None:
+    """Process pool initializer — cap inference threads and preload models.
+
+    Runs once in each worker process before it takes any job. Failures are
+    logged rather than raised: a raising initializer breaks the whole pool,
+    whereas a model that failed to preload will simply load on first use.
+    """
+    from hadley_api import voice_engine
+
+    voice_engine.WHISPER_CPU_THREADS = cpu_threads
+    try:
+        voice_engine._get_whisper()
+        voice_engine._get_kokoro()
+    except Exception as e:
+        logging.getLogger(__name__).error(f"Voice worker {os.getpid()} preload failed: {e}")
+
+
+def _worker_ready() -> int:
+    """No-op job used to force worker processes to spawn (and preload)."""
+    return os.getpid()
+
+
+def _percentile(samples, pct: float) -> float | None:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return round(ordered[idx], 1)
+
+
+class VoiceWorker:
+    """Priority-queued front end for the voice inference process pool."""
+
+    def __init__(self, workers: int = VOICE_WORKERS):
+        self.workers = workers
+        self._pool: ProcessPoolExecutor | None = None
+        self._warm_pids: set[int] = set()
+        self._started_at: float | None = None
+
+        # Event-loop bound state — rebuilt if called from a different loop
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queue: asyncio.PriorityQueue | None = None
+        self._dispatchers: list[asyncio.Task] = []
+        self._seq = itertools.count()
+
+        self._in_flight = 0
+        self._queued_by_priority: dict[int, int] = {}
+        self._counts: dict[str, dict[str, int]] = {}
+        self._wait_ms: dict[str, deque] = {}
+        self._run_ms: dict[str, deque] = {}
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Create the pool and warm every worker in the background.
+
+        Safe to call more than once. Returns immediately — model loading
+        happens in the worker processes.
+        """
+        if self._pool is not None or self.workers <= 0:
+            return
+        cpu_threads = max(1, (os.cpu_count() or 2) // self.workers)
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_worker_init,
+            initargs=(cpu_threads,),
+        )
+        self._started_at = time.time()
+        logger.info(f"Voice worker pool starting: {self.workers} process(es), {cpu_threads} threads each")
+
+        # Submitting one job per worker up front makes the pool spawn all of
+        # them now, so each runs its preload before real work arrives.
+        for _ in range(self.workers):
+            fut = self._pool.submit(_worker_ready)
+            fut.add_done_callback(self._on_worker_ready)
+
+    def _on_worker_ready(self, fut) -> None:
+        try:
+            pid = fut.result()
+        except Exception as e:
+            logger.error(f"Voice worker warm-up failed: {e}")
+            return
+        self._warm_pids.add(pid)
+        logger.info(f"Voice worker {pid} warm ({len(self._warm_pids)}/{self.workers})")
+
+    def shutdown(self) -> None:
+        for task in self._dispatchers:
+            task.cancel()
+        self._dispatchers = []
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        self._warm_pids.clear()
+
+    def _ensure_running(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._queue is not None:
+            return
+        self.start()
+        self._loop = loop
+        self._queue = asyncio.PriorityQueue()
+        self._queued_by_priority = {}
+        self._dispatchers = [
+            loop.create_task(self._dispatch()) for _ in range(max(1, self.workers))
+        ]
+
+    # ------------------------------------------------------------------
+    # Submission / dispatch
+    # ------------------------------------------------------------------
+
+    async def submit(self, fn, *args, priority: int = PRIORITY_INTERACTIVE, kind: str | None = None):
+        """Queue fn(*args) for the pool and await its result.
+
+        fn must be a module-level function (it's pickled to the worker).
+        """
+        self._ensure_running()
+        kind = kind or fn.__name__
+        future = self._loop.create_future()
+        self._queued_by_priority[priority] = self._queued_by_priority.get(priority, 0) + 1
+        await self._queue.put((priority, next(self._seq), time.monotonic(), kind, fn, args, future))
+        return await future
+
+    async def _dispatch(self) -> None:
+        while True:
+            priority, _, queued_at, kind, fn, args, future = await self._queue.get()
+            self._queued_by_priority[priority] -= 1
+            if future.cancelled():
+                continue
+
+            started = time.monotonic()
+            self._in_flight += 1
+            try:
+                result = await self._run(fn, args)
+            except Exception as e:
+                self._record(kind, queued_at, started, ok=False)
+                if not future.cancelled():
+                    future.set_exception(e)
+            else:
+                self._record(kind, queued_at, started, ok=True)
+                if not future.cancelled():
+                    future.set_result(result)
+            finally:
+                self._in_flight -= 1
+
+    async def _run(self, fn, args):
+        loop = asyncio.get_running_loop()
+        pool = self._pool
+        if pool is None:
+            return await loop.run_in_executor(None, fn, *args)
+        try:
+            return await loop.run_in_executor(pool, fn, *args)
+        except BrokenProcessPool:
+            # A worker died (OOM, native crash) — rebuild and retry once.
+            # Every in-flight job sees the same breakage; only the first
+            # to get here replaces the pool, the rest retry on the new one.
+            if self._pool is pool:
+                logger.error("Voice worker pool broken, restarting")
+                pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+                self._warm_pids.clear()
+                self.start()
+            if self._pool is None:
+                raise
+            return await loop.run_in_executor(self._pool, fn, *args)
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def _record(self, kind: str, queued_at: float, started: float, ok: bool) -> None:
+        now = time.monotonic()
+        counts = self._counts.setdefault(kind, {"completed": 0, "failed": 0})
+        counts["completed" if ok else "failed"] += 1
+        self._wait_ms.setdefault(kind, deque(maxlen=_LATENCY_WINDOW)).append((started - queued_at) * 1000)
+        self._run_ms.setdefault(kind, deque(maxlen=_LATENCY_WINDOW)).append((now - started) * 1000)
+
+    def metrics(self) -> dict:
+        """Queue depth, warm workers and per-kind latency percentiles."""
+        priority_labels = {v: k for k, v in PRIORITY_NAMES.items()}
+        jobs = {}
+        for kind, counts in self._counts.items():
+            wait, run = self._wait_ms.get(kind, ()), self._run_ms.get(kind, ())
+            jobs[kind] = {
+                **counts,
+                "wait_ms_p50": _percentile(wait, 50),
+                "wait_ms_p95": _percentile(wait, 95),
+                "run_ms_p50": _percentile(run, 50),
+                "run_ms_p95": _percentile(run, 95),
+            }
+        return {
+            "mode": "process" if self.workers > 0 else "thread",
+            "workers": self.workers,
+            "warm_workers": len(self._warm_pids),
+            "started_at": self._started_at,
+            "in_flight": self._in_flight,
+            "queued": {
+                priority_labels.get(p, str(p)): n
+                for p, n in sorted(self._queued_by_priority.items()) if n
+            },
+            "jobs": jobs,
+        }
+
+
+_worker: VoiceWorker | None = None
+
+
+def get_worker() -> VoiceWorker:
+    """Get or create the process-wide voice worker."""
+    global _worker
+    if _worker is None:
+        _worker = VoiceWorker()
+    return _worker
+
+
+def parse_priority(value: str | None, default: int = PRIORITY_INTERACTIVE) -> int:
+    """Map a query-param priority name ("interactive"/"background") to its value."""
+    if not value:
+        return default
+    return PRIORITY_NAMES.get(value.strip().lower(), default)
@@ -861,8 +861,8 @@ async def _handle_voice_note(
 
     # Transcribe using voice engine
     try:
-        from hadley_api.voice_engine import transcribe
-        text = await transcribe(audio_bytes, source_format="ogg")
+        from hadley_api.voice_engine import transcribe_batched
+        text = await transcribe_batched(audio_bytes, source_format="ogg")
     except Exception as e:
         logger.error(f"Voice note transcription failed: {e}")
         return
@@ -0,0 +1,546 @@
+"""Shared Supabase (PostgREST) data-access layer.
+
+One pooled sync + async httpx client per (url, key), reused by every module
+that talks to Supabase instead of each call opening its own connection.
+On top of the pool:
+
+- Retry with backoff on 429/5xx and connection failures (non-idempotent
+  inserts are only retried when the request provably never reached the
+  server).
+- select() with automatic pagination past PostgREST's 1,000-row cap.
+- upsert() that chunks bulk writes.
+- Per-table call/latency/row-count metrics (see metrics()).
+
+Modules that already build their own URLs and headers can swap
+``async with httpx.AsyncClient() as client:`` for
+``async with get_supabase().session() as client:`` — the session exposes the
+same get/post/patch/delete methods and returns plain httpx.Response objects,
+but runs over the pool with retries and metrics.
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from urllib.parse import urlsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Retry config
+MAX_RETRIES = 3
+RETRY_BACKOFF = [0.5, 1.5, 4.0]  # seconds between retries (Retry-After wins if set)
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Statuses where the request was rejected before doing anything — safe to
+# retry even for plain inserts
+_SAFE_RETRY_STATUSES = {429, 503}
+_IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "PATCH", "DELETE"}
+
+PAGE_SIZE = 1000
+UPSERT_CHUNK_SIZE = 500
+
+# Latency samples kept per table for percentile metrics
+_LATENCY_WINDOW = 200
+
+
+def _is_idempotent(method: str, headers: dict | None) -> bool:
+    if method.upper() in _IDEMPOTENT_METHODS:
+        return True
+    # POST with merge/ignore-duplicates is an upsert — replaying it is harmless
+    prefer = (headers or {}).get("Prefer", "") or (headers or {}).get("prefer", "")
+    return "resolution=" in prefer
+
+
+def _table_from_url(url: str) -> str:
+    """'/rest/v1/tasks?x=1' -> 'tasks'; '/rest/v1/rpc/fn' -> 'rpc/fn'."""
+    path = urlsplit(url).path
+    _, _, tail = path.partition("/rest/v1/")
+    parts = [p for p in tail.split("/") if p]
+    if not parts:
+        return "?"
+    if parts[0] == "rpc" and len(parts) > 1:
+        return f"rpc/{parts[1]}"
+    return parts[0]
+
+
+def _rows_from_response(resp: httpx.Response) -> int:
+    """Row count from PostgREST's Content-Range ('0-24/*' -> 25) when present."""
+    content_range = resp.headers.get("content-range", "")
+    span = content_range.split("/")[0]
+    if "-" in span:
+        start, _, end = span.partition("-")
+        if start.isdigit() and end.isdigit():
+            return int(end) - int(start) + 1
+    return 0
+
+
+def _retry_delay(attempt: int, resp: httpx.Response | None) -> float:
+    if resp is not None:
+        retry_after = resp.headers.get("retry-after", "")
+        if retry_after.replace(".", "", 1).isdigit():
+            return min(float(retry_after), 30.0)
+    return RETRY_BACKOFF[min(attempt, len(RETRY_BACKOFF) - 1)]
+
+
+def _percentile(samples, pct: float) -> float | None:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return round(ordered[idx], 1)
+
+
+class _TableStats:
+    __slots__ = ("calls", "errors", "retries", "rows_read", "rows_written", "latency_ms")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.rows_read = 0
+        self.rows_written = 0
+        self.latency_ms: deque = deque(maxlen=_LATENCY_WINDOW)
+
+
+class _AsyncSession:
+    """httpx.AsyncClient-shaped facade over the pool (get/post/patch/delete)."""
+
+    def __init__(self, rest: "SupabaseREST", timeout: float | None = None):
+        self._rest = rest
+        self._timeout = timeout
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        if self._timeout is not None:
+            kwargs.setdefault("timeout", self._timeout)
+        return await self._rest.request(method, url, **kwargs)
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def patch(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("PATCH", url, **kwargs)
+
+    async def put(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("PUT", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("DELETE", url, **kwargs)
+
+
+class _SyncSession:
+    """httpx.Client-shaped facade over the sync pool."""
+
+    def __init__(self, rest: "SupabaseREST", timeout: float | None = None):
+        self._rest = rest
+        self._timeout = timeout
+
+    def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        if self._timeout is not None:
+            kwargs.setdefault("timeout", self._timeout)
+        return self._rest.request_sync(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> httpx.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> httpx.Response:
+        return self.request("POST", url, **kwargs)
+
+    def patch(self, url: str, **kwargs) -> httpx.Response:
+        return self.request("PATCH", url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> httpx.Response:
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> httpx.Response:
+        return self.request("DELETE", url, **kwargs)
+
+
+class SupabaseREST:
+    """Pooled PostgREST client for one Supabase project + key."""
+
+    def __init__(self, url: str, key: str, timeout: float = 30.0):
+        self.url = (url or "").rstrip("/")
+        self.key = key or ""
+        self.rest_url = f"{self.url}/rest/v1"
+        self.timeout = timeout
+        self._limits = httpx.Limits(max_connections=20, max_keepalive_connections=10)
+
+        # httpx.AsyncClient pools are bound to the loop that opened them, so
+        # keep one per event loop (the bot and Hadley API each run one; a
+        # few jobs use asyncio.run in worker threads).
+        self._async_clients: dict[int, tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = {}
+        self._sync_client: httpx.Client | None = None
+        self._lock = threading.Lock()
+
+        self._stats: dict[str, _TableStats] = {}
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.url and self.key)
+
+    # ------------------------------------------------------------------
+    # Clients
+    # ------------------------------------------------------------------
+
+    def async_client(self) -> httpx.AsyncClient:
+        """Pooled AsyncClient for the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            # Drop clients whose loops have gone away
+            for loop_id, (owner, client) in list(self._async_clients.items()):
+                if owner.is_closed() or client.is_closed:
+                    del self._async_clients[loop_id]
+            entry = self._async_clients.get(id(loop))
+            if entry is None or entry[0] is not loop:
+                client = httpx.AsyncClient(timeout=self.timeout, limits=self._limits)
+                self._async_clients[id(loop)] = (loop, client)
+                return client
+            return entry[1]
+
+    def sync_client(self) -> httpx.Client:
+        """Pooled (thread-safe) sync Client."""
+        with self._lock:
+            if self._sync_client is None or self._sync_client.is_closed:
+                self._sync_client = httpx.Client(timeout=self.timeout, limits=self._limits)
+            return self._sync_client
+
+    def pooled(self, timeout: float | None = None) -> _AsyncSession:
+        """httpx.AsyncClient-shaped handle on the pool, for module-level reuse."""
+        return _AsyncSession(self, timeout)
+
+    @asynccontextmanager
+    async def session(self, timeout: float | None = None):
+        """Drop-in for ``async with httpx.AsyncClient() as client`` — pooled.
+
+        timeout is the default for requests that don't pass their own.
+        Leaving the block does not close connections; they go back to the pool.
+        """
+        yield self.pooled(timeout)
+
+    @contextmanager
+    def session_sync(self, timeout: float | None = None):
+        """Drop-in for ``with httpx.Client() as client`` — pooled."""
+        yield _SyncSession(self, timeout)
+
+    # ------------------------------------------------------------------
+    # URLs / headers
+    # ------------------------------------------------------------------
+
+    def table_url(self, table: str) -> str:
+        return f"{self.rest_url}/{table}"
+
+    def headers(self, *, schema: str | None = None, prefer: str | None = "return=representation") -> dict[str, str]:
+        """Standard auth headers, optionally for a non-public schema."""
+        if not self.key:
+            raise RuntimeError("SUPABASE_KEY is not set — check environment variables")
+        headers = {
+            "apikey": self.key,
+            "Authorization": f"Bearer {self.key}",
+            "Content-Type": "application/json",
+        }
+        if prefer:
+            headers["Prefer"] = prefer
+        if schema:
+            headers["Accept-Profile"] = schema
+            headers["Content-Profile"] = schema
+        return headers
+
+    def _absolute(self, url_or_table: str) -> str:
+        if url_or_table.startswith(("http://", "https://")):
+            return url_or_table
+        return self.table_url(url_or_table.lstrip("/"))
+
+    # ------------------------------------------------------------------
+    # Core request (retry + metrics)
+    # ------------------------------------------------------------------
+
+    def _record(self, table: str, method: str, started: float, resp: httpx.Response | None,
+                retries: int, json_body) -> None:
+        stats = self._stats.get(table)
+        if stats is None:
+            stats = self._stats[table] = _TableStats()
+        stats.calls += 1
+        stats.retries += retries
+        stats.latency_ms.append((time.monotonic() - started) * 1000)
+        if resp is None or resp.status_code >= 400:
+            stats.errors += 1
+            return
+        if method == "GET":
+            stats.rows_read += _rows_from_response(resp)
+        elif method in ("POST", "PATCH", "PUT"):
+            stats.rows_written += len(json_body) if isinstance(json_body, list) else 1
+
+    def _should_retry(self, method: str, headers: dict | None, resp: httpx.Response | None,
+                      exc: Exception | None) -> bool:
+        idempotent = _is_idempotent(method, headers)
+        if exc is not None:
+            # Connect-phase failures never reached the server
+            if isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)):
+                return True
+            return idempotent and isinstance(exc, httpx.TransportError)
+        if resp.status_code in _SAFE_RETRY_STATUSES:
+            return True
+        return idempotent and resp.status_code in RETRY_STATUSES
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send a request over the async pool, retrying transient failures.
+
+        Accepts the same keyword arguments as httpx (params, json, headers,
+        timeout, ...). Returns the final httpx.Response; raises the last
+        transport error if every attempt failed to connect.
+        """
+        method = method.upper()
+        url = self._absolute(url)
+        table = _table_from_url(url)
+        headers = kwargs.get("headers")
+        started = time.monotonic()
+        client = self.async_client()
+
+        attempt = 0
+        while True:
+            resp, exc = None, None
+            try:
+                resp = await client.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                exc = e
+            if attempt < MAX_RETRIES and self._should_retry(method, headers, resp, exc):
+                delay = _retry_delay(attempt, resp)
+                logger.warning(
+                    f"Supabase {method} {table} "
+                    f"{'failed: ' + type(exc).__name__ if exc else resp.status_code}"
+                    f" — retry {attempt + 1}/{MAX_RETRIES} in {delay:.1f}s"
+                )
+                attempt += 1
+                await asyncio.sleep(delay)
+                continue
+            self._record(table, method, started, resp, attempt, kwargs.get("json"))
+            if exc is not None:
+                raise exc
+            return resp
+
+    def request_sync(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Blocking twin of request() over the sync pool."""
+        method = method.upper()
+        url = self._absolute(url)
+        table = _table_from_url(url)
+        headers = kwargs.get("headers")
+        started = time.monotonic()
+        client = self.sync_client()
+
+        attempt = 0
+        while True:
+            resp, exc = None, None
+            try:
+                resp = client.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                exc = e
+            if attempt < MAX_RETRIES and self._should_retry(method, headers, resp, exc):
+                delay = _retry_delay(attempt, resp)
+                logger.warning(
+                    f"Supabase {method} {table} "
+                    f"{'failed: ' + type(exc).__name__ if exc else resp.status_code}"
+                    f" — retry {attempt + 1}/{MAX_RETRIES} in {delay:.1f}s"
+                )
+                attempt += 1
+                time.sleep(delay)
+                continue
+            self._record(table, method, started, resp, attempt, kwargs.get("json"))
+            if exc is not None:
+                raise exc
+            return resp
+
+    # ------------------------------------------------------------------
+    # Helpers (async)
+    # ------------------------------------------------------------------
+
+    async def select(
+        self,
+        table: str,
+        params: dict[str, str] | None = None,
+        *,
+        paginate: bool = False,
+        page_size: int = PAGE_SIZE,
+        schema: str | None = None,
+    ) -> list[dict]:
+        """GET rows. paginate=True follows limit/offset until a short page."""
+        headers = self.headers(schema=schema, prefer=None)
+        params = dict(params or {})
+        if not paginate:
+            resp = await self.request("GET", table, params=params, headers=headers)
+            resp.raise_for_status()
+            return resp.json()
+
+        rows: list[dict] = []
+        offset = int(params.pop("offset", 0))
+        cap = int(params.pop("limit")) if "limit" in params else None
+        while True:
+            take = page_size if cap is None else min(page_size, cap - len(rows))
+            if take <= 0:
+                break
+            resp = await self.request(
+                "GET", table,
+                params={**params, "limit": str(take), "offset": str(offset)},
+                headers=headers,
+            )
+            resp.raise_for_status()
+            batch = resp.json()
+            rows.extend(batch)
+            if len(batch) < take:
+                break
+            offset += take
+        return rows
+
+    async def insert(self, table: str, rows: dict | list[dict], *, returning: bool = True,
+                     schema: str | None = None) -> list[dict]:
+        prefer = "return=representation" if returning else "return=minimal"
+        resp = await self.request("POST", table, json=rows, headers=self.headers(schema=schema, prefer=prefer))
+        resp.raise_for_status()
+        return resp.json() if returning else []
+
+    async def upsert(
+        self,
+        table: str,
+        rows: list[dict],
+        *,
+        on_conflict: str | None = None,
+        ignore_duplicates: bool = False,
+        returning: bool = False,
+        chunk_size: int = UPSERT_CHUNK_SIZE,
+        schema: str | None = None,
+    ) -> list[dict] | int:
+        """Bulk upsert in chunks. Returns rows (returning=True) or rows sent."""
+        resolution = "ignore-duplicates" if ignore_duplicates else "merge-duplicates"
+        prefer = f"resolution={resolution},{'return=representation' if returning else 'return=minimal'}"
+        headers = self.headers(schema=schema, prefer=prefer)
+        params = {"on_conflict": on_conflict} if on_conflict else None
+        out: list[dict] = []
+        sent = 0
+        for i in range(0, len(rows), chunk_size):
+            chunk = rows[i:i + chunk_size]
+            resp = await self.request("POST", table, params=params, json=chunk, headers=headers)
+            resp.raise_for_status()
+            sent += len(chunk)
+            if returning:
+                out.extend(resp.json())
+        return out if returning else sent
+
+    async def update(self, table: str, params: dict[str, str], values: dict, *,
+                     returning: bool = True, schema: str | None = None) -> list[dict]:
+        prefer = "return=representation" if returning else "return=minimal"
+        resp = await self.request("PATCH", table, params=params, json=values,
+                                  headers=self.headers(schema=schema, prefer=prefer))
+        resp.raise_for_status()
+        return resp.json() if returning else []
+
+    async def delete(self, table: str, params: dict[str, str], *, schema: str | None = None) -> None:
+        resp = await self.request("DELETE", table, params=params,
+                                  headers=self.headers(schema=schema, prefer=None))
+        resp.raise_for_status()
+
+    async def rpc(self, fn_name: str, body: dict | None = None, *, schema: str | None = None) -> list[dict]:
+        resp = await self.request("POST", f"rpc/{fn_name}", json=body or {},
+                                  headers=self.headers(schema=schema, prefer=None))
+        resp.raise_for_status()
+        data = resp.json()
+        return data if isinstance(data, list) else [data] if data else []
+
+    # ------------------------------------------------------------------
+    # Helpers (sync)
+    # ------------------------------------------------------------------
+
+    def select_sync(self, table: str, params: dict[str, str] | None = None, *,
+                    paginate: bool = False, page_size: int = PAGE_SIZE,
+                    schema: str | None = None) -> list[dict]:
+        headers = self.headers(schema=schema, prefer=None)
+        params = dict(params or {})
+        if not paginate:
+            resp = self.request_sync("GET", table, params=params, headers=headers)
+            resp.raise_for_status()
+            return resp.json()
+
+        rows: list[dict] = []
+        offset = int(params.pop("offset", 0))
+        cap = int(params.pop("limit")) if "limit" in params else None
+        while True:
+            take = page_size if cap is None else min(page_size, cap - len(rows))
+            if take <= 0:
+                break
+            resp = self.request_sync(
+                "GET", table,
+                params={**params, "limit": str(take), "offset": str(offset)},
+                headers=headers,
+            )
+            resp.raise_for_status()
+            batch = resp.json()
+            rows.extend(batch)
+            if len(batch) < take:
+                break
+            offset += take
+        return rows
+
+    def upsert_sync(self, table: str, rows: list[dict], *, on_conflict: str | None = None,
+                    ignore_duplicates: bool = False, chunk_size: int = UPSERT_CHUNK_SIZE,
+                    schema: str | None = None) -> int:
+        resolution = "ignore-duplicates" if ignore_duplicates else "merge-duplicates"
+        headers = self.headers(schema=schema, prefer=f"resolution={resolution},return=minimal")
+        params = {"on_conflict": on_conflict} if on_conflict else None
+        sent = 0
+        for i in range(0, len(rows), chunk_size):
+            chunk = rows[i:i + chunk_size]
+            resp = self.request_sync("POST", table, params=params, json=chunk, headers=headers)
+            resp.raise_for_status()
+            sent += len(chunk)
+        return sent
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def metrics(self) -> dict:
+        """Per-table calls, errors, retries, rows and latency percentiles."""
+        tables = {}
+        for table, s in sorted(self._stats.items()):
+            tables[table] = {
+                "calls": s.calls,
+                "errors": s.errors,
+                "retries": s.retries,
+                "rows_read": s.rows_read,
+                "rows_written": s.rows_written,
+                "latency_ms_p50": _percentile(s.latency_ms, 50),
+                "latency_ms_p95": _percentile(s.latency_ms, 95),
+            }
+        return {
+            "url": self.url,
+            "open_async_pools": len(self._async_clients),
+            "tables": tables,
+        }
+
+
+_instances: dict[tuple[str, str], SupabaseREST] = {}
+_instances_lock = threading.Lock()
+
+
+def get_supabase(url: str | None = None, key: str | None = None) -> SupabaseREST:
+    """Get the shared client for a project/key (defaults: SUPABASE_URL / SUPABASE_KEY).
+
+    Modules that need a different key (e.g. service role) pass it
+    explicitly and get their own pool.
+    """
+    url = url if url is not None else os.getenv("SUPABASE_URL", "")
+    key = key if key is not None else os.getenv("SUPABASE_KEY", "")
+    with _instances_lock:
+        inst = _instances.get((url, key))
+        if inst is None:
+            inst = _instances[(url, key)] = SupabaseREST(url, key)
+        return inst
+
+
+def all_metrics() -> list[dict]:
+    """Metrics for every client created in this process."""
+    return [inst.metrics() for inst in _instances.values()]
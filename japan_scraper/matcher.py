@@ -1,59 +1,47 @@
 """Deduplication and Tabelog matching for extracted places."""
 
 import json
-import re
-import unicodedata
 from pathlib import Path
 
-from rapidfuzz import fuzz, process
-
 from .config import OUTPUT_DIR, TABELOG_JSON
-
-
-def _normalise(name: str) -> str:
-    """Normalise a place name for matching."""
-    name = unicodedata.normalize("NFKC", name)
-    name = name.lower().strip()
-    # Remove common suffixes/prefixes
-    name = re.sub(r'\s*(restaurant|cafe|café|bar|izakaya|ramen|shop|store)\s*$', '', name)
-    # Remove punctuation
-    name = re.sub(r'[^\w\s]', '', name)
-    # Collapse whitespace
-    name = re.sub(r'\s+', ' ', name)
-    return name.strip()
+from .match_engine import MatchEngine, UnionFind
 
 
 def _deduplicate(places: list[dict], threshold: int = 80) -> list[dict]:
-    """Merge duplicate places using fuzzy matching."""
+    """Merge duplicate places using fuzzy matching.
+
+    Candidate pairs come from the blocked engine (see match_engine.py);
+    places in the same city (or with no city) scoring >= threshold are
+    unioned, best pairs first, so A~B and B~C end up in one group. A group
+    never spans two cities: a place with no city joins at most one of them.
+    """
     if not places:
         return []
 
-    merged = []
-    used = set()
-
-    for i, place in enumerate(places):
-        if i in used:
-            continue
-
-        name_i = _normalise(place.get("name", ""))
-        city_i = place.get("city", "").lower()
-        group = [place]
+    engine = MatchEngine([p.get("name", "") for p in places])
+    cities = [p.get("city", "").lower() for p in places]
 
-        for j in range(i + 1, len(places)):
-            if j in used:
-                continue
+    def same_city(i, j):
+        # Only match within same city (or if city is empty)
+        return not (cities[i] and cities[j] and cities[i] != cities[j])
 
-            name_j = _normalise(places[j].get("name", ""))
-            city_j = places[j].get("city", "").lower()
-
-            # Only match within same city (or if city is empty)
-            if city_i and city_j and city_i != city_j:
-                continue
+    groups = UnionFind(len(places))
+    # Known city per group root ("" while none of its places has one)
+    group_city = list(cities)
+    pairs = sorted(engine.pairs(threshold, compatible=same_city), key=lambda p: (-p[2], p[0], p[1]))
+    for i, j, _ in pairs:
+        ri, rj = groups.find(i), groups.find(j)
+        if ri == rj:
+            continue
+        ci, cj = group_city[ri], group_city[rj]
+        if ci and cj and ci != cj:
+            continue
+        groups.union(i, j)
+        group_city[groups.find(i)] = ci or cj
 
-            score = fuzz.token_sort_ratio(name_i, name_j)
-            if score >= threshold:
-                group.append(places[j])
-                used.add(j)
+    merged = []
+    for members in groups.groups():
+        group = [places[i] for i in members]
 
         # Merge group: keep the richest entry, aggregate sources
         best = max(group, key=lambda p: len(p.get("context", "")))
@@ -71,7 +59,6 @@ def _deduplicate(places: list[dict], threshold: int = 80) -> list[dict]:
         best["source_count"] = len(source_urls)
         best["source_urls"] = list(source_urls)
         merged.append(best)
-        used.add(i)
 
     return merged
 
@@ -102,23 +89,13 @@ def _match_tabelog(places: list[dict], tabelog: list[dict], threshold: int = 85)
     if not tabelog:
         return places
 
-    # Build lookup of normalised Tabelog names
-    tabelog_names = [_normalise(r.get("name", "")) for r in tabelog]
+    engine = MatchEngine([r.get("name", "") for r in tabelog])
+    results = engine.best_matches([p.get("name", "") for p in places], threshold)
 
     matched = 0
-    for place in places:
-        name = _normalise(place.get("name", ""))
-        if not name:
-            continue
-
-        result = process.extractOne(
-            name, tabelog_names,
-            scorer=fuzz.token_sort_ratio,
-            score_cutoff=threshold,
-        )
-
+    for place, result in zip(places, results):
         if result:
-            match_name, score, idx = result
+            idx, score = result
             t = tabelog[idx]
             place["tabelog_match"] = {
                 "name": t.get("name"),
@@ -13,7 +13,12 @@ import unicodedata
 from pathlib import Path
 
 import requests
-from rapidfuzz import fuzz, process
+from rapidfuzz import fuzz
+
+try:
+    from .match_engine import MatchEngine
+except ImportError:  # run as a script
+    from match_engine import MatchEngine
 
 TABELOG_JSON = Path("C:/Users/Chris Hadley/claude-projects/Discord-Messenger/tabelog_combined.json")
 GUIDE_DIR = Path.home() / ".skills/skills/guide-creator/sites/japan-2026"
@@ -103,23 +108,18 @@ def phase1_fuzzy_match(venues):
     with open(TABELOG_JSON, "r", encoding="utf-8") as f:
         tabelog = json.load(f)
 
-    tabelog_names = [norm(r.get("name", "")) for r in tabelog]
+    engine = MatchEngine([r.get("name", "") for r in tabelog])
+    results = engine.best_matches([v for v, _ in venues], threshold=82)
     matched = {}
     unmatched = []
 
-    for v, guide in venues:
-        vn = norm(v)
-        if len(vn) < 3:
+    for (v, guide), result in zip(venues, results):
+        if len(norm(v)) < 3:
             unmatched.append((v, guide))
             continue
 
-        result = process.extractOne(
-            vn, tabelog_names,
-            scorer=fuzz.token_sort_ratio,
-            score_cutoff=82,
-        )
         if result:
-            match_name, score, idx = result
+            idx, score = result
             t = tabelog[idx]
             # Check false positives
             if (v, t["name"]) in FALSE_POSITIVES:
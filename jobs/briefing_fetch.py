@@ -0,0 +1,241 @@
+"""Shared fetch engine for the AI morning briefing searches.
+
+The briefing runs a handful of searches: X and web through Grok's live
+search, and Reddit through its .json search. Each used to open its own
+client, and Reddit was walked one subreddit at a time behind fixed sleeps.
+Now:
+
+- **budget** — every search shares one httpx client whose transport allows
+  at most MAX_CONCURRENCY requests in flight and spaces requests to
+  rate-limited hosts (Reddit) HOST_INTERVALS apart, so searches can fire
+  all their requests at once;
+- **deadlines** — each source has its own deadline, so a slow search costs
+  its own results, not the briefing;
+- **streaming** — ``stream()`` yields results as sources finish. Once a
+  quorum is in and every kind has reported, it waits at most a short grace
+  period and then stops. Stragglers keep running in the background;
+- **cache** — non-empty results are kept per (kind, topic, window) for a few
+  hours in ``data/briefing_cache.db``. A re-run, a retry or a manual
+  ``!skill morning-briefing`` only repeats the searches that failed or came
+  back empty, and stragglers from the last run are picked up from there.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable
+
+import httpx
+
+from logger import logger
+from utils.sqlite_store import SQLiteStore
+
+DB_PATH = Path(__file__).resolve().parents[1] / "data" / "briefing_cache.db"
+
+CACHE_TTL_SECONDS = 3 * 3600
+MAX_CONCURRENCY = 6
+# Minimum seconds between request starts, per host
+HOST_INTERVALS = {"www.reddit.com": 1.0, "reddit.com": 1.0}
+DEFAULT_DEADLINE = 120.0
+# stream() starts its grace period once this share of sources is in
+QUORUM = 2 / 3
+GRACE_SECONDS = 20.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS search_cache (
+    key TEXT PRIMARY KEY,
+    items TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+"""
+
+# Sources still running after stream() returned
+_background: set[asyncio.Task] = set()
+
+
+class SearchCache(SQLiteStore):
+    """Per-topic search results, reused for ttl seconds."""
+
+    SCHEMA = _SCHEMA
+
+    def __init__(self, path: Path | str = DB_PATH, ttl: float = CACHE_TTL_SECONDS):
+        super().__init__(path)
+        self.ttl = ttl
+
+    def get(self, key: str) -> list[dict] | None:
+        with self.db() as conn:
+            row = conn.execute("SELECT items FROM search_cache WHERE key = ? AND fetched_at >= ?",
+                               (key, time.time() - self.ttl)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, key: str, items: list[dict]) -> None:
+        now = time.time()
+        with self.db() as conn:
+            conn.execute("INSERT OR REPLACE INTO search_cache (key, items, fetched_at) VALUES (?, ?, ?)",
+                         (key, json.dumps(items), now))
+            conn.execute("DELETE FROM search_cache WHERE fetched_at < ?", (now - self.ttl,))
+
+
+_cache: SearchCache | None = None
+
+
+def get_cache() -> SearchCache:
+    """The process-wide briefing search cache."""
+    global _cache
+    if _cache is None:
+        _cache = SearchCache()
+    return _cache
+
+
+class BudgetTransport(httpx.AsyncBaseTransport):
+    """Transport wrapper enforcing a shared concurrency cap and per-host spacing."""
+
+    def __init__(self, inner: httpx.AsyncBaseTransport | None = None,
+                 max_concurrency: int = MAX_CONCURRENCY,
+                 host_intervals: dict[str, float] | None = None):
+        self._inner = inner or httpx.AsyncHTTPTransport()
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._intervals = HOST_INTERVALS if host_intervals is None else host_intervals
+        self._host_gates: dict[str, asyncio.Lock] = {}
+        self._last_start: dict[str, float] = {}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        interval = self._intervals.get(host, 0.0)
+        if not interval:
+            async with self._slots:
+                return await self._inner.handle_async_request(request)
+        # One request per spaced host passes the gate at a time, and only
+        # once it holds a slot, so sends (not queue entries) are spaced
+        async with self._host_gates.setdefault(host, asyncio.Lock()):
+            loop = asyncio.get_running_loop()
+            wait = self._last_start.get(host, float("-inf")) + interval - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            await self._slots.acquire()
+            self._last_start[host] = loop.time()
+        try:
+            return await self._inner.handle_async_request(request)
+        finally:
+            self._slots.release()
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+def budget_client(**kwargs) -> httpx.AsyncClient:
+    """An httpx client whose requests go through a fresh BudgetTransport."""
+    return httpx.AsyncClient(transport=BudgetTransport(), **kwargs)
+
+
+@dataclass
+class BriefingSource:
+    """One search. `search(client)` returns items; `key` names it in the cache."""
+
+    kind: str  # "x", "reddit" or "web"
+    key: str
+    search: Callable[[httpx.AsyncClient], Awaitable[list[dict]]]
+    deadline: float = DEFAULT_DEADLINE
+
+
+class BriefingFetcher:
+    """Runs briefing sources under one budget, with deadlines and the cache."""
+
+    def __init__(self, cache: SearchCache | None = None,
+                 transport: httpx.AsyncBaseTransport | None = None):
+        self.cache = cache if cache is not None else get_cache()
+        self._transport = transport
+
+    async def _run(self, client: httpx.AsyncClient, source: BriefingSource,
+                   results: asyncio.Queue) -> None:
+        items: list[dict] = []
+        try:
+            found = await asyncio.wait_for(source.search(client), source.deadline)
+            items = found if isinstance(found, list) else []
+        except asyncio.TimeoutError:
+            logger.warning(f"Briefing source {source.key} missed its {source.deadline:.0f}s deadline")
+        except Exception as e:
+            logger.warning(f"Briefing source {source.key} failed: {e}")
+        if items:
+            try:
+                self.cache.put(source.key, items)
+            except Exception as e:
+                logger.warning(f"Could not cache briefing source {source.key}: {e}")
+        results.put_nowait((source, items))
+
+    async def stream(self, sources: list[BriefingSource], grace: float | None = GRACE_SECONDS,
+                     quorum: float = QUORUM) -> AsyncIterator[tuple[BriefingSource, list[dict]]]:
+        """Yield (source, items) as sources finish, cached ones first.
+
+        Once `quorum` of the sources are in and every kind has reported,
+        waits at most `grace` more seconds (None waits for all) and stops.
+        Sources still running carry on in the background, within their
+        deadlines, and land in the cache for the next run.
+        """
+        results: asyncio.Queue = asyncio.Queue()
+        live = []
+        for source in sources:
+            try:
+                cached = self.cache.get(source.key)
+            except Exception as e:
+                logger.warning(f"Briefing cache unavailable: {e}")
+                cached = None
+            if cached:
+                results.put_nowait((source, cached))
+            else:
+                live.append(source)
+        if live:
+            transport = self._transport or BudgetTransport()
+            client = httpx.AsyncClient(transport=transport, timeout=30, follow_redirects=True)
+            tasks = [asyncio.create_task(self._run(client, s, results)) for s in live]
+            closer = asyncio.create_task(_close_when_done(client, tasks))
+            _background.add(closer)
+            closer.add_done_callback(_background.discard)
+        logger.info(f"Briefing fetch: {len(sources) - len(live)} cached, {len(live)} searching")
+
+        loop = asyncio.get_running_loop()
+        kinds_waiting = {s.kind for s in sources}
+        received = 0
+        cutoff = None
+        while received < len(sources):
+            if results.empty() and cutoff is not None:
+                try:
+                    item = await asyncio.wait_for(results.get(), max(0.0, cutoff - loop.time()))
+                except asyncio.TimeoutError:
+                    logger.info(f"Briefing fetch: going ahead without {len(sources) - received} "
+                                f"source(s) still running")
+                    return
+            else:
+                item = await results.get()
+            received += 1
+            kinds_waiting.discard(item[0].kind)
+            yield item
+            if (cutoff is None and grace is not None and not kinds_waiting
+                    and received >= quorum * len(sources)):
+                cutoff = loop.time() + grace
+
+    async def fetch(self, sources: list[BriefingSource],
+                    grace: float | None = GRACE_SECONDS) -> dict[str, list[dict]]:
+        """Items per kind, de-duplicated by URL, in source order."""
+        by_source: dict[str, list[dict]] = {}
+        async for source, items in self.stream(sources, grace=grace):
+            by_source[source.key] = items
+        results: dict[str, list[dict]] = {s.kind: [] for s in sources}
+        seen: dict[str, set] = {kind: set() for kind in results}
+        for source in sources:
+            for item in by_source.get(source.key, []):
+                url = item.get("url")
+                if url and url in seen[source.kind]:
+                    continue
+                seen[source.kind].add(url)
+                results[source.kind].append(item)
+        return results
+
+
+async def _close_when_done(client: httpx.AsyncClient, tasks: list[asyncio.Task]) -> None:
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await client.aclose()
@@ -22,6 +22,7 @@ import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 
 from config import SUPABASE_URL, SUPABASE_KEY, call_claude_via_cli
+from domains.nutrition.services.health_timeseries import load_health_timeseries
 from logger import logger
 
 # Discord channel for monthly health summary
@@ -40,39 +41,20 @@ def _get_headers() -> dict:
 async def _get_weight_month() -> dict:
     """Get weight data for the past month."""
     try:
-        start_date = (datetime.now() - timedelta(days=30)).isoformat()
-
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{SUPABASE_URL}/rest/v1/weight_readings",
-                headers=_get_headers(),
-                params={
-                    "select": "weight_kg,measured_at",
-                    "user_id": "eq.chris",
-                    "measured_at": f"gte.{start_date}",
-                    "order": "measured_at.asc"
-                },
-                timeout=30
-            )
-
-            if response.status_code != 200:
-                logger.error(f"Weight query failed: {response.status_code}")
-                return {}
-
-            data = response.json()
-
-        if not data:
+        cache = await load_health_timeseries((datetime.now() - timedelta(days=30)).date())
+        at, kg = cache.weights(datetime.now() - timedelta(days=30))
+        if not len(kg):
             return {}
 
-        weights = [float(r["weight_kg"]) for r in data]
-        dates = [datetime.fromisoformat(r["measured_at"].replace("Z", "+00:00")) for r in data]
+        weights = [float(w) for w in kg]
+        dates = at.tolist()  # datetime64[s] -> datetime
         return {
-            "start": weights[0] if weights else None,
-            "end": weights[-1] if weights else None,
+            "start": weights[0],
+            "end": weights[-1],
             "change": round(weights[-1] - weights[0], 1) if len(weights) >= 2 else 0,
-            "min": min(weights) if weights else None,
-            "max": max(weights) if weights else None,
-            "avg": round(sum(weights) / len(weights), 1) if weights else None,
+            "min": float(kg.min()),
+            "max": float(kg.max()),
+            "avg": round(float(kg.mean()), 1),
             "readings": len(weights),
             "raw_weights": weights,
             "raw_dates": dates
@@ -144,37 +126,30 @@ async def _get_nutrition_month() -> dict:
 
 
 async def _get_steps_month() -> dict:
-    """Get steps data for the past 30 days."""
+    """Get steps data for the past 30 days (excluding today)."""
     try:
-        end_date = datetime.now().date().isoformat()
-        start_date = (datetime.now() - timedelta(days=30)).date().isoformat()
-
-        filter_str = f"and=(date.gte.{start_date},date.lt.{end_date})"
-        url = f"{SUPABASE_URL}/rest/v1/garmin_daily_summary?select=date,steps,steps_goal&user_id=eq.chris&{filter_str}&order=date.asc"
-
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=_get_headers(), timeout=30)
-
-            if response.status_code != 200:
-                logger.error(f"Steps query failed: {response.status_code}")
-                return {}
-
-            data = response.json()
-
-        if not data:
+        # 30 days ago to yesterday (exclude today as it's incomplete)
+        start = (datetime.now() - timedelta(days=30)).date()
+        end = datetime.now().date() - timedelta(days=1)
+        cache = await load_health_timeseries(start)
+
+        days, values = cache.daily("steps", start, end)
+        _, goals = cache.daily("steps_goal", start, end)
+        has = values > 0
+        if not has.any():
             return {}
 
-        steps = [d["steps"] for d in data if d["steps"]]
-        dates = [datetime.strptime(d["date"], "%Y-%m-%d") for d in data if d["steps"]]
-        goal = data[0].get("steps_goal", 15000) if data else 15000
+        steps = [int(s) for s in values[has]]
+        dates = [datetime(d.year, d.month, d.day) for d in days[has].tolist()]
+        goal = int(goals[0]) if len(goals) else 15000
 
         return {
             "total": sum(steps),
-            "avg": round(sum(steps) / len(steps)) if steps else 0,
+            "avg": round(sum(steps) / len(steps)),
             "days": len(steps),
             "days_hit_goal": sum(1 for s in steps if s >= goal),
-            "best_day": max(steps) if steps else 0,
-            "worst_day": min(steps) if steps else 0,
+            "best_day": max(steps),
+            "worst_day": min(steps),
             "goal": goal,
             "raw_steps": steps,
             "raw_dates": dates
@@ -185,35 +160,18 @@ async def _get_steps_month() -> dict:
 
 
 async def _get_sleep_month() -> dict:
-    """Get sleep data for the past month."""
+    """Get sleep data for the past month from Garmin."""
     try:
-        start_date = (datetime.now() - timedelta(days=30)).date().isoformat()
-
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{SUPABASE_URL}/rest/v1/garmin_daily_summary",
-                headers=_get_headers(),
-                params={
-                    "select": "date,sleep_hours,sleep_score",
-                    "user_id": "eq.chris",
-                    "date": f"gte.{start_date}",
-                    "order": "date.asc"
-                },
-                timeout=30
-            )
-
-            if response.status_code != 200:
-                logger.error(f"Sleep query failed: {response.status_code}")
-                return {}
-
-            data = response.json()
-
-        if not data:
+        start = (datetime.now() - timedelta(days=30)).date()
+        cache = await load_health_timeseries(start)
+
+        _, hours = cache.daily("sleep_hours", start)
+        _, scores = cache.daily("sleep_score", start)
+        sleep_hours = [float(h) for h in hours if h]
+        sleep_scores = [float(s) for s in scores if s]
+        if not sleep_hours and not sleep_scores:
             return {}
 
-        sleep_hours = [d["sleep_hours"] for d in data if d.get("sleep_hours")]
-        sleep_scores = [d["sleep_score"] for d in data if d.get("sleep_score")]
-
         return {
             "avg_hours": round(sum(sleep_hours) / len(sleep_hours), 1) if sleep_hours else None,
             "avg_score": round(sum(sleep_scores) / len(sleep_scores)) if sleep_scores else None,
@@ -256,38 +214,17 @@ async def _get_previous_month() -> dict:
     """Get summary from previous month for comparison."""
     try:
         # Previous month: 60 to 30 days ago
-        end_date = (datetime.now() - timedelta(days=30)).date().isoformat()
-        start_date = (datetime.now() - timedelta(days=60)).date().isoformat()
-
-        # Weight
-        async with httpx.AsyncClient() as client:
-            weight_resp = await client.get(
-                f"{SUPABASE_URL}/rest/v1/weight_readings",
-                headers=_get_headers(),
-                params={
-                    "select": "weight_kg",
-                    "user_id": "eq.chris",
-                    "measured_at": f"gte.{start_date}",
-                    "measured_at": f"lt.{end_date}",
-                    "order": "measured_at.asc"
-                },
-                timeout=30
-            )
-
-            weight_data = weight_resp.json() if weight_resp.status_code == 200 else []
-            weights = [float(r["weight_kg"]) for r in weight_data] if weight_data else []
-
-            # Steps
-            filter_str = f"and=(date.gte.{start_date},date.lt.{end_date})"
-            steps_url = f"{SUPABASE_URL}/rest/v1/garmin_daily_summary?select=steps&user_id=eq.chris&{filter_str}"
-            steps_resp = await client.get(steps_url, headers=_get_headers(), timeout=30)
+        start = (datetime.now() - timedelta(days=60)).date()
+        end = (datetime.now() - timedelta(days=30)).date()
+        cache = await load_health_timeseries(start)
 
-            steps_data = steps_resp.json() if steps_resp.status_code == 200 else []
-            steps = [d["steps"] for d in steps_data if d.get("steps")]
+        _, weights = cache.weights(start, end)
+        _, steps = cache.daily("steps", start, end - timedelta(days=1))
+        steps = steps[steps > 0]
 
         return {
-            "avg_weight": round(sum(weights) / len(weights), 1) if weights else None,
-            "avg_steps": round(sum(steps) / len(steps)) if steps else None
+            "avg_weight": round(float(weights.mean()), 1) if len(weights) else None,
+            "avg_steps": round(float(steps.mean())) if len(steps) else None
         }
     except Exception as e:
         logger.error(f"Failed to get previous month: {e}")
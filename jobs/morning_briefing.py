@@ -10,17 +10,21 @@ Two-stage approach:
 2. Sonnet curates and formats into polished briefing
 
 Uses xAI's /v1/responses endpoint with x_search and web_search tools for REAL URLs.
+Searches run through jobs/briefing_fetch.py: one request budget, per-source
+deadlines and a few hours' per-topic cache.
 Based on: https://github.com/mvanhorn/last30days-skill
 """
 
 import asyncio
 import json
 import re
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 
 import httpx
 
 from config import GROK_API_KEY, call_claude_via_cli
+from jobs.briefing_fetch import BriefingFetcher, BriefingSource, budget_client
 from logger import logger
 
 # Channel ID for #ai-briefings
@@ -29,6 +33,29 @@ AI_BRIEFINGS_CHANNEL_ID = 1465277483866788037
 # Models
 GROK_MODEL = "grok-4-1-fast"
 
+# Per-source deadlines (seconds); Grok's live search is the slow part.
+# The fetcher cancels a source at its deadline, so Grok requests time out
+# there too rather than at a longer limit they can never reach.
+GROK_DEADLINE = 100.0
+REDDIT_DEADLINE = 45.0
+# Stop issuing Reddit searches once this many distinct posts are in
+REDDIT_ENOUGH_ITEMS = 20
+
+REDDIT_SUBREDDITS = ["ClaudeAI", "ClaudeCode", "LocalLLaMA", "MachineLearning", "artificial", "singularity"]
+REDDIT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+}
+
+
+@asynccontextmanager
+async def _use_client(client: httpx.AsyncClient | None):
+    """The briefing fetcher's shared client, or a budgeted one of our own."""
+    if client is not None:
+        yield client
+    else:
+        async with budget_client(timeout=30) as own:
+            yield own
+
 
 def _extract_urls_with_context(text: str, url_pattern: str) -> list[dict]:
     """Extract URLs from text along with surrounding context."""
@@ -169,7 +196,8 @@ def _parse_web_response(response_data: dict) -> list[dict]:
     return items
 
 
-async def _search_x(topic: str, from_date: str, to_date: str) -> list[dict]:
+async def _search_x(topic: str, from_date: str, to_date: str,
+                    client: httpx.AsyncClient | None = None) -> list[dict]:
     """Search X (Twitter) using xAI's x_search tool."""
     if not GROK_API_KEY:
         return []
@@ -187,8 +215,8 @@ Find 15-20 relevant posts. Focus on:
 Include the full x.com URL for each post."""
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
+        async with _use_client(client) as c:
+            response = await c.post(
                 "https://api.x.ai/v1/responses",
                 headers={
                     "Authorization": f"Bearer {GROK_API_KEY}",
@@ -199,7 +227,7 @@ Include the full x.com URL for each post."""
                     "tools": [{"type": "x_search"}],
                     "input": [{"role": "user", "content": prompt}]
                 },
-                timeout=120
+                timeout=GROK_DEADLINE
             )
 
             if response.status_code == 200:
@@ -214,50 +242,49 @@ Include the full x.com URL for each post."""
         return []
 
 
-async def _search_reddit(topic: str) -> list[dict]:
-    """Search Reddit directly using .json endpoints (no API key needed)."""
-    import asyncio
-
-    # Search across key subreddits + global
-    subreddits = ["ClaudeAI", "ClaudeCode", "LocalLLaMA", "MachineLearning", "artificial", "singularity"]
-    items = []
-
-    try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-        }
-
-        async with httpx.AsyncClient(headers=headers, timeout=30) as client:
-            # Global search
-            resp = await client.get("https://www.reddit.com/search.json", params={
-                "q": topic, "sort": "relevance", "t": "week", "limit": 15, "raw_json": 1
-            })
+async def _search_reddit(topic: str, client: httpx.AsyncClient | None = None) -> list[dict]:
+    """Search Reddit directly using .json endpoints (no API key needed).
+
+    The global and per-subreddit searches are issued together; the
+    budgeted client spaces them to Reddit's rate limit. Once
+    REDDIT_ENOUGH_ITEMS distinct posts are in, searches still waiting
+    for a slot are cancelled.
+    """
+    searches = [("https://www.reddit.com/search.json", {
+        "q": topic, "sort": "relevance", "t": "week", "limit": 15, "raw_json": 1
+    })]
+    # Subreddit-specific searches for higher relevance
+    for sub in REDDIT_SUBREDDITS:
+        searches.append((f"https://www.reddit.com/r/{sub}/search.json", {
+            "q": topic, "sort": "top", "t": "week", "restrict_sr": "on",
+            "limit": 5, "raw_json": 1
+        }))
+
+    async def _listing(c: httpx.AsyncClient, url: str, params: dict) -> list[dict]:
+        try:
+            resp = await c.get(url, params=params, headers=REDDIT_HEADERS, timeout=30)
             if resp.status_code == 200:
-                for child in resp.json().get("data", {}).get("children", []):
-                    d = child.get("data", {})
-                    items.append(_reddit_json_to_item(d))
-
-            await asyncio.sleep(2)
+                return [_reddit_json_to_item(child.get("data", {}))
+                        for child in resp.json().get("data", {}).get("children", [])]
+            logger.debug(f"Reddit search {url} returned {resp.status_code}")
+        except Exception as e:
+            logger.error(f"Reddit search exception: {e}")
+        return []
 
-            # Subreddit-specific searches for higher relevance
-            for sub in subreddits:
-                if len(items) >= 20:
+    items = []
+    async with _use_client(client) as c:
+        pending = [asyncio.create_task(_listing(c, url, params)) for url, params in searches]
+        try:
+            for next_listing in asyncio.as_completed(pending):
+                for item in await next_listing:
+                    # Deduplicate by URL
+                    if not any(i["url"] == item["url"] for i in items):
+                        items.append(item)
+                if len(items) >= REDDIT_ENOUGH_ITEMS:
                     break
-                resp = await client.get(f"https://www.reddit.com/r/{sub}/search.json", params={
-                    "q": topic, "sort": "top", "t": "week", "restrict_sr": "on",
-                    "limit": 5, "raw_json": 1
-                })
-                if resp.status_code == 200:
-                    for child in resp.json().get("data", {}).get("children", []):
-                        d = child.get("data", {})
-                        item = _reddit_json_to_item(d)
-                        # Deduplicate by URL
-                        if not any(i["url"] == item["url"] for i in items):
-                            items.append(item)
-                await asyncio.sleep(1)
-
-    except Exception as e:
-        logger.error(f"Reddit search exception: {e}")
+        finally:
+            for task in pending:
+                task.cancel()
 
     # Sort by score descending, take top 15
     items.sort(key=lambda x: x.get("score", 0), reverse=True)
@@ -285,7 +312,7 @@ def _reddit_json_to_item(d: dict) -> dict:
     }
 
 
-async def _search_web(topic: str) -> list[dict]:
+async def _search_web(topic: str, client: httpx.AsyncClient | None = None) -> list[dict]:
     """Search the web using xAI's web_search tool."""
     if not GROK_API_KEY:
         return []
@@ -297,8 +324,8 @@ Focus on AI company announcements, product updates, and research.
 Include the full URL for each article."""
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
+        async with _use_client(client) as c:
+            response = await c.post(
                 "https://api.x.ai/v1/responses",
                 headers={
                     "Authorization": f"Bearer {GROK_API_KEY}",
@@ -309,7 +336,7 @@ Include the full URL for each article."""
                     "tools": [{"type": "web_search"}],
                     "input": [{"role": "user", "content": prompt}]
                 },
-                timeout=120
+                timeout=GROK_DEADLINE
             )
 
             if response.status_code == 200:
@@ -324,6 +351,30 @@ Include the full URL for each article."""
         return []
 
 
+def briefing_sources(x_topics: list[str], reddit_topics: list[str], web_topics: list[str],
+                     from_date: str, to_date: str) -> list[BriefingSource]:
+    """The briefing's searches as fetcher sources, keyed for the search cache."""
+    sources = [
+        BriefingSource("x", f"x|{topic}|{from_date}..{to_date}",
+                       lambda c, topic=topic: _search_x(topic, from_date, to_date, client=c),
+                       deadline=GROK_DEADLINE)
+        for topic in x_topics
+    ]
+    sources += [
+        BriefingSource("reddit", f"reddit|{topic}|{to_date}",
+                       lambda c, topic=topic: _search_reddit(topic, client=c),
+                       deadline=REDDIT_DEADLINE)
+        for topic in reddit_topics
+    ]
+    sources += [
+        BriefingSource("web", f"web|{topic}|{to_date}",
+                       lambda c, topic=topic: _search_web(topic, client=c),
+                       deadline=GROK_DEADLINE)
+        for topic in web_topics
+    ]
+    return sources
+
+
 async def _fetch_raw_data_from_grok() -> str:
     """Stage 1: Use Grok with live search tools to fetch real AI news data."""
     try:
@@ -351,38 +402,13 @@ async def _fetch_raw_data_from_grok() -> str:
             "Claude Code MCP Model Context Protocol"
         ]
 
-        # Create all search tasks
-        x_tasks = [_search_x(topic, from_date, to_date) for topic in x_topics]
-        reddit_tasks = [_search_reddit(topic) for topic in reddit_topics]
-        web_tasks = [_search_web(topic) for topic in web_topics]
-
-        # Run all searches in parallel
-        results = await asyncio.gather(
-            *x_tasks, *reddit_tasks, *web_tasks,
-            return_exceptions=True
+        # Run all searches under one budget; returns once a quorum is in
+        results = await BriefingFetcher().fetch(
+            briefing_sources(x_topics, reddit_topics, web_topics, from_date, to_date)
         )
-
-        # Collect results
-        x_items = []
-        reddit_items = []
-        web_items = []
-
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                logger.warning(f"Search task {i} failed: {result}")
-                continue
-            if not isinstance(result, list):
-                continue
-
-            for item in result:
-                source = item.get("source", "")
-                # Deduplicate by URL
-                if source == "x" and not any(i["url"] == item["url"] for i in x_items):
-                    x_items.append(item)
-                elif source == "reddit" and not any(i["url"] == item["url"] for i in reddit_items):
-                    reddit_items.append(item)
-                elif source == "web" and not any(i["url"] == item["url"] for i in web_items):
-                    web_items.append(item)
+        x_items = results["x"]
+        reddit_items = results["reddit"]
+        web_items = results["web"]
 
         # Check if we have any results
         total = len(x_items) + len(reddit_items) + len(web_items)
@@ -22,6 +22,7 @@ import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 
 from config import SUPABASE_URL, SUPABASE_KEY, call_claude_via_cli
+from domains.nutrition.services.health_timeseries import load_health_timeseries
 from logger import logger
 
 # Discord channel for weekly health summary
@@ -40,39 +41,20 @@ def _get_headers() -> dict:
 async def _get_weight_week() -> dict:
     """Get weight data for the past week."""
     try:
-        start_date = (datetime.now() - timedelta(days=7)).isoformat()
-
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{SUPABASE_URL}/rest/v1/weight_readings",
-                headers=_get_headers(),
-                params={
-                    "select": "weight_kg,measured_at",
-                    "user_id": "eq.chris",
-                    "measured_at": f"gte.{start_date}",
-                    "order": "measured_at.asc"
-                },
-                timeout=30
-            )
-
-            if response.status_code != 200:
-                logger.error(f"Weight query failed: {response.status_code}")
-                return {}
-
-            data = response.json()
-
-        if not data:
+        cache = await load_health_timeseries((datetime.now() - timedelta(days=7)).date())
+        at, kg = cache.weights(datetime.now() - timedelta(days=7))
+        if not len(kg):
             return {}
 
-        weights = [float(r["weight_kg"]) for r in data]
-        dates = [datetime.fromisoformat(r["measured_at"].replace("Z", "+00:00")) for r in data]
+        weights = [float(w) for w in kg]
+        dates = at.tolist()  # datetime64[s] -> datetime
         return {
-            "start": weights[0] if weights else None,
-            "end": weights[-1] if weights else None,
+            "start": weights[0],
+            "end": weights[-1],
             "change": round(weights[-1] - weights[0], 1) if len(weights) >= 2 else 0,
-            "min": min(weights) if weights else None,
-            "max": max(weights) if weights else None,
-            "avg": round(sum(weights) / len(weights), 1) if weights else None,
+            "min": float(kg.min()),
+            "max": float(kg.max()),
+            "avg": round(float(kg.mean()), 1),
             "readings": len(weights),
             "raw_weights": weights,
             "raw_dates": dates
@@ -146,34 +128,26 @@ async def _get_steps_week() -> dict:
     """Get steps data for the past 7 days (excluding today)."""
     try:
         # 7 days ago to yesterday (exclude today as it's incomplete)
-        end_date = datetime.now().date().isoformat()
-        start_date = (datetime.now() - timedelta(days=7)).date().isoformat()
-
-        filter_str = f"and=(date.gte.{start_date},date.lt.{end_date})"
-        url = f"{SUPABASE_URL}/rest/v1/garmin_daily_summary?select=date,steps,steps_goal&user_id=eq.chris&{filter_str}&order=date.asc"
-
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=_get_headers(), timeout=30)
-
-            if response.status_code != 200:
-                logger.error(f"Steps query failed: {response.status_code}")
-                return {}
-
-            data = response.json()
-
-        if not data:
+        start = (datetime.now() - timedelta(days=7)).date()
+        end = datetime.now().date() - timedelta(days=1)
+        cache = await load_health_timeseries(start)
+
+        days, values = cache.daily("steps", start, end)
+        _, goals = cache.daily("steps_goal", start, end)
+        has = values > 0
+        if not has.any():
             return {}
 
-        steps = [d["steps"] for d in data if d["steps"]]
-        dates = [datetime.strptime(d["date"], "%Y-%m-%d") for d in data if d["steps"]]
-        goal = data[0].get("steps_goal", 15000) if data else 15000
+        steps = [int(s) for s in values[has]]
+        dates = [datetime(d.year, d.month, d.day) for d in days[has].tolist()]
+        goal = int(goals[0]) if len(goals) else 15000
 
         return {
             "total": sum(steps),
-            "avg": round(sum(steps) / len(steps)) if steps else 0,
+            "avg": round(sum(steps) / len(steps)),
             "days": len(steps),
             "days_hit_goal": sum(1 for s in steps if s >= goal),
-            "best_day": max(steps) if steps else 0,
+            "best_day": max(steps),
             "goal": goal,
             "raw_steps": steps,
             "raw_dates": dates
@@ -186,33 +160,16 @@ async def _get_steps_week() -> dict:
 async def _get_sleep_week() -> dict:
     """Get sleep data for the past week from Garmin."""
     try:
-        start_date = (datetime.now() - timedelta(days=7)).date().isoformat()
-
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{SUPABASE_URL}/rest/v1/garmin_daily_summary",
-                headers=_get_headers(),
-                params={
-                    "select": "date,sleep_hours,sleep_score",
-                    "user_id": "eq.chris",
-                    "date": f"gte.{start_date}",
-                    "order": "date.asc"
-                },
-                timeout=30
-            )
-
-            if response.status_code != 200:
-                logger.error(f"Sleep query failed: {response.status_code}")
-                return {}
-
-            data = response.json()
-
-        if not data:
+        start = (datetime.now() - timedelta(days=7)).date()
+        cache = await load_health_timeseries(start)
+
+        _, hours = cache.daily("sleep_hours", start)
+        _, scores = cache.daily("sleep_score", start)
+        sleep_hours = [float(h) for h in hours if h]
+        sleep_scores = [float(s) for s in scores if s]
+        if not sleep_hours and not sleep_scores:
             return {}
 
-        sleep_hours = [d["sleep_hours"] for d in data if d.get("sleep_hours")]
-        sleep_scores = [d["sleep_score"] for d in data if d.get("sleep_score")]
-
         return {
             "avg_hours": round(sum(sleep_hours) / len(sleep_hours), 1) if sleep_hours else None,
             "avg_score": round(sum(sleep_scores) / len(sleep_scores)) if sleep_scores else None,
@@ -228,36 +185,18 @@ async def _get_sleep_week() -> dict:
 async def _get_heart_rate_week() -> dict:
     """Get resting heart rate data for the past week."""
     try:
-        start_date = (datetime.now() - timedelta(days=7)).date().isoformat()
+        start = (datetime.now() - timedelta(days=7)).date()
+        cache = await load_health_timeseries(start)
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{SUPABASE_URL}/rest/v1/garmin_daily_summary",
-                headers=_get_headers(),
-                params={
-                    "select": "date,resting_hr",
-                    "user_id": "eq.chris",
-                    "date": f"gte.{start_date}",
-                    "order": "date.asc"
-                },
-                timeout=30
-            )
-
-            if response.status_code != 200:
-                logger.error(f"HR query failed: {response.status_code}")
-                return {}
-
-            data = response.json()
-
-        if not data:
+        _, values = cache.daily("resting_hr", start)
+        hrs = [int(h) for h in values if h]
+        if not hrs:
             return {}
 
-        hrs = [d["resting_hr"] for d in data if d.get("resting_hr")]
-
         return {
-            "avg": round(sum(hrs) / len(hrs)) if hrs else None,
-            "min": min(hrs) if hrs else None,
-            "max": max(hrs) if hrs else None,
+            "avg": round(sum(hrs) / len(hrs)),
+            "min": min(hrs),
+            "max": max(hrs),
             "days": len(hrs)
         }
     except Exception as e:
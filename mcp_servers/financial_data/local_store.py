@@ -0,0 +1,237 @@
+"""Local SQLite mirror of finance transactions and categories.
+
+Peter's finance questions often fan out into several tools in one turn
+(spending, comparison, recurring, savings rate, health check), and each used
+to re-query Supabase from scratch: excluded categories on every call, six
+months of transactions paginated for every recurring scan, the same
+aggregation RPCs again and again.
+
+The mirror keeps ``finance.transactions`` (the columns the tools read) and
+``finance.categories`` in ``data/finance_mirror.db``:
+
+- a sync runs at most every SYNC_SECONDS and re-pulls only the trailing
+  RECENT_DAYS by ``date`` (where imports and recategorisation happen),
+  replacing that window locally;
+- a row count is compared against Supabase on every sync, and a full reload
+  happens when they disagree (older rows added/deleted) or once per
+  FULL_SYNC_SECONDS;
+- aggregation RPCs go through ``rpc()``, which memoises results against the
+  mirror's data version, so a repeated question costs no round-trip until
+  the underlying transactions change (or RPC_TTL_SECONDS pass, for the
+  budget/savings inputs the mirror doesn't track).
+
+If Supabase is unreachable the last synced data is used; a mirror that has
+never synced raises, so tools report the failure as before.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from utils.sqlite_store import SQLiteStore
+
+from .supabase_client import finance_count, finance_query, finance_rpc
+
+logger = logging.getLogger(__name__)
+
+DB_PATH = Path(__file__).resolve().parents[2] / "data" / "finance_mirror.db"
+
+SYNC_SECONDS = 120
+FULL_SYNC_SECONDS = 24 * 3600
+RECENT_DAYS = 45
+RPC_TTL_SECONDS = 300
+
+_TXN_SELECT = "id,date,description,amount,category_id"
+_CAT_SELECT = "id,name,exclude_from_totals"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    id          TEXT PRIMARY KEY,
+    date        TEXT NOT NULL,
+    description TEXT,
+    amount      REAL NOT NULL,
+    category_id TEXT
+);
+CREATE INDEX IF NOT EXISTS transactions_date_idx ON transactions (date);
+CREATE INDEX IF NOT EXISTS transactions_category_idx ON transactions (category_id, date);
+
+CREATE TABLE IF NOT EXISTS categories (
+    id                  TEXT PRIMARY KEY,
+    name                TEXT NOT NULL,
+    exclude_from_totals INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS rpc_cache (
+    key       TEXT PRIMARY KEY,
+    version   INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    payload   TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class FinanceMirror(SQLiteStore):
+    """Transactions mirror plus memoised RPC results, shared via get_mirror()."""
+
+    SCHEMA = _SCHEMA
+
+    def __init__(self, path: Path | str = DB_PATH):
+        super().__init__(path)
+        self._lock = asyncio.Lock()
+        self._checked_at = 0.0
+
+    def _meta(self, conn, key: str, default: str = "") -> str:
+        row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else default
+
+    def _set_meta(self, conn, **values) -> None:
+        conn.executemany(
+            "INSERT INTO meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            [(k, str(v)) for k, v in values.items()],
+        )
+
+    @property
+    def version(self) -> int:
+        with self.db() as conn:
+            return int(self._meta(conn, "version", "0"))
+
+    # ------------------------------------------------------------------
+    # Sync
+    # ------------------------------------------------------------------
+
+    async def sync(self, force: bool = False) -> None:
+        """Bring the mirror up to date (no-op if synced in the last SYNC_SECONDS)."""
+        async with self._lock:
+            if not force and time.time() - self._checked_at < SYNC_SECONDS:
+                return
+            try:
+                await self._sync(force)
+            except Exception as e:
+                with self.db() as conn:
+                    synced = self._meta(conn, "full_synced_at")
+                if not synced:
+                    raise
+                logger.warning(f"Finance mirror sync failed, using data from last sync: {e}")
+            self._checked_at = time.time()
+
+    async def _sync(self, force: bool) -> None:
+        with self.db() as conn:
+            full_synced_at = float(self._meta(conn, "full_synced_at", "0") or 0)
+        full = force or time.time() - full_synced_at > FULL_SYNC_SECONDS
+        cutoff = (date.today() - timedelta(days=RECENT_DAYS)).isoformat()
+
+        txn_params = {"select": _TXN_SELECT, "order": "date.asc,id.asc"}
+        if not full:
+            txn_params["date"] = f"gte.{cutoff}"
+        cats, txns, remote_count = await asyncio.gather(
+            finance_query("categories", {"select": _CAT_SELECT}, paginate=True),
+            finance_query("transactions", txn_params, paginate=True),
+            finance_count("transactions"),
+        )
+
+        if not full and self._apply(cats, txns, since=cutoff) != remote_count:
+            # Something outside the recent window was added or deleted
+            txns = await finance_query(
+                "transactions", {"select": _TXN_SELECT, "order": "date.asc,id.asc"}, paginate=True)
+            full = True
+        if full:
+            self._apply(cats, txns, since=None)
+            with self.db() as conn:
+                self._set_meta(conn, full_synced_at=time.time())
+
+    def _apply(self, cats: list[dict], txns: list[dict], since: str | None) -> int:
+        """Replace categories and the transactions on/after `since` (all if None).
+
+        Bumps the data version when anything changed. Returns the local row count.
+        """
+        cat_rows = sorted(
+            (c["id"], c.get("name") or "", 1 if c.get("exclude_from_totals") else 0) for c in cats
+        )
+        txn_rows = sorted(
+            (t["id"], t["date"], t.get("description") or "", float(t.get("amount") or 0),
+             t.get("category_id"))
+            for t in txns
+        )
+        with self.db() as conn:
+            where, args = ("WHERE date >= ?", (since,)) if since else ("", ())
+            old_txns = conn.execute(
+                f"SELECT id, date, description, amount, category_id FROM transactions {where} "
+                "ORDER BY id", args).fetchall()
+            old_cats = conn.execute(
+                "SELECT id, name, exclude_from_totals FROM categories ORDER BY id").fetchall()
+            changed = ([tuple(r) for r in old_txns] != txn_rows
+                       or [tuple(r) for r in old_cats] != cat_rows)
+            if changed:
+                conn.execute(f"DELETE FROM transactions {where}", args)
+                conn.executemany("INSERT OR REPLACE INTO transactions VALUES (?, ?, ?, ?, ?)", txn_rows)
+                conn.execute("DELETE FROM categories")
+                conn.executemany("INSERT INTO categories VALUES (?, ?, ?)", cat_rows)
+                self._set_meta(conn, version=int(self._meta(conn, "version", "0")) + 1)
+            return conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def excluded_category_ids(self) -> list[str]:
+        with self.db() as conn:
+            rows = conn.execute(
+                "SELECT id FROM categories WHERE exclude_from_totals = 1 ORDER BY id").fetchall()
+        return [r["id"] for r in rows]
+
+    def outgoing(self, start: str, end: str | None = None) -> list[dict]:
+        """Outgoing transactions (amount < 0) from start (inclusive), newest first."""
+        sql = "SELECT description, amount, date FROM transactions WHERE date >= ? AND amount < 0"
+        args: tuple = (start,)
+        if end:
+            sql += " AND date <= ?"
+            args += (end,)
+        with self.db() as conn:
+            rows = conn.execute(sql + " ORDER BY date DESC, id", args).fetchall()
+        return [dict(r) for r in rows]
+
+    async def rpc(self, fn_name: str, body: dict | None = None) -> list[dict]:
+        """finance_rpc(), memoised until the mirror's data changes or RPC_TTL_SECONDS pass."""
+        key = json.dumps([fn_name, body or {}], sort_keys=True, default=str)
+        with self.db() as conn:
+            version = int(self._meta(conn, "version", "0"))
+            row = conn.execute(
+                "SELECT version, stored_at, payload FROM rpc_cache WHERE key = ?", (key,)).fetchone()
+        if row and row["version"] == version and time.time() - row["stored_at"] < RPC_TTL_SECONDS:
+            return json.loads(row["payload"])
+        result = await finance_rpc(fn_name, body)
+        with self.db() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO rpc_cache (key, version, stored_at, payload) VALUES (?, ?, ?, ?)",
+                (key, version, time.time(), json.dumps(result, default=str)),
+            )
+            conn.execute("DELETE FROM rpc_cache WHERE version < ?", (version,))
+        return result
+
+
+_mirror: FinanceMirror | None = None
+
+
+def get_mirror() -> FinanceMirror:
+    """The process-wide mirror, synced (at most every SYNC_SECONDS) by the caller."""
+    global _mirror
+    if _mirror is None:
+        _mirror = FinanceMirror()
+    return _mirror
+
+
+async def synced_mirror() -> FinanceMirror:
+    mirror = get_mirror()
+    await mirror.sync()
+    return mirror
@@ -1,16 +1,21 @@
 """Personal finance queries — net worth, budgets, spending, FIRE, transactions.
 
-All functions query the `finance` schema in Supabase.
+All functions query the `finance` schema in Supabase. Spending, budget and
+savings aggregations and the recurring scan go through the local mirror
+(local_store.py), which keeps transactions/categories in SQLite and
+memoises the aggregation RPCs between changes.
 """
 
 from __future__ import annotations
 
-import re
+import asyncio
 from collections import defaultdict
 from datetime import date
 
 from .config import get_date_range, month_range
 from .formatters import gbp, pct, change_str, md_table, safe_float
+from .local_store import synced_mirror
+from .recurring import CADENCES, detect_series
 from .supabase_client import finance_query, finance_rpc
 
 
@@ -20,11 +25,23 @@ from .supabase_client import finance_query, finance_rpc
 
 async def net_worth() -> str:
     """Calculate current net worth from all active accounts."""
-    # 1. Fetch active accounts
-    accounts = await finance_query("accounts", {
-        "is_active": "eq.true",
-        "select": "id,name,type,include_in_net_worth",
-    }, paginate=True)
+    today = date.today()
+    prev_m = today.month - 1 if today.month > 1 else 12
+    prev_y = today.year if today.month > 1 else today.year - 1
+    prev_end = date(prev_y, prev_m, 1).isoformat()
+
+    # 1. Fetch active accounts (+ last month's wealth_snapshots alongside)
+    accounts, snapshots = await asyncio.gather(
+        finance_query("accounts", {
+            "is_active": "eq.true",
+            "select": "id,name,type,include_in_net_worth",
+        }, paginate=True),
+        finance_query("wealth_snapshots", {
+            "date": f"lte.{prev_end}",
+            "order": "date.desc,account_id",
+            "limit": "500",
+        }),
+    )
 
     if not accounts:
         return "No active accounts found."
@@ -52,18 +69,7 @@ async def net_worth() -> str:
         total += bal
         by_account.append({"name": acc["name"], "type": acc_type, "balance": bal})
 
-    # 4. Get previous month total from wealth_snapshots
-    today = date.today()
-    prev_m = today.month - 1 if today.month > 1 else 12
-    prev_y = today.year if today.month > 1 else today.year - 1
-    prev_end = date(prev_y, prev_m, 1).isoformat()
-
-    snapshots = await finance_query("wealth_snapshots", {
-        "date": f"lte.{prev_end}",
-        "order": "date.desc,account_id",
-        "limit": "500",
-    })
-
+    # 4. Previous month total from wealth_snapshots
     # Deduplicate: take first (most recent) snapshot per account
     seen: set[str] = set()
     prev_total = 0.0
@@ -131,7 +137,8 @@ async def budget_status(year: int | None = None, month: int | None = None) -> st
     if m:
         params["p_month"] = m
 
-    rows = await finance_rpc("get_budget_vs_actual", params)
+    mirror = await synced_mirror()
+    rows = await mirror.rpc("get_budget_vs_actual", params)
 
     if not rows:
         return f"No budget data for {y}-{m:02d}."
@@ -196,20 +203,8 @@ async def spending_by_category(
 ) -> str:
     """Get spending breakdown by category for a period."""
     start, end = get_date_range(period)
-
-    # Get excluded category IDs
-    excluded_cats = await finance_query("categories", {
-        "exclude_from_totals": "eq.true",
-        "select": "id",
-    })
-    excluded_ids = [c["id"] for c in excluded_cats]
-
-    # Call RPC
-    rows = await finance_rpc("get_spending_by_category", {
-        "start_date": start,
-        "end_date": end,
-        "excluded_ids": excluded_ids,
-    })
+    mirror = await synced_mirror()
+    rows = await _category_spend(mirror, start, end)
 
     if not rows:
         return f"No spending data for {period}."
@@ -241,6 +236,52 @@ async def spending_by_category(
     return output
 
 
+async def _category_spend(mirror, start: str, end: str) -> list[dict]:
+    """get_spending_by_category RPC rows, excluding categories flagged exclude_from_totals."""
+    return await mirror.rpc("get_spending_by_category", {
+        "start_date": start,
+        "end_date": end,
+        "excluded_ids": mirror.excluded_category_ids(),
+    })
+
+
+async def compare_spending(period_a: str, period_b: str) -> str:
+    """Category-by-category spending comparison between two periods."""
+    from .formatters import period_label
+
+    start_a, end_a = get_date_range(period_a)
+    start_b, end_b = get_date_range(period_b)
+    mirror = await synced_mirror()
+    rows_a, rows_b = await asyncio.gather(
+        _category_spend(mirror, start_a, end_a),
+        _category_spend(mirror, start_b, end_b),
+    )
+
+    map_a = {r["category_name"]: safe_float(r["total_amount"]) for r in rows_a}
+    map_b = {r["category_name"]: safe_float(r["total_amount"]) for r in rows_b}
+    all_cats = sorted(set(map_a.keys()) | set(map_b.keys()))
+
+    table_rows = []
+    for cat in all_cats:
+        a = map_a.get(cat, 0)
+        b = map_b.get(cat, 0)
+        table_rows.append([cat, gbp(a), gbp(b), gbp(a - b, show_sign=True)])
+
+    total_a = sum(map_a.values())
+    total_b = sum(map_b.values())
+    table_rows.append(["**Total**", f"**{gbp(total_a)}**", f"**{gbp(total_b)}**",
+                       f"**{gbp(total_a - total_b, show_sign=True)}**"])
+
+    output = f"# Spending Comparison: {period_label(period_a)} vs {period_label(period_b)}\n\n"
+    output += md_table([
+        "Category",
+        period_label(period_a),
+        period_label(period_b),
+        "Difference",
+    ], table_rows)
+    return output
+
+
 # ═══════════════════════════════════════════════════════════════════════════
 # SAVINGS RATE
 # ═══════════════════════════════════════════════════════════════════════════
@@ -254,7 +295,8 @@ async def savings_rate(year: int | None = None, month: int | None = None) -> str
     if m:
         params["p_month"] = m
 
-    rows = await finance_rpc("get_savings_rate", params)
+    mirror = await synced_mirror()
+    rows = await mirror.rpc("get_savings_rate", params)
 
     if not rows:
         return f"No savings data for {y}-{m:02d}."
@@ -294,8 +336,16 @@ async def savings_rate(year: int | None = None, month: int | None = None) -> str
 
 async def fire_status(scenario_name: str | None = None) -> str:
     """Get FIRE (Financial Independence) status and projections."""
-    # Get FIRE inputs
-    inputs = await finance_query("fire_inputs", {"limit": "1", "order": "updated_at.desc"})
+    inputs, scenarios, accounts = await asyncio.gather(
+        finance_query("fire_inputs", {"limit": "1", "order": "updated_at.desc"}),
+        finance_query("fire_scenarios", {"order": "name.asc"}, paginate=True),
+        # Current portfolio value (sum of investment/ISA/pension accounts)
+        finance_query("accounts", {
+            "is_active": "eq.true",
+            "include_in_net_worth": "eq.true",
+            "select": "id,type",
+        }, paginate=True),
+    )
     if not inputs:
         return "No FIRE inputs configured."
 
@@ -304,16 +354,6 @@ async def fire_status(scenario_name: str | None = None) -> str:
     safe_withdrawal = safe_float(fi.get("safe_withdrawal_rate", 4)) / 100
     target = annual_expenses / safe_withdrawal if safe_withdrawal else 0
 
-    # Get scenarios
-    scenarios = await finance_query("fire_scenarios", {"order": "name.asc"}, paginate=True)
-
-    # Get current portfolio value (sum of investment/ISA/pension accounts)
-    accounts = await finance_query("accounts", {
-        "is_active": "eq.true",
-        "include_in_net_worth": "eq.true",
-        "select": "id,type",
-    }, paginate=True)
-
     inv_ids = [a["id"] for a in accounts if a.get("type") in ("investment", "isa", "pension")]
 
     portfolio = 0.0
@@ -399,42 +439,36 @@ async def find_recurring(min_occurrences: int = 3, months: int = 6) -> str:
         start_y -= 1
     start = date(start_y, start_m, 1).isoformat()
 
-    txns = await finance_query("transactions", {
-        "date": f"gte.{start}",
-        "amount": "lt.0",  # outgoing only
-        "select": "description,amount,date",
-        "order": "date.desc",
-    }, paginate=True)
-
-    if not txns:
-        return "No transactions found."
-
-    # Normalise descriptions and group
-    groups: dict[str, list[dict]] = defaultdict(list)
-    for t in txns:
-        desc = t.get("description", "").strip()
-        # Normalise: lowercase, strip trailing digits/dates
-        norm = re.sub(r"\s+\d{2,}[/-]\d{2,}.*$", "", desc.lower()).strip()
-        norm = re.sub(r"\s+", " ", norm)
-        if norm:
-            groups[norm].append(t)
-
-    # Filter by min occurrences
-    recurring = [(desc, txs) for desc, txs in groups.items() if len(txs) >= min_occurrences]
-    recurring.sort(key=lambda x: len(x[1]), reverse=True)
+    mirror = await synced_mirror()
+    recurring = []
+    for series in detect_series(mirror, today):
+        recent = series.since(start)
+        if len(recent) >= min_occurrences:
+            recurring.append((series, recent))
 
     if not recurring:
         return f"No recurring transactions found (min {min_occurrences} occurrences in {months} months)."
 
+    # Regular payments first (by cadence, then count), irregular repeats after
+    cadence_rank = {name: i for i, (name, _) in enumerate(CADENCES)}
+    recurring.sort(key=lambda x: (x[0].cadence is None, cadence_rank.get(x[0].cadence, 0), -len(x[1])))
+
     output = f"# Recurring Transactions (last {months} months)\n\n"
 
     rows = []
-    for desc, txs in recurring[:30]:
-        avg = sum(safe_float(t["amount"]) for t in txs) / len(txs)
-        latest = txs[0].get("date", "")
-        rows.append([desc.title(), str(len(txs)), gbp(avg), latest])
+    for series, recent in recurring[:30]:
+        avg = -sum(series.amounts[i] for i in recent) / len(recent)
+        drift = f" ({series.drift_pct:+.0f}%)" if series.drift_pct and abs(series.drift_pct) >= 5 else ""
+        rows.append([
+            series.series_key.title(),
+            series.cadence or "irregular",
+            str(len(recent)),
+            gbp(avg) + drift,
+            series.last_seen,
+            series.next_expected or "",
+        ])
 
-    output += md_table(["Description", "Count", "Avg Amount", "Latest"], rows)
+    output += md_table(["Description", "Cadence", "Count", "Avg Amount", "Latest", "Next Expected"], rows)
     return output
 
 
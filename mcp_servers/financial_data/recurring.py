@@ -0,0 +1,271 @@
+"""Recurring-payment series detection over the local finance mirror.
+
+One engine behind find_recurring (MCP), the subscription health check
+(dashboard + scheduled subscription monitor) and anything else that asks
+"what do we pay regularly?":
+
+1. **Merchant keys** — descriptions are tokenised (lower-case, punctuation
+   split, tokens containing digits dropped, location/company boilerplate
+   dropped), so "SPOTIFY LIMITED LONDON 12/03" and "Spotify Ltd" share a key.
+2. **Fuzzy clustering** — keys that still differ (truncation, typos) are
+   merged into one series when they share a short prefix and score >=
+   MERGE_SCORE. The key -> series map is persisted, so only descriptions not
+   seen before are ever compared.
+3. **Vectorised statistics** — all series are sorted into one array and
+   interval/amount statistics computed in a single numpy pass: each gap
+   votes for its nearest cadence (weekly .. annual), the winning cadence
+   needs MIN_REGULARITY of the votes, and amount mean/CV/drift come from
+   segment reductions.
+
+Results are stored in the mirror database (``recurring_series``) against the
+mirror's data version, so repeated calls between syncs are a table read.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import asdict, dataclass, field
+from datetime import date, timedelta
+
+import numpy as np
+
+try:
+    from rapidfuzz import fuzz as _fuzz
+
+    def _similarity(a: str, b: str) -> float:
+        return _fuzz.ratio(a, b)
+except ImportError:  # pragma: no cover - rapidfuzz is optional
+    from difflib import SequenceMatcher
+
+    def _similarity(a: str, b: str) -> float:
+        return SequenceMatcher(None, a, b).ratio() * 100
+
+from .local_store import FinanceMirror
+
+DETECT_DAYS = 400          # long enough to see an annual charge twice
+MERGE_SCORE = 85           # fuzzy ratio for two keys to be one merchant
+MIN_REGULARITY = 0.6       # share of gaps that must match the cadence
+CADENCE_TOLERANCE = 0.25   # a gap within ±25% of a period counts for it
+KEY_TOKENS = 3
+BLOCK_CHARS = 3            # only keys sharing a prefix are fuzzy-compared
+
+CADENCES: tuple[tuple[str, float], ...] = (
+    ("weekly", 7.0),
+    ("fortnightly", 14.0),
+    ("monthly", 30.44),
+    ("quarterly", 91.31),
+    ("termly", 121.75),
+    ("annual", 365.25),
+)
+
+# Known non-subscription merchants (shops, restaurants, transport, ...)
+# matched as substrings of the lower-cased description.
+NON_SUBSCRIPTION_PATTERNS = frozenset({
+    "aldi", "tesco", "sainsbury", "lidl", "asda", "waitrose", "co-op",
+    "morrisons", "marks and spencer", "m&s", "ocado",
+    "pret a manger", "costa", "starbucks", "greggs", "mcdonalds",
+    "nandos", "pizza", "burger", "kitchen", "restaurant", "cafe",
+    "bar ", "pub ", "deli", "bakery", "chippy",
+    "tfl travel", "ringgo", "parking", "petrol", "shell", "bp ",
+    "amazon marketplace", "amazon.co.uk", "ebay", "paypal",
+    "hsbc", "non-sterling", "transaction fee", "interest",
+    "atm", "cash", "withdrawal",
+    "stocks green prima",  # school
+    "burnhill",  # renovation
+    "next directory",  # clothing
+    "box bar",  # restaurant
+    "se hildenborough",  # petrol station
+    "accenture",  # work expenses
+    "mmbill", "mmbil",
+})
+
+_STOP_TOKENS = frozenset({
+    "london", "gb", "gbr", "uk", "ltd", "limited", "plc", "llc", "inc", "www",
+    "com", "co", "net", "org", "the", "payment", "pymt", "ref", "dd", "so",
+    "bgc", "fpo", "cr", "dr", "vis", "visa", "card", "purchase", "contactless",
+})
+_TOKEN_RE = re.compile(r"[a-z0-9&+']+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS recurring_keys (
+    merchant_key TEXT PRIMARY KEY,
+    series_key   TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS recurring_series (
+    series_key TEXT PRIMARY KEY,
+    version    INTEGER NOT NULL,
+    since      TEXT NOT NULL,
+    payload    TEXT NOT NULL
+);
+"""
+
+
+@dataclass
+class Series:
+    """One merchant's payment history with its inferred cadence."""
+
+    series_key: str
+    label: str                      # most recent raw description
+    occurrences: int
+    avg_amount: float
+    amount_cv: float
+    latest_amount: float
+    drift_pct: float | None         # latest vs mean of the earlier payments
+    first_seen: str
+    last_seen: str
+    cadence: str | None = None      # None = no consistent interval
+    interval_days: float | None = None
+    regularity: float = 0.0
+    next_expected: str | None = None
+    dates: list[str] = field(default_factory=list)      # newest first
+    amounts: list[float] = field(default_factory=list)  # positive, aligned with dates
+
+    def since(self, start: str) -> list[int]:
+        """Indices of payments on/after `start` (ISO date)."""
+        return [i for i, d in enumerate(self.dates) if d >= start]
+
+    def matches(self, patterns) -> bool:
+        text = f"{self.label.lower()} {self.series_key} "
+        return any(p in text for p in patterns)
+
+
+def merchant_key(description: str) -> str:
+    """Stable merchant key for a bank description ('' if nothing usable)."""
+    tokens = [
+        t for t in _TOKEN_RE.findall((description or "").lower())
+        if not any(c.isdigit() for c in t) and t not in _STOP_TOKENS and len(t) > 1
+    ]
+    return " ".join(tokens[:KEY_TOKENS])
+
+
+def _assign(keys: set[str], known: dict[str, str]) -> dict[str, str]:
+    """Map unseen merchant keys onto existing series (fuzzy) or new ones."""
+    by_first: dict[str, list[str]] = {}
+    for series_key in set(known.values()):
+        by_first.setdefault(series_key[:BLOCK_CHARS], []).append(series_key)
+    new: dict[str, str] = {}
+    # Longest keys first, so truncated variants join the fuller name
+    for key in sorted(keys - known.keys(), key=lambda k: (-len(k), k)):
+        candidates = by_first.setdefault(key[:BLOCK_CHARS], [])
+        score, best = max(((_similarity(key, c), c) for c in candidates), default=(0.0, None))
+        if best is not None and score >= MERGE_SCORE:
+            new[key] = best
+        else:
+            new[key] = key
+            candidates.append(key)
+    return new
+
+
+def _stats(series_idx: np.ndarray, days: np.ndarray, amounts: np.ndarray, n: int) -> dict:
+    """Per-series interval and amount statistics in one vectorised pass.
+
+    Inputs must be sorted by (series_idx, days), with every series 0..n-1
+    present.
+    """
+    starts = np.flatnonzero(np.r_[True, series_idx[1:] != series_idx[:-1]])
+    counts = np.diff(np.r_[starts, len(series_idx)])
+    ends = starts + counts - 1
+
+    sums = np.add.reduceat(amounts, starts)
+    means = sums / counts
+    var = np.add.reduceat(amounts * amounts, starts) / counts - means ** 2
+    cv = np.sqrt(np.clip(var, 0, None)) / np.where(means > 0, means, 1)
+    latest = amounts[ends]
+    prior = np.where(counts > 1, (sums - latest) / np.maximum(counts - 1, 1), np.nan)
+    drift = np.where(prior > 0, (latest - prior) / np.where(prior > 0, prior, 1) * 100, np.nan)
+
+    # Gaps between consecutive payments of the same series (same-day repeats ignored)
+    gaps = np.diff(days).astype(float)
+    gap_series = series_idx[1:]
+    keep = (series_idx[1:] == series_idx[:-1]) & (gaps > 0)
+    gaps, gap_series = gaps[keep], gap_series[keep]
+
+    periods = np.array([p for _, p in CADENCES])
+    rel = np.abs(gaps[:, None] - periods[None, :]) / periods[None, :]
+    nearest = rel.argmin(axis=1) if len(gaps) else np.zeros(0, dtype=int)
+    hit = rel[np.arange(len(gaps)), nearest] <= CADENCE_TOLERANCE if len(gaps) else np.zeros(0, bool)
+    votes = np.zeros((n, len(CADENCES)))
+    np.add.at(votes, (gap_series[hit], nearest[hit]), 1)
+    n_gaps = np.bincount(gap_series, minlength=n)
+    best = votes.argmax(axis=1)
+    regularity = votes.max(axis=1) / np.maximum(n_gaps, 1)
+    gap_sum = np.bincount(gap_series, weights=gaps, minlength=n)
+
+    return {
+        "starts": starts, "counts": counts, "ends": ends, "means": means, "cv": cv,
+        "latest": latest, "drift": drift, "best": best, "regularity": regularity,
+        "n_gaps": n_gaps, "mean_gap": gap_sum / np.maximum(n_gaps, 1),
+    }
+
+
+def detect_series(mirror: FinanceMirror, today: date | None = None) -> list[Series]:
+    """All payment series over the last DETECT_DAYS of outgoing transactions.
+
+    Reads the persisted result when the mirror hasn't changed since it was
+    computed; otherwise recomputes (only new merchant keys are fuzzy-matched).
+    """
+    today = today or date.today()
+    since = (today - timedelta(days=DETECT_DAYS)).isoformat()
+    version = mirror.version
+    with mirror.db() as conn:
+        conn.executescript(_SCHEMA)
+        stored = conn.execute(
+            "SELECT payload FROM recurring_series WHERE version = ? AND since = ?",
+            (version, since)).fetchall()
+        if stored:
+            payloads = (json.loads(r["payload"]) for r in stored)
+            return [Series(**p) for p in payloads if p]
+        known = {r["merchant_key"]: r["series_key"]
+                 for r in conn.execute("SELECT merchant_key, series_key FROM recurring_keys")}
+
+    txns = mirror.outgoing(since)
+    keys = [merchant_key(t.get("description", "")) for t in txns]
+    new = _assign({k for k in keys if k}, known)
+    known.update(new)
+
+    rows = [(known[k], t) for k, t in zip(keys, txns) if k]
+    series_keys = sorted({s for s, _ in rows})
+    result: list[Series] = []
+    if rows:
+        index = {s: i for i, s in enumerate(series_keys)}
+        idx = np.array([index[s] for s, _ in rows])
+        days = np.array([t["date"] for _, t in rows], dtype="datetime64[D]").astype(np.int64)
+        amounts = np.abs(np.array([float(t["amount"]) for _, t in rows]))
+        order = np.lexsort((days, idx))
+        idx, days, amounts = idx[order], days[order], amounts[order]
+        labels = [rows[i][1].get("description", "") for i in order]
+        st = _stats(idx, days, amounts, len(series_keys))
+
+        for i, key in enumerate(series_keys):
+            s, e = st["starts"][i], st["ends"][i]
+            regular = st["n_gaps"][i] >= 1 and st["regularity"][i] >= MIN_REGULARITY
+            cadence, period = CADENCES[st["best"][i]] if regular else (None, None)
+            last = np.datetime64(int(days[e]), "D")
+            drift = st["drift"][i]
+            result.append(Series(
+                series_key=key,
+                label=labels[e],
+                occurrences=int(st["counts"][i]),
+                avg_amount=round(float(st["means"][i]), 2),
+                amount_cv=round(float(st["cv"][i]), 3),
+                latest_amount=round(float(st["latest"][i]), 2),
+                drift_pct=None if np.isnan(drift) else round(float(drift), 1),
+                first_seen=str(np.datetime64(int(days[s]), "D")),
+                last_seen=str(last),
+                cadence=cadence,
+                interval_days=round(float(st["mean_gap"][i]), 1) if st["n_gaps"][i] else None,
+                regularity=round(float(st["regularity"][i]), 2),
+                next_expected=str(last + int(round(period))) if period else None,
+                dates=[str(np.datetime64(int(d), "D")) for d in days[s:e + 1][::-1]],
+                amounts=[round(float(a), 2) for a in amounts[s:e + 1][::-1]],
+            ))
+
+    with mirror.db() as conn:
+        conn.executemany("INSERT OR REPLACE INTO recurring_keys VALUES (?, ?)", new.items())
+        conn.execute("DELETE FROM recurring_series")
+        # A sentinel row keeps an empty result cached too
+        stored_rows = [(s.series_key, version, since, json.dumps(asdict(s))) for s in result]
+        conn.executemany("INSERT INTO recurring_series VALUES (?, ?, ?, ?)",
+                         stored_rows or [("", version, since, "null")])
+    return result
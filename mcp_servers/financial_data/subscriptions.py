@@ -1,11 +1,14 @@
 """Subscription management functions for Peter's MCP tools.
 
-Provides CRUD operations on the finance.subscriptions table and
-exclusion management for the health check's new-recurring detection.
+Provides CRUD operations on the finance.subscriptions table, exclusion
+management for the health check's new-recurring detection, and the health
+check itself (shared by the dashboard API and the scheduled subscription
+monitor).
 """
 
 from __future__ import annotations
 
+import asyncio
 import json
 from datetime import date, timedelta
 from typing import Optional
@@ -13,6 +16,8 @@ from typing import Optional
 import httpx
 
 from .config import SUPABASE_URL, API_KEY
+from .local_store import synced_mirror
+from .recurring import NON_SUBSCRIPTION_PATTERNS, detect_series, merchant_key
 from .supabase_client import finance_query
 
 _REST = f"{SUPABASE_URL}/rest/v1"
@@ -229,3 +234,163 @@ async def list_subscriptions(
 
     lines.append(f"\n**Total monthly: {total_monthly:.2f}**")
     return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# Health check (dashboard /api/subscriptions/health + subscription monitor)
+# ---------------------------------------------------------------------------
+_FREQ_MULTIPLIERS = {
+    "weekly": 52, "fortnightly": 26, "monthly": 12,
+    "quarterly": 4, "termly": 3, "annual": 1,
+}
+
+# Days without a payment before a tracked subscription counts as missed
+_MISSED_AFTER_DAYS = {
+    "weekly": 10, "fortnightly": 20, "monthly": 45,
+    "quarterly": 105, "termly": 140, "annual": 400,
+}
+
+HEALTH_WINDOW_DAYS = 180
+
+
+def monthly_cost(amount: float, frequency: str) -> float:
+    """Convert any frequency to monthly cost."""
+    return amount * _FREQ_MULTIPLIERS.get(frequency, 12) / 12
+
+
+async def subscription_health(today: date | None = None) -> dict:
+    """Check tracked subscriptions against bank transactions.
+
+    Detects price changes and missed payments on tracked subscriptions,
+    cancellation windows and upcoming renewals, and new recurring series
+    (regular cadence, stable amount) that aren't tracked or dismissed yet.
+    """
+    today = today or date.today()
+    subs, exclusion_rows, mirror = await asyncio.gather(
+        finance_query("subscriptions", {"select": "*", "order": "name.asc"}, paginate=True),
+        finance_query("subscription_exclusions", {"select": "description_pattern"}),
+        synced_mirror(),
+    )
+    active_subs = [s for s in subs if s.get("status") == "active"]
+    window_start = (today - timedelta(days=HEALTH_WINDOW_DAYS)).isoformat()
+    all_txns = mirror.outgoing(window_start)
+    alerts: list[dict] = []
+
+    # 1. Tracked subscriptions: price changes + missed payments
+    tracked_patterns: list[str] = []
+    for sub in active_subs:
+        clean = (sub.get("bank_description_pattern") or "").replace("*", "").strip().lower()
+        if not clean:
+            continue
+        tracked_patterns.append(clean)
+
+        matching = [t for t in all_txns if clean in (t.get("description") or "").lower()]
+        if not matching:
+            continue
+
+        # Price change (10% tolerance for FX-converted amounts)
+        stored_amount = abs(float(sub["amount"]))
+        latest_txn = matching[0]
+        latest_amount = abs(float(latest_txn["amount"]))
+        if stored_amount > 0 and abs(latest_amount - stored_amount) / stored_amount > 0.10:
+            alerts.append({
+                "type": "price_change",
+                "subscription": sub["name"],
+                "subscription_id": sub.get("id"),
+                "scope": sub.get("scope", "personal"),
+                "old_amount": stored_amount,
+                "new_amount": round(latest_amount, 2),
+                "last_transaction_date": latest_txn["date"],
+                "description": latest_txn["description"][:60],
+            })
+
+        freq = sub.get("frequency", "monthly")
+        expected_gap_days = _MISSED_AFTER_DAYS.get(freq, 45)
+        latest_date = date.fromisoformat(latest_txn["date"])
+        days_since = (today - latest_date).days
+        if days_since > expected_gap_days:
+            alerts.append({
+                "type": "missed_payment",
+                "subscription": sub["name"],
+                "subscription_id": sub.get("id"),
+                "scope": sub.get("scope", "personal"),
+                "amount": stored_amount,
+                "frequency": freq,
+                "last_payment_date": latest_txn["date"],
+                "days_overdue": days_since - expected_gap_days,
+                "expected_by": (latest_date + timedelta(days=expected_gap_days)).isoformat(),
+            })
+
+    # 2. Cancellation windows (deadline in the next 14 days) + renewals (next 7)
+    upcoming = []
+    for sub in active_subs:
+        renewal_date = sub.get("next_renewal_date")
+        if not renewal_date:
+            continue
+        renewal = date.fromisoformat(renewal_date)
+        notice_days = sub.get("cancellation_notice_days")
+        if notice_days:
+            deadline = renewal - timedelta(days=notice_days)
+            if today <= deadline <= today + timedelta(days=14):
+                alerts.append({
+                    "type": "cancellation_window",
+                    "subscription": sub["name"],
+                    "subscription_id": sub.get("id"),
+                    "scope": sub.get("scope", "personal"),
+                    "renewal_date": renewal_date,
+                    "cancellation_deadline": deadline.isoformat(),
+                    "amount": float(sub["amount"]),
+                    "frequency": sub.get("frequency", "monthly"),
+                })
+        if today <= renewal <= today + timedelta(days=7):
+            upcoming.append({
+                "name": sub["name"],
+                "renewal_date": renewal_date,
+                "amount": float(sub["amount"]),
+                "frequency": sub.get("frequency", "monthly"),
+                "scope": sub.get("scope", "personal"),
+            })
+
+    # 3. New recurring series not yet tracked or dismissed
+    user_exclusions = [r["description_pattern"].lower() for r in exclusion_rows]
+    tracked_keys = {merchant_key(p) for p in tracked_patterns}
+    for series in detect_series(mirror, today):
+        recent = series.since(window_start)
+        if len(recent) < 3 or series.cadence is None:
+            continue
+        if series.matches(NON_SUBSCRIPTION_PATTERNS) or series.matches(user_exclusions):
+            continue
+        if series.series_key in tracked_keys or series.matches(tracked_patterns):
+            continue
+        amounts = [series.amounts[i] for i in recent]
+        avg = sum(amounts) / len(amounts)
+        if avg < 2:
+            continue
+        # Real subs charge (nearly) the same amount each time
+        std_dev = (sum((a - avg) ** 2 for a in amounts) / len(amounts)) ** 0.5
+        if std_dev / avg > 0.20:
+            continue
+        alerts.append({
+            "type": "new_recurring",
+            "description": series.label[:60],
+            "avg_amount": round(avg, 2),
+            "occurrences": len(recent),
+            "cadence": series.cadence,
+            "next_expected": series.next_expected,
+            "first_seen": series.dates[recent[-1]],
+            "latest": series.dates[recent[0]],
+        })
+
+    total_monthly = sum(
+        monthly_cost(float(s["amount"]), s.get("frequency", "monthly")) for s in active_subs
+    )
+    return {
+        "alerts": alerts,
+        "upcoming_renewals": upcoming,
+        "summary": {
+            "total_active": len(active_subs),
+            "total_monthly_cost": round(total_monthly, 2),
+            "alerts_count": len(alerts),
+            "scanned_transactions": len(all_txns),
+        },
+    }
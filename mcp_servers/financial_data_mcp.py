@@ -8,6 +8,7 @@ Usage:
     python mcp_servers/financial_data_mcp.py
 """
 
+import asyncio
 import os
 import sys
 from datetime import date
@@ -33,6 +34,7 @@ from financial_data.personal_finance import (
     find_recurring,
     search_transactions,
     transactions_by_category,
+    compare_spending as _compare_spending,
 )
 from financial_data.business_finance import (
     business_pnl,
@@ -162,8 +164,9 @@ async def get_fire_status(scenario_name: str | None = None) -> str:
 async def find_recurring_transactions(min_occurrences: int = 3, months: int = 6) -> str:
     """Find recurring transactions like subscriptions and regular payments.
 
-    Analyses transaction descriptions to identify patterns — groups by
-    normalised description and shows frequency + average amount.
+    Groups transactions into per-merchant series (fuzzy-matched descriptions)
+    and shows each one's cadence (weekly/monthly/annual...), count, average
+    amount, latest payment and when the next one is expected.
 
     Args:
         min_occurrences: Minimum times a transaction must appear (default: 3)
@@ -297,54 +300,7 @@ async def compare_spending(period_a: str, period_b: str) -> str:
     "How does this month compare to last?"
     """
     try:
-        from financial_data.config import get_date_range
-        from financial_data.supabase_client import finance_rpc, finance_query
-        from financial_data.formatters import gbp, md_table, safe_float, period_label
-
-        # Get excluded categories
-        excluded_cats = await finance_query("categories", {
-            "exclude_from_totals": "eq.true",
-            "select": "id",
-        })
-        excluded_ids = [c["id"] for c in excluded_cats]
-
-        start_a, end_a = get_date_range(period_a)
-        start_b, end_b = get_date_range(period_b)
-
-        rows_a = await finance_rpc("get_spending_by_category", {
-            "start_date": start_a, "end_date": end_a, "excluded_ids": excluded_ids,
-        })
-        rows_b = await finance_rpc("get_spending_by_category", {
-            "start_date": start_b, "end_date": end_b, "excluded_ids": excluded_ids,
-        })
-
-        # Build lookup
-        map_a = {r["category_name"]: safe_float(r["total_amount"]) for r in rows_a}
-        map_b = {r["category_name"]: safe_float(r["total_amount"]) for r in rows_b}
-
-        all_cats = sorted(set(map_a.keys()) | set(map_b.keys()))
-
-        table_rows = []
-        for cat in all_cats:
-            a = map_a.get(cat, 0)
-            b = map_b.get(cat, 0)
-            diff = a - b
-            table_rows.append([cat, gbp(a), gbp(b), gbp(diff, show_sign=True)])
-
-        total_a = sum(map_a.values())
-        total_b = sum(map_b.values())
-        table_rows.append(["**Total**", f"**{gbp(total_a)}**", f"**{gbp(total_b)}**", f"**{gbp(total_a - total_b, show_sign=True)}**"])
-
-        output = f"# Spending Comparison: {period_label(period_a)} vs {period_label(period_b)}\n\n"
-        output += md_table([
-            "Category",
-            period_label(period_a),
-            period_label(period_b),
-            "Difference",
-        ], table_rows)
-
-        return output
-
+        return await _compare_spending(period_a, period_b)
     except Exception as e:
         return f"Failed to compare spending: {e}"
 
@@ -360,38 +316,19 @@ async def get_financial_health() -> str:
     "Financial health check"
     """
     try:
-        sections = []
-
-        # Net worth
-        try:
-            sections.append(await net_worth())
-        except Exception as e:
-            sections.append(f"_Net worth unavailable: {e}_")
-
-        # Budget
-        try:
-            sections.append(await budget_status())
-        except Exception as e:
-            sections.append(f"_Budget unavailable: {e}_")
-
-        # Savings rate
-        try:
-            sections.append(await savings_rate())
-        except Exception as e:
-            sections.append(f"_Savings rate unavailable: {e}_")
-
-        # FIRE
-        try:
-            sections.append(await fire_status())
-        except Exception as e:
-            sections.append(f"_FIRE status unavailable: {e}_")
-
-        # Business P&L (current month)
-        try:
-            sections.append(await business_pnl())
-        except Exception as e:
-            sections.append(f"_Business P&L unavailable: {e}_")
-
+        parts = [
+            ("Net worth", net_worth()),
+            ("Budget", budget_status()),
+            ("Savings rate", savings_rate()),
+            ("FIRE status", fire_status()),
+            ("Business P&L", business_pnl()),  # current month
+        ]
+        # Independent sections: fetch them all at once
+        results = await asyncio.gather(*(coro for _, coro in parts), return_exceptions=True)
+        sections = [
+            f"_{name} unavailable: {res}_" if isinstance(res, Exception) else res
+            for (name, _), res in zip(parts, results)
+        ]
         return "\n\n---\n\n".join(sections)
 
     except Exception as e:
@@ -25,6 +25,7 @@ if _project_root not in sys.path:
     sys.path.insert(0, _project_root)
 
 from mcp_servers.financial_data.supabase_client import finance_query, finance_count
+from mcp_servers.financial_data.subscriptions import subscription_health
 
 import httpx
 
@@ -198,214 +199,7 @@ async def subscription_health_check():
     Returns alerts for price changes, missed payments, new recurring
     charges, cancellation windows, and upcoming renewals.
     """
-    import re
-    from collections import defaultdict
-
-    today = date.today()
-    alerts = []
-
-    # 1. Get all subscriptions
-    subs = await finance_query("subscriptions", {
-        "select": "*",
-        "order": "name.asc",
-    }, paginate=True)
-
-    active_subs = [s for s in subs if s.get("status") == "active"]
-
-    # 2. Get last 6 months of outgoing transactions
-    six_months_ago = (today - timedelta(days=180)).isoformat()
-    all_txns = await finance_query("transactions", {
-        "select": "description,amount,date",
-        "amount": "lt.0",
-        "date": f"gte.{six_months_ago}",
-        "order": "date.desc",
-    }, paginate=True)
-
-    # 3. Analyse each tracked subscription
-    tracked_patterns: list[str] = []
-    for sub in active_subs:
-        pattern = sub.get("bank_description_pattern")
-        if not pattern:
-            continue
-
-        clean = pattern.replace("*", "").strip()
-        if not clean:
-            continue
-
-        tracked_patterns.append(clean.lower())
-
-        matching = [
-            t for t in all_txns
-            if clean.lower() in t.get("description", "").lower()
-        ]
-
-        if not matching:
-            continue
-
-        # Price change detection (10% tolerance for FX)
-        stored_amount = abs(float(sub["amount"]))
-        latest_txn = matching[0]
-        latest_amount = abs(float(latest_txn["amount"]))
-
-        if stored_amount > 0 and abs(latest_amount - stored_amount) / stored_amount > 0.10:
-            alerts.append({
-                "type": "price_change",
-                "subscription": sub["name"],
-                "subscription_id": sub["id"],
-                "scope": sub.get("scope", "personal"),
-                "old_amount": stored_amount,
-                "new_amount": round(latest_amount, 2),
-                "last_transaction_date": latest_txn["date"],
-                "description": latest_txn["description"][:60],
-            })
-
-        # Missed payment detection
-        freq = sub.get("frequency", "monthly")
-        expected_gap_days = {
-            "weekly": 10, "fortnightly": 20, "monthly": 45,
-            "quarterly": 105, "termly": 140, "annual": 400,
-        }.get(freq, 45)
-
-        latest_date = date.fromisoformat(latest_txn["date"])
-        days_since = (today - latest_date).days
-
-        if days_since > expected_gap_days:
-            alerts.append({
-                "type": "missed_payment",
-                "subscription": sub["name"],
-                "subscription_id": sub["id"],
-                "scope": sub.get("scope", "personal"),
-                "amount": stored_amount,
-                "frequency": freq,
-                "last_payment_date": latest_txn["date"],
-                "days_overdue": days_since - expected_gap_days,
-            })
-
-    # 4. Cancellation windows
-    for sub in active_subs:
-        notice_days = sub.get("cancellation_notice_days")
-        renewal_date = sub.get("next_renewal_date")
-        if not notice_days or not renewal_date:
-            continue
-
-        renewal = date.fromisoformat(renewal_date)
-        deadline = renewal - timedelta(days=notice_days)
-        if today <= deadline <= today + timedelta(days=14):
-            alerts.append({
-                "type": "cancellation_window",
-                "subscription": sub["name"],
-                "subscription_id": sub["id"],
-                "scope": sub.get("scope", "personal"),
-                "renewal_date": renewal_date,
-                "cancellation_deadline": deadline.isoformat(),
-                "amount": float(sub["amount"]),
-                "frequency": sub.get("frequency", "monthly"),
-            })
-
-    # 5. Upcoming renewals (next 7 days)
-    upcoming = []
-    for sub in active_subs:
-        renewal_date = sub.get("next_renewal_date")
-        if not renewal_date:
-            continue
-        renewal = date.fromisoformat(renewal_date)
-        if today <= renewal <= today + timedelta(days=7):
-            upcoming.append({
-                "name": sub["name"],
-                "renewal_date": renewal_date,
-                "amount": float(sub["amount"]),
-                "frequency": sub.get("frequency", "monthly"),
-                "scope": sub.get("scope", "personal"),
-            })
-
-    # 6. Detect new recurring transactions
-    # Load user-dismissed exclusions
-    exclusion_rows = await finance_query("subscription_exclusions", {
-        "select": "description_pattern",
-    })
-    user_exclusions = [r["description_pattern"].lower() for r in exclusion_rows]
-
-    groups: dict[str, list[dict]] = defaultdict(list)
-    for t in all_txns:
-        desc = t.get("description", "").strip()
-        norm = re.sub(r"\s+\d{2,}[/-]\d{2,}.*$", "", desc.lower()).strip()
-        norm = re.sub(r"\s+", " ", norm)
-        if norm:
-            groups[norm].append(t)
-
-    # Exclude known non-subscription merchants (shops, restaurants, transport, etc.)
-    _EXCLUDE_PATTERNS = {
-        "aldi", "tesco", "sainsbury", "lidl", "asda", "waitrose", "co-op",
-        "morrisons", "marks and spencer", "m&s", "ocado",
-        "pret a manger", "costa", "starbucks", "greggs", "mcdonalds",
-        "nandos", "pizza", "burger", "kitchen", "restaurant", "cafe",
-        "bar ", "pub ", "deli", "bakery", "chippy",
-        "tfl travel", "ringgo", "parking", "petrol", "shell", "bp ",
-        "amazon marketplace", "amazon.co.uk", "ebay", "paypal",
-        "hsbc", "non-sterling", "transaction fee", "interest",
-        "atm", "cash", "withdrawal",
-        "stocks green prima",  # school
-        "burnhill",  # renovation
-        "next directory",  # clothing
-        "box bar",  # restaurant
-        "se hildenborough",  # petrol station
-        "accenture",  # work expenses
-    }
-
-    for desc, txs in groups.items():
-        if len(txs) < 3:
-            continue
-        if "mmbill" in desc or "mmbil" in desc:
-            continue
-        # Skip excluded patterns
-        if any(excl in desc for excl in _EXCLUDE_PATTERNS):
-            continue
-        # Skip user-dismissed exclusions
-        if any(excl in desc for excl in user_exclusions):
-            continue
-        already_tracked = any(tp in desc for tp in tracked_patterns)
-        if already_tracked:
-            continue
-
-        amounts = [abs(float(t["amount"])) for t in txs]
-        avg = sum(amounts) / len(amounts)
-        if avg < 2:
-            continue
-
-        # Subscription heuristic: consistent amounts (low coefficient of variation)
-        # Real subs charge the same amount each time; shopping varies wildly
-        if len(amounts) >= 3:
-            std_dev = (sum((a - avg) ** 2 for a in amounts) / len(amounts)) ** 0.5
-            cv = std_dev / avg if avg > 0 else 1
-            # Skip if amounts vary by more than 20% (not a fixed subscription)
-            if cv > 0.20:
-                continue
-
-        alerts.append({
-            "type": "new_recurring",
-            "description": txs[0].get("description", desc)[:60],
-            "avg_amount": round(avg, 2),
-            "occurrences": len(txs),
-            "first_seen": txs[-1].get("date", ""),
-            "latest": txs[0].get("date", ""),
-        })
-
-    # Summary
-    total_monthly = sum(
-        _monthly_cost(float(s["amount"]), s.get("frequency", "monthly"))
-        for s in active_subs
-    )
-
-    return {
-        "alerts": alerts,
-        "upcoming_renewals": upcoming,
-        "summary": {
-            "total_active": len(active_subs),
-            "total_monthly_cost": round(total_monthly, 2),
-            "alerts_count": len(alerts),
-            "scanned_transactions": len(all_txns),
-        },
-    }
+    return await subscription_health()
 
 
 # ---------------------------------------------------------------------------
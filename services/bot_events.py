@@ -0,0 +1,165 @@
+"""Local event bus between Hadley API and the Discord bot.
+
+Hadley API (and the dashboard, through it) used to tell the bot about
+changes by writing trigger files that the bot polled every 10 s, and the
+bot polled Supabase every 60 s for reminders created elsewhere. Instead the
+bot now runs a tiny HTTP endpoint on localhost and Hadley API publishes to
+it the moment something changes:
+
+    POST http://127.0.0.1:8106/events   {"type": "schedule.reload", "payload": {...}}
+
+- ``EventBus`` — the bot side. Handlers subscribe per event type; each
+  event is dispatched to its handlers as background tasks, so the publisher
+  gets a 202 straight away.
+- ``publish`` / ``publish_sync`` — the publisher side. They return False
+  when the bot isn't listening, in which case callers fall back to the old
+  trigger file; the bot still sweeps those files (and Supabase), just
+  rarely, as reconciliation.
+- ``EventBus.expose`` / ``query`` — read-only views of bot state
+  (``GET /state/<name>``), e.g. the reminder engine's upcoming fires.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from typing import Any, Awaitable, Callable
+
+import httpx
+
+from logger import logger
+
+SCHEDULE_RELOAD = "schedule.reload"   # payload: {"reason"}
+SKILL_RUN = "skill.run"               # payload: {"skill", "channel"}
+REMINDER_CHANGED = "reminder.changed"  # payload: {"id", "action", "reminder_type"}
+
+EVENTS_HOST = "127.0.0.1"
+EVENTS_PORT = int(os.getenv("BOT_EVENTS_PORT", "8106"))
+EVENTS_URL = os.getenv("BOT_EVENTS_URL", f"http://{EVENTS_HOST}:{EVENTS_PORT}/events")
+PUBLISH_TIMEOUT = 2.0
+# Polling fallbacks run this often while the bus is up
+RECONCILE_SECONDS = 15 * 60
+
+Handler = Callable[[dict], Awaitable[Any]]
+Provider = Callable[[dict], Any]
+
+
+class EventBus:
+    """In-process event dispatch, fed by a localhost HTTP endpoint."""
+
+    def __init__(self, host: str = EVENTS_HOST, port: int = EVENTS_PORT):
+        self.host = host
+        self.port = port
+        self._handlers: dict[str, list[Handler]] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._providers: dict[str, Provider] = {}
+        self._runner = None
+
+    @property
+    def running(self) -> bool:
+        return self._runner is not None
+
+    def subscribe(self, event_type: str, handler: Handler) -> None:
+        self._handlers.setdefault(event_type, []).append(handler)
+
+    def expose(self, name: str, provider: Provider) -> None:
+        """Serve provider(query params) as JSON at GET /state/<name>."""
+        self._providers[name] = provider
+
+    def dispatch(self, event_type: str, payload: dict | None = None) -> int:
+        """Start every handler for an event; returns how many were started."""
+        handlers = self._handlers.get(event_type, [])
+        for handler in handlers:
+            task = asyncio.create_task(self._run(event_type, handler, payload or {}))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return len(handlers)
+
+    async def _run(self, event_type: str, handler: Handler, payload: dict) -> None:
+        try:
+            await handler(payload)
+        except Exception as e:
+            logger.error(f"Event handler for {event_type} failed: {e}")
+
+    async def _handle_post(self, request):
+        from aiohttp import web
+
+        try:
+            data = await request.json()
+            event_type = data["type"]
+        except Exception:
+            return web.json_response({"error": "expected {type, payload}"}, status=400)
+        started = self.dispatch(event_type, data.get("payload") or {})
+        logger.info(f"Event {event_type} received ({started} handler(s))")
+        return web.json_response({"status": "accepted", "handlers": started}, status=202)
+
+    async def _handle_state(self, request):
+        from aiohttp import web
+
+        provider = self._providers.get(request.match_info["name"])
+        if provider is None:
+            return web.json_response({"error": "unknown state"}, status=404)
+        return web.json_response(provider(dict(request.query)))
+
+    async def start(self) -> bool:
+        """Start listening; False (and polling stays the delivery path) if the port is taken."""
+        from aiohttp import web
+
+        app = web.Application()
+        app.router.add_post("/events", self._handle_post)
+        app.router.add_get("/events/health", lambda request: web.json_response({"status": "ok"}))
+        app.router.add_get("/state/{name}", self._handle_state)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        try:
+            await web.TCPSite(runner, self.host, self.port).start()
+        except OSError as e:
+            logger.warning(f"Event bus port {self.port} unavailable ({e}) — falling back to polling")
+            await runner.cleanup()
+            return False
+        self._runner = runner
+        logger.info(f"Event bus listening on {self.host}:{self.port}")
+        return True
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def poll_interval(self, fallback_seconds: int) -> int:
+        """Interval for a polling job that the bus makes redundant."""
+        return RECONCILE_SECONDS if self.running else fallback_seconds
+
+
+async def publish(event_type: str, payload: dict | None = None) -> bool:
+    """Send an event to the bot; False if it couldn't be delivered."""
+    try:
+        async with httpx.AsyncClient(timeout=PUBLISH_TIMEOUT) as client:
+            resp = await client.post(EVENTS_URL, json={"type": event_type, "payload": payload or {}})
+        return resp.status_code == 202
+    except httpx.HTTPError as e:
+        logger.debug(f"Event {event_type} not delivered: {e}")
+        return False
+
+
+def publish_sync(event_type: str, payload: dict | None = None) -> bool:
+    """Blocking publish() for synchronous callers."""
+    try:
+        resp = httpx.post(EVENTS_URL, json={"type": event_type, "payload": payload or {}},
+                          timeout=PUBLISH_TIMEOUT)
+        return resp.status_code == 202
+    except httpx.HTTPError as e:
+        logger.debug(f"Event {event_type} not delivered: {e}")
+        return False
+
+
+async def query(name: str, params: dict | None = None) -> Any | None:
+    """Read a state view the bot exposes; None if the bot isn't answering."""
+    url = EVENTS_URL.rsplit("/events", 1)[0] + f"/state/{name}"
+    try:
+        async with httpx.AsyncClient(timeout=PUBLISH_TIMEOUT) as client:
+            resp = await client.get(url, params=params)
+        return resp.json() if resp.status_code == 200 else None
+    except httpx.HTTPError as e:
+        logger.debug(f"State {name} not available: {e}")
+        return None
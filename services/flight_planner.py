@@ -0,0 +1,169 @@
+"""History-guided search planning for flight date pairs.
+
+``generate_date_pairs`` yields a brute-force grid (every Fri/Sat x every trip
+length), and each pair is a paid SerpAPI search. Most of those pairs barely
+move day to day, so the planner ranks them using what ``price_checks``
+already knows and spends a fixed query budget on the ones worth re-checking:
+
+- **never checked** pairs come first (coverage), soonest departure first;
+  a search that found no flights counts as a check (``empty_checks``), so
+  such pairs come back every DEFAULT_RECHECK_DAYS rather than every scan;
+- each checked pair gets a **re-check interval** from Google's last price
+  level for it (low = 1 day, typical = 3, high = 7), shortened to a day when
+  the pair's recent prices are volatile or it is among the route's cheapest;
+- pairs past their interval are **due**; due pairs are ranked by
+  staleness / interval, weighted up for cheapness relative to the route and
+  for volatility, and the top ``budget`` are selected.
+
+Pairs that aren't due are not searched even when budget remains, so a longer
+watch list costs roughly its volatile/cheap subset, not its full length.
+"""
+
+from __future__ import annotations
+
+import math
+import sqlite3
+import statistics
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Optional
+
+RECHECK_DAYS = {"low": 1.0, "typical": 3.0, "high": 7.0}
+DEFAULT_RECHECK_DAYS = 3.0
+VOLATILE_CV = 0.05       # coefficient of variation above which a pair is re-checked daily
+PROMISING_QUANTILE = 0.25  # pairs priced in the route's cheapest quarter are re-checked daily
+HISTORY_CHECKS = 10      # recent checks per pair used for volatility
+
+
+@dataclass
+class PairPlan:
+    """Coverage, staleness and priority of one (route, date pair)."""
+
+    route_id: int
+    outbound: str
+    return_date: str
+    checks: int = 0
+    misses: int = 0                       # searches that found no flights
+    last_checked: Optional[str] = None
+    staleness_days: Optional[float] = None
+    last_pp: Optional[float] = None
+    min_pp: Optional[float] = None
+    volatility: Optional[float] = None    # CV of recent price_pp
+    price_level: Optional[str] = None     # Google's last low/typical/high
+    interval_days: Optional[float] = None
+    due: bool = True
+    score: float = math.inf
+    selected: bool = False
+
+    def to_dict(self) -> dict:
+        d = asdict(self)
+        d["score"] = None if math.isinf(self.score) else round(self.score, 3)
+        return d
+
+
+def _history(conn: sqlite3.Connection, route_ids: list[int], pairs: list[tuple[str, str]]) -> dict:
+    """(route_id, outbound, return) -> newest-first [(price_pp, price_level, checked_at)]."""
+    if not route_ids or not pairs:
+        return {}
+    outbounds = [o for o, _ in pairs]
+    marks = ",".join("?" * len(route_ids))
+    rows = conn.execute(
+        f"""SELECT route_id, outbound_date, return_date, price_pp, checked_at, price_level
+            FROM price_checks
+            WHERE route_id IN ({marks}) AND outbound_date BETWEEN ? AND ?
+              AND price_pp IS NOT NULL
+            ORDER BY checked_at DESC""",
+        (*route_ids, min(outbounds), max(outbounds)),
+    ).fetchall()
+    out: dict[tuple, list] = {}
+    for r in rows:
+        out.setdefault((r[0], r[1], r[2]), []).append((r[3], r[5], r[4]))
+    return out
+
+
+def _misses(conn: sqlite3.Connection, route_ids: list[int], pairs: list[tuple[str, str]]) -> dict:
+    """(route_id, outbound, return) -> (misses, last_checked) for searches with no flights."""
+    if not route_ids or not pairs:
+        return {}
+    outbounds = [o for o, _ in pairs]
+    marks = ",".join("?" * len(route_ids))
+    rows = conn.execute(
+        f"""SELECT route_id, outbound_date, return_date, misses, last_checked
+            FROM empty_checks
+            WHERE route_id IN ({marks}) AND outbound_date BETWEEN ? AND ?""",
+        (*route_ids, min(outbounds), max(outbounds)),
+    ).fetchall()
+    return {(r[0], r[1], r[2]): (r[3], r[4]) for r in rows}
+
+
+def _age_days(checked_at: str, now: datetime) -> float:
+    ts = datetime.fromisoformat(checked_at)
+    if ts.tzinfo is None and now.tzinfo is not None:
+        ts = ts.replace(tzinfo=now.tzinfo)
+    return max(0.0, (now - ts).total_seconds() / 86400)
+
+
+def plan_pairs(
+    conn: sqlite3.Connection,
+    route_ids: list[int],
+    pairs: list[tuple[str, str]],
+    budget: Optional[int],
+    now: datetime,
+) -> list[PairPlan]:
+    """Rank every (route, pair) by expected value; mark the top `budget` due ones selected.
+
+    Returns plans ordered by priority (selected first). ``budget=None``
+    selects every due pair.
+    """
+    history = _history(conn, route_ids, pairs)
+    misses = _misses(conn, route_ids, pairs)
+    plans: list[PairPlan] = []
+
+    for route_id in route_ids:
+        latest = [h[0][0] for (rid, *_), h in history.items() if rid == route_id]
+        median = statistics.median(latest) if latest else None
+        cheap_cut = (statistics.quantiles(latest, n=round(1 / PROMISING_QUANTILE))[0] if len(latest) >= 4
+                     else min(latest) if latest else None)
+
+        for outbound, ret in pairs:
+            plan = PairPlan(route_id, outbound, ret)
+            checks = history.get((route_id, outbound, ret))
+            missed = misses.get((route_id, outbound, ret))
+            if missed:
+                plan.misses = missed[0]
+            if missed and (not checks or missed[1] > checks[0][2]):
+                # Last search found nothing: re-check on the default interval
+                plan.checks = len(checks or [])
+                plan.last_checked = missed[1]
+                plan.staleness_days = round(_age_days(missed[1], now), 2)
+                plan.interval_days = DEFAULT_RECHECK_DAYS
+                plan.score = plan.staleness_days / DEFAULT_RECHECK_DAYS
+                plan.due = plan.score >= 1
+            elif checks:
+                recent = [pp for pp, _, _ in checks[:HISTORY_CHECKS]]
+                level = next((lvl for _, lvl, _ in checks if lvl), None)
+                cv = (statistics.pstdev(recent) / statistics.mean(recent)
+                      if len(recent) > 1 and statistics.mean(recent) > 0 else 0.0)
+                plan.checks = len(checks)
+                plan.last_checked = checks[0][2]
+                plan.staleness_days = round(_age_days(checks[0][2], now), 2)
+                plan.last_pp = recent[0]
+                plan.min_pp = min(pp for pp, _, _ in checks)
+                plan.volatility = round(cv, 4)
+                plan.price_level = level
+                interval = RECHECK_DAYS.get(level, DEFAULT_RECHECK_DAYS)
+                if cv >= VOLATILE_CV or (cheap_cut is not None and plan.last_pp <= cheap_cut):
+                    interval = 1.0
+                plan.interval_days = interval
+                urgency = plan.staleness_days / interval
+                plan.due = urgency >= 1
+                promise = max(-0.5, min(0.5, (median - plan.last_pp) / median)) if median else 0.0
+                plan.score = urgency * (1 + promise + min(cv * 5, 1.0))
+            plans.append(plan)
+
+    plans.sort(key=lambda p: (-p.score, p.outbound, p.route_id))
+    due = [p for p in plans if p.due]
+    for p in due[:budget] if budget is not None else due:
+        p.selected = True
+    plans.sort(key=lambda p: not p.selected)
+    return plans
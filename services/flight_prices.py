@@ -15,8 +15,11 @@ import asyncio
 import json
 import os
 import sqlite3
+import statistics
 import subprocess
+import threading
 import time
+import zlib
 from contextlib import contextmanager
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -26,6 +29,8 @@ from zoneinfo import ZoneInfo
 import httpx
 
 from logger import logger
+from services.flight_planner import plan_pairs
+from services.flight_scan import RateLimited, job_id_for, run_scan, serpapi_bucket
 
 UK_TZ = ZoneInfo("Europe/London")
 REPO_ROOT = Path(__file__).parent.parent
@@ -51,6 +56,7 @@ DEFAULT_CONFIG = {
     "alert_threshold_abs": None,  # alert when price_pp drops below this (e.g. 500)
     "scan_window_days": 180,  # how far ahead to scan
     "scan_strategy": "weekends",  # weekends | specific_dates | flexible
+    "scan_query_budget": 40,  # SerpAPI searches per scheduled scan (None = every due pair)
 }
 
 
@@ -58,18 +64,43 @@ DEFAULT_CONFIG = {
 # Database
 # ---------------------------------------------------------------------------
 
+_local = threading.local()
+_initialised: set[str] = set()
+
+# Per-pair rows to flush in one transaction during a scan
+WRITE_BATCH = 25
+
+
 @contextmanager
 def get_db():
-    conn = sqlite3.connect(str(DB_PATH), timeout=10.0)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA journal_mode=WAL")
+    """Long-lived WAL connection to the price DB (one per thread).
+
+    Commits anything left open on exit and rolls back on error, so callers
+    keep the usual ``with get_db() as conn`` shape without paying a
+    connect/close per query.
+    """
+    conns = getattr(_local, "conns", None)
+    if conns is None:
+        conns = _local.conns = {}
+    conn = conns.get(str(DB_PATH))
+    if conn is None:
+        conn = sqlite3.connect(str(DB_PATH), timeout=10.0)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conns[str(DB_PATH)] = conn
     try:
         yield conn
-    finally:
-        conn.close()
+    except BaseException:
+        conn.rollback()
+        raise
+    if conn.in_transaction:
+        conn.commit()
 
 
 def init_db():
+    if str(DB_PATH) in _initialised:
+        return
     with get_db() as conn:
         conn.executescript("""
             CREATE TABLE IF NOT EXISTS routes (
@@ -97,11 +128,50 @@ def init_db():
                 departure_time TEXT,
                 arrival_time TEXT,
                 source TEXT DEFAULT 'serpapi',
-                raw_json TEXT,
+                raw_json TEXT,  -- legacy; payloads now live in price_raw
                 checked_at TEXT NOT NULL,
+                price_level TEXT,  -- Google's low/typical/high (serpapi checks)
                 FOREIGN KEY(route_id) REFERENCES routes(id)
             );
 
+            -- zlib-compressed JSON payload per check, kept out of the hot table
+            CREATE TABLE IF NOT EXISTS price_raw (
+                check_id INTEGER PRIMARY KEY,
+                payload BLOB NOT NULL
+            );
+
+            -- Rollup per (route, date pair), refreshed whenever checks are written
+            CREATE TABLE IF NOT EXISTS pair_stats (
+                route_id INTEGER NOT NULL,
+                outbound_date TEXT NOT NULL,
+                return_date TEXT NOT NULL,
+                checks INTEGER NOT NULL,
+                sum_pp REAL NOT NULL,
+                min_pp REAL,
+                median_pp REAL,
+                last_check_id INTEGER,
+                last_pp REAL,
+                prev_pp REAL,
+                last_checked TEXT,
+                trend_pct REAL,  -- latest vs median
+                price_level TEXT,
+                scrape_checks INTEGER NOT NULL DEFAULT 0,
+                scrape_min_pp REAL,
+                scrape_prev_pp REAL,
+                PRIMARY KEY (route_id, outbound_date, return_date)
+            ) WITHOUT ROWID;
+
+            -- Searches that found no flights, so the planner ages them like
+            -- priced checks instead of treating the pair as never checked
+            CREATE TABLE IF NOT EXISTS empty_checks (
+                route_id INTEGER NOT NULL,
+                outbound_date TEXT NOT NULL,
+                return_date TEXT NOT NULL,
+                misses INTEGER NOT NULL,
+                last_checked TEXT NOT NULL,
+                PRIMARY KEY (route_id, outbound_date, return_date)
+            ) WITHOUT ROWID;
+
             CREATE TABLE IF NOT EXISTS alerts (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 route_id INTEGER NOT NULL,
@@ -115,13 +185,139 @@ def init_db():
                 FOREIGN KEY(route_id) REFERENCES routes(id)
             );
 
-            CREATE INDEX IF NOT EXISTS idx_checks_route_date
-                ON price_checks(route_id, outbound_date, checked_at DESC);
             CREATE INDEX IF NOT EXISTS idx_checks_checked
                 ON price_checks(checked_at DESC);
             CREATE INDEX IF NOT EXISTS idx_alerts_sent
                 ON alerts(sent_at DESC);
         """)
+        if conn.execute("PRAGMA user_version").fetchone()[0] < 1:
+            _migrate_v1(conn)
+        conn.commit()
+    _initialised.add(str(DB_PATH))
+
+
+def _migrate_v1(conn: sqlite3.Connection) -> None:
+    """Add price_level + covering index, move raw_json out, build pair_stats."""
+    cols = {r["name"] for r in conn.execute("PRAGMA table_info(price_checks)")}
+    if "price_level" not in cols:
+        conn.execute("ALTER TABLE price_checks ADD COLUMN price_level TEXT")
+    conn.execute("DROP INDEX IF EXISTS idx_checks_route_date")
+    conn.execute(
+        """CREATE INDEX IF NOT EXISTS idx_checks_pair
+           ON price_checks(route_id, outbound_date, return_date, checked_at DESC,
+                           price_pp, source, price_level)"""
+    )
+    for row in conn.execute(
+        "SELECT id, source, raw_json FROM price_checks WHERE raw_json IS NOT NULL"
+    ).fetchall():
+        level = None
+        if row["source"] == "serpapi":
+            try:
+                level = (json.loads(row["raw_json"]).get("insights") or {}).get("price_level")
+            except (ValueError, AttributeError):
+                pass
+        conn.execute("INSERT OR REPLACE INTO price_raw VALUES (?, ?)",
+                     (row["id"], zlib.compress(row["raw_json"].encode())))
+        conn.execute("UPDATE price_checks SET raw_json = NULL, price_level = ? WHERE id = ?",
+                     (level, row["id"]))
+    pairs = conn.execute(
+        "SELECT DISTINCT route_id, outbound_date, return_date FROM price_checks").fetchall()
+    _refresh_pair_stats(conn, [tuple(p) for p in pairs])
+    conn.execute("PRAGMA user_version = 1")
+
+
+def record_checks(rows: list[dict]) -> list[int]:
+    """Insert price checks in one transaction and refresh their pair rollups.
+
+    Each row has the price_checks columns plus ``raw`` (any JSON-able payload,
+    stored compressed in price_raw). Returns the new check ids.
+    """
+    if not rows:
+        return []
+    ids = []
+    with get_db() as conn:
+        for r in rows:
+            cur = conn.execute(
+                """INSERT INTO price_checks
+                   (route_id, outbound_date, return_date, price_total, price_pp, airline,
+                    duration_min, departure_time, arrival_time, source, price_level, checked_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (r["route_id"], r["outbound_date"], r["return_date"], r.get("price_total"),
+                 r.get("price_pp"), r.get("airline"), r.get("duration_min"),
+                 r.get("departure_time"), r.get("arrival_time"), r.get("source", "serpapi"),
+                 r.get("price_level"), r["checked_at"]),
+            )
+            ids.append(cur.lastrowid)
+            if r.get("raw") is not None:
+                conn.execute("INSERT INTO price_raw VALUES (?, ?)",
+                             (cur.lastrowid, zlib.compress(json.dumps(r["raw"]).encode())))
+        _refresh_pair_stats(conn, {(r["route_id"], r["outbound_date"], r["return_date"]) for r in rows})
+        conn.commit()
+    return ids
+
+
+def record_empty_checks(rows: list[dict]) -> None:
+    """Note searches that found no flights (route_id, outbound_date, return_date, checked_at)."""
+    if not rows:
+        return
+    with get_db() as conn:
+        conn.executemany(
+            """INSERT INTO empty_checks VALUES (?, ?, ?, 1, ?)
+               ON CONFLICT(route_id, outbound_date, return_date) DO UPDATE SET
+                 misses = misses + 1,
+                 last_checked = MAX(last_checked, excluded.last_checked)""",
+            [(r["route_id"], r["outbound_date"], r["return_date"], r["checked_at"]) for r in rows],
+        )
+        conn.commit()
+
+
+def get_raw_payload(check_id: int) -> Optional[dict]:
+    """Decompressed raw payload stored with a price check (None if absent)."""
+    with get_db() as conn:
+        row = conn.execute("SELECT payload FROM price_raw WHERE check_id = ?", (check_id,)).fetchone()
+    return json.loads(zlib.decompress(row["payload"])) if row else None
+
+
+def _refresh_pair_stats(conn: sqlite3.Connection, pairs) -> None:
+    """Recompute pair_stats for the given (route_id, outbound, return) keys."""
+    for route_id, outbound, return_date in pairs:
+        rows = conn.execute(
+            """SELECT id, price_pp, source, price_level, checked_at FROM price_checks
+               WHERE route_id = ? AND outbound_date = ? AND return_date = ?
+                 AND price_pp IS NOT NULL
+               ORDER BY checked_at DESC, id DESC""",
+            (route_id, outbound, return_date),
+        ).fetchall()
+        if not rows:
+            continue
+        pps = [r["price_pp"] for r in rows]
+        scrape = [r["price_pp"] for r in rows if r["source"] == "scrape"]
+        median = statistics.median(pps)
+        conn.execute(
+            "INSERT OR REPLACE INTO pair_stats VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (route_id, outbound, return_date, len(pps), sum(pps), min(pps), median,
+             rows[0]["id"], pps[0], pps[1] if len(pps) > 1 else None, rows[0]["checked_at"],
+             round((pps[0] - median) / median * 100, 2) if median else None,
+             next((r["price_level"] for r in rows if r["price_level"]), None),
+             len(scrape), min(scrape) if scrape else None,
+             scrape[1] if len(scrape) > 1 else None),
+        )
+
+
+def pair_history(conn: sqlite3.Connection, route_id: int, outbound: str, return_date: str) -> dict:
+    """compute_history() for one date pair, read from its pair_stats rollup."""
+    row = conn.execute(
+        """SELECT checks, min_pp, prev_pp, scrape_checks, scrape_min_pp, scrape_prev_pp
+           FROM pair_stats WHERE route_id = ? AND outbound_date = ? AND return_date = ?""",
+        (route_id, outbound, return_date),
+    ).fetchone()
+    if row and row["scrape_checks"]:
+        return {"lowest_pp": row["scrape_min_pp"], "checks": row["scrape_checks"],
+                "prev_pp": row["scrape_prev_pp"], "basis": "scrape"}
+    if row and row["checks"]:
+        return {"lowest_pp": row["min_pp"], "checks": row["checks"],
+                "prev_pp": row["prev_pp"], "basis": "all"}
+    return compute_history([])
 
 
 # ---------------------------------------------------------------------------
@@ -139,7 +335,11 @@ async def search_flights(
     stops: int = 0,
     currency: str = "GBP",
 ) -> dict[str, Any]:
-    """Query SerpAPI Google Flights endpoint."""
+    """Query SerpAPI Google Flights endpoint.
+
+    Draws from the shared SerpAPI token bucket; a 429 raises RateLimited so
+    the scan scheduler can back off and retry the pair.
+    """
     params = {
         "engine": "google_flights",
         "departure_id": departure_id,
@@ -155,8 +355,12 @@ async def search_flights(
         "api_key": api_key,
     }
 
+    await serpapi_bucket().acquire()
     async with httpx.AsyncClient(timeout=30) as client:
         resp = await client.get(SERPAPI_BASE, params=params)
+        if resp.status_code == 429:
+            retry_after = resp.headers.get("Retry-After")
+            raise RateLimited(float(retry_after) if retry_after and retry_after.isdigit() else None)
         resp.raise_for_status()
         return resp.json()
 
@@ -295,6 +499,7 @@ class FlightPriceMonitor:
         import os
         self.api_key = api_key or os.getenv("SERPAPI_KEY", "")
         self.config = {**DEFAULT_CONFIG, **(config or {})}
+        self._pending: list[dict] = []
         init_db()
         self._ensure_routes()
 
@@ -325,89 +530,149 @@ class FlightPriceMonitor:
 
         Returns list of cheapest flight per date pair.
         """
+        results = await self._scan([route], date_pairs)
+        return results.get(route["id"], [])
+
+    async def check_all_routes(self, date_pairs: list[tuple[str, str]] = None) -> dict[str, Any]:
+        """Check all active routes. Returns summary.
+
+        Without ``date_pairs`` the configured grid is pruned by the history
+        planner (see plan_scan) rather than searched exhaustively.
+        """
+        routes = self.get_routes()
+        by_route = await self._scan(routes, date_pairs)
+        return {
+            route["label"]: {"route": route, "results": by_route.get(route["id"], [])}
+            for route in routes
+        }
+
+    def _default_pairs(self) -> list[tuple[str, str]]:
+        return generate_date_pairs(
+            strategy=self.config.get("scan_strategy", "weekends"),
+            window_days=self.config.get("scan_window_days", 180),
+            trip_lengths=self.config.get("trip_lengths"),
+            specific_dates=self.config.get("specific_dates"),
+        )
+
+    def plan_scan(
+        self,
+        routes: list[dict] = None,
+        date_pairs: list[tuple[str, str]] = None,
+        budget: Optional[int] = None,
+    ) -> list[dict]:
+        """Coverage, staleness and priority of every (route, date pair) in the scan grid.
+
+        Pairs marked ``selected`` are the ones the next scheduled scan will
+        search (see services/flight_planner.py). ``budget`` defaults to the
+        configured ``scan_query_budget``.
+        """
+        routes = self.get_routes() if routes is None else routes
+        if date_pairs is None:
+            date_pairs = self._default_pairs()
+        if budget is None:
+            budget = self.config.get("scan_query_budget")
+        with get_db() as conn:
+            plans = plan_pairs(conn, [r["id"] for r in routes], date_pairs, budget,
+                               now=datetime.now(UK_TZ))
+        return [p.to_dict() for p in plans]
+
+    async def _scan(
+        self,
+        routes: list[dict],
+        date_pairs: list[tuple[str, str]] = None,
+    ) -> dict[int, list[dict]]:
+        """Search (route, date pair)s through the shared scan scheduler.
+
+        Explicit ``date_pairs`` are all searched. Without them the configured
+        grid is planned against price history and only the selected pairs
+        (at most ``scan_query_budget``) are searched. All routes share one
+        rate budget and worker pool; progress is checkpointed per scan, so
+        re-running an interrupted scan the same day only searches the pairs
+        it hadn't finished. Returns results per route id, in date-pair order.
+        """
         if not self.api_key:
             logger.error("SERPAPI_KEY not set — cannot check flight prices")
-            return []
+            return {}
 
+        by_id = {r["id"]: r for r in routes}
         if date_pairs is None:
-            date_pairs = generate_date_pairs(
-                strategy=self.config.get("scan_strategy", "weekends"),
-                window_days=self.config.get("scan_window_days", 180),
-                trip_lengths=self.config.get("trip_lengths"),
-                specific_dates=self.config.get("specific_dates"),
-            )
+            plans = [p for p in self.plan_scan(routes) if p["selected"]]
+            items = sorted((p["route_id"], p["outbound"], p["return_date"]) for p in plans)
+            logger.info(f"Flight scan: {len(items)} pairs selected by history planner")
+        else:
+            items = [(r["id"], outbound, ret) for r in routes for outbound, ret in date_pairs]
+        job_id = job_id_for(items, datetime.now(UK_TZ).date().isoformat())
 
-        results = []
-        now = datetime.now(UK_TZ).isoformat()
+        async def check_pair(item) -> dict:
+            route_id, outbound, return_date = item
+            return await self._check_pair(by_id[route_id], outbound, return_date)
 
-        for outbound, return_date in date_pairs:
-            try:
-                data = await search_flights(
-                    api_key=self.api_key,
-                    departure_id=route["from_airport"],
-                    arrival_id=route["to_airport"],
-                    outbound_date=outbound,
-                    return_date=return_date,
-                    adults=route.get("passengers", self.config["passengers"]),
-                    travel_class=route.get("cabin", self.config["cabin"]),
-                    stops=route.get("stops", self.config["stops"]),
-                    currency=self.config.get("currency", "GBP"),
-                )
+        try:
+            # Checkpoints are written after each batch is stored, so a crash
+            # can't leave pairs marked done that never reached the database
+            scanned = await run_scan(items, check_pair, job_id=job_id,
+                                     commit=self._flush, checkpoint_every=WRITE_BATCH)
+        finally:
+            self._flush()
+
+        results: dict[int, list[dict]] = {r["id"]: [] for r in routes}
+        for (route_id, _, _), result in zip(items, scanned):
+            if result:
+                results[route_id].append(result)
+        return results
 
-                flights = parse_flight_results(data, route.get("passengers", self.config["passengers"]))
-                insights = extract_price_insights(data)
-
-                if flights:
-                    cheapest = flights[0]
-
-                    # Store in DB
-                    with get_db() as conn:
-                        conn.execute(
-                            """INSERT INTO price_checks
-                               (route_id, outbound_date, return_date, price_total, price_pp,
-                                airline, duration_min, departure_time, arrival_time, source, raw_json, checked_at)
-                               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 'serpapi', ?, ?)""",
-                            (route["id"], outbound, return_date, cheapest["price_total"],
-                             cheapest["price_pp"], cheapest["airline"], cheapest["duration_min"],
-                             cheapest["departure_time"], cheapest["arrival_time"],
-                             json.dumps({"flights": flights[:5], "insights": insights}), now),
-                        )
-                        conn.commit()
-
-                    results.append({
-                        "outbound": outbound,
-                        "return": return_date,
-                        "cheapest": cheapest,
-                        "all_flights": flights[:5],
-                        "insights": insights,
-                    })
-
-                # Rate limit: ~1 req/sec to stay within SerpAPI limits
-                await asyncio.sleep(1.0)
-
-            except httpx.HTTPStatusError as e:
-                logger.warning(f"SerpAPI error for {outbound}-{return_date}: {e.response.status_code}")
-                if e.response.status_code == 429:
-                    logger.warning("Rate limited — stopping scan")
-                    break
-            except Exception as e:
-                logger.warning(f"Flight check failed for {outbound}-{return_date}: {e}")
+    def _flush(self) -> None:
+        """Write buffered scan results in one transaction (empty searches apart)."""
+        rows, self._pending = self._pending, []
+        record_checks([r for r in rows if not r.get("empty")])
+        record_empty_checks([r for r in rows if r.get("empty")])
 
-        return results
+    async def _check_pair(self, route: dict, outbound: str, return_date: str) -> dict:
+        """Search one date pair and buffer its cheapest result for writing
+        (run_scan commits the buffer with each checkpoint).
 
-    async def check_all_routes(self, date_pairs: list[tuple[str, str]] = None) -> dict[str, Any]:
-        """Check all active routes. Returns summary."""
-        routes = self.get_routes()
-        all_results = {}
+        Returns {} when there are no flights.
+        """
+        passengers = route.get("passengers", self.config["passengers"])
+        data = await search_flights(
+            api_key=self.api_key,
+            departure_id=route["from_airport"],
+            arrival_id=route["to_airport"],
+            outbound_date=outbound,
+            return_date=return_date,
+            adults=passengers,
+            travel_class=route.get("cabin", self.config["cabin"]),
+            stops=route.get("stops", self.config["stops"]),
+            currency=self.config.get("currency", "GBP"),
+        )
 
-        for route in routes:
-            results = await self.check_route(route, date_pairs)
-            all_results[route["label"]] = {
-                "route": route,
-                "results": results,
-            }
+        flights = parse_flight_results(data, passengers)
+        insights = extract_price_insights(data)
+        if not flights:
+            self._pending.append({
+                "route_id": route["id"], "outbound_date": outbound, "return_date": return_date,
+                "checked_at": datetime.now(UK_TZ).isoformat(), "empty": True,
+            })
+            return {}
 
-        return all_results
+        cheapest = flights[0]
+        self._pending.append({
+            "route_id": route["id"], "outbound_date": outbound, "return_date": return_date,
+            "price_total": cheapest["price_total"], "price_pp": cheapest["price_pp"],
+            "airline": cheapest["airline"], "duration_min": cheapest["duration_min"],
+            "departure_time": cheapest["departure_time"], "arrival_time": cheapest["arrival_time"],
+            "source": "serpapi", "price_level": insights.get("price_level"),
+            "raw": {"flights": flights[:5], "insights": insights},
+            "checked_at": datetime.now(UK_TZ).isoformat(),
+        })
+
+        return {
+            "outbound": outbound,
+            "return": return_date,
+            "cheapest": cheapest,
+            "all_flights": flights[:5],
+            "insights": insights,
+        }
 
     async def quick_check(self, outbound: str, return_date: str) -> dict[str, Any]:
         """Single date pair check across all routes. For on-demand queries."""
@@ -519,60 +784,61 @@ class FlightPriceMonitor:
         A "deal" is when the latest price for a date is:
         - Below the absolute threshold (if set), OR
         - X% below the average price we've seen for that date
+
+        Reads the pair_stats rollups, so the cost scales with the number of
+        date pairs rather than the number of checks.
         """
         threshold_pct = self.config.get("alert_threshold_pct", 10)
         threshold_abs = self.config.get("alert_threshold_abs")
         deals = []
 
+        route_filter, params = ("AND ps.route_id = ?", [route_id]) if route_id else ("", [])
         with get_db() as conn:
-            # Get latest price per route+date combo
-            query = """
-                SELECT pc.route_id, pc.outbound_date, pc.return_date,
-                       pc.price_pp, pc.price_total, pc.airline, pc.checked_at,
-                       r.label
-                FROM price_checks pc
-                JOIN routes r ON r.id = pc.route_id
-                WHERE r.active = 1
-                  AND pc.id IN (
-                    SELECT id FROM price_checks sub
-                    WHERE sub.route_id = pc.route_id
-                      AND sub.outbound_date = pc.outbound_date
-                      AND sub.return_date = pc.return_date
-                    ORDER BY sub.checked_at DESC
-                    LIMIT 1
+            # Latest price per route+date pair
+            latest = conn.execute(
+                f"""SELECT ps.route_id, ps.outbound_date, ps.return_date,
+                           pc.price_pp, pc.price_total, pc.airline, pc.checked_at,
+                           r.label
+                    FROM pair_stats ps
+                    JOIN price_checks pc ON pc.id = ps.last_check_id
+                    JOIN routes r ON r.id = ps.route_id
+                    WHERE r.active = 1 {route_filter}""",
+                params,
+            ).fetchall()
+            # Baseline per route+outbound date (across return dates)
+            baselines = {
+                (b["route_id"], b["outbound_date"]): b
+                for b in conn.execute(
+                    f"""SELECT ps.route_id, ps.outbound_date,
+                               SUM(ps.sum_pp) / SUM(ps.checks) AS avg_pp,
+                               MIN(ps.min_pp) AS min_pp, SUM(ps.checks) AS checks
+                        FROM pair_stats ps
+                        WHERE 1 = 1 {route_filter}
+                        GROUP BY ps.route_id, ps.outbound_date""",
+                    params,
                 )
-            """
-            params = []
-            if route_id:
-                query += " AND pc.route_id = ?"
-                params.append(route_id)
+            }
 
-            for row in conn.execute(query, params).fetchall():
-                row = dict(row)
+        for row in latest:
+            row = dict(row)
 
-                # Check absolute threshold
-                if threshold_abs and row["price_pp"] <= threshold_abs:
-                    row["deal_type"] = "below_target"
-                    row["target"] = threshold_abs
+            # Check absolute threshold
+            if threshold_abs and row["price_pp"] <= threshold_abs:
+                row["deal_type"] = "below_target"
+                row["target"] = threshold_abs
+                deals.append(row)
+                continue
+
+            # Check percentage drop vs average
+            avg_row = baselines.get((row["route_id"], row["outbound_date"]))
+            if avg_row and avg_row["checks"] > 1 and avg_row["avg_pp"]:
+                drop_pct = ((avg_row["avg_pp"] - row["price_pp"]) / avg_row["avg_pp"]) * 100
+                if drop_pct >= threshold_pct:
+                    row["deal_type"] = "price_drop"
+                    row["drop_pct"] = round(drop_pct, 1)
+                    row["avg_price_pp"] = round(avg_row["avg_pp"], 2)
+                    row["min_price_pp"] = round(avg_row["min_pp"], 2)
                     deals.append(row)
-                    continue
-
-                # Check percentage drop vs average
-                avg_row = conn.execute(
-                    """SELECT AVG(price_pp) as avg_pp, MIN(price_pp) as min_pp, COUNT(*) as checks
-                       FROM price_checks
-                       WHERE route_id = ? AND outbound_date = ?""",
-                    (row["route_id"], row["outbound_date"]),
-                ).fetchone()
-
-                if avg_row and avg_row["checks"] > 1 and avg_row["avg_pp"]:
-                    drop_pct = ((avg_row["avg_pp"] - row["price_pp"]) / avg_row["avg_pp"]) * 100
-                    if drop_pct >= threshold_pct:
-                        row["deal_type"] = "price_drop"
-                        row["drop_pct"] = round(drop_pct, 1)
-                        row["avg_price_pp"] = round(avg_row["avg_pp"], 2)
-                        row["min_price_pp"] = round(avg_row["min_pp"], 2)
-                        deals.append(row)
 
         deals.sort(key=lambda d: d["price_pp"])
         return deals
@@ -623,7 +889,7 @@ class FlightPriceMonitor:
                 (from_airport, to_airport, label, passengers, cabin, stops),
             )
             conn.commit()
-            if cursor.lastrowid:
+            if cursor.rowcount:
                 return cursor.lastrowid
             # Already exists — fetch id
             row = conn.execute(
@@ -854,6 +1120,8 @@ async def _serpapi_best(monitor: "FlightPriceMonitor", w: dict) -> tuple[Optiona
             "layover_airports": [],
             "off_criteria": True,  # serpapi can't honour time/layover filters
         }, "serpapi"
+    except RateLimited:
+        raise  # the scan scheduler backs off and retries
     except Exception as e:
         logger.warning(f"SerpApi fallback failed for {w['id']}: {e}")
         return None, None
@@ -886,25 +1154,15 @@ def _record_check(monitor: "FlightPriceMonitor", w: dict, best: dict, source: st
         w["origin"], w["destination"], w["label"],
         passengers=pax, cabin=1, stops=w.get("maxStops") or 0,
     )
-    now = datetime.now(UK_TZ).isoformat()
+    record_checks([{
+        "route_id": route_id, "outbound_date": w["outbound"], "return_date": w["return"],
+        "price_total": best["price_total"], "price_pp": best["price_pp"],
+        "airline": best.get("airlines"), "duration_min": best.get("duration_min"),
+        "departure_time": best.get("depart_time"), "arrival_time": best.get("arrive_time"),
+        "source": source, "raw": best, "checked_at": datetime.now(UK_TZ).isoformat(),
+    }])
     with get_db() as conn:
-        conn.execute(
-            """INSERT INTO price_checks
-               (route_id, outbound_date, return_date, price_total, price_pp,
-                airline, duration_min, departure_time, arrival_time, source, raw_json, checked_at)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-            (route_id, w["outbound"], w["return"], best["price_total"], best["price_pp"],
-             best.get("airlines"), best.get("duration_min"), best.get("depart_time"),
-             best.get("arrive_time"), source, json.dumps(best), now),
-        )
-        conn.commit()
-        rows = conn.execute(
-            """SELECT price_pp, source FROM price_checks
-               WHERE route_id = ? AND outbound_date = ? AND return_date = ?
-               ORDER BY checked_at DESC""",
-            (route_id, w["outbound"], w["return"]),
-        ).fetchall()
-    return compute_history([dict(r) for r in rows])
+        return pair_history(conn, route_id, w["outbound"], w["return"])
 
 
 async def run_daily_watches(config_path: Path = WATCHES_PATH) -> dict:
@@ -961,6 +1219,8 @@ async def run_daily_watches(config_path: Path = WATCHES_PATH) -> dict:
 
     monitor = FlightPriceMonitor()
 
+    entries: list[dict] = []
+    picks: list[tuple[Optional[dict], Optional[str]]] = []
     for w in cfg["watches"]:
         pax = w.get("adults", 1) + len(w.get("children") or [])
         entry: dict[str, Any] = {
@@ -977,11 +1237,20 @@ async def run_daily_watches(config_path: Path = WATCHES_PATH) -> dict:
                 source = "scrape"
                 entry["insight"] = sr.get("insight")
                 entry["cheapest_banner"] = sr.get("cheapestBanner")
-        if not best:
-            best, source = await _serpapi_best(monitor, w)
-            if best:
+        entries.append(entry)
+        picks.append((best, source))
+
+    # SerpApi fallbacks run concurrently under the shared rate budget
+    missing = [i for i, (best, _) in enumerate(picks) if not best]
+    if missing:
+        watches = cfg["watches"]
+        fallbacks = await run_scan(missing, lambda i: _serpapi_best(monitor, watches[i]))
+        for i, result in zip(missing, fallbacks):
+            picks[i] = result or (None, None)
+            if picks[i][0]:
                 out["fallback_used"] = True
 
+    for w, entry, (best, source) in zip(cfg["watches"], entries, picks):
         if best:
             entry["best"] = best
             entry["source"] = source
@@ -0,0 +1,232 @@
+"""Rate-budgeted, resumable scan scheduler for SerpAPI flight searches.
+
+A 180-day weekend scan is ~150 searches per route. Done one at a time with a
+fixed 1s sleep, most of the wall time was spent waiting on SerpAPI latency
+rather than on the rate limit, and a single 429 aborted the whole scan.
+
+- ``TokenBucket`` — one process-wide budget (SERPAPI_RATE_PER_SEC, bursting
+  to SERPAPI_BURST) that every SerpAPI call draws from, whichever route,
+  month scan or daily watch it belongs to. A 429 halves the rate and pauses
+  the bucket (honouring Retry-After); successes creep it back up.
+- ``run_scan`` — runs items through a worker with bounded concurrency.
+  Rate-limited items are requeued rather than dropped, and when given a
+  ``job_id`` finished items are checkpointed to
+  ``data/flight_scan_checkpoints/<job_id>.json`` so an interrupted scan
+  resumes where it stopped. A caller that buffers results passes ``commit``,
+  which runs before every checkpoint write, so nothing is marked done before
+  it is stored. The checkpoint is removed once the scan completes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+from logger import logger
+
+REPO_ROOT = Path(__file__).parent.parent
+CHECKPOINT_DIR = REPO_ROOT / "data" / "flight_scan_checkpoints"
+
+SERPAPI_RATE_PER_SEC = float(os.getenv("SERPAPI_RATE_PER_SEC", "1.0"))
+SERPAPI_BURST = int(os.getenv("SERPAPI_BURST", "3"))
+SCAN_CONCURRENCY = int(os.getenv("FLIGHT_SCAN_CONCURRENCY", "4"))
+MAX_ATTEMPTS = 4
+CHECKPOINT_MAX_AGE_S = 24 * 3600  # don't resume yesterday's prices
+
+
+class RateLimited(Exception):
+    """SerpAPI answered 429; the item should be retried later."""
+
+    def __init__(self, retry_after: Optional[float] = None):
+        super().__init__(f"rate limited (retry_after={retry_after})")
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Async token bucket with multiplicative backoff on 429s.
+
+    Args:
+        rate: tokens per second at full speed.
+        burst: bucket capacity.
+        min_rate: floor for the backed-off rate.
+    """
+
+    def __init__(self, rate: float, burst: int = 1, min_rate: float = 0.1):
+        self.base_rate = rate
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.min_rate = min(min_rate, rate)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+        self.stats = {"acquired": 0, "throttled": 0, "waited_s": 0.0}
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Wait for one token. Callers are served in arrival order."""
+        started = time.monotonic()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    break
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+        self.stats["acquired"] += 1
+        self.stats["waited_s"] += time.monotonic() - started
+
+    def throttle(self, retry_after: Optional[float] = None) -> None:
+        """Back off after a 429: halve the rate and pause for retry_after (or 1/rate)."""
+        self.rate = max(self.min_rate, self.rate / 2)
+        pause = retry_after if retry_after is not None else 1 / self.rate
+        self._paused_until = max(self._paused_until, time.monotonic() + pause)
+        self._tokens = 0.0
+        self.stats["throttled"] += 1
+        logger.warning(f"SerpAPI rate limited — slowing to {self.rate:.2f} req/s, pausing {pause:.1f}s")
+
+    def recover(self) -> None:
+        """Additive increase back towards the configured rate after a success."""
+        if self.rate < self.base_rate:
+            self.rate = min(self.base_rate, self.rate + self.base_rate * 0.05)
+
+
+_bucket: TokenBucket | None = None
+
+
+def serpapi_bucket() -> TokenBucket:
+    """The process-wide SerpAPI budget shared by every scan."""
+    global _bucket
+    if _bucket is None:
+        _bucket = TokenBucket(SERPAPI_RATE_PER_SEC, SERPAPI_BURST)
+    return _bucket
+
+
+def job_id_for(*parts: Any) -> str:
+    """Stable checkpoint id for a scan (e.g. route id + date pairs + day)."""
+    blob = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha1(blob.encode()).hexdigest()[:16]
+
+
+class _Checkpoint:
+    def __init__(self, job_id: Optional[str], directory: Path):
+        self.path = directory / f"{job_id}.json" if job_id else None
+        self.done: dict[str, Any] = {}
+        if self.path and self.path.exists():
+            try:
+                data = json.loads(self.path.read_text())
+                if time.time() - data.get("started_at", 0) < CHECKPOINT_MAX_AGE_S:
+                    self.done = data.get("done", {})
+                    self.started_at = data["started_at"]
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Ignoring unreadable scan checkpoint {self.path}: {e}")
+        if not hasattr(self, "started_at"):
+            self.started_at = time.time()
+            self.done = {}
+
+    def record(self, key: str, result: Any) -> None:
+        self.done[key] = result
+        self.save()
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"started_at": self.started_at, "done": self.done}, default=str))
+        os.replace(tmp, self.path)
+
+    def clear(self) -> None:
+        if self.path:
+            self.path.unlink(missing_ok=True)
+
+
+async def run_scan(
+    items: list[Hashable],
+    worker: Callable[[Any], Awaitable[Any]],
+    *,
+    job_id: Optional[str] = None,
+    concurrency: int = SCAN_CONCURRENCY,
+    bucket: Optional[TokenBucket] = None,
+    checkpoint_dir: Optional[Path] = None,
+    commit: Optional[Callable[[], None]] = None,
+    checkpoint_every: int = 1,
+) -> list[Any]:
+    """Run ``worker(item)`` for every item; returns results in item order.
+
+    The worker should raise ``RateLimited`` on a 429 — the item is requeued
+    (up to MAX_ATTEMPTS) after the bucket backs off. Any other exception is
+    logged and the item's result is None (and not checkpointed, so a resumed
+    scan retries it). Checkpoints go to ``checkpoint_dir`` (default
+    CHECKPOINT_DIR), every ``checkpoint_every`` finished items and at the
+    end, each after ``commit()`` has stored the results buffered so far.
+    """
+    bucket = bucket or serpapi_bucket()
+    checkpoint = _Checkpoint(job_id, checkpoint_dir or CHECKPOINT_DIR)
+    keys = [json.dumps(item, default=str) for item in items]
+    results: dict[int, Any] = {}
+    queue: asyncio.Queue = asyncio.Queue()
+    for i, key in enumerate(keys):
+        if key in checkpoint.done:
+            results[i] = checkpoint.done[key]
+        else:
+            queue.put_nowait((i, 1))
+    if checkpoint.done and results:
+        logger.info(f"Resuming scan {job_id}: {len(results)}/{len(items)} already done")
+    unsaved = 0
+
+    def save() -> None:
+        nonlocal unsaved
+        if commit is not None:
+            commit()
+        checkpoint.save()
+        unsaved = 0
+
+    async def run_worker():
+        nonlocal unsaved
+        while True:
+            try:
+                i, attempt = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                result = await worker(items[i])
+            except RateLimited as e:
+                bucket.throttle(e.retry_after)
+                if attempt < MAX_ATTEMPTS:
+                    queue.put_nowait((i, attempt + 1))
+                else:
+                    logger.warning(f"Giving up on {items[i]} after {attempt} rate-limited attempts")
+                    results[i] = None
+                continue
+            except Exception as e:
+                logger.warning(f"Scan item {items[i]} failed: {e}")
+                results[i] = None
+                continue
+            bucket.recover()
+            results[i] = result
+            checkpoint.done[keys[i]] = result
+            unsaved += 1
+            if unsaved >= checkpoint_every:
+                save()
+
+    await asyncio.gather(*(run_worker() for _ in range(max(1, min(concurrency, queue.qsize())))))
+    if all(keys[i] in checkpoint.done for i in range(len(items))):
+        if commit is not None:
+            commit()
+        checkpoint.clear()
+    elif unsaved:
+        save()
+    return [results.get(i) for i in range(len(items))]
@@ -0,0 +1,46 @@
+-- Per-day rollup of the shared ai_api_usage audit log for reconciliation.
+-- domains/api_usage/reconcile.py and reconcile_csv.py used to pull every raw
+-- row in the window (capped at 200k) and sum them client-side; they now call
+-- this function and get one row per (day, project, model) back.
+-- Days are UTC, matching Anthropic's usage_report / Console CSV buckets.
+
+CREATE INDEX IF NOT EXISTS ai_api_usage_source_created_idx
+    ON public.ai_api_usage (billing_source, created_at);
+
+CREATE OR REPLACE FUNCTION public.ai_usage_daily(
+    since date,
+    until date DEFAULT NULL,
+    source text DEFAULT 'api_key'
+)
+RETURNS TABLE(
+    usage_date date,
+    project text,
+    model text,
+    calls bigint,
+    input_tokens bigint,
+    output_tokens bigint,
+    cache_creation_input_tokens bigint,
+    cache_read_input_tokens bigint,
+    cost_usd numeric
+) AS $$
+  SELECT
+    (u.created_at AT TIME ZONE 'UTC')::date AS usage_date,
+    COALESCE(u.project, '?') AS project,
+    COALESCE(u.model, 'unknown') AS model,
+    COUNT(*)::bigint,
+    COALESCE(SUM(u.input_tokens), 0)::bigint,
+    COALESCE(SUM(u.output_tokens), 0)::bigint,
+    COALESCE(SUM(u.cache_creation_input_tokens), 0)::bigint,
+    COALESCE(SUM(u.cache_read_input_tokens), 0)::bigint,
+    COALESCE(SUM(u.cost_usd), 0)
+  FROM public.ai_api_usage u
+  WHERE u.created_at >= (since::timestamp AT TIME ZONE 'UTC')
+    AND (until IS NULL OR u.created_at < ((until + 1)::timestamp AT TIME ZONE 'UTC'))
+    AND (source IS NULL OR u.billing_source = source)
+  GROUP BY 1, 2, 3
+  ORDER BY 1, 2, 3;
+$$ LANGUAGE sql STABLE;
+
+-- The table is RLS-locked to the service role; keep the rollup the same.
+REVOKE EXECUTE ON FUNCTION public.ai_usage_daily(date, date, text) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.ai_usage_daily(date, date, text) TO service_role;
@@ -0,0 +1,29 @@
+-- Sync cursor for the bot's reminder engine.
+-- domains/peterbot/reminders/engine.py used to re-read every pending reminder
+-- each minute; it now asks only for rows changed since the newest updated_at
+-- it has seen (updated_at=gt.<cursor>), so reminders.updated_at must move on
+-- every insert and update.
+
+-- Backfill before setting the default, which would otherwise stamp every
+-- existing row with the migration time
+ALTER TABLE reminders ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ;
+UPDATE reminders SET updated_at = COALESCE(fired_at, created_at, NOW()) WHERE updated_at IS NULL;
+ALTER TABLE reminders ALTER COLUMN updated_at SET DEFAULT NOW();
+
+CREATE OR REPLACE FUNCTION update_reminders_updated_at()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = NOW();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS set_updated_at ON reminders;
+CREATE TRIGGER set_updated_at
+    BEFORE UPDATE ON reminders
+    FOR EACH ROW
+    EXECUTE FUNCTION update_reminders_updated_at();
+
+CREATE INDEX IF NOT EXISTS idx_reminders_updated_at ON reminders(updated_at);
+
+COMMENT ON COLUMN reminders.updated_at IS 'Last insert/update; incremental sync cursor for the bot';
@@ -0,0 +1,123 @@
+-- Migration: accountability_log_progress RPC
+-- Applies a batch of progress logs in one call. Each entry is applied in its
+-- own subtransaction with the goal row locked:
+--   * delta against the goal's latest progress value
+--   * upsert per (goal_id, date, source) for auto sources, insert for
+--     manual / peter_chat
+--   * goal current_value, habit streak and target completion
+--   * reached_at on newly reached milestones
+-- domains/accountability/service.py used to make up to six REST calls per
+-- log, and the nightly auto-source sync could race with manual logs. It now
+-- sends one call per batch. A failing entry returns {goal_id, error} and
+-- does not affect the other entries.
+--
+-- entries: [{"goal_id", "value", "source", "note", "date"}, ...]
+-- returns: [{"goal_id", "entry", "milestones_reached"} | {"goal_id", "error"}, ...]
+--          in input order
+
+CREATE OR REPLACE FUNCTION public.accountability_log_progress(entries jsonb)
+RETURNS jsonb AS $$
+DECLARE
+    e jsonb;
+    g accountability_goals%ROWTYPE;
+    v_value NUMERIC;
+    v_date DATE;
+    v_source TEXT;
+    v_prev NUMERIC;
+    v_existing UUID;
+    v_row accountability_progress%ROWTYPE;
+    v_hit BOOLEAN;
+    v_reached jsonb;
+    v_today DATE := (now() AT TIME ZONE 'Europe/London')::date;
+    results jsonb := '[]'::jsonb;
+BEGIN
+    FOR e IN SELECT value FROM jsonb_array_elements(entries) LOOP
+        BEGIN
+            SELECT * INTO g FROM accountability_goals
+             WHERE id = (e->>'goal_id')::uuid
+               FOR UPDATE;
+            IF NOT FOUND THEN
+                results := results || jsonb_build_array(jsonb_build_object(
+                    'goal_id', e->>'goal_id', 'error', 'goal not found'));
+                CONTINUE;
+            END IF;
+
+            v_value := (e->>'value')::numeric;
+            v_date := COALESCE((e->>'date')::date, v_today);
+            v_source := COALESCE(e->>'source', 'manual');
+
+            v_prev := NULL;
+            SELECT p.value INTO v_prev FROM accountability_progress p
+             WHERE p.goal_id = g.id
+             ORDER BY p.logged_at DESC
+             LIMIT 1;
+
+            -- Auto sources keep one row per day (see idx_progress_dedup)
+            v_existing := NULL;
+            IF v_source NOT IN ('manual', 'peter_chat') THEN
+                SELECT p.id INTO v_existing FROM accountability_progress p
+                 WHERE p.goal_id = g.id AND p.date = v_date AND p.source = v_source
+                 LIMIT 1;
+            END IF;
+
+            IF v_existing IS NOT NULL THEN
+                UPDATE accountability_progress p
+                   SET value = v_value, delta = v_value - v_prev,
+                       note = COALESCE(e->>'note', p.note)
+                 WHERE p.id = v_existing
+                RETURNING * INTO v_row;
+            ELSE
+                INSERT INTO accountability_progress (goal_id, value, delta, note, source, date)
+                VALUES (g.id, v_value, v_value - v_prev, e->>'note', v_source, v_date)
+                RETURNING * INTO v_row;
+            END IF;
+
+            -- Same rules as service._update_goal_current_value
+            v_hit := CASE WHEN g.direction = 'up' THEN v_value >= g.target_value
+                          ELSE v_value <= g.target_value END;
+            g.current_value := v_value;
+            IF g.goal_type = 'habit' AND g.target_value <> 0 AND v_hit THEN
+                IF g.last_hit_date IS NULL OR v_today - g.last_hit_date > 1 THEN
+                    g.current_streak := 1;
+                ELSIF v_today - g.last_hit_date = 1 THEN
+                    g.current_streak := COALESCE(g.current_streak, 0) + 1;
+                END IF;
+                g.best_streak := GREATEST(COALESCE(g.best_streak, 0), COALESCE(g.current_streak, 0));
+                g.last_hit_date := v_today;
+            END IF;
+            IF g.goal_type = 'target' AND v_hit AND g.status = 'active' THEN
+                g.status := 'completed';
+                g.completed_at := now();
+            END IF;
+
+            UPDATE accountability_goals
+               SET current_value = g.current_value,
+                   current_streak = g.current_streak,
+                   best_streak = g.best_streak,
+                   last_hit_date = g.last_hit_date,
+                   status = g.status,
+                   completed_at = g.completed_at
+             WHERE id = g.id;
+
+            WITH reached AS (
+                UPDATE accountability_milestones m
+                   SET reached_at = now()
+                 WHERE m.goal_id = g.id AND m.reached_at IS NULL
+                   AND CASE WHEN g.direction = 'up' THEN v_value >= m.target_value
+                            ELSE v_value <= m.target_value END
+                RETURNING m.*
+            )
+            SELECT COALESCE(jsonb_agg(to_jsonb(r) ORDER BY r.target_value), '[]'::jsonb)
+              INTO v_reached
+              FROM reached r;
+
+            results := results || jsonb_build_array(jsonb_build_object(
+                'goal_id', g.id, 'entry', to_jsonb(v_row), 'milestones_reached', v_reached));
+        EXCEPTION WHEN OTHERS THEN
+            results := results || jsonb_build_array(jsonb_build_object(
+                'goal_id', e->>'goal_id', 'error', SQLERRM));
+        END;
+    END LOOP;
+    RETURN results;
+END;
+$$ LANGUAGE plpgsql;
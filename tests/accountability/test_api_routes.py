@@ -215,6 +215,23 @@ class TestLogProgress:
             assert resp.status_code == 500
 
 
+    def test_log_progress_batch(self, client, auth_headers):
+        with patch("hadley_api.accountability_routes.log_progress_many", new_callable=AsyncMock) as mock:
+            mock.return_value = [{"id": "p1", "value": 12000}, None]
+            resp = client.post("/accountability/progress/batch", headers=auth_headers, json={
+                "entries": [
+                    {"goal_id": "goal-001", "value": 12000},
+                    {"goal_id": "goal-002", "value": 1, "source": "peter_chat"},
+                ],
+            })
+            assert resp.status_code == 200
+            assert resp.json()["logged"] == 1
+            assert resp.json()["failed"] == 1
+            sent = mock.call_args[0][0]
+            assert sent[1] == {"goal_id": "goal-002", "value": 1, "source": "peter_chat",
+                               "note": None, "log_date": None}
+
+
 # ── POST /accountability/goals/{id}/milestones ───────────────────────────
 
 class TestCreateMilestone:
@@ -126,7 +126,7 @@ class TestRunAutoUpdates:
             "id": "g1", "title": "Manual Goal", "auto_source": None, "status": "active"
         }
         with patch("domains.accountability.service.get_goals", new_callable=AsyncMock) as mock_get, \
-             patch("domains.accountability.service.log_progress", new_callable=AsyncMock) as mock_log:
+             patch("domains.accountability.service.log_progress_many", new_callable=AsyncMock) as mock_log:
             mock_get.return_value = [mock_goal_no_source]
             result = await run_auto_updates()
             mock_log.assert_not_called()
@@ -140,14 +140,37 @@ class TestRunAutoUpdates:
         }
         with patch("domains.accountability.service.get_goals", new_callable=AsyncMock) as mock_get, \
              patch("domains.accountability.auto_sources.fetch_auto_value", new_callable=AsyncMock) as mock_fetch, \
-             patch("domains.accountability.service.log_progress", new_callable=AsyncMock) as mock_log:
+             patch("domains.accountability.service.log_progress_many", new_callable=AsyncMock) as mock_log:
             mock_get.return_value = [mock_goal]
             mock_fetch.return_value = 11234
-            mock_log.return_value = {"id": "p1", "value": 11234}
+            mock_log.return_value = [{"id": "p1", "value": 11234}]
             result = await run_auto_updates()
             assert result["updated"] == 1
             mock_log.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_auto_updates_log_in_one_batch(self):
+        from domains.accountability.auto_sources import run_auto_updates
+        goals = [
+            {"id": "g1", "title": "Steps", "auto_source": "garmin_steps", "status": "active"},
+            {"id": "g2", "title": "Water", "auto_source": "nutrition_water", "status": "active"},
+            {"id": "g3", "title": "Weight", "auto_source": "weight", "status": "active"},
+        ]
+        values = {"garmin_steps": 11234, "nutrition_water": None, "weight": 81.5}
+        with patch("domains.accountability.service.get_goals", new_callable=AsyncMock) as mock_get, \
+             patch("domains.accountability.auto_sources.fetch_auto_value", new_callable=AsyncMock) as mock_fetch, \
+             patch("domains.accountability.service.log_progress_many", new_callable=AsyncMock) as mock_log:
+            mock_get.return_value = goals
+            mock_fetch.side_effect = lambda key, target: values[key]
+            mock_log.return_value = [{"id": "p1"}, None]
+            result = await run_auto_updates("2026-04-01")
+            mock_log.assert_called_once()
+            batch = mock_log.call_args[0][0]
+            assert [(u["goal_id"], u["source"]) for u in batch] == [("g1", "garmin"), ("g3", "weight")]
+            assert all(u["log_date"] == "2026-04-01" for u in batch)
+            assert result["updated"] == 1
+            assert result["skipped"] == 2
+
     @pytest.mark.asyncio
     async def test_auto_updates_skips_null_values(self):
         from domains.accountability.auto_sources import run_auto_updates
@@ -156,7 +179,7 @@ class TestRunAutoUpdates:
         }
         with patch("domains.accountability.service.get_goals", new_callable=AsyncMock) as mock_get, \
              patch("domains.accountability.auto_sources.fetch_auto_value", new_callable=AsyncMock) as mock_fetch, \
-             patch("domains.accountability.service.log_progress", new_callable=AsyncMock) as mock_log:
+             patch("domains.accountability.service.log_progress_many", new_callable=AsyncMock) as mock_log:
             mock_get.return_value = [mock_goal]
             mock_fetch.return_value = None  # No data available
             result = await run_auto_updates()
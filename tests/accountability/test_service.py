@@ -404,6 +404,60 @@ class TestLogProgress:
     @pytest.mark.asyncio
     async def test_log_progress_manual(self):
         from domains.accountability.service import log_progress
+        entry = {"id": "prog-001", "goal_id": "goal-steps-001", "value": 12000, "source": "manual"}
+        mock_rpc_resp = MagicMock()
+        mock_rpc_resp.status_code = 200
+        mock_rpc_resp.json.return_value = [
+            {"goal_id": "goal-steps-001", "entry": entry, "milestones_reached": []}
+        ]
+
+        with patch("domains.accountability.service.httpx.AsyncClient") as mock_client:
+            client = AsyncMock()
+            client.post = AsyncMock(return_value=mock_rpc_resp)
+            mock_client.return_value.__aenter__.return_value = client
+
+            result = await log_progress("goal-steps-001", 12000, source="manual", note="Great day!")
+            assert result == entry
+            # One RPC call replaces the read / write / goal / milestone round-trips
+            client.post.assert_called_once()
+            url = client.post.call_args[0][0]
+            assert url.endswith("/rest/v1/rpc/accountability_log_progress")
+            sent = client.post.call_args[1]["json"]["entries"]
+            assert sent[0]["goal_id"] == "goal-steps-001"
+            assert sent[0]["note"] == "Great day!"
+            assert sent[0]["date"]
+
+    @pytest.mark.asyncio
+    async def test_log_progress_many_keeps_order_and_failures(self):
+        from domains.accountability.service import log_progress_many
+        mock_rpc_resp = MagicMock()
+        mock_rpc_resp.status_code = 200
+        mock_rpc_resp.json.return_value = [
+            {"goal_id": "g1", "entry": {"id": "p1"}, "milestones_reached": [{"title": "5k"}]},
+            {"goal_id": "g2", "error": "goal not found"},
+        ]
+
+        with patch("domains.accountability.service.httpx.AsyncClient") as mock_client:
+            client = AsyncMock()
+            client.post = AsyncMock(return_value=mock_rpc_resp)
+            mock_client.return_value.__aenter__.return_value = client
+
+            result = await log_progress_many([
+                {"goal_id": "g1", "value": 5000, "source": "garmin", "log_date": "2026-04-01"},
+                {"goal_id": "g2", "value": 3},
+            ])
+            assert result == [{"id": "p1"}, None]
+            client.post.assert_called_once()
+            sent = client.post.call_args[1]["json"]["entries"]
+            assert [e["source"] for e in sent] == ["garmin", "manual"]
+            assert sent[0]["date"] == "2026-04-01"
+
+    @pytest.mark.asyncio
+    async def test_log_progress_falls_back_without_rpc(self):
+        from domains.accountability.service import log_progress
+        mock_missing_rpc = MagicMock()
+        mock_missing_rpc.status_code = 404
+
         mock_post_resp = MagicMock()
         mock_post_resp.status_code = 201
         mock_post_resp.json.return_value = [{"id": "prog-001", "value": 12000, "source": "manual"}]
@@ -427,12 +481,12 @@ class TestLogProgress:
             client = AsyncMock()
             # Return different responses for different calls
             client.get = AsyncMock(side_effect=[mock_get_resp, mock_goal_resp, mock_milestones_resp])
-            client.post = AsyncMock(return_value=mock_post_resp)
+            client.post = AsyncMock(side_effect=[mock_missing_rpc, mock_post_resp])
             client.patch = AsyncMock(return_value=mock_patch_resp)
             mock_client.return_value.__aenter__.return_value = client
 
             result = await log_progress("goal-steps-001", 12000, source="manual", note="Great day!")
-            assert result is not None
+            assert result == {"id": "prog-001", "value": 12000, "source": "manual"}
 
 
 class TestCheckMilestones:
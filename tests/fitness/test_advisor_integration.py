@@ -79,14 +79,6 @@ MOCK_GARMIN_ROWS = [
 ]
 
 
-def _mock_httpx_response(json_data, status_code=200):
-    resp = Mock()
-    resp.json.return_value = json_data
-    resp.status_code = status_code
-    resp.raise_for_status = Mock()
-    return resp
-
-
 def _mock_trend():
     from domains.fitness.trend import TrendResult
     return TrendResult(
@@ -135,23 +127,16 @@ class TestBuildSnapshot:
                 _MockSession(2, "pull"),
                 _MockSession(3, "legs"),
             ]),
-            patch("httpx.AsyncClient") as mock_httpx_cls,
+            patch("domains.fitness.service.fetch_live_steps", new_callable=AsyncMock, return_value=None),
+            patch("domains.fitness.service.fetch_recovery_history", new_callable=AsyncMock, return_value=MOCK_GARMIN_ROWS),
+            patch("domains.fitness.service.fetch_mobility_dates", new_callable=AsyncMock, return_value={
+                "2026-05-01", "2026-04-30", "2026-04-29",
+            }),
+            patch("domains.fitness.service.fetch_nutrition_logs", new_callable=AsyncMock, return_value=[
+                {"logged_at": "2026-04-28T12:00:00", "calories": 2300, "protein_g": 140},
+                {"logged_at": "2026-04-29T12:00:00", "calories": 2100, "protein_g": 150},
+            ]),
         ):
-            mock_client = AsyncMock()
-            mock_client.get = AsyncMock(side_effect=[
-                _mock_httpx_response(MOCK_GARMIN_ROWS),
-                _mock_httpx_response([
-                    {"session_date": "2026-05-01"},
-                    {"session_date": "2026-04-30"},
-                    {"session_date": "2026-04-29"},
-                ]),
-                _mock_httpx_response([
-                    {"logged_at": "2026-04-28T12:00:00", "calories": 2300, "protein_g": 140},
-                    {"logged_at": "2026-04-29T12:00:00", "calories": 2100, "protein_g": 150},
-                ]),
-            ])
-            mock_httpx_cls.return_value.__aenter__.return_value = mock_client
-
             snap = await build_snapshot()
 
             assert snap.programme_active is True
@@ -340,8 +325,16 @@ class TestGarminHrvSync:
     via daily_summary_records() — keyed to each metric's true calendar date —
     and bulk-upserts on (user_id,date) so late-syncing nights self-heal."""
 
+    @pytest.fixture(autouse=True)
+    def health_cache_file(self, tmp_path, monkeypatch):
+        """Keep the sync's cache writes off the repo's data/health_daily.npz."""
+        from domains.nutrition.services import health_timeseries as ht
+        monkeypatch.setattr(ht, "CACHE_FILE", tmp_path / "health.npz")
+        monkeypatch.setattr(ht, "_cache", None)
+        return tmp_path / "health.npz"
+
     @pytest.mark.asyncio
-    async def test_sync_bulk_upserts_records(self):
+    async def test_sync_bulk_upserts_records(self, health_cache_file):
         """_sync_garmin_to_supabase posts whatever daily_summary_records returns."""
         records = [
             {
@@ -386,6 +379,8 @@ class TestGarminHrvSync:
                     assert "on_conflict=user_id,date" in url
                     headers = call_args.kwargs.get("headers", {})
                     assert "merge-duplicates" in headers.get("Prefer", "")
+                    # The synced days went to the test's cache file
+                    assert health_cache_file.exists()
 
     @pytest.mark.asyncio
     async def test_sync_noop_when_no_records(self):
@@ -0,0 +1,77 @@
+"""Tests for the per-request fitness fetch memoiser."""
+import asyncio
+
+import pytest
+
+from domains.fitness.loader import load_scope, memo
+
+
+def _counting_fetcher(delay: float = 0.01):
+    calls = []
+
+    async def fetch(*args):
+        calls.append(args)
+        await asyncio.sleep(delay)
+        return {"args": args}
+
+    return fetch, calls
+
+
+@pytest.mark.asyncio
+async def test_no_scope_does_not_cache():
+    fetch, calls = _counting_fetcher()
+    await memo(fetch, 30)
+    await memo(fetch, 30)
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_consumers_share_one_fetch():
+    fetch, calls = _counting_fetcher()
+    async with load_scope():
+        a, b, c = await asyncio.gather(memo(fetch, 30), memo(fetch, 30), memo(fetch, 7))
+        again = await memo(fetch, 30)
+    assert a is b is again
+    assert c == {"args": (7,)}
+    assert calls == [(30,), (7,)]
+
+
+@pytest.mark.asyncio
+async def test_nested_scope_joins_outer():
+    fetch, calls = _counting_fetcher()
+
+    async def consumer():
+        async with load_scope():
+            return await memo(fetch)
+
+    async with load_scope():
+        await asyncio.gather(consumer(), consumer(), memo(fetch))
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_scope_ends_with_request():
+    fetch, calls = _counting_fetcher()
+    async with load_scope():
+        await memo(fetch)
+    async with load_scope():
+        await memo(fetch)
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_unawaited_fetches_cancelled_on_exit():
+    cancelled = asyncio.Event()
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async with load_scope():
+        fetches = asyncio.gather(memo(slow))
+        await asyncio.sleep(0.01)
+        fetches.cancel()  # e.g. build_snapshot() bailing out with no programme
+    await asyncio.wait_for(cancelled.wait(), 1)
@@ -0,0 +1,183 @@
+"""Tests for the batched ai_api_usage audit writer."""
+
+import json
+import os
+import time
+
+import httpx
+import pytest
+
+from domains.api_usage import audit_log
+from domains.api_usage.audit_log import _AuditWriter
+
+
+class _FakePost:
+    def __init__(self):
+        self.batches = []
+        self.down = False
+        self.fail_keys: set[str] = set()   # groups with these keys fail (transient)
+        self.reject_tokens: set[int] = set()  # rows with these input_tokens get a 400
+        self.status: int | None = None  # every insert answers this status
+        self.calls = 0
+
+    def __call__(self, rows):
+        self.calls += 1
+        if self.down or self.fail_keys & set(rows[0]):
+            raise ConnectionError("supabase unreachable")
+        status = self.status or (400 if any(r["input_tokens"] in self.reject_tokens for r in rows) else None)
+        if status:
+            req = httpx.Request("POST", "https://example.supabase.co/rest/v1/ai_api_usage")
+            raise httpx.HTTPStatusError(f"{status}", request=req,
+                                        response=httpx.Response(status, request=req))
+        self.batches.append(list(rows))
+
+
+def _journal_tokens(path):
+    return [json.loads(line)["input_tokens"] for line in path.read_text().splitlines()]
+
+
+@pytest.fixture
+def post():
+    return _FakePost()
+
+
+@pytest.fixture
+def writer(post, tmp_path):
+    w = _AuditWriter(post, tmp_path / "journal.jsonl", batch_size=3, flush_seconds=0.05)
+    yield w
+    w.close(timeout=1)
+
+
+def _row(i, **extra):
+    return {"feature": "test", "input_tokens": i, **extra}
+
+
+def test_flushes_in_batches(writer, post):
+    for i in range(7):
+        writer.submit(_row(i))
+    deadline = time.monotonic() + 2
+    while writer.stats["written"] < 7 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert [len(b) for b in post.batches] == [3, 3, 1]
+    m = writer.metrics()
+    assert m["queue_depth"] == 0
+    assert m["written"] == 7 and m["flushes"] == 3
+    assert m["last_flush_ms"] is not None
+
+
+def test_groups_rows_by_key_set(writer, post):
+    writer._flush([_row(1), _row(2, error="boom"), _row(3)])
+    assert sorted(len(b) for b in post.batches) == [1, 2]
+    assert all(len({frozenset(r) for r in b}) == 1 for b in post.batches)
+
+
+def test_spills_then_replays(writer, post):
+    post.down = True
+    writer._flush([_row(1), _row(2)])
+    writer._flush([_row(3)])
+    assert writer.stats["spilled"] == 3
+    assert writer.metrics()["journal_pending"] == 3
+
+    # Still down: rows stay journalled, not double-counted
+    assert writer.replay_journal() == 0
+    assert writer.metrics()["journal_pending"] == 3
+    assert writer.stats["spilled"] == 3
+
+    post.down = False
+    assert writer.replay_journal() == 3
+    assert not writer.journal.exists()
+    assert [r["input_tokens"] for b in post.batches for r in b] == [1, 2, 3]
+    assert writer.stats["replayed"] == 3
+
+
+def test_spills_only_unwritten_groups(writer, post):
+    post.fail_keys = {"error"}
+    writer._flush([_row(1), _row(2, error="boom"), _row(3)])
+    assert [r["input_tokens"] for b in post.batches for r in b] == [1, 3]
+    assert _journal_tokens(writer.journal) == [2]
+    assert writer.stats["written"] == 2 and writer.stats["spilled"] == 1
+
+    post.fail_keys = set()
+    assert writer.replay_journal() == 1
+    assert [r["input_tokens"] for b in post.batches for r in b] == [1, 3, 2]
+
+
+def test_rejected_rows_are_quarantined(writer, post):
+    post.reject_tokens = {2}
+    writer._flush([_row(1), _row(2), _row(3)])
+    assert [r["input_tokens"] for b in post.batches for r in b] == [1, 3]
+    assert _journal_tokens(writer.rejected) == [2]
+    assert not writer.journal.exists()
+    assert writer.stats["quarantined"] == 1 and writer.stats["written"] == 2
+
+
+def test_rejected_row_does_not_block_replay(writer, post):
+    post.down = True
+    writer._flush([_row(1), _row(2), _row(3)])
+    writer._flush([_row(4)])
+    post.down = False
+    post.reject_tokens = {1}
+    assert writer.replay_journal() == 3
+    assert not writer.journal.exists()
+    assert _journal_tokens(writer.rejected) == [1]
+
+
+def test_auth_failure_is_retried_not_quarantined(writer, post):
+    post.status = 401  # e.g. a rotated service key
+    writer._flush([_row(1), _row(2), _row(3, error="x")])
+    assert post.calls == 1  # no per-row bisecting, no hammering the other group
+    assert _journal_tokens(writer.journal) == [1, 2, 3]
+    assert writer.stats["quarantined"] == 0 and not writer.rejected.exists()
+
+    # Backing off: the next batch goes straight to the journal
+    writer._flush([_row(4)])
+    assert post.calls == 1 and writer.metrics()["journal_pending"] == 4
+
+    post.status = None
+    assert writer.replay_journal() == 4
+
+
+def test_replays_orphaned_claims(writer, post):
+    orphan = writer.journal.with_name(f"{writer.journal.stem}.replay-99999")
+    orphan.write_text(json.dumps(_row(1)) + "\n")
+    fresh = writer.journal.with_name(f"{writer.journal.stem}.replay-88888")
+    fresh.write_text(json.dumps(_row(2)) + "\n")
+    stale = time.time() - audit_log.ORPHAN_SECONDS - 60
+    os.utime(orphan, (stale, stale))
+
+    # No journal, but the stale claim counts as backlog; a fresh one may
+    # still belong to a live replay and is left alone
+    assert writer._has_backlog()
+    assert writer.replay_journal() == 1
+    assert not orphan.exists() and fresh.exists()
+    assert [r["input_tokens"] for b in post.batches for r in b] == [1]
+
+
+def test_full_queue_drops_without_blocking(post, tmp_path):
+    w = _AuditWriter(post, tmp_path / "j.jsonl", max_queue=2)
+    w._thread = object()  # don't start the writer; let the queue fill
+    for i in range(5):
+        w.submit(_row(i))
+    assert w.stats["enqueued"] == 2
+    assert w.stats["dropped"] == 3
+
+
+def test_close_flushes_pending(post, tmp_path):
+    w = _AuditWriter(post, tmp_path / "j.jsonl", batch_size=100, flush_seconds=60)
+    w._q.put_nowait(_row(1))
+    w.close()
+    assert post.batches == [[_row(1)]]
+
+
+def test_log_ai_usage_enqueues(monkeypatch, post, tmp_path):
+    w = _AuditWriter(post, tmp_path / "j.jsonl")
+    monkeypatch.setattr(audit_log, "_SUPABASE_URL", "https://example.supabase.co")
+    monkeypatch.setattr(audit_log, "_SERVICE_KEY", "key")
+    monkeypatch.setattr(audit_log, "_get_writer", lambda: w)
+    monkeypatch.setattr(w, "_start", lambda: None)
+    audit_log.log_ai_usage(feature="unit", model="claude-sonnet-4-5",
+                           usage={"input_tokens": 10, "output_tokens": 5})
+    row = w._q.get_nowait()
+    assert row["feature"] == "unit" and row["input_tokens"] == 10
+    assert None not in row.values()
+    json.dumps(row)
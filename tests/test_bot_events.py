@@ -0,0 +1,67 @@
+"""Tests for the Hadley API -> bot event bus."""
+
+import asyncio
+import socket
+
+import pytest
+
+from services import bot_events
+from services.bot_events import EventBus
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture
+async def bus(monkeypatch):
+    port = _free_port()
+    monkeypatch.setattr(bot_events, "EVENTS_URL", f"http://127.0.0.1:{port}/events")
+    bus = EventBus(port=port)
+    yield bus
+    await bus.stop()
+
+
+async def test_publish_delivers_to_subscribers(bus):
+    received = asyncio.Queue()
+
+    async def handler(payload):
+        await received.put(payload)
+
+    bus.subscribe(bot_events.SKILL_RUN, handler)
+    assert await bus.start()
+    assert bus.poll_interval(10) == bot_events.RECONCILE_SECONDS
+
+    assert await bot_events.publish(bot_events.SKILL_RUN, {"skill": "news", "channel": "#peterbot"})
+    payload = await asyncio.wait_for(received.get(), timeout=2)
+    assert payload == {"skill": "news", "channel": "#peterbot"}
+
+    # Events nobody subscribes to are still accepted
+    assert await bot_events.publish("unknown.event")
+
+
+async def test_publish_reports_undelivered(bus):
+    assert not bus.running
+    assert bus.poll_interval(10) == 10
+    assert not await bot_events.publish(bot_events.SCHEDULE_RELOAD, {"reason": "test"})
+    assert not await asyncio.to_thread(bot_events.publish_sync, bot_events.SCHEDULE_RELOAD)
+
+
+async def test_handler_errors_are_contained(bus):
+    calls = []
+
+    async def broken(payload):
+        raise RuntimeError("boom")
+
+    async def ok(payload):
+        calls.append(payload)
+
+    bus.subscribe(bot_events.SCHEDULE_RELOAD, broken)
+    bus.subscribe(bot_events.SCHEDULE_RELOAD, ok)
+    assert bus.dispatch(bot_events.SCHEDULE_RELOAD, {"reason": "x"}) == 2
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert calls == [{"reason": "x"}]
+
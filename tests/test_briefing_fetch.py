@@ -0,0 +1,110 @@
+"""Tests for the morning briefing fetch engine (jobs/briefing_fetch.py)."""
+
+import asyncio
+
+import httpx
+
+from jobs.briefing_fetch import BriefingFetcher, BriefingSource, BudgetTransport, SearchCache
+
+
+async def test_transport_caps_concurrency_and_spaces_hosts():
+    in_flight = 0
+    peak = 0
+    starts: dict[str, list[float]] = {}
+    loop = asyncio.get_running_loop()
+
+    class SlowTransport(httpx.AsyncBaseTransport):
+        async def handle_async_request(self, request):
+            nonlocal in_flight, peak
+            starts.setdefault(request.url.host, []).append(loop.time())
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.02)
+            in_flight -= 1
+            return httpx.Response(200, json={})
+
+    transport = BudgetTransport(SlowTransport(), max_concurrency=3,
+                                host_intervals={"www.reddit.com": 0.05})
+    async with httpx.AsyncClient(transport=transport) as client:
+        await asyncio.gather(
+            *(client.get(f"https://api.x.ai/{i}") for i in range(8)),
+            *(client.get(f"https://www.reddit.com/r/{i}") for i in range(4)),
+        )
+
+    assert peak <= 3
+    reddit = sorted(starts["www.reddit.com"])
+    assert len(reddit) == 4
+    assert all(b - a >= 0.045 for a, b in zip(reddit, reddit[1:]))
+
+
+async def test_fetch_caches_dedups_and_survives_failures(tmp_path):
+    calls = {"x": 0, "web": 0}
+
+    async def search_x(client):
+        calls["x"] += 1
+        return [{"url": "https://x.com/a/status/1"}, {"url": "https://x.com/b/status/2"}]
+
+    async def search_x_dup(client):
+        return [{"url": "https://x.com/b/status/2"}, {"url": "https://x.com/c/status/3"}]
+
+    async def search_web(client):
+        calls["web"] += 1
+        return []
+
+    async def search_reddit(client):
+        raise RuntimeError("reddit down")
+
+    async def search_slow(client):
+        await asyncio.sleep(5)
+        return [{"url": "https://never.example"}]
+
+    sources = [
+        BriefingSource("x", "x|one", search_x),
+        BriefingSource("x", "x|two", search_x_dup),
+        BriefingSource("web", "web|one", search_web),
+        BriefingSource("reddit", "reddit|one", search_reddit),
+        BriefingSource("web", "web|slow", search_slow, deadline=0.05),
+    ]
+    fetcher = BriefingFetcher(cache=SearchCache(tmp_path / "cache.db"))
+    results = await fetcher.fetch(sources, grace=None)
+
+    assert [i["url"] for i in results["x"]] == [
+        "https://x.com/a/status/1", "https://x.com/b/status/2", "https://x.com/c/status/3",
+    ]
+    assert results["reddit"] == []
+    assert results["web"] == []
+
+    # A re-run reuses non-empty results and only repeats the empty search
+    await fetcher.fetch(sources, grace=None)
+    assert calls == {"x": 1, "web": 2}
+
+
+async def test_stream_stops_after_quorum_and_grace(tmp_path):
+    release = asyncio.Event()
+
+    async def fast(client):
+        return [{"url": "https://example.com/fast"}]
+
+    async def straggler(client):
+        await release.wait()
+        return [{"url": "https://example.com/late"}]
+
+    sources = [
+        BriefingSource("x", "x|fast", fast),
+        BriefingSource("web", "web|fast", fast),
+        BriefingSource("reddit", "reddit|fast", fast),
+        BriefingSource("web", "web|late", straggler),
+    ]
+    cache = SearchCache(tmp_path / "cache.db")
+    fetcher = BriefingFetcher(cache=cache)
+
+    got = [source.key async for source, _ in fetcher.stream(sources, grace=0.05)]
+    assert sorted(got) == ["reddit|fast", "web|fast", "x|fast"]
+
+    # The straggler finishes in the background and lands in the cache
+    release.set()
+    for _ in range(50):
+        if cache.get("web|late"):
+            break
+        await asyncio.sleep(0.01)
+    assert cache.get("web|late") == [{"url": "https://example.com/late"}]
@@ -0,0 +1,162 @@
+"""Tests for the incremental appliance event detector."""
+
+import random
+import statistics
+
+import numpy as np
+import pytest
+
+from domains.energy import events
+from domains.energy.events import EventDetector, _WindowQuantile
+
+T0 = 1_780_000_000.0
+
+
+@pytest.fixture(autouse=True)
+def _no_dispatches(monkeypatch):
+    monkeypatch.setattr(events, "_dispatches", lambda: {"planned": [], "completed": []})
+
+
+def _series(profile):
+    """[(n_samples, watts), ...] -> (epochs, demands) on a 10s grid."""
+    demands = np.concatenate([np.full(n, float(w)) for n, w in profile])
+    return T0 + 10 * np.arange(len(demands)), demands
+
+
+class TestWindowQuantile:
+    def test_matches_statistics_quantiles(self):
+        rng = random.Random(7)
+        q = _WindowQuantile(window_s=600)
+        values = []
+        for i in range(500):
+            v = rng.uniform(100, 5000)
+            q.add(T0 + 10 * i, v)
+            values.append(v)
+            window = values[-61:]  # 600s window at 10s spacing, inclusive
+            if len(window) >= 2:
+                assert q.value() == pytest.approx(statistics.quantiles(window, n=10)[0])
+
+    def test_evicts_old_values(self):
+        q = _WindowQuantile(window_s=100)
+        for i in range(50):
+            q.add(T0 + 10 * i, 5000.0 if i < 25 else 100.0)
+        assert q.value() == 100.0
+        assert len(q) == 11
+
+
+class TestEventDetector:
+    def test_kettle_detected_when_it_closes(self):
+        det = EventDetector()
+        epochs, demands = _series([(60, 300), (18, 2700), (10, 300)])
+        closed = det.feed(epochs, demands)
+        assert len(closed) == 1
+        ev = closed[0]
+        assert ev["event_type"] == "kettle"
+        assert ev["detail"]["duration_s"] == 180
+        assert ev["detail"]["window_clipped"] is False
+        assert ev["energy_kwh"] == pytest.approx(2.4 * 180 / 3600, abs=0.01)
+        assert det.open is None
+
+    def test_event_spans_feeds(self):
+        det = EventDetector()
+        epochs, demands = _series([(60, 300), (120, 2500), (10, 300)])
+        assert det.feed(epochs[:100], demands[:100]) == []
+        assert det.ongoing()["detail"]["ongoing"] is True
+        closed = det.feed(epochs[100:], demands[100:])
+        assert [e["event_type"] for e in closed] == ["oven_or_heater"]
+        assert closed[0]["detail"]["duration_s"] == 1200
+
+    def test_replayed_samples_ignored(self):
+        det = EventDetector()
+        epochs, demands = _series([(60, 300), (18, 2700), (10, 300)])
+        det.feed(epochs, demands)
+        assert det.feed(epochs, demands) == []
+
+    def test_long_ev_charge_not_closed_by_rising_baseline(self):
+        det = EventDetector()
+        # 3h at 7.2kW: the rolling p10 climbs onto the load after ~2h, but the
+        # open event keeps the baseline it opened with
+        epochs, demands = _series([(60, 300), (1080, 7500), (10, 300)])
+        closed = det.feed(epochs, demands)
+        assert len(closed) == 1
+        assert closed[0]["event_type"] == "ev_charge"
+        assert closed[0]["detail"]["duration_s"] == 10800
+
+    def test_no_events_before_baseline_warm(self):
+        det = EventDetector()
+        epochs, demands = _series([(5, 300), (20, 3000), (10, 300)])
+        assert det.feed(epochs, demands) == []
+
+    def test_state_round_trip(self):
+        det = EventDetector()
+        epochs, demands = _series([(60, 300), (60, 2500), (10, 300)])
+        det.feed(epochs[:90], demands[:90])
+        history = np.zeros(90, dtype=[("epoch", "f8"), ("demand_w", "f8")])
+        history["epoch"], history["demand_w"] = epochs[:90], demands[:90]
+
+        restored = EventDetector.from_state(det.to_state(), history)
+        closed = restored.feed(epochs[90:], demands[90:])
+        assert len(closed) == 1
+        assert closed[0]["detail"]["duration_s"] == 600
+
+
+class TestSustainedAlert:
+    def test_alerts_once_per_repeat_window(self, monkeypatch):
+        posts = []
+        monkeypatch.setattr(events.httpx, "post", lambda *a, **k: posts.append(k["json"]))
+        monkeypatch.setattr(events, "_lounge_occupied", lambda: True)
+        det = EventDetector()
+        epochs, demands = _series([(60, 300), (600, 2000)])
+        for i in range(0, len(epochs), 3):
+            det.feed(epochs[i:i + 3], demands[i:i + 3])
+            events._maybe_alert_sustained(det)
+        assert len(posts) == 1
+        assert "Sustained electrical load" in posts[0]["message"]
+
+
+class TestScanStoreRetry:
+    def test_unstored_events_survive_and_retry(self, monkeypatch, tmp_path):
+        epochs, demands = _series([(60, 300), (18, 2700), (10, 300)])
+        samples = np.zeros(len(epochs), dtype=[("epoch", "f8"), ("demand_w", "f8")])
+        samples["epoch"], samples["demand_w"] = epochs, demands
+
+        class Ring:
+            def range(self, start, end=float("inf")):
+                return samples[(samples["epoch"] >= start) & (samples["epoch"] < end)]
+
+        class Resp:
+            def __init__(self, status, body=None):
+                self.status_code, self._body = status, body
+
+            def json(self):
+                return self._body
+
+        post_status = [503]
+        posted = []
+
+        def fake_post(url, **kw):
+            posted.append(kw["json"])
+            return Resp(post_status[0])
+
+        monkeypatch.setattr(events, "get_ring", lambda: Ring())
+        monkeypatch.setattr(events, "STATE_PATH", tmp_path / "state.json")
+        monkeypatch.setattr(events.httpx, "get", lambda *a, **k: Resp(200, []))
+        monkeypatch.setattr(events.httpx, "post", fake_post)
+        det = EventDetector()
+        det.last_epoch = det.history_start = T0 - 10
+        monkeypatch.setattr(events, "_detector", det)
+
+        first = events.scan_once()
+        assert first["events_closed"] == 1
+        assert first["events_stored"] == 0
+        assert first["events_pending"] == 1
+
+        # A restart restores the unstored event from the state file
+        monkeypatch.setattr(events, "_detector", None)
+        post_status[0] = 201
+        second = events.scan_once()
+        assert second["samples"] == 0
+        assert second["events_stored"] == 1
+        assert second["events_pending"] == 0
+        assert posted[0]["event_type"] == posted[1]["event_type"] == "kettle"
+        assert posted[0]["started_at"] == posted[1]["started_at"]
@@ -0,0 +1,145 @@
+"""Tests for the financial-data MCP local SQLite mirror."""
+
+from datetime import date, timedelta
+
+import pytest
+
+from mcp_servers.financial_data import local_store, personal_finance
+from mcp_servers.financial_data.local_store import FinanceMirror
+
+
+def _day(days_ago: int) -> str:
+    return (date.today() - timedelta(days=days_ago)).isoformat()
+
+
+class _FakeFinance:
+    def __init__(self, txns, cats):
+        self.txns = txns
+        self.cats = cats
+        self.queries = []
+        self.rpcs = []
+
+    async def query(self, table, params=None, *, paginate=False):
+        self.queries.append((table, dict(params or {})))
+        if table == "categories":
+            return list(self.cats)
+        since = (params or {}).get("date", "gte.0000")[4:]
+        return [t for t in self.txns if t["date"] >= since]
+
+    async def count(self, table, params=None):
+        return len(self.txns)
+
+    async def rpc(self, fn, body=None):
+        self.rpcs.append((fn, body))
+        return [{"category_name": "Groceries", "total_amount": 100.0}]
+
+
+@pytest.fixture
+def remote(monkeypatch):
+    fake = _FakeFinance(
+        txns=[
+            {"id": "t1", "date": _day(400), "description": "Netflix", "amount": -10.99, "category_id": "c1"},
+            {"id": "t2", "date": _day(10), "description": "Netflix", "amount": -10.99, "category_id": "c1"},
+            {"id": "t3", "date": _day(5), "description": "Salary", "amount": 3000.0, "category_id": "c2"},
+        ],
+        cats=[
+            {"id": "c1", "name": "Subscriptions", "exclude_from_totals": False},
+            {"id": "c2", "name": "Transfers", "exclude_from_totals": True},
+        ],
+    )
+    monkeypatch.setattr(local_store, "finance_query", fake.query)
+    monkeypatch.setattr(local_store, "finance_count", fake.count)
+    monkeypatch.setattr(local_store, "finance_rpc", fake.rpc)
+    return fake
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    return FinanceMirror(tmp_path / "finance.db")
+
+
+async def test_first_sync_is_full_then_recent_window(mirror, remote):
+    await mirror.sync()
+    assert "date" not in remote.queries[1][1]
+    assert len(mirror.outgoing(_day(500))) == 2
+    assert mirror.excluded_category_ids() == ["c2"]
+
+    remote.queries.clear()
+    await mirror.sync()  # within SYNC_SECONDS: no round-trips
+    assert remote.queries == []
+
+    remote.txns.append({"id": "t4", "date": _day(1), "description": "Tesco", "amount": -40.0,
+                        "category_id": None})
+    mirror._checked_at = 0
+    await mirror.sync()
+    txn_queries = [p for t, p in remote.queries if t == "transactions"]
+    assert txn_queries == [{"select": local_store._TXN_SELECT, "order": "date.asc,id.asc",
+                            "date": f"gte.{_day(local_store.RECENT_DAYS)}"}]
+    assert [t["description"] for t in mirror.outgoing(_day(3))] == ["Tesco"]
+
+
+async def test_count_mismatch_triggers_full_reload(mirror, remote):
+    await mirror.sync()
+    del remote.txns[0]  # an old row deleted upstream
+    mirror._checked_at = 0
+    await mirror.sync()
+    assert len([t for t, _ in remote.queries if t == "transactions"]) == 3
+    assert len(mirror.outgoing(_day(500))) == 1
+
+
+async def test_rpc_memoised_until_data_changes(mirror, remote):
+    await mirror.sync()
+    body = {"start_date": "2026-01-01", "end_date": "2026-01-31", "excluded_ids": ["c2"]}
+    await mirror.rpc("get_spending_by_category", body)
+    assert await mirror.rpc("get_spending_by_category", body) == [
+        {"category_name": "Groceries", "total_amount": 100.0}]
+    assert len(remote.rpcs) == 1
+
+    remote.txns[1]["amount"] = -12.99  # recategorised/edited recent row
+    mirror._checked_at = 0
+    await mirror.sync()
+    await mirror.rpc("get_spending_by_category", body)
+    assert len(remote.rpcs) == 2
+
+
+async def test_unchanged_sync_keeps_version(mirror, remote):
+    await mirror.sync()
+    version = mirror.version
+    mirror._checked_at = 0
+    await mirror.sync()
+    assert mirror.version == version
+
+
+async def test_stale_data_used_when_supabase_down(mirror, remote, monkeypatch):
+    await mirror.sync()
+
+    async def down(*a, **k):
+        raise ConnectionError("offline")
+
+    monkeypatch.setattr(local_store, "finance_count", down)
+    mirror._checked_at = 0
+    await mirror.sync()
+    assert len(mirror.outgoing(_day(500))) == 2
+
+
+async def test_never_synced_mirror_raises(mirror, monkeypatch):
+    async def down(*a, **k):
+        raise ConnectionError("offline")
+
+    monkeypatch.setattr(local_store, "finance_query", down)
+    monkeypatch.setattr(local_store, "finance_count", down)
+    with pytest.raises(ConnectionError):
+        await mirror.sync()
+
+
+async def test_find_recurring_reads_mirror(mirror, remote, monkeypatch):
+    remote.txns.append({"id": "t5", "date": _day(40), "description": "Netflix", "amount": -10.99,
+                        "category_id": "c1"})
+
+    async def synced():
+        await mirror.sync()
+        return mirror
+
+    monkeypatch.setattr(personal_finance, "synced_mirror", synced)
+    out = await personal_finance.find_recurring(min_occurrences=2, months=6)
+    assert "Netflix" in out and "| 2 |" in out
@@ -0,0 +1,87 @@
+"""Tests for history-guided flight date-pair planning."""
+
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from services.flight_planner import plan_pairs
+
+NOW = datetime(2026, 10, 18, 9, 0)
+PAIRS = [("2026-11-06", "2026-11-20"), ("2026-11-13", "2026-11-27"),
+         ("2026-11-20", "2026-12-04"), ("2026-11-27", "2026-12-11")]
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("""CREATE TABLE price_checks (
+        route_id INTEGER, outbound_date TEXT, return_date TEXT, price_pp REAL,
+        source TEXT, price_level TEXT, checked_at TEXT)""")
+    conn.execute("""CREATE TABLE empty_checks (
+        route_id INTEGER, outbound_date TEXT, return_date TEXT, misses INTEGER, last_checked TEXT)""")
+    return conn
+
+
+def _check(conn, pair, price, days_ago, level=None, route_id=1):
+    conn.execute("INSERT INTO price_checks VALUES (?, ?, ?, ?, 'serpapi', ?, ?)",
+                 (route_id, pair[0], pair[1], price, level,
+                  (NOW - timedelta(days=days_ago)).isoformat()))
+
+
+def test_unchecked_pairs_come_first(conn):
+    _check(conn, PAIRS[0], 900, days_ago=10, level="typical")
+    plans = plan_pairs(conn, [1], PAIRS, budget=2, now=NOW)
+    selected = [(p.outbound, p.checks) for p in plans if p.selected]
+    assert selected == [("2026-11-13", 0), ("2026-11-20", 0)]
+
+
+def test_empty_checks_age_like_priced_ones(conn):
+    conn.execute("INSERT INTO empty_checks VALUES (1, ?, ?, 3, ?)",
+                 (*PAIRS[0], (NOW - timedelta(days=1)).isoformat()))
+    _check(conn, PAIRS[1], 900, days_ago=10, level="typical")
+    plans = {p.outbound: p for p in plan_pairs(conn, [1], PAIRS, budget=3, now=NOW)}
+    # The no-flights pair isn't "never checked": it waits out its interval
+    # and leaves the budget to the stale priced pair
+    assert plans["2026-11-06"].misses == 3 and not plans["2026-11-06"].due
+    assert not plans["2026-11-06"].selected
+    assert plans["2026-11-13"].selected
+
+    later = {p.outbound: p for p in plan_pairs(conn, [1], PAIRS, budget=None, now=NOW + timedelta(days=3))}
+    assert later["2026-11-06"].due
+
+
+def test_stable_expensive_pairs_rechecked_rarely(conn):
+    for pair, price in zip(PAIRS, (700, 800, 900, 1000)):
+        for age in (12, 8, 4):
+            _check(conn, pair, price, days_ago=age, level="typical")
+    _check(conn, PAIRS[3], 1000, days_ago=2, level="high")  # stable, expensive
+    plans = {p.outbound: p for p in plan_pairs(conn, [1], PAIRS, budget=None, now=NOW)}
+
+    assert plans["2026-11-27"].interval_days == 7.0
+    assert not plans["2026-11-27"].due
+    assert plans["2026-11-06"].interval_days == 1.0   # cheapest on the route
+    assert plans["2026-11-06"].staleness_days == 4.0
+    assert plans["2026-11-13"].due and plans["2026-11-20"].due
+    # Cheaper pairs outrank equally stale expensive ones
+    ranked = [p.outbound for p in plan_pairs(conn, [1], PAIRS, budget=None, now=NOW) if p.selected]
+    assert ranked == ["2026-11-06", "2026-11-13", "2026-11-20"]
+
+
+def test_volatile_pairs_rechecked_daily(conn):
+    for age, price in ((3, 700), (2, 900), (1.5, 800)):
+        _check(conn, PAIRS[2], price, days_ago=age, level="high")
+    for pair in PAIRS[:2]:
+        _check(conn, pair, 1000, days_ago=1.5, level="high")
+    plans = {p.outbound: p for p in plan_pairs(conn, [1], PAIRS[:3], budget=1, now=NOW)}
+    assert plans["2026-11-20"].volatility > 0.05
+    assert plans["2026-11-20"].interval_days == 1.0
+    assert plans["2026-11-20"].selected
+    assert not plans["2026-11-13"].due
+
+
+def test_budget_spans_routes(conn):
+    plans = plan_pairs(conn, [1, 2], PAIRS, budget=3, now=NOW)
+    assert len(plans) == 8
+    assert sum(p.selected for p in plans) == 3
+    assert plans[0].to_dict()["score"] is None  # never checked
@@ -0,0 +1,152 @@
+"""Tests for the rate-budgeted, resumable flight scan scheduler."""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from services import flight_prices, flight_scan
+from services.flight_scan import RateLimited, TokenBucket, run_scan
+
+
+@pytest.fixture
+def bucket():
+    return TokenBucket(rate=1000, burst=10)
+
+
+async def test_results_in_item_order_with_bounded_concurrency(bucket, tmp_path):
+    running = peak = 0
+
+    async def worker(item):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01 * (item % 3))
+        running -= 1
+        return item * 2
+
+    out = await run_scan(list(range(10)), worker, concurrency=3, bucket=bucket,
+                         checkpoint_dir=tmp_path)
+    assert out == [i * 2 for i in range(10)]
+    assert peak == 3
+
+
+async def test_rate_limited_items_are_retried(bucket, tmp_path):
+    attempts: dict[int, int] = {}
+
+    async def worker(item):
+        attempts[item] = attempts.get(item, 0) + 1
+        if item == 2 and attempts[item] < 3:
+            raise RateLimited(retry_after=0)
+        return item
+
+    out = await run_scan([1, 2, 3], worker, bucket=bucket, checkpoint_dir=tmp_path)
+    assert out == [1, 2, 3]
+    assert attempts[2] == 3
+    assert bucket.stats["throttled"] == 2
+    assert bucket.rate < bucket.base_rate
+
+
+async def test_interrupted_scan_resumes(bucket, tmp_path):
+    calls = []
+
+    async def flaky(item):
+        calls.append(item)
+        if item == "c":
+            raise RuntimeError("boom")
+        return {"item": item}
+
+    out = await run_scan(["a", "b", "c"], flaky, job_id="job", bucket=bucket,
+                         checkpoint_dir=tmp_path)
+    assert out == [{"item": "a"}, {"item": "b"}, None]
+    assert (tmp_path / "job.json").exists()
+
+    calls.clear()
+
+    async def ok(item):
+        calls.append(item)
+        return {"item": item}
+
+    out = await run_scan(["a", "b", "c"], ok, job_id="job", bucket=bucket,
+                         checkpoint_dir=tmp_path)
+    assert calls == ["c"]
+    assert out == [{"item": "a"}, {"item": "b"}, {"item": "c"}]
+    assert not (tmp_path / "job.json").exists()
+
+
+async def test_checkpoint_only_covers_committed_results(bucket, tmp_path, monkeypatch):
+    stored, buffered = [], []
+
+    async def worker(item):
+        if item == "e":
+            raise RuntimeError("boom")
+        buffered.append(item)
+        return item
+
+    def commit():
+        stored.extend(buffered)
+        buffered.clear()
+
+    saves = []
+    real_save = flight_scan._Checkpoint.save
+
+    def checked_save(self):
+        real_save(self)
+        done = {json.loads(k) for k in json.loads((tmp_path / "job.json").read_text())["done"]}
+        assert done <= set(stored)  # nothing marked done before it was stored
+        saves.append(done)
+
+    monkeypatch.setattr(flight_scan._Checkpoint, "save", checked_save)
+    out = await run_scan(list("abcde"), worker, job_id="job", bucket=bucket, checkpoint_dir=tmp_path,
+                         commit=commit, checkpoint_every=2, concurrency=1)
+    assert out == ["a", "b", "c", "d", None]
+    assert saves == [{"a", "b"}, {"a", "b", "c", "d"}]
+    assert stored == ["a", "b", "c", "d"]
+
+
+async def test_bucket_paces_requests():
+    bucket = TokenBucket(rate=50, burst=1)
+    started = time.monotonic()
+    for _ in range(6):
+        await bucket.acquire()
+    assert time.monotonic() - started >= 0.09
+
+
+async def test_check_all_routes_shares_one_scan(tmp_path, monkeypatch):
+    monkeypatch.setattr(flight_prices, "DB_PATH", tmp_path / "flights.db")
+    monkeypatch.setattr(flight_scan, "CHECKPOINT_DIR", tmp_path / "checkpoints")
+    monkeypatch.setattr(flight_scan, "_bucket", TokenBucket(rate=1000, burst=10))
+    monkeypatch.setattr(flight_prices, "WRITE_BATCH", 1)  # checkpoint (and create the dir) per pair
+    seen = []
+    limited = set()
+
+    async def fake_search(api_key, departure_id, arrival_id, outbound_date, return_date, **kw):
+        key = (arrival_id, outbound_date)
+        seen.append(key)
+        if key == ("NRT", "2026-11-06") and key not in limited:
+            limited.add(key)
+            raise RateLimited(0)
+        price = 900 if arrival_id == "NRT" else 800
+        return {"best_flights": [{"price": price, "flights": [{"airline": "JAL"}]}]}
+
+    monkeypatch.setattr(flight_prices, "search_flights", fake_search)
+    monitor = flight_prices.FlightPriceMonitor(api_key="k", config={"routes": [
+        {"from": "LHR", "to": "HND", "label": "London to Haneda"},
+        {"from": "LHR", "to": "NRT", "label": "London to Narita"},
+    ]})
+    pairs = [("2026-11-06", "2026-11-20"), ("2026-11-13", "2026-11-27")]
+    real_checkpoints = flight_scan.REPO_ROOT / "data" / "flight_scan_checkpoints"
+    real_mtime = real_checkpoints.stat().st_mtime if real_checkpoints.exists() else None
+    results = await monitor.check_all_routes(pairs)
+
+    # Checkpoints went to the patched directory, not the repo's data/
+    assert (tmp_path / "checkpoints").is_dir()
+    if real_mtime is not None:
+        assert real_checkpoints.stat().st_mtime == real_mtime
+
+    assert len(seen) == 2 * len(pairs) + 1  # the rate-limited pair is retried, not dropped
+    for data in results.values():
+        assert [r["outbound"] for r in data["results"]] == ["2026-11-06", "2026-11-13"]
+    with flight_prices.get_db() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM price_checks").fetchone()[0] == len(seen) - 1
@@ -0,0 +1,107 @@
+"""Tests for the flight price store: migration, batched writes and pair rollups."""
+
+import json
+import sqlite3
+
+import pytest
+
+from services import flight_prices as fp
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(fp, "DB_PATH", tmp_path / "flights.db")
+    return tmp_path / "flights.db"
+
+
+def _row(price, checked_at, source="serpapi", outbound="2026-11-06", ret="2026-11-20", **kw):
+    return {"route_id": 1, "outbound_date": outbound, "return_date": ret, "price_total": price * 2,
+            "price_pp": price, "airline": "JAL", "source": source, "checked_at": checked_at,
+            "raw": {"flights": [{"price_pp": price}]}, **kw}
+
+
+def test_legacy_db_is_migrated(db):
+    conn = sqlite3.connect(db)
+    conn.executescript("""
+        CREATE TABLE price_checks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, route_id INTEGER NOT NULL,
+            outbound_date TEXT NOT NULL, return_date TEXT NOT NULL, price_total REAL,
+            price_pp REAL, airline TEXT, duration_min INTEGER, departure_time TEXT,
+            arrival_time TEXT, source TEXT DEFAULT 'serpapi', raw_json TEXT,
+            checked_at TEXT NOT NULL);
+        CREATE INDEX idx_checks_route_date ON price_checks(route_id, outbound_date, checked_at DESC);
+    """)
+    raw = json.dumps({"flights": [], "insights": {"price_level": "low"}})
+    conn.executemany(
+        "INSERT INTO price_checks (route_id, outbound_date, return_date, price_pp, source, raw_json, checked_at)"
+        " VALUES (1, '2026-11-06', '2026-11-20', ?, 'serpapi', ?, ?)",
+        [(800, raw, "2026-10-01T09:00"), (700, raw, "2026-10-02T09:00")])
+    conn.commit()
+    conn.close()
+
+    fp.init_db()
+    with fp.get_db() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM price_checks WHERE raw_json IS NOT NULL").fetchone()[0] == 0
+        assert {r["price_level"] for r in conn.execute("SELECT price_level FROM price_checks")} == {"low"}
+        indexes = {r["name"] for r in conn.execute("PRAGMA index_list(price_checks)")}
+        assert "idx_checks_pair" in indexes and "idx_checks_route_date" not in indexes
+        stats = conn.execute("SELECT * FROM pair_stats").fetchone()
+        assert (stats["checks"], stats["min_pp"], stats["last_pp"], stats["prev_pp"]) == (2, 700, 700, 800)
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT price_pp, source FROM price_checks "
+            "WHERE route_id = 1 AND outbound_date = 'x' AND return_date = 'y' ORDER BY checked_at DESC"
+        ).fetchall()
+        assert "COVERING INDEX idx_checks_pair" in " ".join(r[3] for r in plan)
+    assert fp.get_raw_payload(1) == json.loads(raw)
+
+
+def test_rollup_matches_compute_history(db):
+    fp.init_db()
+    rows = [_row(900, "2026-10-01T09:00", "scrape"), _row(650, "2026-10-02T09:00", "serpapi"),
+            _row(880, "2026-10-03T09:00", "scrape")]
+    ids = fp.record_checks(rows)
+    assert len(ids) == 3
+    newest_first = [{"price_pp": r["price_pp"], "source": r["source"]} for r in reversed(rows)]
+    with fp.get_db() as conn:
+        assert fp.pair_history(conn, 1, "2026-11-06", "2026-11-20") == fp.compute_history(newest_first)
+        assert fp.pair_history(conn, 1, "2026-12-01", "2026-12-10") == fp.compute_history([])
+        stats = conn.execute("SELECT median_pp, trend_pct FROM pair_stats").fetchone()
+    assert stats["median_pp"] == 880
+    assert stats["trend_pct"] == 0.0
+    assert fp.get_raw_payload(ids[0]) == rows[0]["raw"]
+
+
+def test_detect_deals_from_rollups(db):
+    monitor = fp.FlightPriceMonitor(api_key="k")
+    route_id = monitor.get_routes()[0]["id"]
+    fp.record_checks([
+        _row(1000, "2026-10-01T09:00", route_id=route_id),
+        _row(1000, "2026-10-02T09:00", route_id=route_id),
+        _row(1000, "2026-10-01T09:00", route_id=route_id, ret="2026-11-24"),
+        _row(700, "2026-10-03T09:00", route_id=route_id),
+        _row(990, "2026-10-01T09:00", route_id=route_id, outbound="2026-11-13", ret="2026-11-27"),
+        _row(985, "2026-10-02T09:00", route_id=route_id, outbound="2026-11-13", ret="2026-11-27"),
+    ])
+    deals = monitor.detect_deals()
+    assert [(d["outbound_date"], d["return_date"], d["deal_type"]) for d in deals] == [
+        ("2026-11-06", "2026-11-20", "price_drop")]
+    assert deals[0]["avg_price_pp"] == 925.0
+    assert deals[0]["min_price_pp"] == 700
+
+
+def test_add_route_returns_existing_id(db):
+    monitor = fp.FlightPriceMonitor(api_key="k")
+    first = monitor.add_route("LHR", "KIX", "London to Osaka")
+    fp.record_checks([_row(500, "2026-10-01T09:00", route_id=first)])
+    assert monitor.add_route("LHR", "KIX", "London to Osaka") == first
+
+
+def test_empty_checks_are_recorded_apart(db):
+    fp.init_db()
+    empty = {"route_id": 1, "outbound_date": "2026-11-06", "return_date": "2026-11-20"}
+    fp.record_empty_checks([{**empty, "checked_at": "2026-10-01T09:00"}])
+    fp.record_empty_checks([{**empty, "checked_at": "2026-10-03T09:00"}])
+    with fp.get_db() as conn:
+        row = conn.execute("SELECT misses, last_checked FROM empty_checks").fetchone()
+        assert tuple(row) == (2, "2026-10-03T09:00")
+        assert conn.execute("SELECT COUNT(*) FROM price_checks").fetchone()[0] == 0
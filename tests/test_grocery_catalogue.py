@@ -0,0 +1,143 @@
+"""Tests for the grocery product catalogue and cache-first shopping-list matching."""
+
+import pytest
+
+from domains.nutrition.services import grocery_service
+from domains.nutrition.services.product_catalogue import (
+    STRONG_MATCH, WEAK_MATCH, ProductCatalogue, match_score, normalise_phrase, parse_quantity, same_head,
+)
+
+PRODUCTS = [
+    {"product_uid": "1", "name": "Sainsbury's British Semi Skimmed Milk 2.27L (4 pint)", "price": 1.65},
+    {"product_uid": "2", "name": "Sainsbury's British Semi Skimmed Milk 1.13L (2 pint)", "price": 1.15},
+    {"product_uid": "3", "name": "Sainsbury's British Free Range Large Eggs x12", "price": 3.50},
+    {"product_uid": "4", "name": "Sainsbury's Aubergine (Eggplant) Each", "price": 0.90},
+    {"product_uid": "5", "name": "Sainsbury's British Chicken Breast Fillets 1kg", "price": 7.50},
+    {"product_uid": "6", "name": "Sainsbury's British Chicken Breast Fillets 500g", "price": 4.20},
+    {"product_uid": "7", "name": "Sainsbury's Milk Chocolate 100g", "price": 1.00},
+    {"product_uid": "8", "name": "Oxo Chicken Stock Cubes x12", "price": 1.20},
+]
+
+
+@pytest.fixture
+def catalogue(tmp_path):
+    cat = ProductCatalogue(tmp_path / "catalogue.db")
+    cat.record_products(PRODUCTS)
+    return cat
+
+
+def test_parse_quantity():
+    assert parse_quantity("500g chicken breast") == (500, "g")
+    assert parse_quantity("Semi Skimmed Milk 2.27L") == (2270, "ml")
+    assert parse_quantity("2 pints milk") == (1136, "ml")
+    assert parse_quantity("12 eggs") == (12, "each")
+    assert parse_quantity("6 x 500g passata") == (500, "g")
+    assert parse_quantity("eggs") is None
+    assert normalise_phrase("500g Chicken Breasts") == normalise_phrase("chicken breast 500 g")
+
+
+def test_match_score_uses_tokens_and_quantity():
+    eggs = {"name": "Free Range Eggs x12"}
+    aubergine = {"name": "Aubergine (Eggplant) Each"}
+    assert match_score("eggs", eggs) >= 0.7
+    assert match_score("eggs", aubergine) < 0.3  # no substring false positive
+    half = {"name": "Chicken Breast Fillets 500g"}
+    kilo = {"name": "Chicken Breast Fillets 1kg"}
+    assert match_score("500g chicken breast", half) > match_score("500g chicken breast", kilo)
+    assert match_score("eggs", {**eggs, "available": False}) < 0.1
+
+
+def test_name_must_not_add_its_own_head():
+    assert same_head("semi skimmed milk", "Sainsbury's British Semi Skimmed Milk 2.27L (4 pint)")
+    assert same_head("chicken breast", "British Chicken Breast Fillets 1kg")
+    assert same_head("baked beans", "Heinz Baked Beans in Tomato Sauce 415g")
+    assert not same_head("milk", "Sainsbury's Milk Chocolate 100g")
+    assert not same_head("chicken", "Oxo Chicken Stock Cubes x12")
+    assert not same_head("basil", "Tomato Sauce with Basil")
+    # Still offered as options, never auto-added
+    for query, name in [("milk", "Sainsbury's Milk Chocolate 100g"), ("chicken", "Oxo Chicken Stock Cubes x12")]:
+        assert WEAK_MATCH <= match_score(query, {"name": name}) < STRONG_MATCH
+
+
+def test_rank_and_lookup(catalogue):
+    ranked = catalogue.rank("500g chicken breast")
+    assert ranked[0][0]["product_uid"] == "6"
+    assert catalogue.rank("milk")[0][0]["product_uid"] in ("1", "2")
+    assert catalogue.lookup("pickled herring") is None
+    # Ranked hits are only candidates: nothing resolves until it's been chosen
+    assert catalogue.lookup("milk") is None
+    assert catalogue.lookup("chicken") is None
+
+    catalogue.record_choice("2 pints milk", "2")
+    product, score = catalogue.lookup("2 Pints Milk")
+    assert (product["product_uid"], score) == ("2", 1.0)
+
+    catalogue.record_products([{**PRODUCTS[1], "available": False}])
+    assert catalogue.lookup("2 pints milk") is None  # back to searching
+
+
+class _FakePage:
+    url = "https://www.sainsburys.co.uk/gol-ui/groceries"
+
+    def close(self):
+        pass
+
+
+class _FakeBrowser:
+    def close(self):
+        pass
+
+
+class _FakePlaywright:
+    def stop(self):
+        pass
+
+
+@pytest.fixture
+def shop(monkeypatch, catalogue):
+    searches, added = [], []
+    monkeypatch.setattr(grocery_service, "get_catalogue", lambda store: catalogue)
+    monkeypatch.setattr(grocery_service, "_connect_browser", lambda: (_FakePlaywright(), _FakeBrowser()))
+    monkeypatch.setattr(grocery_service, "_get_page", lambda browser: _FakePage())
+    monkeypatch.setattr(grocery_service, "_check_sainsburys_login", lambda page: True)
+
+    def fake_search(page, queries, limit=5):
+        searches.append(list(queries))
+        stock = {"tofu": [{"product_uid": "9", "name": "Cauldron Organic Tofu 396g", "price": 2.0,
+                           "available": True}]}
+        return {q: stock.get(q, []) for q in queries}
+
+    def fake_add(page, product_uid, quantity=1):
+        added.append(product_uid)
+        return {"ok": True}
+
+    monkeypatch.setattr(grocery_service, "_search_sainsburys_many", fake_search)
+    monkeypatch.setattr(grocery_service, "_add_to_sainsburys_trolley", fake_add)
+    return searches, added
+
+
+async def test_add_shopping_list_searches_only_misses(shop):
+    searches, added = shop
+    result = await grocery_service.add_shopping_list(
+        "sainsburys", [{"name": "500g chicken breast"}, {"name": "eggs"}, {"name": "tofu"}])
+    # Nothing chosen yet: all searched, cached products join the candidates
+    assert [m["source"] for m in result["matched"]] == ["search", "search", "search"]
+    assert added == ["6", "3", "9"]
+    assert searches == [["500g chicken breast", "chicken breast", "eggs", "tofu"]]
+    assert result["summary"]["from_catalogue"] == 0
+
+    # Second run: all three are now remembered, so no search happens at all
+    searches.clear()
+    again = await grocery_service.add_shopping_list(
+        "sainsburys", [{"name": "500g chicken breast"}, {"name": "eggs"}, {"name": "tofu"}])
+    assert [m["source"] for m in again["matched"]] == ["catalogue"] * 3
+    assert searches == []
+
+
+async def test_cached_lookalikes_are_not_auto_added(shop):
+    searches, added = shop
+    result = await grocery_service.add_shopping_list("sainsburys", [{"name": "chicken"}])
+    assert added == [] and result["matched"] == []
+    options = [o["product_uid"] for o in result["ambiguous"][0]["options"]]
+    assert "8" in options  # stock cubes offered, not picked
+    assert searches == [["chicken"]]
@@ -0,0 +1,132 @@
+"""Tests for the local daily health timeseries cache."""
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+
+import numpy as np
+import pytest
+
+from domains.nutrition.services import health_timeseries as ht
+from domains.nutrition.services.health_timeseries import (
+    HealthTimeseries, ema, period_delta, rolling_mean, slope_per_day,
+)
+from domains.fitness.trend import ema as trend_ema
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return HealthTimeseries(tmp_path / "health.npz")
+
+
+def _write_days(path, month):
+    cache = HealthTimeseries(path)
+    for day in range(1, 11):
+        cache.record_days([{"date": f"2026-{month:02d}-{day:02d}", "steps": day}])
+
+
+class _FakeSupabase:
+    def __init__(self, tables):
+        self.tables = tables
+        self.calls = []
+
+    async def select(self, table, params=None, *, paginate=False):
+        self.calls.append((table, params))
+        return self.tables[table]
+
+
+class TestWrites:
+    def test_days_merge_non_null_fields(self, cache):
+        cache.record_days([
+            {"date": "2026-05-01", "steps": 9000, "resting_hr": 55},
+            {"date": "2026-04-29", "steps": 12000},
+        ])
+        # Late overnight metrics arrive in a later sync with steps=None
+        cache.record_days([{"date": "2026-05-01", "sleep_hours": 7.5, "steps": None}])
+        assert cache.points("steps", date(2026, 4, 1)) == [
+            {"date": "2026-04-29", "value": 12000.0},
+            {"date": "2026-05-01", "value": 9000.0},
+        ]
+        assert cache.points("sleep_hours", date(2026, 4, 1)) == [{"date": "2026-05-01", "value": 7.5}]
+
+    def test_weights_dedupe_and_daily_mean(self, cache):
+        window = [
+            {"measured_at": "2026-05-01T07:00:00", "weight_kg": 80.0},
+            {"measured_at": "2026-05-01T21:00:00", "weight_kg": 81.0},
+            {"measured_at": "2026-04-30T07:00:00+00:00", "weight_kg": 82.0},
+        ]
+        cache.record_weights(window)
+        cache.record_weights(window)  # Withings re-stores the whole window
+        at, kg = cache.weights(date(2026, 4, 1))
+        assert kg.tolist() == [82.0, 80.0, 81.0]
+        assert cache.points("weight", date(2026, 5, 1)) == [{"date": "2026-05-01", "value": 80.5}]
+        _, kg = cache.weights(datetime(2026, 5, 1, 12))
+        assert kg.tolist() == [81.0]
+
+    def test_persists_across_instances(self, cache):
+        cache.record_days([{"date": "2026-05-01", "steps": 100}])
+        other = HealthTimeseries(cache.path)
+        assert other.points("steps", date(2026, 5, 1)) == [{"date": "2026-05-01", "value": 100.0}]
+        # A write from another process is picked up on the next write here
+        other.record_days([{"date": "2026-05-02", "steps": 200}])
+        cache.record_days([{"date": "2026-05-03", "steps": 300}])
+        assert len(cache.daily("steps", date(2026, 5, 1))[0]) == 3
+
+    def test_concurrent_processes_keep_every_write(self, cache):
+        with ProcessPoolExecutor(max_workers=3) as pool:
+            list(pool.map(_write_days, [cache.path] * 3, [4, 5, 6]))
+        assert len(HealthTimeseries(cache.path).daily("steps", date(2026, 4, 1))[0]) == 30
+        assert list(cache.path.parent.glob("*.tmp")) == []
+
+
+class TestEnsure:
+    @pytest.mark.asyncio
+    async def test_backfill_then_fresh(self, cache, monkeypatch):
+        fake = _FakeSupabase({
+            "garmin_daily_summary": [{"date": "2026-05-01", "steps": 8000}],
+            "weight_readings": [{"measured_at": "2026-05-01T07:00:00", "weight_kg": 80.0}],
+        })
+        monkeypatch.setattr(ht, "get_supabase", lambda: fake)
+
+        await cache.ensure(date(2026, 4, 1))
+        assert len(fake.calls) == 2
+        assert fake.calls[0][1]["date"] == "gte.2026-04-01"
+        assert cache.points("steps", date(2026, 4, 1))[0]["value"] == 8000.0
+
+        await cache.ensure(date(2026, 4, 15))  # inside coverage, just refreshed
+        assert len(fake.calls) == 2
+
+        await cache.ensure(date(2026, 3, 1))  # older than coverage -> backfill
+        assert fake.calls[-2][1]["date"] == "gte.2026-03-01"
+
+    @pytest.mark.asyncio
+    async def test_stale_cache_pulls_short_delta(self, cache, monkeypatch):
+        fake = _FakeSupabase({"garmin_daily_summary": [], "weight_readings": []})
+        monkeypatch.setattr(ht, "get_supabase", lambda: fake)
+        cache.covered_from = np.datetime64("2026-01-01")
+        cache.refreshed_at = time.time() - ht.REFRESH_SECONDS - 1
+        await cache.ensure(date(2026, 2, 1))
+        start = np.datetime64(fake.calls[0][1]["date"][4:])
+        expected = np.datetime64(date.today()) - ht.REFRESH_OVERLAP_DAYS
+        assert start == max(expected, cache.covered_from)
+
+
+class TestAggregates:
+    def test_rolling_mean(self):
+        assert rolling_mean(np.array([1.0, 2.0, 3.0, 4.0]), 2).tolist() == [1.0, 1.5, 2.5, 3.5]
+
+    def test_ema_matches_trend_module(self):
+        values = [90.0, 89.6, 89.9, 89.2, 88.8, 89.0]
+        assert ema(np.array(values), 0.1) == pytest.approx(trend_ema(values, 0.1))
+        assert ema(np.array([])) is None
+
+    def test_slope(self):
+        days = np.array(["2026-05-01", "2026-05-03", "2026-05-08"], dtype="datetime64[D]")
+        assert slope_per_day(days, np.array([90.0, 89.8, 89.3])) == pytest.approx(-0.1, abs=1e-9)
+        assert slope_per_day(days[:1], np.array([90.0])) is None
+
+    def test_period_delta(self):
+        days = np.array(["2026-05-01", "2026-04-25", "2026-04-10"], dtype="datetime64[D]")
+        out = period_delta(days, np.array([110.0, 90.0, 80.0]), date(2026, 5, 1))
+        assert out == {"current": 100.0, "prior": 80.0, "delta_pct": 25.0, "n": 3}
+        assert period_delta(days[:0], np.array([]), date(2026, 5, 1))["current"] is None
@@ -0,0 +1,96 @@
+"""Tests for home-sensor trend aggregation, daily cache and downsampling."""
+
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from domains.home_sensors import service
+
+
+def _today() -> date:
+    return datetime.now(service.LONDON).date()
+
+
+def _points(days_back: int, per_day: int = 4, temp: float = 20.0) -> list[dict]:
+    """Readings from `days_back` London days ago through now, spread per day, in UTC."""
+    now = datetime.now(timezone.utc)
+    out = []
+    for d in range(days_back, -1, -1):
+        day = _today() - timedelta(days=d)
+        for i in range(per_day):
+            local = datetime.combine(day, datetime.min.time(), tzinfo=service.LONDON)
+            ts = (local + timedelta(hours=i * 24 / per_day)).astimezone(timezone.utc)
+            if ts > now:
+                break
+            out.append({"ts": ts.isoformat(), "temperature": temp + i, "humidity": 50.0})
+    return out
+
+
+@pytest.fixture
+def bridge(monkeypatch, tmp_path):
+    monkeypatch.setattr(service, "DAILY_CACHE_FILE", tmp_path / "daily.json")
+    monkeypatch.setattr(service, "get_sensors", lambda: {"sensors": [
+        {"id": "sensor_kitchen", "room": "Kitchen", "temperature_c": 21.0, "humidity_pct": 50},
+        {"id": "sensor_bedroom", "room": "Bedroom", "temperature_c": 19.0, "humidity_pct": 55},
+        {"id": "motion_lounge", "room": "Lounge", "temperature_c": None, "humidity_pct": None},
+    ]})
+    calls = []
+
+    def fake_history(device, hours=24, kind="readings"):
+        calls.append((device, hours))
+        points = [p for p in _points(hours // 24 + 1)
+                  if datetime.fromisoformat(p["ts"]) >= datetime.now(timezone.utc) - timedelta(hours=hours)]
+        return {"device": device, "room": service._friendly_room(device), "points": points}
+
+    monkeypatch.setattr(service, "get_history", fake_history)
+    return calls
+
+
+def test_trend_caches_completed_days(bridge):
+    first = service.get_trend(days=5)
+    assert [r["room"] for r in first["rooms"]] == ["Kitchen", "Bedroom"]
+    kitchen = first["rooms"][0]["daily"]
+    assert [r["date"] for r in kitchen] == [
+        (_today() - timedelta(days=i)).isoformat() for i in range(4, -1, -1)
+    ]
+    assert kitchen[0] == {"date": kitchen[0]["date"], "temp_min": 20.0, "temp_max": 23.0,
+                          "temp_avg": 21.5, "humidity_avg": 50.0, "samples": 4}
+    assert sorted(h for _, h in bridge) == [120, 120]
+
+    bridge.clear()
+    second = service.get_trend(days=5)
+    # Only today's points are fetched once past days are cached
+    assert all(h <= 24 for _, h in bridge)
+    assert second["rooms"][0]["daily"] == kitchen
+
+
+def test_wider_window_refetches(bridge):
+    service.get_trend(days=3)
+    bridge.clear()
+    service.get_trend(days=6)
+    assert sorted(h for _, h in bridge) == [144, 144]
+
+
+def test_days_are_bucketed_in_london_time():
+    buckets = service._daily_buckets([
+        {"ts": "2026-07-01T22:30:00Z", "temperature": 20.0},      # 23:30 BST, same day
+        {"ts": "2026-07-01T23:30:00+00:00", "temperature": 18.0},  # 00:30 BST, next day
+        {"ts": "2026-12-01T23:30:00", "temperature": 16.0},        # GMT: UTC date holds
+    ])
+    assert {d: b["temp_min"] for d, b in buckets.items()} == {
+        "2026-07-01": 20.0, "2026-07-02": 18.0, "2026-12-01": 16.0,
+    }
+
+
+def test_series_downsamples(monkeypatch):
+    now = datetime(2026, 5, 1, 12)
+    points = [{"ts": (now - timedelta(minutes=i)).isoformat(), "temperature": 20.0 + (i % 2),
+               "humidity": None} for i in range(1000)]
+    monkeypatch.setattr(service, "get_history", lambda *a, **k: {
+        "device": "sensor_kitchen", "room": "Kitchen", "points": points})
+    out = service.get_series("kitchen", hours=24, max_points=50)
+    assert out["raw_count"] == 1000
+    assert out["count"] == 50
+    assert all(p["temperature"] == pytest.approx(20.5) for p in out["points"])
+    assert all(p["humidity"] is None for p in out["points"])
+    assert out["points"] == sorted(out["points"], key=lambda p: p["ts"])
@@ -0,0 +1,87 @@
+"""Tests for blocked fuzzy dedup and Tabelog linking in japan_scraper."""
+
+import random
+
+import pytest
+
+pytest.importorskip("rapidfuzz")
+from rapidfuzz import fuzz, process
+
+from japan_scraper.match_engine import MatchEngine, UnionFind, normalise
+from japan_scraper.matcher import _deduplicate, _match_tabelog
+
+STEMS = ["ichiran", "afuri", "fuunji", "tsuta", "sushi dai", "gonpachi", "kagari",
+         "menya musashi", "tonkatsu maisen", "uobei", "harajuku gyoza", "nakiryu"]
+
+
+def _names(n: int, seed: int = 1) -> list[str]:
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        name = rng.choice(STEMS)
+        if rng.random() < 0.5:
+            name += " " + rng.choice(["shibuya", "shinjuku", "honten", "ginza", "ramen", "cafe"])
+        if rng.random() < 0.3:  # typo
+            i = rng.randrange(len(name))
+            name = name[:i] + name[i + 1:]
+        out.append(name.title())
+    return out
+
+
+def test_pairs_match_brute_force():
+    names = _names(150)
+    engine = MatchEngine(names)
+    blocked = {(i, j) for i, j, _ in engine.pairs(80)}
+    norm = [normalise(n) for n in names]
+    brute = {(i, j) for i in range(len(norm)) for j in range(i + 1, len(norm))
+             if norm[i] and norm[j] and fuzz.token_sort_ratio(norm[i], norm[j]) >= 80}
+    assert blocked <= brute
+    assert len(blocked) >= 0.95 * len(brute)
+
+
+def test_best_matches_agree_with_extract_one():
+    choices = _names(200, seed=2)
+    queries = _names(60, seed=3)
+    engine = MatchEngine(choices)
+    norm_choices = [normalise(c) for c in choices]
+    for q, got in zip(queries, engine.best_matches(queries, 85)):
+        want = process.extractOne(normalise(q), norm_choices, scorer=fuzz.token_sort_ratio,
+                                  score_cutoff=85)
+        if got is None:
+            continue  # blocking may only lose matches, never invent them
+        assert want is not None and got[1] == pytest.approx(want[1])
+
+
+def test_union_find_groups():
+    uf = UnionFind(5)
+    uf.union(0, 3)
+    uf.union(3, 4)
+    assert uf.groups() == [[0, 3, 4], [1], [2]]
+
+
+def test_deduplicate_merges_transitively_within_city():
+    places = [
+        {"name": "Ichiran Shibuya", "city": "Tokyo", "context": "x", "source_platform": "reddit",
+         "source_url": "r1"},
+        {"name": "Ichiran Shibuya Ramen", "city": "tokyo", "context": "longer text",
+         "source_platform": "youtube", "source_url": "y1"},
+        {"name": "Ichiran Shibuyaa", "city": "", "context": "", "source_platform": "reddit",
+         "source_url": "r2"},
+        {"name": "Ichiran Shibuya", "city": "Osaka", "context": "", "source_platform": "reddit",
+         "source_url": "r3"},
+        {"name": "Afuri", "city": "Tokyo", "context": "", "source_platform": "reddit"},
+    ]
+    out = _deduplicate(places)
+    # The city-less place links Tokyo and Osaka, but only joins one of them
+    assert [p["name"] for p in out] == ["Ichiran Shibuya Ramen", "Ichiran Shibuya", "Afuri"]
+    assert out[0]["sources"] == ["reddit", "youtube"]
+    assert out[0]["source_count"] == 3
+    assert out[1]["city"] == "Osaka" and out[1]["source_urls"] == ["r3"]
+
+
+def test_match_tabelog():
+    places = [{"name": "Fuunji"}, {"name": "Nowhere Diner"}]
+    tabelog = [{"name": "Tsuta", "score": "3.9"}, {"name": "Fu-unji", "score": "3.8", "url": "u"}]
+    out = _match_tabelog(places, tabelog, threshold=85)
+    assert out[0]["tabelog_match"]["url"] == "u"
+    assert "tabelog_match" not in out[1]
@@ -11,6 +11,13 @@ from domains.peterbot.data_fetchers import (
 )
 
 
+@pytest.fixture(autouse=True)
+def _briefing_cache(tmp_path, monkeypatch):
+    """Give each test its own search cache so mocked results don't leak."""
+    from jobs import briefing_fetch
+    monkeypatch.setattr(briefing_fetch, "_cache", briefing_fetch.SearchCache(tmp_path / "cache.db"))
+
+
 class TestTrimXItems:
     """Tests for X/Twitter post trimming."""
 
@@ -407,3 +414,31 @@ class TestMorningBriefingIntegration:
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
+
+
+class _StaggeredReddit:
+    """Fake client: each search returns 10 new posts, later ones slower."""
+
+    def __init__(self):
+        self.started = 0
+        self.finished = 0
+
+    async def get(self, url, params=None, headers=None, timeout=None):
+        import asyncio
+        import httpx
+        n = self.started
+        self.started += 1
+        await asyncio.sleep(0.01 * (n + 1))
+        self.finished += 1
+        children = [{"data": {"permalink": f"/r/x/comments/{n}_{i}", "title": "t", "score": i}}
+                    for i in range(10)]
+        return httpx.Response(200, json={"data": {"children": children}})
+
+
+@pytest.mark.asyncio
+async def test_reddit_search_stops_once_enough_items():
+    from jobs.morning_briefing import REDDIT_ENOUGH_ITEMS, _search_reddit
+    client = _StaggeredReddit()
+    items = await _search_reddit("claude", client=client)
+    assert len(items) == 15
+    assert client.finished == REDDIT_ENOUGH_ITEMS // 10 < client.started
@@ -0,0 +1,101 @@
+"""Tests for the conditional-GET news aggregator and news store."""
+
+import httpx
+import pytest
+
+from domains.news.services import feeds
+from domains.news.services.store import NewsStore, extract_links, normalise_url
+
+RSS = """<?xml version="1.0"?><rss version="2.0"><channel><title>{name}</title>
+{items}</channel></rss>"""
+ITEM = "<item><title>{title}</title><link>{link}</link><pubDate>{date}</pubDate></item>"
+
+
+def _rss(name, items):
+    return RSS.format(name=name, items="".join(ITEM.format(title=t, link=l, date=d) for t, l, d in items))
+
+
+FEEDS = {
+    "https://a.test/rss": _rss("A", [
+        ("Old story", "https://news.test/old?utm_source=a", "Mon, 12 Oct 2026 08:00:00 GMT"),
+        ("Shared story", "https://www.news.test/shared/", "Wed, 14 Oct 2026 08:00:00 GMT"),
+    ]),
+    "https://b.test/rss": _rss("B", [
+        ("Shared story (B)", "https://news.test/shared?utm_medium=rss", "Wed, 14 Oct 2026 08:00:00 GMT"),
+        ("New story", "https://news.test/new", "Thu, 15 Oct 2026 08:00:00 GMT"),
+    ]),
+}
+
+
+@pytest.fixture
+def served(monkeypatch, tmp_path):
+    store = NewsStore(tmp_path / "news.db")
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        url = str(request.url)
+        if url in FEEDS:
+            if request.headers.get("if-none-match") == f'"{url}"':
+                return httpx.Response(304)
+            return httpx.Response(200, text=FEEDS[url], headers={"ETag": f'"{url}"'})
+        if url == "https://down.test/rss":
+            return httpx.Response(503)
+        return httpx.Response(200, text="<html><body><nav>menu</nav><article><p>Body text</p>"
+                                        "</article></body></html>")
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(feeds.httpx, "AsyncClient",
+                        lambda **kw: real_client(transport=httpx.MockTransport(handler), **kw))
+    monkeypatch.setattr(feeds, "get_store", lambda: store)
+    monkeypatch.setattr(feeds, "SOURCES", {"tech": [("A", "https://a.test/rss"),
+                                                    ("B", "https://b.test/rss")]})
+    return store, requests
+
+
+def test_normalise_url_and_links():
+    assert normalise_url("HTTP://www.News.test/a/?utm_source=x&id=2#top") == "https://news.test/a?id=2"
+    links = extract_links("• [Big story](<https://x.test/1>) - BBC\nsee https://y.test/2.")
+    assert links == [("https://x.test/1", "Big story"), ("https://y.test/2", None)]
+
+
+async def test_fetch_feed_dedups_and_sorts(served):
+    store, requests = served
+    result = await feeds.fetch_feed("tech", limit=10)
+    titles = [h["title"] for h in result["headlines"]]
+    assert titles == ["New story", "Shared story", "Old story"]
+    assert len(requests) == 2
+
+
+async def test_conditional_get_serves_from_store(served, monkeypatch):
+    store, requests = served
+    await feeds.fetch_feed("tech")
+    requests.clear()
+    result = await feeds.fetch_feed("tech")
+    assert sorted(r.headers.get("if-none-match") for r in requests) == ['"https://a.test/rss"',
+                                                                   '"https://b.test/rss"']
+    assert len(result["headlines"]) == 3
+
+    # A feed that is down still contributes nothing but doesn't fail the category
+    monkeypatch.setattr(feeds, "SOURCES", {"tech": [("A", "https://a.test/rss"),
+                                                    ("Down", "https://down.test/rss")]})
+    result = await feeds.fetch_feed("tech")
+    assert "error" not in result and len(result["headlines"]) == 2
+
+
+async def test_fetch_article_is_cached(served):
+    store, requests = served
+    first = await feeds.fetch_article("https://news.test/new?utm_source=x")
+    assert first["content"] == "Body text"
+    second = await feeds.fetch_article("https://news.test/new")
+    assert second == {"content": "Body text", "url": "https://news.test/new", "cached": True}
+    assert len(requests) == 1
+
+
+def test_briefings_record_covered_links(tmp_path):
+    store = NewsStore(tmp_path / "news.db")
+    store.record_briefing("📰 [Story one](https://news.test/one?utm_source=discord)")
+    store.record_briefing("Nothing linked today", sent_at=0)  # outside the window
+    recent = store.recent_briefings(days=7)
+    assert len(recent) == 1
+    assert recent[0]["links"] == [{"url": "https://news.test/one?utm_source=discord", "title": "Story one"}]
@@ -0,0 +1,143 @@
+"""Tests for the local Notion mirror (incremental sync, coalescing, write-through)."""
+
+import asyncio
+
+import pytest
+
+from hadley_api import notion_mirror
+from hadley_api.notion_mirror import NotionMirror
+
+DB = "db-todos-0001"
+
+
+def _page(page_id, edited, title="Task", created="2026-01-01T00:00:00.000Z", archived=False):
+    return {
+        "object": "page",
+        "id": page_id,
+        "created_time": created,
+        "last_edited_time": edited,
+        "archived": archived,
+        "properties": {"Name": {"title": [{"plain_text": title}]}},
+    }
+
+
+class FakeNotion:
+    """Stands in for notion_client._notion_request — serves a page list."""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.queries = []
+        self.delay = 0
+
+    async def __call__(self, endpoint, method="GET", data=None):
+        self.queries.append(data)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        results = [p for p in self.pages if not p.get("archived")]
+        flt = (data or {}).get("filter")
+        if flt:
+            since = flt["last_edited_time"]["on_or_after"]
+            results = [p for p in results if p["last_edited_time"] >= since]
+        start = int((data or {}).get("start_cursor") or 0)
+        size = data["page_size"]
+        chunk = results[start:start + size]
+        more = start + size < len(results)
+        return {"results": chunk, "has_more": more, "next_cursor": str(start + size) if more else None}
+
+
+@pytest.fixture
+def fake():
+    return FakeNotion([
+        _page("a", "2026-01-01T10:00:00.000Z", "Buy milk"),
+        _page("b", "2026-01-02T10:00:00.000Z", "Fix bike", created="2026-01-02T00:00:00.000Z"),
+    ])
+
+
+@pytest.fixture
+def mirror(tmp_path, fake):
+    return NotionMirror(tmp_path / "notion_mirror.db", fake)
+
+
+async def test_first_read_does_full_sync(mirror, fake):
+    result = await mirror.read(DB)
+    assert [p["id"] for p in result["pages"]] == ["b", "a"]
+    assert result["sync_lag_seconds"] is not None
+    assert "filter" not in fake.queries[0]
+
+
+async def test_fresh_mirror_is_served_without_querying(mirror, fake):
+    await mirror.read(DB)
+    await mirror.read(DB)
+    assert len(fake.queries) == 1
+
+
+async def test_incremental_sync_uses_last_edited_cursor(mirror, fake):
+    await mirror.sync(DB)
+    fake.pages.append(_page("c", "2026-01-03T09:00:00.000Z", "New"))
+    fetched = await mirror.sync(DB)
+    assert fake.queries[-1]["filter"]["last_edited_time"]["on_or_after"] == "2026-01-02T10:00:00.000Z"
+    # b (edited at the cursor) and c
+    assert fetched == 2
+    assert {p["id"] for p in mirror.pages(DB)} == {"a", "b", "c"}
+
+
+async def test_sync_paginates(tmp_path, monkeypatch):
+    monkeypatch.setattr(notion_mirror, "QUERY_PAGE_SIZE", 2)
+    fake = FakeNotion([_page(str(i), f"2026-01-01T10:0{i}:00.000Z") for i in range(5)])
+    mirror = NotionMirror(tmp_path / "m.db", fake)
+    assert await mirror.sync(DB) == 5
+    assert len(fake.queries) == 3
+
+
+async def test_full_resync_drops_pages_archived_in_notion(mirror, fake):
+    await mirror.sync(DB)
+    fake.pages[0]["archived"] = True
+    await mirror.sync(DB, full=True)
+    assert [p["id"] for p in mirror.pages(DB)] == ["b"]
+
+
+async def test_concurrent_syncs_are_coalesced(mirror, fake):
+    fake.delay = 0.05
+    results = await asyncio.gather(*(mirror.read(DB) for _ in range(5)))
+    assert len(fake.queries) == 1
+    assert all(len(r["pages"]) == 2 for r in results)
+
+
+async def test_stale_mirror_served_when_sync_fails(mirror, fake):
+    await mirror.sync(DB)
+
+    async def broken(endpoint, method="GET", data=None):
+        return {"object": "error", "message": "rate_limited"}
+
+    mirror._request = broken
+    result = await mirror.read(DB, max_age=0)
+    assert len(result["pages"]) == 2
+    assert "error" not in result
+    assert mirror.status()["databases"][DB]["last_error"] == "rate_limited"
+
+
+async def test_read_errors_when_never_synced(mirror):
+    async def broken(endpoint, method="GET", data=None):
+        return {"object": "error", "message": "unauthorized"}
+
+    mirror._request = broken
+    result = await mirror.read(DB)
+    assert result["pages"] == []
+    assert result["error"] == "unauthorized"
+
+
+async def test_apply_page_writes_through(mirror):
+    await mirror.sync(DB)
+    mirror.apply_page(DB, _page("a", "2026-01-05T00:00:00.000Z", "Buy oat milk"))
+    mirror.apply_page(DB, _page("b", "2026-01-05T00:00:00.000Z", archived=True))
+    pages = mirror.pages(DB)
+    assert [p["id"] for p in pages] == ["a"]
+    assert pages[0]["properties"]["Name"]["title"][0]["plain_text"] == "Buy oat milk"
+
+
+async def test_status_reports_sync_lag(mirror):
+    await mirror.sync(DB)
+    status = mirror.status()["databases"][DB]
+    assert status["pages"] == 2
+    assert 0 <= status["sync_lag_seconds"] < 5
+    assert status["syncs"] == 1
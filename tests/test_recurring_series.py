@@ -0,0 +1,106 @@
+"""Tests for the recurring-payment series engine."""
+
+from datetime import date, timedelta
+
+import pytest
+
+from mcp_servers.financial_data import recurring, subscriptions
+from mcp_servers.financial_data.local_store import FinanceMirror
+from mcp_servers.financial_data.recurring import detect_series, merchant_key
+
+TODAY = date(2026, 6, 1)
+
+
+def _txn(i, days_ago, desc, amount):
+    return (f"t{i}", (TODAY - timedelta(days=days_ago)).isoformat(), desc, -amount, None)
+
+
+def _mirror(tmp_path, rows) -> FinanceMirror:
+    mirror = FinanceMirror(tmp_path / "finance.db")
+    with mirror.db() as conn:
+        conn.executemany("INSERT INTO transactions VALUES (?, ?, ?, ?, ?)", rows)
+        conn.execute("INSERT INTO meta VALUES ('version', '1')")
+    return mirror
+
+
+def _rows():
+    rows = []
+    # Monthly with a price rise and description noise
+    for k in range(6):
+        desc = "SPOTIFY LIMITED LONDON" if k % 2 else f"Spotify Ltd {k:02d}/05"
+        rows.append(_txn(len(rows), 30 * k + 1, desc, 11.99 if k else 12.99))
+    # Weekly, truncated description variant
+    for k in range(8):
+        rows.append(_txn(len(rows), 7 * k + 2, "GYMFLEXX MEMBERSHIP" if k % 3 else "GYMFLEX MEMBERSHI", 9.0))
+    # Irregular repeat
+    for d in (3, 4, 19, 60, 61):
+        rows.append(_txn(len(rows), d, "TESCO STORES 2041", 20.0 + d))
+    return rows
+
+
+def test_merchant_key_strips_noise():
+    assert merchant_key("SPOTIFY LIMITED LONDON") == "spotify"
+    assert merchant_key("Spotify Ltd 12/05") == "spotify"
+    assert merchant_key("PAYPAL *NETFLIX.COM 4029357733") == "paypal netflix"
+    assert merchant_key("123 456") == ""
+
+
+def test_cadence_amounts_and_fuzzy_merge(tmp_path):
+    series = {s.series_key: s for s in detect_series(_mirror(tmp_path, _rows()), TODAY)}
+    assert set(series) == {"spotify", "gymflexx membership", "tesco stores"}
+
+    spotify = series["spotify"]
+    assert spotify.cadence == "monthly"
+    assert spotify.occurrences == 6
+    assert spotify.latest_amount == 12.99
+    assert spotify.drift_pct == pytest.approx(8.3, abs=0.1)
+    assert spotify.next_expected == (TODAY - timedelta(days=1) + timedelta(days=30)).isoformat()
+
+    gym = series["gymflexx membership"]
+    assert gym.cadence == "weekly" and gym.occurrences == 8
+    assert gym.amount_cv == 0
+
+    assert series["tesco stores"].cadence is None
+
+
+def test_results_persisted_until_mirror_changes(tmp_path, monkeypatch):
+    mirror = _mirror(tmp_path, _rows())
+    first = detect_series(mirror, TODAY)
+
+    calls = []
+    monkeypatch.setattr(recurring, "_assign", lambda *a: calls.append(a) or {})
+    assert detect_series(mirror, TODAY) == first
+    assert calls == []  # served from recurring_series
+
+    with mirror.db() as conn:
+        conn.execute("INSERT INTO transactions VALUES ('x', ?, 'Spotify Limited', -12.99, NULL)",
+                     (TODAY.isoformat(),))
+        conn.execute("UPDATE meta SET value = '2' WHERE key = 'version'")
+    monkeypatch.undo()
+    again = {s.series_key: s for s in detect_series(mirror, TODAY)}
+    assert again["spotify"].occurrences == 7
+    with mirror.db() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM recurring_keys").fetchone()[0] == 4
+
+
+async def test_health_flags_new_untracked_series(tmp_path, monkeypatch):
+    mirror = _mirror(tmp_path, _rows())
+
+    async def query(table, params=None, *, paginate=False):
+        if table == "subscriptions":
+            return [{"id": "s1", "name": "Spotify", "status": "active", "amount": 10.99,
+                     "frequency": "monthly", "bank_description_pattern": "Spotify*"}]
+        return []
+
+    async def synced():
+        return mirror
+
+    monkeypatch.setattr(subscriptions, "finance_query", query)
+    monkeypatch.setattr(subscriptions, "synced_mirror", synced)
+    result = await subscriptions.subscription_health(today=TODAY)
+
+    new = [a for a in result["alerts"] if a["type"] == "new_recurring"]
+    assert [(a["description"], a["cadence"]) for a in new] == [("GYMFLEX MEMBERSHI", "weekly")]  # latest raw description
+    price = [a for a in result["alerts"] if a["type"] == "price_change"]
+    assert price[0]["new_amount"] == 12.99
+    assert result["summary"]["total_monthly_cost"] == 10.99
@@ -0,0 +1,233 @@
+"""Tests for the timing wheel and the reminder engine."""
+
+import asyncio
+import random
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+
+from domains.peterbot.reminders import engine as engine_mod
+from domains.peterbot.reminders import store
+from domains.peterbot.reminders.engine import ReminderEngine
+from domains.peterbot.reminders.wheel import TimingWheel
+
+T0 = datetime(2026, 10, 19, 9, 0, tzinfo=timezone.utc).timestamp()
+
+
+def _iso(ts):
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat()
+
+
+def test_wheel_expires_on_time_across_levels():
+    rng = random.Random(7)
+    wheel = TimingWheel(start=T0, slots=8, levels=3)  # small wheel: cascades and overflow
+    deadlines = {f"k{i}": T0 + rng.choice([rng.uniform(-5, 10), rng.uniform(0, 600), rng.uniform(0, 50_000)])
+                 for i in range(200)}
+    for key, at in deadlines.items():
+        wheel.add(key, at)
+    cancelled = set(rng.sample(sorted(deadlines), 20))
+    for key in cancelled:
+        assert wheel.remove(key)
+
+    fired, now = {}, T0
+    while len(wheel):
+        now = max(now, wheel.next_wakeup())
+        for key in wheel.advance(now):
+            fired[key] = now
+
+    assert set(fired) == set(deadlines) - cancelled
+    for key, at in fired.items():
+        assert at >= deadlines[key] or deadlines[key] < T0  # never early
+        assert at - max(deadlines[key], T0) < 1.0           # at most one tick late
+
+
+def test_wheel_upcoming_and_reschedule():
+    wheel = TimingWheel(start=T0)
+    wheel.add("a", T0 + 30)
+    wheel.add("b", T0 + 10)
+    wheel.add("a", T0 + 5)  # reschedule
+    assert [k for k, _ in wheel.upcoming()] == ["a", "b"]
+    assert wheel.advance(T0 + 6) == ["a"]
+    assert wheel.next_wakeup() == T0 + 10
+
+
+class _Clock:
+    def __init__(self, t):
+        self.t = t
+
+    def __call__(self):
+        return self.t
+
+
+@pytest.fixture
+def supabase(monkeypatch):
+    db = {"rows": [], "writes": []}
+
+    async def active():
+        return [dict(r) for r in db["rows"] if engine_mod.is_active(r)]
+
+    async def changed(cursor):
+        return [dict(r) for r in db["rows"] if r["updated_at"] > cursor]
+
+    async def mark_fired(ids):
+        db["writes"].append((sorted(ids), "fired_at"))
+        for r in db["rows"]:
+            if r["id"] in ids:
+                r["fired_at"] = _iso(T0)
+        return True
+
+    async def update(ids, fields):
+        db["writes"].append((sorted(ids), ",".join(sorted(fields))))
+        return True
+
+    monkeypatch.setattr(engine_mod, "get_active_reminders", active)
+    monkeypatch.setattr(engine_mod, "get_reminders_changed_since", changed)
+    monkeypatch.setattr(engine_mod, "mark_reminders_fired", mark_fired)
+    monkeypatch.setattr(engine_mod, "update_reminders", update)
+    return db
+
+
+def _row(rid, run_at, updated, **extra):
+    return {"id": rid, "task": f"task {rid}", "user_id": 1, "channel_id": 2, "run_at": _iso(run_at),
+            "updated_at": _iso(updated), "fired_at": None, **extra}
+
+
+async def test_engine_fires_batches_and_nags(supabase):
+    clock = _Clock(T0)
+    fired, nags = [], []
+
+    async def fire(row):
+        fired.append(row["id"])
+
+    async def send_nag(target, message):
+        nags.append((target, message.split("\n")[0]))
+
+    supabase["rows"] = [
+        _row("a", T0 + 10, T0 - 60),
+        _row("b", T0 + 10, T0 - 50),
+        _row("old", T0 - 3600, T0 - 7200),  # long past: skipped, as before
+        _row("nag", T0 + 20, T0 - 40, reminder_type="nag", delivery="whatsapp:chris",
+             interval_minutes=30, nag_until="11:00"),
+    ]
+    eng = ReminderEngine(fire=fire, send_nag=send_nag, clock=clock)
+    assert await eng.sync(full=True) == 4
+    assert eng.stats["skipped_late"] == 1 and "old" not in eng.reminders
+    assert supabase["writes"] == []  # missed, not delivered: left unfired
+
+    clock.t = T0 + 10
+    assert await eng.tick() == 2
+    await asyncio.sleep(0)
+    assert sorted(fired) == ["a", "b"]
+    assert supabase["writes"][-1] == (["a", "b"], "fired_at")  # one write for the batch
+
+    clock.t = T0 + 20  # nag's run_at: Discord fire + first WhatsApp nag on the same tick
+    await eng.tick()
+    await asyncio.sleep(0)
+    assert fired[-1] == "nag" and nags == [("chris", "Hey — task nag 💪")]
+    assert eng.upcoming()[0]["at"] == _iso(T0 + 20 + 30 * 60)
+
+    clock.t = T0 + 20 + 30 * 60
+    await eng.tick()
+    assert len(nags) == 2 and supabase["writes"][-1] == (["nag"], "last_nagged_at")
+
+    # T0 is 10:00 BST, so the 11:00 cut-off comes before the next nag (11:00:40)
+    assert eng.upcoming()[0]["at"] == _iso(T0 + 3600)
+    clock.t = T0 + 3600
+    await eng.tick()
+    assert "Wrapping up" in nags[-1][1]
+    assert "nag" not in eng.reminders
+    assert supabase["writes"][-1] == (["nag"], "acknowledged_at")
+
+
+async def test_engine_incremental_sync_and_events(supabase):
+    clock = _Clock(T0)
+    eng = ReminderEngine(fire=lambda row: asyncio.sleep(0), send_nag=lambda t, m: asyncio.sleep(0), clock=clock)
+    supabase["rows"] = [_row("a", T0 + 600, T0 - 10)]
+    await eng.sync()
+    assert eng.cursor == _iso(T0 - 10)
+
+    # Moved later and a new one added: only rows past the cursor come back
+    supabase["rows"] = [_row("a", T0 + 900, T0 + 1), _row("b", T0 + 60, T0 + 2)]
+    assert await eng.sync() == 2
+    assert [u["id"] for u in eng.upcoming()] == ["b", "a"]
+    assert eng.wheel.deadline("fire:a") == T0 + 900
+
+    await eng.apply_event({"id": "b", "action": "deleted"})
+    assert "b" not in eng.reminders
+
+    # A full sync drops rows deleted upstream that no event reported
+    supabase["rows"] = []
+    await eng.sync(full=True)
+    assert eng.reminders == {} and len(eng.wheel) == 0
+
+
+async def test_late_reminders_skipped_once_and_left_unfired(supabase):
+    clock = _Clock(T0)
+    eng = ReminderEngine(fire=lambda row: asyncio.sleep(0), send_nag=lambda t, m: asyncio.sleep(0), clock=clock)
+    supabase["rows"] = [_row("old1", T0 - 3600, T0 - 7200), _row("old2", T0 - 600, T0 - 7200),
+                        _row("soon", T0 + 60, T0 - 60)]
+    await eng.sync(full=True)
+    assert eng.stats["skipped_late"] == 2
+
+    # Later full syncs still see them, but neither report nor stamp them again
+    clock.t = T0 + 3600
+    assert await eng.sync(full=True) == 3
+    assert eng.stats["skipped_late"] == 2 and supabase["writes"] == []
+    assert "old1" not in eng.reminders
+
+
+async def test_reconcile_fires_reminders_whose_event_was_lost(supabase):
+    clock = _Clock(T0)
+    fired = []
+
+    async def fire(row):
+        fired.append(row["id"])
+
+    eng = ReminderEngine(fire=fire, send_nag=lambda t, m: asyncio.sleep(0), clock=clock)
+    supabase["rows"] = [_row("a", T0 + 3600, T0 - 60)]
+    await eng.sync()
+
+    # Created a minute after that sync, due two minutes later; its
+    # reminder.changed event never arrived, so the 15-minute reconcile finds it late
+    supabase["rows"].append(_row("lost", T0 + 180, T0 + 60, created_at=_iso(T0 + 60)))
+    clock.t = T0 + 900
+    await eng.sync()
+    assert eng.stats["skipped_late"] == 0
+    await eng.tick()
+    await asyncio.sleep(0)
+    assert fired == ["lost"]
+    assert supabase["writes"] == [(["lost"], "fired_at")]
+
+
+async def test_full_sync_works_without_updated_at(monkeypatch):
+    """Before the updated_at migration, PostgREST 400s any query naming it."""
+    rows = [{"id": "a", "run_at": _iso(T0 + 60), "fired_at": None}]
+    seen = []
+
+    class _Client:
+        async def get(self, url, params=None, **kwargs):
+            seen.append(params)
+            req = httpx.Request("GET", url, params=params)
+            if any("updated_at" in str(v) for v in (params or {}).values()):
+                return httpx.Response(400, json={"code": "42703"}, request=req)
+            return httpx.Response(200, json=rows, request=req)
+
+    class _Supabase:
+        @asynccontextmanager
+        async def session(self):
+            yield _Client()
+
+    monkeypatch.setattr(store, "SUPABASE_URL", "https://example.supabase.co")
+    monkeypatch.setattr(store, "SUPABASE_KEY", "key")
+    monkeypatch.setattr(store, "get_supabase", lambda: _Supabase())
+    monkeypatch.setattr(engine_mod, "get_active_reminders", store.get_active_reminders)
+    monkeypatch.setattr(engine_mod, "get_reminders_changed_since", store.get_reminders_changed_since)
+
+    eng = ReminderEngine(fire=lambda row: asyncio.sleep(0), send_nag=lambda t, m: asyncio.sleep(0),
+                         clock=_Clock(T0))
+    assert await eng.sync() == 1
+    assert "fire:a" in eng.wheel
+    assert eng.cursor is None  # no updated_at yet: every sync stays a full one
+    assert await eng.sync() == 1 and len(seen) == 2
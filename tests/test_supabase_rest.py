@@ -0,0 +1,148 @@
+"""Tests for the shared pooled Supabase REST client."""
+
+import httpx
+import pytest
+
+from integrations import supabase_rest
+from integrations.supabase_rest import SupabaseREST, _table_from_url
+
+
+@pytest.fixture(autouse=True)
+def _no_backoff(monkeypatch):
+    monkeypatch.setattr(supabase_rest, "RETRY_BACKOFF", [0, 0, 0])
+
+
+def _client(handler) -> SupabaseREST:
+    rest = SupabaseREST("https://example.supabase.co", "test-key")
+    transport = httpx.MockTransport(handler)
+    rest.async_client = lambda: _shared_async(rest, transport)
+    rest.sync_client = lambda: _shared_sync(rest, transport)
+    return rest
+
+
+def _shared_async(rest, transport):
+    if not hasattr(rest, "_test_async"):
+        rest._test_async = httpx.AsyncClient(transport=transport)
+    return rest._test_async
+
+
+def _shared_sync(rest, transport):
+    if not hasattr(rest, "_test_sync"):
+        rest._test_sync = httpx.Client(transport=transport)
+    return rest._test_sync
+
+
+class TestTableFromUrl:
+    def test_table(self):
+        assert _table_from_url("https://x.supabase.co/rest/v1/tasks?id=eq.1") == "tasks"
+
+    def test_rpc(self):
+        assert _table_from_url("https://x.supabase.co/rest/v1/rpc/search_knowledge") == "rpc/search_knowledge"
+
+
+class TestRetry:
+    async def test_retries_get_on_502(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) < 3:
+                return httpx.Response(502)
+            return httpx.Response(200, json=[{"id": 1}])
+
+        rest = _client(handler)
+        async with rest.session() as client:
+            resp = await client.get(rest.table_url("tasks"), headers=rest.headers())
+        assert resp.status_code == 200
+        assert len(calls) == 3
+        assert rest.metrics()["tables"]["tasks"]["retries"] == 2
+
+    async def test_plain_insert_not_retried_on_500(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(500)
+
+        rest = _client(handler)
+        resp = await rest.request("POST", "tasks", json={"title": "x"}, headers=rest.headers())
+        assert resp.status_code == 500
+        assert len(calls) == 1
+        assert rest.metrics()["tables"]["tasks"]["errors"] == 1
+
+    async def test_insert_retried_on_429(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                return httpx.Response(429, headers={"Retry-After": "0"})
+            return httpx.Response(201, json=[{"id": 1}])
+
+        rest = _client(handler)
+        rows = await rest.insert("tasks", {"title": "x"})
+        assert rows == [{"id": 1}]
+        assert len(calls) == 2
+
+    def test_sync_upsert_retried_on_500(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            if len(calls) == 1:
+                return httpx.Response(500)
+            return httpx.Response(201)
+
+        rest = _client(handler)
+        assert rest.upsert_sync("energy_live", [{"minute_start": "a"}], on_conflict="minute_start") == 1
+        assert len(calls) == 2
+
+
+class TestSelectAndUpsert:
+    async def test_select_paginates_until_short_page(self):
+        data = [{"id": i} for i in range(25)]
+        offsets = []
+
+        def handler(request):
+            offset = int(request.url.params["offset"])
+            limit = int(request.url.params["limit"])
+            offsets.append(offset)
+            return httpx.Response(200, json=data[offset:offset + limit])
+
+        rest = _client(handler)
+        rows = await rest.select("tasks", {"select": "id"}, paginate=True, page_size=10)
+        assert rows == data
+        assert offsets == [0, 10, 20]
+
+    async def test_select_respects_limit_cap(self):
+        def handler(request):
+            offset = int(request.url.params["offset"])
+            limit = int(request.url.params["limit"])
+            return httpx.Response(200, json=[{"id": i} for i in range(offset, offset + limit)])
+
+        rest = _client(handler)
+        rows = await rest.select("tasks", {"limit": "15"}, paginate=True, page_size=10)
+        assert len(rows) == 15
+
+    async def test_upsert_chunks(self):
+        sizes = []
+
+        def handler(request):
+            import json
+            sizes.append(len(json.loads(request.content)))
+            assert "resolution=merge-duplicates" in request.headers["prefer"]
+            return httpx.Response(201)
+
+        rest = _client(handler)
+        sent = await rest.upsert("energy_live", [{"n": i} for i in range(12)], chunk_size=5)
+        assert sent == 12
+        assert sizes == [5, 5, 2]
+        assert rest.metrics()["tables"]["energy_live"]["rows_written"] == 12
+
+
+def test_get_supabase_caches_per_key():
+    a = supabase_rest.get_supabase("https://a.supabase.co", "k1")
+    b = supabase_rest.get_supabase("https://a.supabase.co", "k1")
+    c = supabase_rest.get_supabase("https://a.supabase.co", "k2")
+    assert a is b
+    assert a is not c
@@ -0,0 +1,118 @@
+"""Tests for the energy tariff interval index."""
+
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from domains.energy.tariff_index import TariffIndex, to_epoch, to_epochs
+
+PEAK, OFFPEAK = 27.5, 7.5
+
+
+def _iso(dt: datetime) -> str:
+    return dt.isoformat().replace("+00:00", "Z")
+
+
+def _daily_windows(day: date, days: int = 1) -> list[dict]:
+    """Intelligent Go style windows: off-peak 23:30-05:30 UTC, peak otherwise."""
+    rows = []
+    start = datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+    for d in range(days):
+        base = start + timedelta(days=d)
+        rows += [
+            {"valid_from": _iso(base - timedelta(minutes=30)), "valid_to": _iso(base + timedelta(hours=5, minutes=30)),
+             "value_inc_vat": OFFPEAK},
+            {"valid_from": _iso(base + timedelta(hours=5, minutes=30)), "valid_to": _iso(base + timedelta(hours=23, minutes=30)),
+             "value_inc_vat": PEAK},
+        ]
+    return rows
+
+
+def _linear_rate(ts_iso: str, rows: list[dict]) -> float | None:
+    """The old per-row scan, for equivalence checks."""
+    ts = datetime.fromisoformat(ts_iso.replace("Z", "+00:00"))
+    for r in rows:
+        w_from = datetime.fromisoformat(r["valid_from"].replace("Z", "+00:00"))
+        w_to = datetime.fromisoformat(r["valid_to"].replace("Z", "+00:00")) if r.get("valid_to") else None
+        if w_from <= ts and (w_to is None or ts < w_to):
+            return r["value_inc_vat"]
+    return None
+
+
+class TestRateAt:
+    def test_window_boundaries(self):
+        index = TariffIndex(_daily_windows(date(2026, 3, 2)))
+        assert index.rate_at("2026-03-02T05:29:00Z") == OFFPEAK
+        assert index.rate_at("2026-03-02T05:30:00Z") == PEAK
+        assert index.rate_at("2026-03-02T23:29:00Z") == PEAK
+
+    def test_offset_timestamps(self):
+        index = TariffIndex(_daily_windows(date(2026, 6, 2)))
+        # 06:00 BST is 05:00 UTC — still off-peak
+        assert index.rate_at("2026-06-02T06:00:00+01:00") == OFFPEAK
+
+    def test_daily_pattern_fallback(self):
+        index = TariffIndex(_daily_windows(date(2026, 3, 2)))
+        assert index.rate_at("2026-03-03T12:00:00Z") == PEAK
+        assert index.rate_at("2026-03-04T02:00:00Z") == OFFPEAK
+        assert index.rate_at("2026-03-03T12:00:00Z", pattern_fallback=False) is None
+        assert index.rate_at("2026-03-10T12:00:00Z", default=1.0) == 1.0
+
+    def test_open_ended_and_unsorted_rows(self):
+        rows = [
+            {"valid_from": "2026-04-01T00:00:00Z", "valid_to": None, "value_inc_vat": 30.0},
+            {"valid_from": "2026-01-01T00:00:00Z", "valid_to": "2026-04-01T00:00:00Z", "value_inc_vat": 25.0},
+        ]
+        index = TariffIndex(rows)
+        assert index.rate_at("2026-02-01T00:00:00Z") == 25.0
+        assert index.rate_at("2027-01-01T00:00:00Z") == 30.0
+        assert index.latest_rate == 30.0
+
+    def test_overlapping_windows_prefer_latest_start(self):
+        rows = [
+            {"valid_from": "2026-01-01T00:00:00Z", "valid_to": None, "value_inc_vat": 20.0},
+            {"valid_from": "2026-02-01T00:00:00Z", "valid_to": "2026-02-02T00:00:00Z", "value_inc_vat": 5.0},
+        ]
+        index = TariffIndex(rows)
+        assert index.rate_at("2026-02-01T12:00:00Z") == 5.0
+        assert index.rate_at("2026-02-03T00:00:00Z") == 20.0
+        many = index.rates_at(to_epochs(["2026-02-01T12:00:00Z", "2026-02-03T00:00:00Z"]))
+        assert many.tolist() == [5.0, 20.0]
+
+    def test_standing_charge_by_date(self):
+        index = TariffIndex([
+            {"valid_from": "2025-10-01T00:00:00Z", "valid_to": "2026-01-01T00:00:00Z", "value_inc_vat": 55.0},
+            {"valid_from": "2026-01-01T00:00:00Z", "valid_to": None, "value_inc_vat": 60.0},
+        ])
+        assert index.rate_at(date(2025, 12, 31), pattern_fallback=False) == 55.0
+        assert index.rate_at(date(2026, 1, 1), pattern_fallback=False) == 60.0
+
+    def test_empty_index(self):
+        index = TariffIndex([])
+        assert index.rate_at("2026-01-01T00:00:00Z") is None
+        assert np.isnan(index.rates_at(np.array([0.0]))).all()
+        assert index.min_rate is None
+
+
+class TestVectorised:
+    def test_matches_linear_scan_over_a_day_of_minutes(self):
+        rows = _daily_windows(date(2026, 3, 1), days=3)
+        index = TariffIndex(rows)
+        start = datetime(2026, 3, 2, tzinfo=timezone.utc)
+        stamps = [_iso(start + timedelta(minutes=m)) for m in range(1440)]
+        got = index.rates_at(to_epochs(stamps))
+        expected = [_linear_rate(s, rows) for s in stamps]
+        assert got.tolist() == expected
+
+    def test_cost(self):
+        index = TariffIndex(_daily_windows(date(2026, 3, 2)))
+        epochs = to_epochs(["2026-03-02T01:00:00Z", "2026-03-02T12:00:00Z", "2026-03-09T12:00:00Z"])
+        # Third interval has no window (even 48h back) -> fallback rate
+        cost = index.cost(epochs, [10.0, 1.0, 2.0], fallback_rate=50.0)
+        assert cost == pytest.approx(10 * OFFPEAK + 1 * PEAK + 2 * 50.0)
+
+    def test_cost_defaults_to_highest_rate_on_miss(self):
+        index = TariffIndex(_daily_windows(date(2026, 3, 2)))
+        cost = index.cost(np.array([to_epoch("2026-05-01T00:00:00Z")]), [1.0])
+        assert cost == pytest.approx(PEAK)
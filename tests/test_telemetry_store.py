@@ -0,0 +1,94 @@
+"""Tests for the binary energy telemetry ring buffer."""
+
+import json
+
+import numpy as np
+import pytest
+
+from domains.energy.telemetry_store import TelemetryRing, migrate_jsonl
+
+T0 = 1_780_000_000.0  # arbitrary epoch, 10s grid from here
+
+
+def _append(ring, start, n, demand=100.0):
+    epochs = T0 + 10 * np.arange(start, start + n)
+    return ring.append(epochs, np.full(n, demand) + np.arange(n), np.full(n, 0.3))
+
+
+@pytest.fixture
+def ring(tmp_path):
+    r = TelemetryRing(tmp_path / "t.ring", capacity=100)
+    yield r
+    r.close()
+
+
+def test_append_and_range(ring):
+    assert _append(ring, 0, 50) == 50
+    out = ring.range(T0 + 100, T0 + 200)
+    assert out["epoch"].tolist() == [T0 + 10 * i for i in range(10, 20)]
+    assert len(ring.range(T0)) == 50
+    assert len(ring.range(T0 + 10_000)) == 0
+
+
+def test_wraps_without_losing_order(ring):
+    _append(ring, 0, 80)
+    _append(ring, 80, 50)  # 130 total into 100 slots
+    assert len(ring) == 100
+    out = ring.range(0)
+    assert out["epoch"][0] == T0 + 10 * 30
+    assert out["epoch"][-1] == T0 + 10 * 129
+    assert np.all(np.diff(out["epoch"]) > 0)
+    # a range straddling the physical wrap point
+    mid = ring.range(T0 + 10 * 95, T0 + 10 * 105)
+    assert mid["epoch"].tolist() == [T0 + 10 * i for i in range(95, 105)]
+
+
+def test_batch_larger_than_capacity_keeps_newest(ring):
+    _append(ring, 0, 250)
+    out = ring.range(0)
+    assert len(out) == 100
+    assert out["epoch"][0] == T0 + 10 * 150
+
+
+def test_stale_and_duplicate_samples_dropped(ring):
+    _append(ring, 0, 10)
+    assert _append(ring, 5, 10) == 5  # only 10..14 are new
+    assert ring.append([T0 + 500, T0 + 500, T0 + 490], [1, 2, 3], [0, 0, 0]) == 2
+    assert np.all(np.diff(ring.range(0)["epoch"]) > 0)
+
+
+def test_latest_and_persistence(tmp_path):
+    path = tmp_path / "t.ring"
+    ring = TelemetryRing(path, capacity=10)
+    ring.append_samples([
+        {"readAt": "2026-06-01T10:00:00+00:00", "demand": 450, "consumptionDelta": 1.2},
+        {"readAt": "2026-06-01T10:00:10Z", "demand": 2450.0, "consumptionDelta": None},
+        {"readAt": "2026-06-01T10:00:20Z", "demand": None},
+    ])
+    ring.close()
+
+    reader = TelemetryRing(path, readonly=True)
+    latest = reader.latest()
+    assert latest["demand"] == 2450.0
+    assert latest["readAt"].startswith("2026-06-01T10:00:10")
+    assert len(reader) == 2
+    with pytest.raises(PermissionError):
+        reader.append([T0], [1], [0])
+    reader.close()
+
+
+def test_readonly_missing_file(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        TelemetryRing(tmp_path / "missing.ring", readonly=True)
+
+
+def test_migrate_jsonl(tmp_path, ring):
+    log = tmp_path / "energy_telemetry.jsonl"
+    lines = [json.dumps({"readAt": f"2026-06-01T10:00:{s:02d}Z", "demand": 300 + s,
+                         "consumptionDelta": 0.5}) for s in range(0, 60, 10)]
+    lines.insert(2, "{not json")
+    log.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    assert migrate_jsonl(log, ring) == 6
+    # re-running is a no-op
+    assert migrate_jsonl(log, ring) == 0
+    assert ring.range(0)["demand_w"].tolist() == [300, 310, 320, 330, 340, 350]
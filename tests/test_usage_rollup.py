@@ -0,0 +1,94 @@
+"""Tests for the server-side ai_api_usage rollup used by reconciliation."""
+
+from datetime import date
+
+import httpx
+import pytest
+
+from domains.api_usage import reconcile, reconcile_csv, rollup
+
+
+class _FakeSupabase:
+    def __init__(self, rpc_rows=None, raw_rows=None):
+        self.rpc_rows = rpc_rows
+        self.raw_rows = raw_rows or []
+        self.requests = []
+        self.selects = []
+
+    def headers(self, **kw):
+        return {}
+
+    def request_sync(self, method, url, **kwargs):
+        self.requests.append((method, url, kwargs.get("params")))
+        req = httpx.Request(method, f"https://x/rest/v1/{url}")
+        if self.rpc_rows is None:
+            return httpx.Response(404, json={"code": "PGRST202"}, request=req)
+        return httpx.Response(200, json=self.rpc_rows, request=req)
+
+    def select_sync(self, table, params=None, *, paginate=False):
+        self.selects.append((table, params))
+        return self.raw_rows
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    holder = {}
+
+    def install(**kw):
+        holder["sb"] = _FakeSupabase(**kw)
+        monkeypatch.setattr(rollup, "get_supabase", lambda url, key: holder["sb"])
+        return holder["sb"]
+    return install
+
+
+RPC_ROWS = [
+    {"usage_date": "2026-05-01", "project": "discord-messenger", "model": "claude-sonnet-4-5",
+     "calls": 3, "input_tokens": 300, "output_tokens": 30, "cache_creation_input_tokens": 0,
+     "cache_read_input_tokens": 10, "cost_usd": "0.0123"},
+    {"usage_date": "2026-05-01", "project": "hadley-bricks", "model": "claude-sonnet-4-5",
+     "calls": 1, "input_tokens": 100, "output_tokens": 20, "cache_creation_input_tokens": 0,
+     "cache_read_input_tokens": 0, "cost_usd": 0.01},
+]
+
+
+def test_rpc_rows_normalised(fake):
+    sb = fake(rpc_rows=RPC_ROWS)
+    rows = rollup.daily_rollup("u", "k", date(2026, 5, 1), date(2026, 5, 2))
+    assert sb.requests == [("GET", "rpc/ai_usage_daily",
+                            {"since": "2026-05-01", "source": "api_key", "until": "2026-05-02"})]
+    assert rows[0]["cost_usd"] == pytest.approx(0.0123)
+    assert rows[0]["calls"] == 3 and rows[0]["cache_read_input_tokens"] == 10
+    assert sb.selects == []
+
+
+def test_falls_back_to_raw_rows_when_rpc_missing(fake):
+    sb = fake(raw_rows=[
+        {"created_at": "2026-05-01T10:00:00+00:00", "project": "p", "model": "m",
+         "input_tokens": 5, "output_tokens": 1, "cost_usd": 0.5},
+        {"created_at": "2026-05-01T11:00:00+00:00", "project": "p", "model": "m",
+         "input_tokens": 7, "output_tokens": 2, "cost_usd": None},
+        {"created_at": "2026-05-02T00:00:01+00:00", "project": None, "model": None,
+         "input_tokens": 1, "output_tokens": 1, "cost_usd": 0.1},
+    ])
+    rows = rollup.daily_rollup("u", "k", date(2026, 5, 1))
+    assert [(r["usage_date"], r["project"], r["model"], r["calls"]) for r in rows] == [
+        ("2026-05-01", "p", "m", 2), ("2026-05-02", "?", "unknown", 1)]
+    assert rows[0]["input_tokens"] == 12 and rows[0]["cost_usd"] == pytest.approx(0.5)
+    assert sb.selects[0][1]["billing_source"] == "eq.api_key"
+
+
+def test_reconcile_folds_projects_by_model(fake, monkeypatch):
+    fake(rpc_rows=RPC_ROWS)
+    monkeypatch.setattr(reconcile, "_SUPABASE_URL", "https://x")
+    monkeypatch.setattr(reconcile, "_SERVICE_KEY", "k")
+    logged = reconcile._fetch_logged(date(2026, 5, 1))
+    assert dict(logged) == {("2026-05-01", "claude-sonnet-4-5"):
+                            {"input": 400, "output": 50, "cost": pytest.approx(0.0223)}}
+
+
+def test_reconcile_csv_sums_cost_by_project(fake, monkeypatch):
+    sb = fake(rpc_rows=RPC_ROWS)
+    monkeypatch.setattr(reconcile_csv, "_SERVICE_KEY", "k")
+    logged = reconcile_csv._fetch_logged_cost("2026-05-01", "2026-05-03")
+    assert logged[("2026-05-01", "hadley-bricks")] == pytest.approx(0.01)
+    assert sb.requests[0][2]["until"] == "2026-05-03"
@@ -101,3 +101,98 @@ class TestModelLoading:
         k1 = _get_kokoro()
         k2 = _get_kokoro()
         assert k1 is k2, "Should return same instance"
+
+
+class TestSplitSentences:
+    """Sentence chunking for streaming TTS."""
+
+    def test_merges_short_sentences(self):
+        from hadley_api.voice_engine import split_sentences
+        chunks = split_sentences("Hi. Sure thing, I've added milk to the shopping list. Anything else?")
+        assert chunks[0].startswith("Hi. Sure thing")
+        assert all(len(c) >= 10 for c in chunks)
+
+    def test_preserves_all_text(self):
+        from hadley_api.voice_engine import split_sentences
+        text = "First sentence is here and long enough. Second one follows it closely! Third?"
+        assert " ".join(split_sentences(text)) == text
+
+    def test_empty(self):
+        from hadley_api.voice_engine import split_sentences
+        assert split_sentences("") == []
+
+
+class TestDecodeAudio:
+    """In-memory decoding for STT."""
+
+    def test_resamples_to_16k_mono(self):
+        import numpy as np
+        import soundfile as sf
+        from hadley_api.voice_engine import _decode_audio
+        buf = io.BytesIO()
+        sf.write(buf, np.zeros((24000, 2), dtype="float32"), 24000, format="WAV")
+        audio = _decode_audio(buf.getvalue(), source_format="wav")
+        assert audio.dtype == np.float32
+        assert audio.shape == (16000,)
+
+    def test_corrupt_audio_raises(self):
+        from hadley_api.voice_engine import _decode_audio
+        with pytest.raises(ValueError):
+            _decode_audio(b"not audio data", source_format="wav")
+
+
+class _FakeWhisper:
+    """Stands in for WhisperModel — returns the clip length as its 'text'."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def transcribe(self, audio, **kwargs):
+        from types import SimpleNamespace
+        self.calls += 1
+        segment = SimpleNamespace(text=f" {len(audio)} ")
+        return [segment], SimpleNamespace(duration=len(audio) / 16000)
+
+
+def _wav(seconds):
+    import numpy as np
+    import soundfile as sf
+    buf = io.BytesIO()
+    sf.write(buf, np.zeros(int(16000 * seconds), dtype="float32"), 16000, format="WAV")
+    return buf.getvalue()
+
+
+class TestTranscribeBatch:
+    """Batched transcription (stub model)."""
+
+    @pytest.fixture(autouse=True)
+    def fake_model(self, monkeypatch):
+        from hadley_api import voice_engine
+        model = _FakeWhisper()
+        monkeypatch.setattr(voice_engine, "_whisper_model", model)
+        return model
+
+    def test_per_clip_results_in_order(self, fake_model):
+        from hadley_api.voice_engine import transcribe_batch_sync
+        results = transcribe_batch_sync([(_wav(1), "wav"), (b"junk", "wav"), (_wav(0.5), "wav")])
+        assert [r["text"] for r in results] == ["16000", "", "8000"]
+        assert results[1]["error"] is not None
+        assert results[0]["error"] is None and results[0]["duration"] == 1.0
+        assert fake_model.calls == 2
+
+    async def test_concurrent_calls_are_coalesced(self, fake_model, monkeypatch):
+        import asyncio
+        from hadley_api import voice_engine, voice_worker
+        monkeypatch.setattr(voice_worker, "_worker", voice_worker.VoiceWorker(workers=0))
+        monkeypatch.setattr(voice_engine, "_batcher", None)
+        monkeypatch.setattr(voice_engine, "BATCH_WINDOW_SECONDS", 0.05)
+
+        texts = await asyncio.gather(
+            voice_engine.transcribe_batched(_wav(1), "wav"),
+            voice_engine.transcribe_batched(_wav(2), "wav"),
+        )
+        assert texts == ["16000", "32000"]
+        jobs = voice_worker.get_worker().metrics()["jobs"]
+        assert jobs["transcribe_batch"]["completed"] == 1
+        await asyncio.sleep(0)
+        assert voice_engine._batcher._running == set()
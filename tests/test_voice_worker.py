@@ -0,0 +1,95 @@
+"""Unit tests for the voice worker priority queue (thread mode, no models)."""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from hadley_api.voice_worker import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    VoiceWorker,
+    parse_priority,
+)
+
+
+def _sleep_and_return(name, seconds):
+    time.sleep(seconds)
+    return name
+
+
+def _boom():
+    raise RuntimeError("inference failed")
+
+
+async def test_interactive_jumps_background_queue():
+    worker = VoiceWorker(workers=0)
+    finished = []
+
+    async def run(name, priority):
+        finished.append(await worker.submit(_sleep_and_return, name, 0.05, priority=priority))
+
+    first = asyncio.create_task(run("bg-1", PRIORITY_BACKGROUND))
+    await asyncio.sleep(0.01)  # bg-1 is now running
+    rest = [
+        asyncio.create_task(run("bg-2", PRIORITY_BACKGROUND)),
+        asyncio.create_task(run("live", PRIORITY_INTERACTIVE)),
+    ]
+    await asyncio.gather(first, *rest)
+    assert finished == ["bg-1", "live", "bg-2"]
+
+
+async def test_errors_propagate_and_are_counted():
+    worker = VoiceWorker(workers=0)
+    with pytest.raises(RuntimeError):
+        await worker.submit(_boom, kind="transcribe")
+    assert worker.metrics()["jobs"]["transcribe"]["failed"] == 1
+
+
+async def test_metrics_record_latency():
+    worker = VoiceWorker(workers=0)
+    await worker.submit(_sleep_and_return, "x", 0.01, kind="synthesise")
+    stats = worker.metrics()["jobs"]["synthesise"]
+    assert stats["completed"] == 1
+    assert stats["run_ms_p50"] >= 10
+
+
+class _BrokenPool(ThreadPoolExecutor):
+    def __init__(self):
+        super().__init__(max_workers=1)
+        self.shutdowns = []
+
+    def submit(self, fn, *args, **kwargs):
+        raise BrokenProcessPool("worker died")
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        self.shutdowns.append(cancel_futures)
+        super().shutdown(wait=wait, cancel_futures=cancel_futures)
+
+
+async def test_broken_pool_is_shut_down_and_replaced_once():
+    worker = VoiceWorker(workers=2)
+    broken = worker._pool = _BrokenPool()
+    restarts = []
+
+    def fake_start():
+        if worker._pool is None:
+            restarts.append(1)
+            worker._pool = ThreadPoolExecutor(max_workers=2)
+
+    worker.start = fake_start
+    results = await asyncio.gather(
+        worker.submit(_sleep_and_return, "a", 0.01),
+        worker.submit(_sleep_and_return, "b", 0.01),
+    )
+    assert sorted(results) == ["a", "b"]
+    assert broken.shutdowns == [True]
+    assert len(restarts) == 1
+    worker.shutdown()
+
+
+def test_parse_priority():
+    assert parse_priority("background") == PRIORITY_BACKGROUND
+    assert parse_priority(None) == PRIORITY_INTERACTIVE
+    assert parse_priority("nonsense") == PRIORITY_INTERACTIVE
@@ -1,5 +1,6 @@
 """Utility modules for Discord-Messenger."""
 
 from .log_sanitizer import sanitize_log, sanitize_for_log
+from .sqlite_store import SQLiteStore
 
-__all__ = ["sanitize_log", "sanitize_for_log"]
+__all__ = ["sanitize_log", "sanitize_for_log", "SQLiteStore"]
@@ -0,0 +1,40 @@
+"""Base class for the small single-file SQLite stores.
+
+Each store keeps its own database file under data/ and opens a short-lived
+connection per operation, so one instance can be shared across threads
+and event loops without check_same_thread gymnastics. The parent directory,
+WAL mode and schema are set up on the first connection only.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+
+
+class SQLiteStore:
+    """A SQLite file with an idempotent schema. Subclasses set SCHEMA."""
+
+    SCHEMA = ""
+
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        self._ready = False
+
+    @contextmanager
+    def db(self):
+        """Connection to the store (schema ensured), committed on exit."""
+        if not self._ready:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), timeout=10.0)
+        conn.row_factory = sqlite3.Row
+        try:
+            if not self._ready:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(self.SCHEMA)
+                self._ready = True
+            with conn:
+                yield conn
+        finally:
+            conn.close()